@@ -0,0 +1,81 @@
+# ============================
+# benchmark_alpha_conversion.py
+# ============================
+#
+# Times the grayscale -> RGBA atlas conversion at several glyph sizes,
+# comparing the original per-pixel loop against font_atlas.grayscale_to_rgba.
+# Also checks that both paths produce byte-identical images.
+#
+# Usage: python benchmark_alpha_conversion.py [glyph sizes...]
+# ============================
+import os
+import sys
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+import font_atlas
+
+# ========== CONFIG ==========
+FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "NotoSansMono-Regular.ttf")
+GLYPH_SIZES = [32, 64, 128]
+COLUMNS = 16
+REPEATS = 3
+
+codepoints = (
+    list(range(32, 127)) +
+    [0x401, 0x451] +
+    list(range(0x410, 0x430)) +
+    list(range(0x430, 0x450))
+)
+
+
+def render_grayscale_atlas(glyph_size):
+    """Render the codepoint set into a fixed grid, roughly like the generators do."""
+    font = ImageFont.truetype(FONT_PATH, glyph_size)
+    ascent, descent = font.getmetrics()
+    cell_w = max(int(font.getlength(chr(cp))) for cp in codepoints)
+    cell_h = ascent + descent
+    rows = (len(codepoints) + COLUMNS - 1) // COLUMNS
+
+    atlas_image = Image.new("L", (COLUMNS * cell_w, rows * cell_h), color=0)
+    atlas_draw = ImageDraw.Draw(atlas_image)
+    for i, cp in enumerate(codepoints):
+        row, col = divmod(i, COLUMNS)
+        atlas_draw.text((col * cell_w, row * cell_h), chr(cp), font=font, fill=255)
+    return atlas_image
+
+
+def best_time(func, *args, **kwargs):
+    best = None
+    result = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(glyph_sizes):
+    print(f"{'size':>6} {'atlas px':>12} {'mode':>6} {'loop ms':>10} {'bands ms':>10} {'speedup':>8}  identical")
+    all_identical = True
+    for glyph_size in glyph_sizes:
+        atlas_image = render_grayscale_atlas(glyph_size)
+        for antialiased in (False, True):
+            loop_time, loop_rgba = best_time(font_atlas.grayscale_to_rgba_per_pixel, atlas_image, antialiased)
+            band_time, band_rgba = best_time(font_atlas.grayscale_to_rgba, atlas_image, antialiased)
+            identical = loop_rgba.tobytes() == band_rgba.tobytes()
+            all_identical = all_identical and identical
+            size_str = f"{atlas_image.width}x{atlas_image.height}"
+            print(
+                f"{glyph_size:>6} {size_str:>12} {'aa' if antialiased else 'solid':>6} "
+                f"{loop_time * 1000:>10.2f} {band_time * 1000:>10.2f} "
+                f"{loop_time / band_time:>7.1f}x  {identical}"
+            )
+    return 0 if all_identical else 1
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or GLYPH_SIZES
+    sys.exit(main(sizes))
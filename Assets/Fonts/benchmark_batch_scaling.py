@@ -0,0 +1,87 @@
+# ============================
+# benchmark_batch_scaling.py
+# ============================
+#
+# Builds a fixed set of atlas jobs (several sizes x solid/aa) serially with
+# font_atlas.build_atlas, then with font_atlas.build_atlas_batch at an
+# increasing number of worker processes. Reports wall time, speedup over the
+# serial build and over the 1-worker batch, and checks every batch result is
+# byte-identical to the serial one. (The batch also renders each glyph once
+# for solid/aa pairs that share a size, so it beats serial even at 1 worker.)
+#
+# Caching is disabled throughout so every run rasterizes every glyph.
+#
+# Usage: python benchmark_batch_scaling.py [max workers]
+# ============================
+import os
+import sys
+import time
+
+import font_atlas
+
+# ========== CONFIG ==========
+FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "NotoSansMono-Regular.ttf")
+GLYPH_SIZES = [16, 24, 32, 48, 64, 96, 128]
+# ASCII, Latin-1, Greek, Cyrillic, box drawing
+CODEPOINT_RANGES = "32-126,0xA0-0xFF,0x370-0x3FF,0x400-0x4FF,0x2500-0x257F"
+
+
+def make_jobs():
+    codepoints = font_atlas.parse_codepoint_ranges(CODEPOINT_RANGES)
+    return [
+        {
+            "font_path": FONT_PATH,
+            "codepoints": codepoints,
+            "target_glyph_size": size,
+            "columns": font_atlas.DEFAULT_COLUMNS,
+            "antialiased": antialiased,
+            "threshold": font_atlas.DEFAULT_THRESHOLD,
+        }
+        for size in GLYPH_SIZES
+        for antialiased in (False, True)
+    ]
+
+
+def worker_counts(max_workers):
+    counts = []
+    n = 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def main(max_workers):
+    jobs = make_jobs()
+    glyphs = sum(len(job["codepoints"]) for job in jobs)
+    print(f"{len(jobs)} jobs, {glyphs} glyph cells, {os.cpu_count()} CPUs available")
+
+    start = time.perf_counter()
+    serial = [font_atlas.build_atlas(cache_dir=None, **job) for job in jobs]
+    serial_time = time.perf_counter() - start
+    print(f"{'serial':>10} {serial_time * 1000:>10.1f} ms")
+
+    all_identical = True
+    one_worker_time = None
+    for workers in worker_counts(max_workers):
+        start = time.perf_counter()
+        batch = font_atlas.build_atlas_batch(jobs, workers=workers, cache_dir=None)
+        elapsed = time.perf_counter() - start
+        if one_worker_time is None:
+            one_worker_time = elapsed
+
+        identical = all(
+            a[0].tobytes() == b[0].tobytes() and a[1] == b[1] and a[2] == b[2]
+            for a, b in zip(serial, batch)
+        )
+        all_identical = all_identical and identical
+        print(f"{workers:>3} workers {elapsed * 1000:>10.1f} ms  {serial_time / elapsed:>5.2f}x serial  "
+              f"{one_worker_time / elapsed:>5.2f}x 1-worker  identical={identical}")
+
+    return 0 if all_identical else 1
+
+
+if __name__ == "__main__":
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    sys.exit(main(limit))
@@ -0,0 +1,145 @@
+# ============================
+# benchmark_glyph_lookup.py
+# ============================
+#
+# Per-glyph lookup cost of the metadata JSON against the binary lookup:
+# - json str keys:  str(cp) in metadata, then metadata[str(cp)]   (current scheme)
+# - json int keys:  metadata re-keyed by int once (FontTester.gd style)
+# - lookup.bin:     GlyphLookup.get(cp)
+# - lookup table:   a plain list indexed by cp - first   (what Godot does with
+#                   the PackedInt32Array from the .bin)
+# - numpy gather:   whole text at once through the dense slot table
+#
+# Also compares load time of <name>_metadata.json against <name>_lookup.bin.
+# Every scheme must resolve the same (x, y) for every character.
+#
+# Usage: python benchmark_glyph_lookup.py [atlas prefix]
+# ============================
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+import glyph_lookup
+
+# ========== CONFIG ==========
+HERE = os.path.dirname(os.path.abspath(__file__))
+ATLAS_PREFIX = os.path.join(HERE, "font_atlas_fixed_grid_baseline_fixed")
+SAMPLE_TEXT = ("In the beginning God created the heaven and the earth. "
+               "В начале сотворил Бог небо и землю. Ёё 一 ") * 2000
+LOAD_REPEATS = 50
+
+
+def best_of(function, repeats=5):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(prefix):
+    with open(prefix + "_fontinfo.json", "r", encoding="utf-8") as f:
+        font_info = json.load(f)
+    glyph_w = font_info["glyph_box_width"]
+    glyph_h = font_info["glyph_box_height"]
+
+    # ========== LOAD ==========
+    def load_json():
+        with open(prefix + "_metadata.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    json_load, metadata = best_of(lambda: [load_json() for _ in range(LOAD_REPEATS)][-1])
+    bin_load, lookup = best_of(lambda: [glyph_lookup.GlyphLookup.load(prefix + "_lookup.bin")
+                                        for _ in range(LOAD_REPEATS)][-1])
+    print(f"Load: metadata.json {json_load / LOAD_REPEATS * 1e6:.1f} us, "
+          f"lookup.bin {bin_load / LOAD_REPEATS * 1e6:.1f} us")
+
+    codepoints = [ord(ch) for ch in SAMPLE_TEXT]
+    count = len(codepoints)
+
+    # ========== PER-GLYPH ==========
+    def json_str_keys():
+        out = []
+        for cp in codepoints:
+            if str(cp) in metadata:
+                row, col = metadata[str(cp)]
+                out.append((col * glyph_w, row * glyph_h))
+            else:
+                out.append(None)
+        return out
+
+    int_metadata = {int(k): v for k, v in metadata.items()}
+
+    def json_int_keys():
+        out = []
+        for cp in codepoints:
+            entry = int_metadata.get(cp)
+            if entry is not None:
+                out.append((entry[1] * glyph_w, entry[0] * glyph_h))
+            else:
+                out.append(None)
+        return out
+
+    def lookup_bin():
+        out = []
+        for cp in codepoints:
+            record = lookup.get(cp)
+            out.append((record[0], record[1]) if record is not None else None)
+        return out
+
+    table = list(lookup.table)
+    records = list(lookup.records)
+    first = lookup.first_codepoint
+
+    def lookup_table():
+        out = []
+        size = len(table)
+        for cp in codepoints:
+            index = cp - first
+            slot = table[index] - 1 if 0 <= index < size else -1
+            out.append((records[slot * 7], records[slot * 7 + 1]) if slot >= 0 else None)
+        return out
+
+    schemes = [
+        ("json str keys", json_str_keys),
+        ("json int keys", json_int_keys),
+        ("lookup.bin", lookup_bin),
+        ("lookup table", lookup_table),
+    ]
+    reference = None
+    all_identical = True
+    print(f"{count} characters:")
+    for name, function in schemes:
+        elapsed, result = best_of(function)
+        reference = reference if reference is not None else result
+        identical = result == reference
+        all_identical = all_identical and identical
+        print(f"  {name:<14} {elapsed / count * 1e9:>8.1f} ns/glyph  identical={identical}")
+
+    # ========== VECTORIZED ==========
+    dense = np.zeros(first + len(table), dtype=np.int32)
+    dense[first:] = table
+    record_array = np.asarray(records, dtype=np.int32).reshape(-1, glyph_lookup.RECORD_SIZE)
+    text_codepoints = np.asarray(codepoints, dtype=np.int64)
+
+    def numpy_gather():
+        in_range = text_codepoints < len(dense)
+        slots = np.where(in_range, dense[np.where(in_range, text_codepoints, 0)], 0) - 1
+        return slots, record_array[slots, :2]
+
+    elapsed, (slots, xy) = best_of(numpy_gather)
+    vector_result = [tuple(int(v) for v in xy[i]) if slots[i] >= 0 else None for i in range(count)]
+    identical = vector_result == reference
+    all_identical = all_identical and identical
+    print(f"  {'numpy gather':<14} {elapsed / count * 1e9:>8.1f} ns/glyph  identical={identical}")
+
+    return 0 if all_identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else ATLAS_PREFIX))
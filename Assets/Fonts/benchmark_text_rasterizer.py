@@ -0,0 +1,150 @@
+# ============================
+# benchmark_text_rasterizer.py
+# ============================
+#
+# Renders the whole KJV as fixed-size pages two ways and compares them:
+# - legacy:     per-glyph crop/paste with a str(cp) metadata lookup per
+#               character (what old/render_atlas2.py used to do)
+# - rasterizer: text_rasterizer.TextRasterizer, one gather per page
+#
+# The legacy path is only timed on the first --legacy-pages pages (it is far
+# too slow for the full text); those pages are also checked to be
+# byte-identical between the two. The rasterizer then renders every page,
+# through the full RGBA blend.
+#
+# Text comes from Bible/kjv_ascii.txt (tab-separated "Book C:V<TAB>text"
+# lines) when it exists; otherwise a deterministic synthetic text of the same
+# size is used so the benchmark always runs.
+#
+# Usage: python benchmark_text_rasterizer.py [--kjv PATH] [--save-dir DIR]
+# ============================
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+import text_rasterizer
+
+# ========== CONFIG ==========
+HERE = os.path.dirname(os.path.abspath(__file__))
+ATLAS_PREFIX = os.path.join(HERE, "font_atlas_fixed_grid_baseline_fixed")
+KJV_PATH = os.path.join(HERE, "..", "..", "Bible", "kjv_ascii.txt")
+PAGE_COLS = 80
+PAGE_ROWS = 40
+LEGACY_PAGES = 20
+SYNTHETIC_VERSES = 31102  # Verses in the KJV
+SYNTHETIC_WORDS = ["and", "the", "of", "unto", "LORD", "shall", "he", "they", "said", "for", "his",
+                   "that", "in", "them", "Israel", "thee", "thou", "upon", "people", "came", "house"]
+
+
+def load_text(path):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            verses = [line.rstrip("\n").replace("\t", " ") for line in f if "\t" in line]
+        return "\n".join(verses), "kjv"
+
+    rng = random.Random(1611)
+    verses = []
+    for i in range(SYNTHETIC_VERSES):
+        words = [rng.choice(SYNTHETIC_WORDS) for _ in range(rng.randint(12, 40))]
+        verses.append(f"Book {i // 1000 + 1}:{i % 1000 + 1} " + " ".join(words) + ".")
+    return "\n".join(verses), "synthetic"
+
+
+def render_legacy(atlas_coverage, metadata, glyph_w, glyph_h, lines, cols):
+    output_image = Image.new("L", (cols * glyph_w, len(lines) * glyph_h), color=0)
+    for line_idx, line in enumerate(lines):
+        for char_idx, char in enumerate(line[:cols]):
+            cp = ord(char)
+            if str(cp) not in metadata:
+                continue
+            row, col = metadata[str(cp)]
+            x1 = col * glyph_w
+            y1 = row * glyph_h
+            glyph = atlas_coverage.crop((x1, y1, x1 + glyph_w, y1 + glyph_h))
+            output_image.paste(glyph, (char_idx * glyph_w, line_idx * glyph_h))
+    return output_image
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark whole-book page rendering.")
+    parser.add_argument("--kjv", default=KJV_PATH, help="kjv_ascii.txt path (default: %(default)s)")
+    parser.add_argument("--atlas", default=ATLAS_PREFIX, help="Atlas path prefix (default: %(default)s)")
+    parser.add_argument("--cols", type=int, default=PAGE_COLS)
+    parser.add_argument("--rows", type=int, default=PAGE_ROWS)
+    parser.add_argument("--legacy-pages", type=int, default=LEGACY_PAGES)
+    parser.add_argument("--save-dir", help="Write every rasterized page here as PNG (not timed)")
+    args = parser.parse_args(argv)
+
+    text, source = load_text(args.kjv)
+    start = time.perf_counter()
+    pages = text_rasterizer.paginate(text_rasterizer.word_wrap(text, args.cols), args.rows)
+    wrap_time = time.perf_counter() - start
+    print(f"Text: {source}, {len(text)} chars -> {len(pages)} pages of {args.cols}x{args.rows} "
+          f"(wrapped in {wrap_time * 1000:.1f} ms)")
+
+    start = time.perf_counter()
+    rasterizer = text_rasterizer.TextRasterizer.load(args.atlas)
+    print(f"Atlas loaded in {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"({len(rasterizer.glyphs) - 1} glyphs, {rasterizer.glyph_width}x{rasterizer.glyph_height})")
+
+    # ========== LEGACY vs RASTERIZER (coverage only) ==========
+    atlas_image = Image.open(args.atlas + ".png")
+    atlas_coverage = atlas_image.getchannel("A") if "A" in atlas_image.getbands() else atlas_image.convert("L")
+    with open(args.atlas + "_metadata.json", "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+
+    sample = pages[:args.legacy_pages]
+    start = time.perf_counter()
+    legacy = [render_legacy(atlas_coverage, metadata, rasterizer.glyph_width, rasterizer.glyph_height,
+                            page, args.cols) for page in sample]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = [rasterizer.render_coverage(page, args.cols) for page in sample]
+    fast_time = time.perf_counter() - start
+
+    identical = all(
+        a.tobytes() == b.tobytes() for a, b in zip(legacy, fast)
+    )
+    print(f"First {len(sample)} pages, coverage only:")
+    print(f"  legacy crop/paste {legacy_time * 1000:>10.1f} ms  ({legacy_time / len(sample) * 1000:.2f} ms/page)")
+    print(f"  rasterizer        {fast_time * 1000:>10.1f} ms  ({fast_time / len(sample) * 1000:.2f} ms/page)")
+    print(f"  speedup {legacy_time / fast_time:.1f}x, identical={identical}")
+
+    # ========== WHOLE BOOK (RGBA) ==========
+    for blend_mode in text_rasterizer.BLEND_MODES:
+        start = time.perf_counter()
+        for page in pages:
+            rasterizer.render(page, args.cols, fg=(1.0, 0.85, 0.4, 1.0), bg=(0.05, 0.05, 0.1, 1.0),
+                              blend_mode=blend_mode)
+        elapsed = time.perf_counter() - start
+        print(f"All {len(pages)} pages, RGBA {blend_mode:<11} {elapsed:>8.2f} s  "
+              f"({len(pages) / elapsed:.0f} pages/s; legacy estimate {legacy_time / len(sample) * len(pages):.0f} s "
+              f"for coverage alone)")
+
+    # Per-cell colors take the full per-pixel blend instead of the color table
+    rng = np.random.default_rng(0)
+    sample_colors = rng.random((args.rows, args.cols, 4), dtype=np.float32)
+    start = time.perf_counter()
+    for page in sample:
+        rasterizer.render(page, args.cols, fg=sample_colors[:len(page)], bg=text_rasterizer.BLACK)
+    elapsed = time.perf_counter() - start
+    print(f"First {len(sample)} pages, per-cell fg colors {elapsed / len(sample) * 1000:.2f} ms/page")
+
+    if args.save_dir:
+        os.makedirs(args.save_dir, exist_ok=True)
+        for index, page in enumerate(pages):
+            rasterizer.render(page, args.cols).save(os.path.join(args.save_dir, f"page_{index + 1:05d}.png"))
+        print(f"Saved {len(pages)} pages to {args.save_dir}")
+
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
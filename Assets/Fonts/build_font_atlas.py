@@ -0,0 +1,173 @@
+# ============================
+# build_font_atlas.py
+# ============================
+#
+# Parameterized atlas build entry point.
+#
+# Generates:
+# - <output>.png
+# - <output>_metadata.json
+# - <output>_fontinfo.json
+# - <output>_lookup.bin
+#
+# Example (what generate_font_atlas_anti_aliased.py does):
+#   python build_font_atlas.py --font NotoSansMono-Regular.ttf --size 32 --columns 16 \
+#       --codepoints "32-126,0x401,0x451,0x410-0x42F,0x430-0x44F" --mode aa \
+#       --output font_atlas_fixed_grid_baseline_fixed
+#
+# --mode sdf writes a signed distance field atlas instead (distance in alpha,
+# see distance_field.py) that stays sharp at any zoom; render_sdf.py renders
+# and verifies it.
+#
+# Rendered glyphs are cached in --cache-dir (default .atlas_cache), keyed on
+# the font file hash plus the rasterization parameters, so rebuilding a
+# variant only renders glyphs it has not seen before.
+#
+# Batch mode builds many atlases at once, rasterizing glyphs across a
+# process pool:
+#   python build_font_atlas.py --batch atlas_jobs.json --workers 8
+# where atlas_jobs.json is a list of jobs such as
+#   [{"font": "NotoSansMono-Regular.ttf", "size": 64, "mode": "aa", "output": "atlas_64_aa"}]
+# Jobs may also set "columns", "codepoints", "packing", "threshold", "sdf_spread"
+# and "sdf_supersample"; anything left out
+# falls back to the command line options.
+# ============================
+import argparse
+import json
+import os
+import sys
+
+import font_atlas
+
+MODES = ["solid", "aa", "sdf"]
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Build a font atlas (PNG + metadata + fontinfo).")
+    parser.add_argument("--font", default=font_atlas.DEFAULT_FONT_PATH,
+                        help="Path to the TTF/OTF font (default: %(default)s)")
+    parser.add_argument("--size", type=int, default=font_atlas.DEFAULT_TARGET_GLYPH_SIZE,
+                        help="Target glyph size in pixels (default: %(default)s)")
+    parser.add_argument("--columns", type=int, default=font_atlas.DEFAULT_COLUMNS,
+                        help="Glyphs per atlas row (default: %(default)s)")
+    parser.add_argument("--codepoints", default=font_atlas.DEFAULT_CODEPOINT_RANGES,
+                        help="Comma-separated codepoints/inclusive ranges, decimal or 0x hex (default: %(default)s)")
+    parser.add_argument("--mode", choices=MODES, default="aa",
+                        help="solid = hard threshold, aa = keep anti-aliasing as alpha, "
+                             "sdf = signed distance field in alpha (default: %(default)s)")
+    parser.add_argument("--packing", choices=font_atlas.PACKINGS, default=font_atlas.PACKING_GRID,
+                        help="grid = fixed cells, skyline = tight bboxes in a power-of-two atlas (default: %(default)s)")
+    parser.add_argument("--threshold", type=int, default=font_atlas.DEFAULT_THRESHOLD,
+                        help="Gray level that counts as ink in solid mode (default: %(default)s)")
+    parser.add_argument("--sdf-spread", type=int, default=font_atlas.DEFAULT_SDF_SPREAD,
+                        help="Atlas pixels of distance kept on each side of the edge in sdf mode (default: %(default)s)")
+    parser.add_argument("--sdf-supersample", type=int, default=font_atlas.DEFAULT_SDF_SUPERSAMPLE,
+                        help="Rasterization scale the distance field is computed at (default: %(default)s)")
+    parser.add_argument("--output", default=font_atlas.DEFAULT_OUTPUT_NAME,
+                        help="Output path prefix, without extension (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=font_atlas.DEFAULT_CACHE_DIR,
+                        help="Glyph/layout cache directory (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Render everything from scratch and leave the cache untouched")
+    parser.add_argument("--batch", metavar="JOBS_JSON",
+                        help="Build every job listed in this JSON file instead of a single atlas")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for --batch (default: CPU count)")
+    return parser
+
+
+def load_batch_jobs(path, args):
+    """Read a jobs file, filling unspecified keys from the command line options."""
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    jobs = []
+    for entry in entries:
+        mode = entry.get("mode", args.mode)
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r} in {path}")
+        packing = entry.get("packing", args.packing)
+        if packing not in font_atlas.PACKINGS:
+            raise ValueError(f"Unknown packing {packing!r} in {path}")
+        jobs.append({
+            "font_path": entry.get("font", args.font),
+            "codepoints": font_atlas.parse_codepoint_ranges(entry.get("codepoints", args.codepoints)),
+            "target_glyph_size": int(entry.get("size", args.size)),
+            "columns": int(entry.get("columns", args.columns)),
+            "antialiased": mode == "aa",
+            "threshold": int(entry.get("threshold", args.threshold)),
+            "packing": packing,
+            "sdf_spread": int(entry.get("sdf_spread", args.sdf_spread)) if mode == "sdf" else 0,
+            "sdf_supersample": int(entry.get("sdf_supersample", args.sdf_supersample)),
+            "output": entry["output"],
+        })
+    return jobs
+
+
+def save_output(output_name, atlas_rgba, metadata, font_info):
+    output_dir = os.path.dirname(output_name)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    font_atlas.save_atlas(output_name, atlas_rgba, metadata, font_info)
+
+
+def main_batch(args):
+    jobs = load_batch_jobs(args.batch, args)
+    for job in jobs:
+        if not os.path.exists(job["font_path"]):
+            print(f"Font not found: {job['font_path']}", file=sys.stderr)
+            return 1
+
+    results = font_atlas.build_atlas_batch(
+        jobs,
+        workers=args.workers,
+        cache_dir=None if args.no_cache else args.cache_dir,
+    )
+    for job, (atlas_rgba, metadata, font_info, stats) in zip(jobs, results):
+        save_output(job["output"], atlas_rgba, metadata, font_info)
+        print(f"{job['output']}: {atlas_rgba.size[0]}x{atlas_rgba.size[1]} px, "
+              f"{stats['glyph_count']} glyphs ({stats['tiles_rendered']} rendered)")
+    return 0
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    if args.batch:
+        return main_batch(args)
+
+    if not os.path.exists(args.font):
+        print(f"Font not found: {args.font}", file=sys.stderr)
+        return 1
+    if args.size <= 0 or args.columns <= 0:
+        print("--size and --columns must be positive", file=sys.stderr)
+        return 1
+    if args.mode == "sdf" and (args.sdf_spread <= 0 or args.sdf_supersample <= 0):
+        print("--sdf-spread and --sdf-supersample must be positive", file=sys.stderr)
+        return 1
+
+    codepoints = font_atlas.parse_codepoint_ranges(args.codepoints)
+    if not codepoints:
+        print("No codepoints selected", file=sys.stderr)
+        return 1
+
+    atlas_rgba, metadata, font_info, stats = font_atlas.build_atlas(
+        font_path=args.font,
+        codepoints=codepoints,
+        target_glyph_size=args.size,
+        columns=args.columns,
+        antialiased=args.mode == "aa",
+        threshold=args.threshold,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        packing=args.packing,
+        sdf_spread=args.sdf_spread if args.mode == "sdf" else 0,
+        sdf_supersample=args.sdf_supersample,
+    )
+
+    save_output(args.output, atlas_rgba, metadata, font_info)
+    font_atlas.print_summary(atlas_rgba, font_info, stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# ============================
+# distance_field.py
+# ============================
+#
+# Signed distance fields for the SDF atlas mode.
+#
+# Each glyph is rendered `supersample` times larger than the atlas size, the
+# exact Euclidean distance to the glyph edge is computed on that raster and
+# then box-filtered down to atlas resolution. Distances are stored in atlas
+# pixels, mapped so that
+#
+#   value = 0.5 + distance / distance_range    (0..1, 255 in the PNG)
+#
+# with distance positive inside the glyph and distance_range = 2 * spread.
+# The edge sits at 0.5; anything further than `spread` atlas pixels from it
+# saturates to 0 or 1.
+# ============================
+import numpy as np
+from PIL import Image
+
+
+def shifted(array, offset, axis, fill):
+    """array shifted by `offset` along `axis`, filling the vacated cells with `fill`."""
+    result = np.full_like(array, fill)
+    src = [slice(None)] * array.ndim
+    dst = [slice(None)] * array.ndim
+    if offset >= 0:
+        src[axis] = slice(0, array.shape[axis] - offset)
+        dst[axis] = slice(offset, None)
+    else:
+        src[axis] = slice(-offset, None)
+        dst[axis] = slice(0, array.shape[axis] + offset)
+    result[tuple(dst)] = array[tuple(src)]
+    return result
+
+
+def squared_distance_to(features, radius):
+    """Squared distance from every cell to the nearest True cell of `features`.
+
+    Separable exact EDT (column pass, then row pass) restricted to a
+    +/- radius window, so distances are exact up to `radius` and anything
+    further reads as at least radius^2.
+    """
+    far = np.float32((radius + 1) ** 2)
+
+    # Column pass: distance to the nearest feature in the same column
+    columns = np.where(features, np.float32(0), far)
+    for k in range(1, radius + 1):
+        for offset in (k, -k):
+            columns = np.minimum(columns, np.where(shifted(features, offset, 0, False), np.float32(k * k), far))
+
+    # Row pass: combine with horizontal offsets
+    result = columns.copy()
+    for k in range(1, radius + 1):
+        for offset in (k, -k):
+            result = np.minimum(result, shifted(columns, offset, 1, far) + np.float32(k * k))
+    return np.minimum(result, far)
+
+
+def signed_distance(coverage, radius):
+    """Signed distance in raster pixels (positive inside) for an L coverage array."""
+    inside = coverage >= 128
+    to_inside = np.sqrt(squared_distance_to(inside, radius))
+    to_outside = np.sqrt(squared_distance_to(~inside, radius))
+    # Pixel centres sit half a pixel from the edge between them
+    return np.where(inside, to_outside - 0.5, 0.5 - to_inside)
+
+
+def glyph_distance_tile(dx, dy, tile, supersample, spread):
+    """Turn one supersampled glyph tile into an atlas-resolution distance tile.
+
+    (dx, dy) is the tile's offset inside the supersampled glyph cell. Returns
+    (x, y, L image) with (x, y) the distance tile's offset inside the
+    atlas-resolution glyph cell; the tile extends `spread` pixels past the ink.
+    """
+    x0 = dx // supersample - spread
+    y0 = dy // supersample - spread
+    x1 = -(-(dx + tile.width) // supersample) + spread
+    y1 = -(-(dy + tile.height) // supersample) + spread
+    width = x1 - x0
+    height = y1 - y0
+
+    canvas = Image.new("L", (width * supersample, height * supersample), 0)
+    canvas.paste(tile, (dx - x0 * supersample, dy - y0 * supersample))
+    coverage = np.asarray(canvas)
+
+    distance = signed_distance(coverage, (spread + 1) * supersample)
+    # Box filter down to atlas resolution, in atlas pixels
+    distance = distance.reshape(height, supersample, width, supersample).mean(axis=(1, 3)) / supersample
+
+    value = np.clip(0.5 + distance / (2 * spread), 0.0, 1.0)
+    return x0, y0, Image.fromarray(np.round(value * 255).astype(np.uint8))
+
+
+def coverage_from_distance(values, distance_range, scale):
+    """Reconstruct coverage (0..1) from stored 0..1 distance values sampled at `scale`.
+
+    One atlas pixel spans `scale` output pixels, so the 0.5 edge is widened
+    to a one-output-pixel anti-aliased ramp.
+    """
+    return np.clip((values - 0.5) * distance_range * scale + 0.5, 0.0, 1.0)
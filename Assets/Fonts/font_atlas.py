@@ -0,0 +1,666 @@
+# ============================
+# font_atlas.py
+# ============================
+#
+# Shared atlas build pipeline used by build_font_atlas.py and the
+# generate_font_atlas*.py wrappers.
+#
+# Produces:
+# - <name>.png
+# - <name>_metadata.json
+# - <name>_fontinfo.json
+# - <name>_lookup.bin  (binary codepoint lookup, see glyph_lookup.py)
+#
+# Grayscale -> RGBA conversion goes through one band-based path so
+# both formats stay byte-identical to the old per-pixel loops:
+# - hard threshold:  gray >= threshold -> (255, 255, 255, 255), else (0, 0, 0, 0)
+# - anti-aliased:    gray > 0          -> (255, 255, 255, gray), else (0, 0, 0, 0)
+#
+# Two packings are supported:
+# - grid:    every glyph gets a fixed glyph_box_width x glyph_box_height cell and
+#            the metadata maps codepoints to [row, col]
+# - skyline: each glyph's tight ink bbox is packed into a power-of-two atlas and
+#            the metadata maps codepoints to
+#            {"rect": [x, y, w, h], "bearing": [dx, dy], "advance": a}
+#            where bearing is the rect's offset from the top-left of the glyph box
+#            it would occupy in a grid atlas, and advance is in pixels
+#
+# SDF mode (sdf_spread > 0) stores a signed distance field in the alpha
+# channel instead of coverage; see distance_field.py. Glyphs are rasterized
+# sdf_supersample times larger, grid cells grow by sdf_spread pixels on every
+# side (fontinfo "glyph_padding") and fontinfo records the "distance_range".
+# numpy is only needed for this mode.
+#
+# Glyph coverage tiles are cached on disk, keyed on the font file hash
+# and the parameters that affect rasterization, so rebuilding an atlas
+# variant only renders glyphs that have never been rendered before.
+# ============================
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PIL import Image, ImageDraw, ImageFont
+
+import glyph_lookup
+import skyline_packer
+
+# ========== OUTPUT FORMATS ==========
+FORMAT_SOLID = "RGBA_solid_white_no_antialiasing"
+FORMAT_ANTIALIASED = "RGBA_white_with_antialiasing"
+FORMAT_SDF = "RGBA_white_signed_distance_alpha"
+
+DEFAULT_THRESHOLD = 1  # Very low threshold - any non-zero pixel becomes solid white
+
+# ========== PACKINGS ==========
+PACKING_GRID = "grid"
+PACKING_SKYLINE = "skyline"
+PACKINGS = [PACKING_GRID, PACKING_SKYLINE]
+
+DEFAULT_GLYPH_SPACING = 1  # Empty pixels kept between packed glyphs
+
+# ========== SDF ==========
+DEFAULT_SDF_SPREAD = 4       # Atlas pixels of distance stored on each side of the edge
+DEFAULT_SDF_SUPERSAMPLE = 8  # Glyphs are rasterized this many times larger than the atlas
+
+# ========== DEFAULTS ==========
+DEFAULT_FONT_PATH = "NotoSansMono-Regular.ttf"
+DEFAULT_TARGET_GLYPH_SIZE = 32
+DEFAULT_COLUMNS = 16
+DEFAULT_OUTPUT_NAME = "font_atlas_fixed_grid_baseline_fixed"
+DEFAULT_CACHE_DIR = ".atlas_cache"
+
+# ASCII 32-126, Ё/ё, Cyrillic А-Я, Cyrillic а-я (this order is baked into existing atlases)
+DEFAULT_CODEPOINT_RANGES = "32-126,0x401,0x451,0x410-0x42F,0x430-0x44F"
+
+BASE_FONT_SIZE = 16  # Fonts are measured at this size, then scaled to the target glyph size
+
+CACHE_VERSION = 1  # Bump when the tile/layout format or the rasterization steps change
+
+
+def threshold_lut(threshold):
+    """256-entry lookup table: 255 where gray >= threshold, else 0."""
+    return [255 if value >= threshold else 0 for value in range(256)]
+
+
+def grayscale_to_rgba(atlas_image, antialiased=False, threshold=DEFAULT_THRESHOLD):
+    """Convert a grayscale atlas into white-on-transparent RGBA.
+
+    Works on whole bands with lookup tables instead of touching
+    pixels one at a time from Python.
+    """
+    if atlas_image.mode != "L":
+        atlas_image = atlas_image.convert("L")
+
+    if antialiased:
+        # Any coverage at all makes the pixel white; coverage becomes alpha
+        white = atlas_image.point(threshold_lut(1))
+        alpha = atlas_image
+    else:
+        white = atlas_image.point(threshold_lut(threshold))
+        alpha = white
+
+    return Image.merge("RGBA", (white, white, white, alpha))
+
+
+def grayscale_to_rgba_per_pixel(atlas_image, antialiased=False, threshold=DEFAULT_THRESHOLD):
+    """Reference implementation: the original nested-loop conversion.
+
+    Kept so the benchmark can check the fast path produces the same bytes.
+    """
+    atlas_width, atlas_height = atlas_image.size
+    atlas_rgba = Image.new("RGBA", (atlas_width, atlas_height), (0, 0, 0, 0))
+
+    pixels = atlas_image.load()
+    rgba_pixels = atlas_rgba.load()
+
+    for y in range(atlas_height):
+        for x in range(atlas_width):
+            gray_value = pixels[x, y]
+            if antialiased:
+                if gray_value > 0:
+                    rgba_pixels[x, y] = (255, 255, 255, gray_value)
+                else:
+                    rgba_pixels[x, y] = (0, 0, 0, 0)
+            else:
+                if gray_value >= threshold:
+                    rgba_pixels[x, y] = (255, 255, 255, 255)
+                else:
+                    rgba_pixels[x, y] = (0, 0, 0, 0)
+
+    return atlas_rgba
+
+
+# ========== CODEPOINTS ==========
+def parse_codepoint_ranges(spec):
+    """Parse "32-126,0x401,0x410-0x44F" into an ordered, de-duplicated codepoint list.
+
+    Ranges are inclusive and numbers may be decimal or 0x-prefixed hex.
+    Order is preserved because it decides where each glyph lands in the grid.
+    """
+    codepoints = []
+    seen = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start, end = int(start_str, 0), int(end_str, 0)
+        else:
+            start = end = int(part, 0)
+        if start > end:
+            raise ValueError(f"Invalid codepoint range: {part}")
+        for cp in range(start, end + 1):
+            if cp not in seen:
+                seen.add(cp)
+                codepoints.append(cp)
+    return codepoints
+
+
+# ========== CACHE KEYS ==========
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(*parts):
+    """Content address for a list of JSON-serializable parts."""
+    payload = json.dumps([CACHE_VERSION, *parts], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ========== LAYOUT ==========
+def measure_layout(font_path, codepoints, target_glyph_size):
+    """Measure every glyph and derive the fixed grid cell size.
+
+    Glyphs are measured at BASE_FONT_SIZE and the result is scaled so the
+    larger cell dimension matches target_glyph_size.
+    """
+    font = ImageFont.truetype(font_path, BASE_FONT_SIZE)
+    dummy_img = Image.new("L", (BASE_FONT_SIZE * 3, BASE_FONT_SIZE * 3), 0)
+    dummy_draw = ImageDraw.Draw(dummy_img)
+
+    max_width = 0
+    max_above_baseline = 0
+    max_below_baseline = 0
+    for cp in codepoints:
+        bbox = dummy_draw.textbbox((0, 0), chr(cp), font=font)
+        max_width = max(max_width, bbox[2] - bbox[0])
+        max_above_baseline = max(max_above_baseline, -bbox[1])  # top: usually negative or zero
+        max_below_baseline = max(max_below_baseline, bbox[3])   # bottom: usually positive or zero
+
+    # Natural proportions from the font
+    natural_width = max_width
+    natural_height = int(max_above_baseline + max_below_baseline)
+    natural_baseline_offset = int(max_above_baseline)
+
+    # Scale everything to target size (keeping proportions)
+    scale_factor = target_glyph_size / max(natural_width, natural_height)
+    return {
+        "font_size": int(BASE_FONT_SIZE * scale_factor),
+        "glyph_box_width": int(natural_width * scale_factor),
+        "glyph_box_height": int(natural_height * scale_factor),
+        "baseline_offset": int(natural_baseline_offset * scale_factor),
+        "scale_factor": scale_factor,
+    }
+
+
+# ========== GLYPH TILES ==========
+def render_glyph_tile(font, cp, baseline_offset, padding):
+    """Render one glyph's coverage mask, cropped to its ink.
+
+    Returns (dx, dy, tile) where (dx, dy) is the tile's position relative to
+    the top-left of the glyph's cell, or None for glyphs with no ink.
+    The padding keeps glyphs that overhang their cell intact, so pasting the
+    tile reproduces exactly what drawing straight into the atlas would.
+    """
+    char = chr(cp)
+    probe = ImageDraw.Draw(Image.new("L", (1, 1), 0))
+    bbox = probe.textbbox((0, 0), char, font=font)
+    offset_x = -bbox[0]  # compensate left side bearing
+
+    size = max(padding * 2 + bbox[2] - bbox[0], 1), max(padding * 2 + bbox[3] + baseline_offset, 1)
+    tile = Image.new("L", size, 0)
+    ImageDraw.Draw(tile).text((padding + offset_x, padding + baseline_offset), char, font=font, fill=255)
+
+    ink = tile.getbbox()
+    if ink is None:
+        return None
+    return ink[0] - padding, ink[1] - padding, tile.crop(ink)
+
+
+class GlyphTileCache:
+    """On-disk store of rendered glyph tiles for one (font, size, baseline) combination.
+
+    Layout: <cache_dir>/tiles/<key>/index.json + tiles.bin, where the index
+    maps codepoints to [dx, dy, width, height, byte_offset] (or null for
+    glyphs without ink).
+    """
+
+    def __init__(self, cache_dir, key):
+        self.directory = os.path.join(cache_dir, "tiles", key) if cache_dir else None
+        self.index = {}
+        self.blob = bytearray()
+        self.dirty = False
+        if self.directory and os.path.exists(os.path.join(self.directory, "index.json")):
+            with open(os.path.join(self.directory, "index.json"), "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+            with open(os.path.join(self.directory, "tiles.bin"), "rb") as f:
+                self.blob = bytearray(f.read())
+
+    def has(self, cp):
+        return str(cp) in self.index
+
+    def get(self, cp):
+        """Return (dx, dy, Image) for a cached glyph, or None for blank glyphs."""
+        entry = self.index[str(cp)]
+        if entry is None:
+            return None
+        dx, dy, width, height, offset = entry
+        data = bytes(self.blob[offset:offset + width * height])
+        return dx, dy, Image.frombytes("L", (width, height), data)
+
+    def put(self, cp, tile):
+        if tile is None:
+            self.index[str(cp)] = None
+        else:
+            dx, dy, image = tile
+            self.index[str(cp)] = [dx, dy, image.width, image.height, len(self.blob)]
+            self.blob.extend(image.tobytes())
+        self.dirty = True
+
+    def save(self):
+        if not self.directory or not self.dirty:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, "tiles.bin"), "wb") as f:
+            f.write(self.blob)
+        with open(os.path.join(self.directory, "index.json"), "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        self.dirty = False
+
+
+def layout_cache_key(font_hash, codepoints, target_glyph_size):
+    return cache_key("layout", font_hash, BASE_FONT_SIZE, target_glyph_size, codepoints)
+
+
+def load_cached_layout(cache_dir, key):
+    if not cache_dir:
+        return None
+    path = os.path.join(cache_dir, "layouts", key + ".json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_cached_layout(cache_dir, key, layout):
+    if not cache_dir:
+        return
+    os.makedirs(os.path.join(cache_dir, "layouts"), exist_ok=True)
+    with open(os.path.join(cache_dir, "layouts", key + ".json"), "w", encoding="utf-8") as f:
+        json.dump(layout, f)
+
+
+# ========== BUILD ==========
+def render_glyph_tiles(font_path, font_size, baseline_offset, padding, codepoints):
+    """Render a batch of glyph tiles.
+
+    This is the unit of work handed to worker processes, so it only takes and
+    returns plain picklable values: a list of (cp, None) for blank glyphs or
+    (cp, (dx, dy, width, height, bytes)).
+    """
+    font = ImageFont.truetype(font_path, font_size)
+    results = []
+    for cp in codepoints:
+        tile = render_glyph_tile(font, cp, baseline_offset, padding)
+        if tile is None:
+            results.append((cp, None))
+        else:
+            dx, dy, image = tile
+            results.append((cp, (dx, dy, image.width, image.height, image.tobytes())))
+    return results
+
+
+def plan_atlas(font_path, codepoints, target_glyph_size, cache_dir, layout=None, tile_caches=None, supersample=1):
+    """Resolve the layout and work out which glyph tiles still need rendering.
+
+    tile_caches lets several plans in one batch share a GlyphTileCache when
+    they rasterize the same font at the same size (e.g. solid + aa variants).
+    supersample > 1 renders tiles that many times larger (for SDF atlases).
+    """
+    font_hash = file_sha256(font_path)
+
+    # ========== LAYOUT (cached per font + codepoint set + size) ==========
+    layout_key = layout_cache_key(font_hash, codepoints, target_glyph_size)
+    layout_cached = True
+    if layout is None:
+        layout = load_cached_layout(cache_dir, layout_key)
+    if layout is None:
+        layout_cached = False
+        layout = measure_layout(font_path, codepoints, target_glyph_size)
+        save_cached_layout(cache_dir, layout_key, layout)
+
+    # ========== GLYPH TILES (cached per font + font size + baseline) ==========
+    render_font_size = layout["font_size"] * supersample
+    render_baseline_offset = layout["baseline_offset"] * supersample
+    tile_key = cache_key("tiles", font_hash, render_font_size, render_baseline_offset)
+    if tile_caches is None:
+        tile_caches = {}
+    if tile_key not in tile_caches:
+        tile_caches[tile_key] = GlyphTileCache(cache_dir, tile_key)
+    tile_cache = tile_caches[tile_key]
+
+    return {
+        "font_path": font_path,
+        "codepoints": codepoints,
+        "target_glyph_size": target_glyph_size,
+        "layout": layout,
+        "layout_key": layout_key,
+        "layout_cached": layout_cached,
+        "tile_cache": tile_cache,
+        "supersample": supersample,
+        "render_font_size": render_font_size,
+        "render_baseline_offset": render_baseline_offset,
+        "padding": max(layout["glyph_box_width"], layout["glyph_box_height"]) * supersample,
+        "missing": [cp for cp in codepoints if not tile_cache.has(cp)],
+    }
+
+
+def store_rendered_tiles(tile_cache, results):
+    for cp, tile in results:
+        if tile is None:
+            tile_cache.put(cp, None)
+        else:
+            dx, dy, width, height, data = tile
+            tile_cache.put(cp, (dx, dy, Image.frombytes("L", (width, height), data)))
+
+
+def make_font_info(plan, antialiased, threshold, sdf_spread=0, **extra):
+    layout = plan["layout"]
+    font_info = {
+        "glyph_box_width": layout["glyph_box_width"],
+        "glyph_box_height": layout["glyph_box_height"],
+    }
+    font_info.update(extra)
+    font_info.update({
+        "baseline_offset": layout["baseline_offset"],
+        "font_size": layout["font_size"],
+        "target_glyph_size": plan["target_glyph_size"],
+        "scale_factor": layout["scale_factor"],
+    })
+    if sdf_spread:
+        font_info["distance_range"] = 2 * sdf_spread
+        font_info["sdf_supersample"] = plan["supersample"]
+        font_info["format"] = FORMAT_SDF
+        return font_info
+    if not antialiased:
+        font_info["threshold"] = threshold
+    font_info["format"] = FORMAT_ANTIALIASED if antialiased else FORMAT_SOLID
+    return font_info
+
+
+def glyph_tiles(plan, sdf_spread):
+    """{cp: (dx, dy, L image) or None} at atlas resolution, relative to the glyph cell."""
+    tile_cache = plan["tile_cache"]
+    tiles = {cp: tile_cache.get(cp) for cp in plan["codepoints"]}
+    if not sdf_spread:
+        return tiles
+
+    import distance_field
+    return {
+        cp: None if tile is None else distance_field.glyph_distance_tile(*tile, plan["supersample"], sdf_spread)
+        for cp, tile in tiles.items()
+    }
+
+
+def make_stats(plan, atlas_image):
+    layout = plan["layout"]
+    codepoints = plan["codepoints"]
+    return {
+        "glyph_count": len(codepoints),
+        "layout_cached": plan["layout_cached"],
+        "tiles_cached": len(codepoints) - len(plan["missing"]),
+        "tiles_rendered": len(plan["missing"]),
+        "atlas_pixels": atlas_image.width * atlas_image.height,
+        "glyph_box_pixels": len(codepoints) * layout["glyph_box_width"] * layout["glyph_box_height"],
+    }
+
+
+def assemble_atlas(plan, columns, antialiased, threshold, sdf_spread=0):
+    """Paste every glyph tile into the grid and convert to RGBA.
+
+    Returns (atlas_rgba, metadata, font_info, stats).
+    """
+    layout = plan["layout"]
+    codepoints = plan["codepoints"]
+    tiles = glyph_tiles(plan, sdf_spread)
+    pad = sdf_spread
+    cell_w = layout["glyph_box_width"] + 2 * pad
+    cell_h = layout["glyph_box_height"] + 2 * pad
+
+    rows = (len(codepoints) + columns - 1) // columns
+    atlas_image = Image.new("L", (columns * cell_w, rows * cell_h), color=0)
+    metadata = {}
+
+    for i, cp in enumerate(codepoints):
+        row = i // columns
+        col = i % columns
+
+        tile = tiles[cp]
+        if tile is not None:
+            dx, dy, image = tile
+            if sdf_spread:
+                # Distance values must not spill into the neighbouring cells
+                left, top = max(0, -(dx + pad)), max(0, -(dy + pad))
+                right = min(image.width, cell_w - (dx + pad))
+                bottom = min(image.height, cell_h - (dy + pad))
+                atlas_image.paste(image.crop((left, top, right, bottom)),
+                                  (col * cell_w + pad + dx + left, row * cell_h + pad + dy + top))
+            else:
+                # Same fill-with-mask blend draw.text uses, so overhangs composite identically
+                atlas_image.paste(255, (col * cell_w + dx, row * cell_h + dy), mask=image)
+        metadata[str(cp)] = [row, col]
+
+    atlas_rgba = grayscale_to_rgba(atlas_image, antialiased=antialiased or bool(sdf_spread), threshold=threshold)
+    extra = {"columns": columns}
+    if sdf_spread:
+        extra["glyph_padding"] = pad
+    font_info = make_font_info(plan, antialiased, threshold, sdf_spread, **extra)
+    return atlas_rgba, metadata, font_info, make_stats(plan, atlas_image)
+
+
+def assemble_packed_atlas(plan, antialiased, threshold, sdf_spread=0, spacing=DEFAULT_GLYPH_SPACING):
+    """Pack each glyph's tight bbox into a power-of-two atlas and convert to RGBA.
+
+    Returns (atlas_rgba, metadata, font_info, stats).
+    """
+    layout = plan["layout"]
+    codepoints = plan["codepoints"]
+    font = ImageFont.truetype(plan["font_path"], layout["font_size"])
+
+    tiles = glyph_tiles(plan, sdf_spread)
+    sizes = {cp: (tile[2].width, tile[2].height) for cp, tile in tiles.items() if tile is not None}
+    atlas_width, atlas_height, positions = skyline_packer.pack_rects(sizes, spacing=spacing)
+
+    atlas_image = Image.new("L", (atlas_width, atlas_height), color=0)
+    metadata = {}
+    for cp in codepoints:
+        tile = tiles[cp]
+        advance = round(font.getlength(chr(cp)))
+        if tile is None:
+            metadata[str(cp)] = {"rect": [0, 0, 0, 0], "bearing": [0, 0], "advance": advance}
+            continue
+        dx, dy, mask = tile
+        x, y = positions[cp]
+        atlas_image.paste(mask, (x, y))
+        metadata[str(cp)] = {"rect": [x, y, mask.width, mask.height], "bearing": [dx, dy], "advance": advance}
+
+    atlas_rgba = grayscale_to_rgba(atlas_image, antialiased=antialiased or bool(sdf_spread), threshold=threshold)
+    font_info = make_font_info(
+        plan, antialiased, threshold, sdf_spread,
+        packing=PACKING_SKYLINE,
+        atlas_width=atlas_width,
+        atlas_height=atlas_height,
+        glyph_spacing=spacing,
+    )
+    return atlas_rgba, metadata, font_info, make_stats(plan, atlas_image)
+
+
+def assemble(plan, packing, columns, antialiased, threshold, sdf_spread=0):
+    if packing == PACKING_SKYLINE:
+        return assemble_packed_atlas(plan, antialiased, threshold, sdf_spread)
+    return assemble_atlas(plan, columns, antialiased, threshold, sdf_spread)
+
+
+def build_atlas(
+    font_path=DEFAULT_FONT_PATH,
+    codepoints=None,
+    target_glyph_size=DEFAULT_TARGET_GLYPH_SIZE,
+    columns=DEFAULT_COLUMNS,
+    antialiased=True,
+    threshold=DEFAULT_THRESHOLD,
+    cache_dir=DEFAULT_CACHE_DIR,
+    packing=PACKING_GRID,
+    sdf_spread=0,
+    sdf_supersample=DEFAULT_SDF_SUPERSAMPLE,
+):
+    """Build an atlas in this process.
+
+    Returns (atlas_rgba, metadata, font_info, stats). Pass cache_dir=None to
+    render everything from scratch without touching the disk cache, and
+    sdf_spread > 0 for a signed distance field atlas.
+    """
+    if codepoints is None:
+        codepoints = parse_codepoint_ranges(DEFAULT_CODEPOINT_RANGES)
+
+    plan = plan_atlas(font_path, codepoints, target_glyph_size, cache_dir,
+                      supersample=sdf_supersample if sdf_spread else 1)
+    if plan["missing"]:
+        results = render_glyph_tiles(font_path, plan["render_font_size"], plan["render_baseline_offset"],
+                                     plan["padding"], plan["missing"])
+        store_rendered_tiles(plan["tile_cache"], results)
+        plan["tile_cache"].save()
+
+    return assemble(plan, packing, columns, antialiased, threshold, sdf_spread)
+
+
+# ========== BATCH BUILD ==========
+def chunked(items, chunk_size):
+    for start in range(0, len(items), chunk_size):
+        yield items[start:start + chunk_size]
+
+
+def build_atlas_batch(jobs, workers=None, cache_dir=DEFAULT_CACHE_DIR, chunk_size=None):
+    """Build several atlases, measuring and rasterizing glyphs in a process pool.
+
+    Each job is a dict with the build_atlas keyword arguments (font_path,
+    codepoints, target_glyph_size, columns, antialiased, threshold, packing,
+    sdf_spread, sdf_supersample).
+    Returns a list of (atlas_rgba, metadata, font_info, stats), one per job,
+    identical to what build_atlas would produce for each job on its own.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = [dict(job) for job in jobs]
+    for job in jobs:
+        if job.get("codepoints") is None:
+            job["codepoints"] = parse_codepoint_ranges(DEFAULT_CODEPOINT_RANGES)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # ========== LAYOUTS ==========
+        font_hashes = {}
+        layouts = [None] * len(jobs)
+        layout_cached = [True] * len(jobs)
+        pending = {}
+        for index, job in enumerate(jobs):
+            font_path = job["font_path"]
+            if font_path not in font_hashes:
+                font_hashes[font_path] = file_sha256(font_path)
+            key = layout_cache_key(font_hashes[font_path], job["codepoints"], job["target_glyph_size"])
+            layouts[index] = load_cached_layout(cache_dir, key)
+            if layouts[index] is None:
+                layout_cached[index] = False
+                future = executor.submit(measure_layout, font_path, job["codepoints"], job["target_glyph_size"])
+                pending[future] = (index, key)
+        for future in as_completed(pending):
+            index, key = pending[future]
+            layouts[index] = future.result()
+            save_cached_layout(cache_dir, key, layouts[index])
+
+        # ========== TILES ==========
+        tile_caches = {}
+        plans = []
+        for index, job in enumerate(jobs):
+            supersample = job.get("sdf_supersample", DEFAULT_SDF_SUPERSAMPLE) if job.get("sdf_spread") else 1
+            plan = plan_atlas(job["font_path"], job["codepoints"], job["target_glyph_size"], cache_dir,
+                              layout=layouts[index], tile_caches=tile_caches, supersample=supersample)
+            plan["layout_cached"] = layout_cached[index]
+            plans.append(plan)
+
+        # Jobs that share a tile cache (same font + size) only render each glyph once
+        work = {}
+        for plan in plans:
+            tile_cache = plan["tile_cache"]
+            if id(tile_cache) not in work:
+                work[id(tile_cache)] = (plan, [], set())
+            _, queued, seen = work[id(tile_cache)]
+            for cp in plan["missing"]:
+                if cp not in seen:
+                    seen.add(cp)
+                    queued.append(cp)
+
+        total_missing = sum(len(cps) for _, cps, _ in work.values())
+        size = chunk_size or max(8, -(-total_missing // (workers * 4)))
+        pending = {}
+        for plan, cps, _ in work.values():
+            for chunk in chunked(cps, size):
+                future = executor.submit(render_glyph_tiles, plan["font_path"], plan["render_font_size"],
+                                         plan["render_baseline_offset"], plan["padding"], chunk)
+                pending[future] = plan["tile_cache"]
+        for future in as_completed(pending):
+            store_rendered_tiles(pending[future], future.result())
+
+    for tile_cache in tile_caches.values():
+        tile_cache.save()
+
+    return [
+        assemble(plan, job.get("packing", PACKING_GRID), job.get("columns", DEFAULT_COLUMNS),
+                 job.get("antialiased", True), job.get("threshold", DEFAULT_THRESHOLD), job.get("sdf_spread", 0))
+        for plan, job in zip(plans, jobs)
+    ]
+
+
+def save_atlas(output_name, atlas_rgba, metadata, font_info):
+    """Write <name>.png, <name>_metadata.json, <name>_fontinfo.json and <name>_lookup.bin."""
+    atlas_rgba.save(output_name + ".png")
+
+    with open(output_name + "_metadata.json", "w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+    with open(output_name + "_fontinfo.json", "w", encoding="utf-8") as f:
+        json.dump(font_info, f, ensure_ascii=False, indent=2)
+
+    glyph_lookup.write_lookup(output_name + "_lookup.bin", metadata, font_info)
+
+
+def print_summary(atlas_rgba, font_info, stats):
+    print("\n=====================")
+    print(f"Generated atlas: {atlas_rgba.size} px")
+    print(f"Glyph count: {stats['glyph_count']}")
+    print(f"TARGET_GLYPH_SIZE = {font_info['target_glyph_size']}")
+    print(f"GLYPH_BOX_WIDTH  = {font_info['glyph_box_width']}")
+    print(f"GLYPH_BOX_HEIGHT = {font_info['glyph_box_height']}")
+    print(f"Scale factor: {font_info['scale_factor']:.2f}")
+    print(f"Font size: {font_info['font_size']}")
+    print(f"Format: {font_info['format']}")
+    if "distance_range" in font_info:
+        print(f"Distance range: {font_info['distance_range']} px")
+    print(f"Packing: {font_info.get('packing', PACKING_GRID)}")
+    print(f"Atlas pixels: {stats['atlas_pixels']} ({stats['glyph_box_pixels']} in fixed glyph boxes)")
+    print(f"Cache: layout {'hit' if stats['layout_cached'] else 'miss'}, "
+          f"{stats['tiles_cached']} glyphs reused, {stats['tiles_rendered']} rendered")
+    print("=====================\n")
@@ -0,0 +1,150 @@
+# ============================
+# glyph_lookup.py
+# ============================
+#
+# Binary codepoint -> glyph lookup written next to every atlas as
+# <name>_lookup.bin, so consumers can find glyphs with integer indexing
+# instead of parsing the metadata JSON and building str(cp) keys.
+#
+# Layout (little-endian):
+#   header   "GLYL", u16 version, u16 kind, u32 glyph_count,
+#            u32 first_codepoint, u32 table_length          (20 bytes)
+#   table    i32[table_length]
+#            - kind 0 (dense):  table[cp - first_codepoint] = slot + 1, 0 = missing
+#            - kind 1 (sorted): the glyphs' codepoints in ascending order,
+#                               slot = index in the table (binary search)
+#   records  i32[glyph_count][7], by slot:
+#            x, y, w, h, bearing_x, bearing_y, advance
+#
+# Records are the same for both packings: (x, y, w, h) is the glyph's pixel
+# rect in the atlas and the bearing places it in the glyph box. Grid atlases
+# get their full cell with bearing (0, 0); blank packed glyphs get w = h = 0.
+#
+# Everything is 32-bit so Godot can load each section with a single
+# PackedByteArray.to_int32_array().
+# ============================
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+MAGIC = b"GLYL"
+VERSION = 1
+KIND_DENSE = 0
+KIND_SORTED = 1
+HEADER = struct.Struct("<4sHHIII")
+RECORD_SIZE = 7
+
+DENSE_MAX_CODEPOINT = 0xFFFF  # Dense tables cover the BMP at most (256 KB)
+
+
+def glyph_records(metadata, font_info):
+    """[(cp, (x, y, w, h, bearing_x, bearing_y, advance))] sorted by codepoint."""
+    glyph_w = font_info["glyph_box_width"]
+    glyph_h = font_info["glyph_box_height"]
+    pad = font_info.get("glyph_padding", 0)
+    packed = font_info.get("packing") == "skyline"
+
+    records = []
+    for key, entry in metadata.items():
+        if packed:
+            record = tuple(entry["rect"]) + tuple(entry["bearing"]) + (entry["advance"],)
+        else:
+            row, col = entry
+            x = col * (glyph_w + 2 * pad) + pad
+            y = row * (glyph_h + 2 * pad) + pad
+            record = (x, y, glyph_w, glyph_h, 0, 0, glyph_w)
+        records.append((int(key), record))
+    records.sort()
+    return records
+
+
+def encode_lookup(metadata, font_info):
+    records = glyph_records(metadata, font_info)
+    codepoints = [cp for cp, _ in records]
+
+    if not codepoints or codepoints[-1] <= DENSE_MAX_CODEPOINT:
+        kind = KIND_DENSE
+        first = codepoints[0] if codepoints else 0
+        table = array("i", [0]) * ((codepoints[-1] - first + 1) if codepoints else 0)
+        for slot, cp in enumerate(codepoints):
+            table[cp - first] = slot + 1
+    else:
+        kind = KIND_SORTED
+        first = 0
+        table = array("i", codepoints)
+
+    values = array("i", [value for _, record in records for value in record])
+    if sys.byteorder != "little":
+        table.byteswap()
+        values.byteswap()
+    header = HEADER.pack(MAGIC, VERSION, kind, len(records), first, len(table))
+    return header + table.tobytes() + values.tobytes()
+
+
+def write_lookup(path, metadata, font_info):
+    with open(path, "wb") as f:
+        f.write(encode_lookup(metadata, font_info))
+
+
+class GlyphLookup:
+    """Decoded <name>_lookup.bin; all lookups are integer indexing."""
+
+    def __init__(self, data):
+        magic, version, kind, count, first, table_length = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} glyph lookup")
+
+        table_end = HEADER.size + table_length * 4
+        self.kind = kind
+        self.first_codepoint = first
+        self.table = array("i", data[HEADER.size:table_end])
+        self.records = array("i", data[table_end:table_end + count * RECORD_SIZE * 4])
+        if sys.byteorder != "little":
+            self.table.byteswap()
+            self.records.byteswap()
+        self.glyph_count = count
+        self.record_tuples = [tuple(self.records[start:start + RECORD_SIZE])
+                              for start in range(0, len(self.records), RECORD_SIZE)]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    @classmethod
+    def from_metadata(cls, metadata, font_info):
+        return cls(encode_lookup(metadata, font_info))
+
+    def slot(self, cp):
+        """Glyph slot for a codepoint, or -1 if the atlas does not have it."""
+        if self.kind == KIND_DENSE:
+            index = cp - self.first_codepoint
+            if 0 <= index < len(self.table):
+                return self.table[index] - 1
+            return -1
+        index = bisect_left(self.table, cp)
+        if index < len(self.table) and self.table[index] == cp:
+            return index
+        return -1
+
+    def record(self, slot):
+        """(x, y, w, h, bearing_x, bearing_y, advance) for a slot."""
+        return self.record_tuples[slot]
+
+    def get(self, cp):
+        """Record for a codepoint, or None if the atlas does not have it."""
+        if self.kind == KIND_DENSE:
+            index = cp - self.first_codepoint
+            if 0 <= index < len(self.table):
+                slot = self.table[index]
+                return self.record_tuples[slot - 1] if slot else None
+            return None
+        slot = self.slot(cp)
+        return self.record_tuples[slot] if slot >= 0 else None
+
+    def codepoints(self):
+        """Codepoints in slot order."""
+        if self.kind == KIND_SORTED:
+            return list(self.table)
+        return [self.first_codepoint + index for index, slot in enumerate(self.table) if slot]
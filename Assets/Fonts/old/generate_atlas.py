@@ -1,9 +1,12 @@
-from PIL import Image, ImageDraw, ImageFont
 import json
+import sys
+
+from PIL import Image, ImageDraw, ImageFont
 
 FONT_PATH = "NotoSansMono-Regular.ttf"
 FONT_SIZE = 32
 COLUMNS = 16
+OUTPUT_PREFIX = "font_atlas_fixed_grid_baseline_fixed"
 
 # Define codepoints
 ascii_start = 32
@@ -21,75 +24,98 @@ codepoints = list(range(ascii_start, ascii_end)) + special_chars + \
              list(range(cyrillic_upper_start, cyrillic_upper_end)) + \
              list(range(cyrillic_lower_start, cyrillic_lower_end))
 
-# Load font
-font = ImageFont.truetype(FONT_PATH, FONT_SIZE)
 
-# Create dummy draw for measuring glyph bounding boxes
-dummy_img = Image.new("L", (FONT_SIZE * 3, FONT_SIZE * 3), 0)
-dummy_draw = ImageDraw.Draw(dummy_img)
+def measure_glyphs(font, font_size, codepoints):
+    """Bounding boxes per codepoint, plus the shared box width, height and baseline."""
+    # Create dummy draw for measuring glyph bounding boxes
+    dummy_img = Image.new("L", (font_size * 3, font_size * 3), 0)
+    dummy_draw = ImageDraw.Draw(dummy_img)
+
+    max_width = 0
+    glyph_bboxes = {}
+
+    for cp in codepoints:
+        char = chr(cp)
+        bbox = dummy_draw.textbbox((0, 0), char, font=font)
+        glyph_bboxes[cp] = bbox
+
+        width = bbox[2] - bbox[0]
+        if width > max_width:
+            max_width = width
+
+    # Find max vertical extents relative to baseline
+    max_above_baseline = 0
+    max_below_baseline = 0
+
+    for bbox in glyph_bboxes.values():
+        top = bbox[1]    # usually negative or zero (above baseline)
+        bottom = bbox[3] # usually positive or zero (below baseline)
+
+        if -top > max_above_baseline:
+            max_above_baseline = -top
+        if bottom > max_below_baseline:
+            max_below_baseline = bottom
+
+    return glyph_bboxes, max_width, int(max_above_baseline + max_below_baseline), int(max_above_baseline)
 
-max_width = 0
-glyph_bboxes = {}
 
-for cp in codepoints:
-    char = chr(cp)
-    bbox = dummy_draw.textbbox((0, 0), char, font=font)
-    glyph_bboxes[cp] = bbox
+def build_atlas(font_path=FONT_PATH, font_size=FONT_SIZE, columns=COLUMNS, codepoints=codepoints):
+    """Render the codepoints into a fixed grid; returns (atlas_image, metadata, font_info)."""
+    # Load font
+    font = ImageFont.truetype(font_path, font_size)
+    glyph_bboxes, glyph_box_width, glyph_box_height, baseline_offset = measure_glyphs(font, font_size, codepoints)
 
-    width = bbox[2] - bbox[0]
-    if width > max_width:
-        max_width = width
+    glyph_count = len(codepoints)
+    rows = (glyph_count + columns - 1) // columns
 
-# Find max vertical extents relative to baseline
-max_above_baseline = 0
-max_below_baseline = 0
+    atlas_width = columns * glyph_box_width
+    atlas_height = rows * glyph_box_height
 
-for bbox in glyph_bboxes.values():
-    top = bbox[1]    # usually negative or zero (above baseline)
-    bottom = bbox[3] # usually positive or zero (below baseline)
+    atlas_image = Image.new("L", (atlas_width, atlas_height), color=0)
+    draw = ImageDraw.Draw(atlas_image)
 
-    if -top > max_above_baseline:
-        max_above_baseline = -top
-    if bottom > max_below_baseline:
-        max_below_baseline = bottom
+    metadata = {}
 
-GLYPH_BOX_WIDTH = max_width
-GLYPH_BOX_HEIGHT = int(max_above_baseline + max_below_baseline)
-baseline_offset = int(max_above_baseline)
+    for i, cp in enumerate(codepoints):
+        row = i // columns
+        col = i % columns
 
-GLYPH_COUNT = len(codepoints)
-ROWS = (GLYPH_COUNT + COLUMNS - 1) // COLUMNS
+        cell_x = col * glyph_box_width
+        cell_y = row * glyph_box_height
 
-atlas_width = COLUMNS * GLYPH_BOX_WIDTH
-atlas_height = ROWS * GLYPH_BOX_HEIGHT
+        char = chr(cp)
+        bbox = glyph_bboxes[cp]
 
-atlas_image = Image.new("L", (atlas_width, atlas_height), color=0)
-draw = ImageDraw.Draw(atlas_image)
+        offset_x = -bbox[0]  # compensate left side bearing
 
-metadata = {}
+        # y position: row start + baseline offset
+        y = cell_y + baseline_offset
 
-for i, cp in enumerate(codepoints):
-    row = i // COLUMNS
-    col = i % COLUMNS
+        draw.text((cell_x + offset_x, y), char, font=font, fill=255)
 
-    cell_x = col * GLYPH_BOX_WIDTH
-    cell_y = row * GLYPH_BOX_HEIGHT
+        metadata[str(cp)] = [row, col]
 
-    char = chr(cp)
-    bbox = glyph_bboxes[cp]
+    font_info = {
+        "glyph_box_width": glyph_box_width,
+        "glyph_box_height": glyph_box_height,
+        "columns": columns,
+        "baseline_offset": baseline_offset,
+        "font_size": font_size
+    }
+    return atlas_image, metadata, font_info
 
-    offset_x = -bbox[0]  # compensate left side bearing
 
-    # y position: row start + baseline offset
-    y = cell_y + baseline_offset
+def main():
+    atlas_image, metadata, _ = build_atlas()
 
-    draw.text((cell_x + offset_x, y), char, font=font, fill=255)
+    # Save results
+    atlas_image.save(OUTPUT_PREFIX + ".png")
+    with open(OUTPUT_PREFIX + "_metadata.json", "w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False)
 
-    metadata[str(cp)] = [row, col]
+    print(f"Generated fixed-grid baseline-fixed atlas {atlas_image.size} with {len(metadata)} glyphs.")
+    return 0
 
-# Save results
-atlas_image.save("font_atlas_fixed_grid_baseline_fixed.png")
-with open("font_atlas_fixed_grid_baseline_fixed_metadata.json", "w", encoding="utf-8") as f:
-    json.dump(metadata, f, ensure_ascii=False)
 
-print(f"Generated fixed-grid baseline-fixed atlas {atlas_image.size} with {GLYPH_COUNT} glyphs.")
+if __name__ == "__main__":
+    sys.exit(main())
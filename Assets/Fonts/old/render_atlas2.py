@@ -11,14 +11,18 @@
 # - rendered_text.png
 # ============================
 
+import os
+import sys
+
 from PIL import Image
-import json
+
+# text_rasterizer lives one directory up
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import text_rasterizer  # noqa: E402
 
 # ========== CONFIG ==========
 
-FONT_ATLAS_PATH = "font_atlas_fixed_grid_baseline_fixed.png"
-METADATA_PATH = "font_atlas_fixed_grid_baseline_fixed_metadata.json"
-FONTINFO_PATH = "font_atlas_fixed_grid_baseline_fixed_fontinfo.json"
+FONT_ATLAS_PREFIX = "font_atlas_fixed_grid_baseline_fixed"
 
 STRING_TO_RENDER = (
     "The quick brown fox jumps over the lazy dog. 1234567890\n"
@@ -34,65 +38,27 @@ STRING_TO_RENDER = (
 )
 
 
-# ========== LOAD DATA ==========
-
-# Load atlas image
-atlas_image = Image.open(FONT_ATLAS_PATH).convert("L")
-
-# Load metadata
-with open(METADATA_PATH, "r", encoding="utf-8") as f:
-    metadata = json.load(f)
-
-# Load font info
-with open(FONTINFO_PATH, "r", encoding="utf-8") as f:
-    font_info = json.load(f)
-
-GLYPH_BOX_WIDTH = font_info["glyph_box_width"]
-GLYPH_BOX_HEIGHT = font_info["glyph_box_height"]
-COLUMNS = font_info["columns"]
-
-# ========== RENDER STRING ==========
-
-lines = STRING_TO_RENDER.split("\n")
-num_lines = len(lines)
-max_line_length = max(len(line) for line in lines)
-
-output_width = max_line_length * GLYPH_BOX_WIDTH
-output_height = num_lines * GLYPH_BOX_HEIGHT
-
-output_image = Image.new("L", (output_width, output_height), color=0)
-
-for line_idx, line in enumerate(lines):
-    for char_idx, char in enumerate(line):
-        cp = ord(char)
-
-        # Skip rendering missing codepoints
-        if str(cp) not in metadata:
-            continue
-
-        row, col = metadata[str(cp)]
+def render_string(text=STRING_TO_RENDER, prefix=FONT_ATLAS_PREFIX):
+    """Render text with the atlas at prefix; missing codepoints render as blank cells."""
+    rasterizer = text_rasterizer.TextRasterizer.load(prefix)
+    return Image.fromarray(rasterizer.render_coverage(text.split("\n")))
 
-        # Compute position in atlas
-        x1 = col * GLYPH_BOX_WIDTH
-        y1 = row * GLYPH_BOX_HEIGHT
-        x2 = x1 + GLYPH_BOX_WIDTH
-        y2 = y1 + GLYPH_BOX_HEIGHT
 
-        glyph = atlas_image.crop((x1, y1, x2, y2))
+def main():
+    output_image = render_string()
 
-        # Paste glyph into output image
-        dest_x = char_idx * GLYPH_BOX_WIDTH
-        dest_y = line_idx * GLYPH_BOX_HEIGHT
+    # ========== SAVE OUTPUT ==========
 
-        output_image.paste(glyph, (dest_x, dest_y))
+    output_image.save("rendered_text.png")
 
-# ========== SAVE OUTPUT ==========
+    # ========== SUMMARY OUTPUT ==========
 
-output_image.save("rendered_text.png")
+    print("\n=====================")
+    print(f"Rendered text saved to 'rendered_text.png'")
+    print(f"Output size: {output_image.size} px")
+    print("=====================\n")
+    return 0
 
-# ========== SUMMARY OUTPUT ==========
 
-print("\n=====================")
-print(f"Rendered text saved to 'rendered_text.png'")
-print(f"Output size: {output_image.size} px")
-print("=====================\n")
+if __name__ == "__main__":
+    sys.exit(main())
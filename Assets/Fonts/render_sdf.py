@@ -0,0 +1,238 @@
+# ============================
+# render_sdf.py
+# ============================
+#
+# Reference renderer for SDF atlases (build_font_atlas.py --mode sdf).
+#
+# Reconstructs text from the distance field at any scale, the same way a
+# shader would: bilinearly sample the stored distance, then turn it into
+# coverage with a one-output-pixel ramp around the 0.5 edge.
+#
+# Render a string:
+#   python render_sdf.py font_atlas_sdf --text "Hello, world" --scale 6 --output hello.png
+#
+# Check the field against the glyphs it was built from, at several scales:
+#   python render_sdf.py font_atlas_sdf --verify --font NotoSansMono-Regular.ttf
+# Ground truth is each glyph rasterized at the atlas' supersampled size and
+# box-filtered down to the output scale; reports mean coverage error and the
+# IoU of the >= 50% coverage masks per scale. For skyline atlases it also
+# compares each packed glyph with the same field placed in a whole grid cell
+# (min cell IoU), at every scale, so the two packings can't render apart.
+# ============================
+import argparse
+import json
+import sys
+
+import numpy as np
+from PIL import Image, ImageFont
+
+import distance_field
+import font_atlas
+
+DEFAULT_SCALES = "0.5,1,2,4,8"
+MIN_IOU = 0.85  # --verify fails below this at scales >= 1
+MIN_CELL_IOU = 0.99  # ... and, at every scale, if packed glyphs drift this far from their grid-cell rendering
+
+
+def load_atlas(prefix):
+    """Return (distance values 0..1 as float32 array, metadata, font_info)."""
+    with open(prefix + "_fontinfo.json", "r", encoding="utf-8") as f:
+        font_info = json.load(f)
+    if font_info.get("format") != font_atlas.FORMAT_SDF:
+        raise ValueError(f"{prefix} is not an SDF atlas (format {font_info.get('format')!r})")
+    with open(prefix + "_metadata.json", "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+    alpha = Image.open(prefix + ".png").convert("RGBA").getchannel("A")
+    return np.asarray(alpha, dtype=np.float32) / 255.0, metadata, font_info
+
+
+def glyph_field(atlas, metadata, font_info, cp):
+    """(x, y, values) for one glyph, (x, y) relative to its glyph box; None if absent or blank."""
+    entry = metadata.get(str(cp))
+    if entry is None:
+        return None
+    if font_info.get("packing", font_atlas.PACKING_GRID) == font_atlas.PACKING_SKYLINE:
+        x, y, w, h = entry["rect"]
+        if w <= 0 or h <= 0:
+            return None
+        dx, dy = entry["bearing"]
+        return dx, dy, atlas[y:y + h, x:x + w]
+
+    pad = font_info["glyph_padding"]
+    cell_w = font_info["glyph_box_width"] + 2 * pad
+    cell_h = font_info["glyph_box_height"] + 2 * pad
+    row, col = entry
+    return -pad, -pad, atlas[row * cell_h:(row + 1) * cell_h, col * cell_w:(col + 1) * cell_w]
+
+
+def cell_field(field, font_info):
+    """`field` pasted into an empty glyph box, as grid packing would store it."""
+    x, y, values = field
+    x0, y0 = min(x, 0), min(y, 0)
+    x1 = max(x + values.shape[1], font_info["glyph_box_width"])
+    y1 = max(y + values.shape[0], font_info["glyph_box_height"])
+    cell = np.zeros((y1 - y0, x1 - x0), dtype=values.dtype)
+    cell[y - y0:y - y0 + values.shape[0], x - x0:x - x0 + values.shape[1]] = values
+    return x0, y0, cell
+
+
+def mask_iou(a, b):
+    """IoU of the >= 50% coverage masks of two coverage arrays."""
+    a = a >= 0.5
+    b = b >= 0.5
+    union = np.logical_or(a, b).sum()
+    return np.logical_and(a, b).sum() / union if union else 1.0
+
+
+def glyph_advance(metadata, font_info, cp):
+    entry = metadata.get(str(cp))
+    if isinstance(entry, dict):
+        return entry["advance"]
+    return font_info["glyph_box_width"]
+
+
+def resample_weights(count, start, scale, size):
+    """(size x count) bilinear weights from `count` field pixels to `size` output pixels.
+
+    Output pixel i samples the field at continuous position
+    (i + 0.5 - start) / scale, with `start` the unrounded output position of
+    the field's left/top edge. Like PIL's BILINEAR, the triangle filter
+    widens to 1 / scale field pixels when shrinking. Field pixels past the
+    edges count as 0 (far outside) rather than repeating the edge, so a tight
+    packed rect reconstructs exactly like the same glyph in a full cell.
+    """
+    support = max(1.0, 1.0 / scale)
+    reach = int(np.ceil(support)) + 1
+    pixels = np.arange(-reach, count + reach) + 0.5
+    centers = (np.arange(size) + 0.5 - start) / scale
+    weights = np.clip(1.0 - np.abs(pixels[None, :] - centers[:, None]) / support, 0.0, None)
+    weights /= weights.sum(axis=1, keepdims=True)
+    return weights[:, reach:reach + count].astype(np.float32)
+
+
+def draw_glyph(canvas, field, origin_x, origin_y, scale, distance_range):
+    """Max-composite one glyph's reconstructed coverage into `canvas` (float array).
+
+    The field is resampled from continuous coordinates: its output position
+    is never rounded, so a packed rect lands on the same sub-pixel position
+    as the glyph box it was cut from.
+    """
+    x, y, values = field
+    left = origin_x + x * scale
+    top = origin_y + y * scale
+    dst_x0 = max(0, int(np.floor(left)))
+    dst_y0 = max(0, int(np.floor(top)))
+    dst_x1 = min(canvas.shape[1], int(np.ceil(left + values.shape[1] * scale)))
+    dst_y1 = min(canvas.shape[0], int(np.ceil(top + values.shape[0] * scale)))
+    if dst_x1 <= dst_x0 or dst_y1 <= dst_y0:
+        return
+    columns = resample_weights(values.shape[1], left - dst_x0, scale, dst_x1 - dst_x0)
+    rows = resample_weights(values.shape[0], top - dst_y0, scale, dst_y1 - dst_y0)
+    sampled = rows @ values @ columns.T
+    region = distance_field.coverage_from_distance(sampled, distance_range, scale)
+    canvas[dst_y0:dst_y1, dst_x0:dst_x1] = np.maximum(canvas[dst_y0:dst_y1, dst_x0:dst_x1], region)
+
+
+def render_text(atlas, metadata, font_info, text, scale):
+    """Render one line of text at `scale` times the atlas glyph size; returns coverage 0..1."""
+    advances = [glyph_advance(metadata, font_info, ord(ch)) for ch in text]
+    width = max(1, round(sum(advances) * scale))
+    height = max(1, round(font_info["glyph_box_height"] * scale))
+    canvas = np.zeros((height, width), dtype=np.float32)
+
+    pen_x = 0
+    for ch, advance in zip(text, advances):
+        field = glyph_field(atlas, metadata, font_info, ord(ch))
+        if field is not None:
+            draw_glyph(canvas, field, pen_x * scale, 0, scale, font_info["distance_range"])
+        pen_x += advance
+    return canvas
+
+
+def reference_glyph(font, cp, font_info, scale):
+    """Ground-truth coverage of one glyph box at `scale`, from the supersampled raster."""
+    supersample = font_info["sdf_supersample"]
+    box_w = font_info["glyph_box_width"] * supersample
+    box_h = font_info["glyph_box_height"] * supersample
+    tile = font_atlas.render_glyph_tile(font, cp, font_info["baseline_offset"] * supersample, max(box_w, box_h))
+
+    # Cover whole output pixels at exactly `scale` (a box resized to a rounded
+    # size would be stretched), padding the cell with empty pixels to fit
+    size = (max(1, int(np.ceil(font_info["glyph_box_width"] * scale))),
+            max(1, int(np.ceil(font_info["glyph_box_height"] * scale))))
+    region = (0, 0, size[0] * supersample / scale, size[1] * supersample / scale)
+    cell = Image.new("L", (max(box_w, int(np.ceil(region[2]))), max(box_h, int(np.ceil(region[3])))), 0)
+    if tile is not None:
+        dx, dy, image = tile
+        cell.paste(image, (dx, dy))
+    return np.asarray(cell.resize(size, Image.BOX, box=region), dtype=np.float32) / 255.0
+
+
+def verify(atlas, metadata, font_info, font_path, scales):
+    font = ImageFont.truetype(font_path, font_info["font_size"] * font_info["sdf_supersample"])
+    packed = font_info.get("packing", font_atlas.PACKING_GRID) == font_atlas.PACKING_SKYLINE
+    ok = True
+    print(f"{'scale':>6} {'glyphs':>7} {'mean |err|':>11} {'mean IoU':>9} {'min IoU':>8}"
+          + (f" {'min cell IoU':>13}" if packed else ""))
+    for scale in scales:
+        errors = []
+        ious = []
+        cell_ious = []
+        for key in metadata:
+            cp = int(key)
+            expected = reference_glyph(font, cp, font_info, scale)
+            if not expected.any():
+                continue
+            field = glyph_field(atlas, metadata, font_info, cp)
+            canvas = np.zeros_like(expected)
+            draw_glyph(canvas, field, 0, 0, scale, font_info["distance_range"])
+
+            errors.append(np.abs(canvas - expected).mean())
+            ious.append(mask_iou(canvas, expected))
+            if packed:
+                cell_canvas = np.zeros_like(expected)
+                draw_glyph(cell_canvas, cell_field(field, font_info), 0, 0, scale, font_info["distance_range"])
+                cell_ious.append(mask_iou(canvas, cell_canvas))
+
+        mean_iou = float(np.mean(ious))
+        if scale >= 1 and mean_iou < MIN_IOU:
+            ok = False
+        line = f"{scale:>6g} {len(ious):>7} {np.mean(errors):>11.4f} {mean_iou:>9.4f} {np.min(ious):>8.4f}"
+        if packed:
+            if np.min(cell_ious) < MIN_CELL_IOU:
+                ok = False
+            line += f" {np.min(cell_ious):>13.4f}"
+        print(line)
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render or verify an SDF font atlas.")
+    parser.add_argument("atlas", help="Atlas path prefix (without .png / _metadata.json / _fontinfo.json)")
+    parser.add_argument("--text", default="The quick brown fox jumps over the lazy dog",
+                        help="Text to render (default: %(default)s)")
+    parser.add_argument("--scale", type=float, default=4.0,
+                        help="Output size relative to the atlas glyph size (default: %(default)s)")
+    parser.add_argument("--output", default="sdf_render.png", help="Output PNG (default: %(default)s)")
+    parser.add_argument("--verify", action="store_true",
+                        help="Compare every glyph against the font instead of rendering --text")
+    parser.add_argument("--font", default=font_atlas.DEFAULT_FONT_PATH,
+                        help="Font the atlas was built from, for --verify (default: %(default)s)")
+    parser.add_argument("--scales", default=DEFAULT_SCALES,
+                        help="Comma-separated scales for --verify (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    atlas, metadata, font_info = load_atlas(args.atlas)
+
+    if args.verify:
+        scales = [float(s) for s in args.scales.split(",") if s.strip()]
+        return 0 if verify(atlas, metadata, font_info, args.font, scales) else 1
+
+    coverage = render_text(atlas, metadata, font_info, args.text, args.scale)
+    Image.fromarray(np.round(coverage * 255).astype(np.uint8)).save(args.output)
+    print(f"Wrote {args.output} ({coverage.shape[1]}x{coverage.shape[0]} px)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
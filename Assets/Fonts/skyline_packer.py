@@ -0,0 +1,120 @@
+# ============================
+# skyline_packer.py
+# ============================
+#
+# Bottom-left skyline rectangle packer, used to pack tight glyph
+# bounding boxes into a power-of-two atlas.
+#
+# The skyline is a list of horizontal segments [x, y, width] describing the
+# current top edge of everything packed so far. Each rectangle goes where its
+# top edge ends up lowest (ties broken by the leftmost position).
+# ============================
+
+
+def next_power_of_two(value):
+    power = 1
+    while power < value:
+        power *= 2
+    return power
+
+
+class SkylinePacker:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.skyline = [[0, 0, width]]
+
+    def fit(self, index, width, height):
+        """Return the y a width x height rect would rest at on segment `index`, or None."""
+        x = self.skyline[index][0]
+        if x + width > self.width:
+            return None
+        y = 0
+        remaining = width
+        i = index
+        while remaining > 0:
+            y = max(y, self.skyline[i][1])
+            if y + height > self.height:
+                return None
+            remaining -= self.skyline[i][2]
+            i += 1
+        return y
+
+    def insert(self, width, height):
+        """Place a rectangle and return its (x, y), or None if it does not fit."""
+        best = None
+        for index in range(len(self.skyline)):
+            y = self.fit(index, width, height)
+            if y is None:
+                continue
+            candidate = (y + height, self.skyline[index][0], index, y)
+            if best is None or candidate < best:
+                best = candidate
+        if best is None:
+            return None
+
+        _, x, index, y = best
+        self.add_segment(index, x, y + height, width)
+        return x, y
+
+    def add_segment(self, index, x, top, width):
+        skyline = self.skyline
+        skyline.insert(index, [x, top, width])
+
+        # Trim or drop the segments the new one now covers
+        i = index + 1
+        while i < len(skyline):
+            prev_end = skyline[i - 1][0] + skyline[i - 1][2]
+            segment = skyline[i]
+            if segment[0] >= prev_end:
+                break
+            shrink = prev_end - segment[0]
+            segment[0] += shrink
+            segment[2] -= shrink
+            if segment[2] > 0:
+                break
+            del skyline[i]
+
+        # Merge neighbours at the same height
+        i = 0
+        while i < len(skyline) - 1:
+            if skyline[i][1] == skyline[i + 1][1]:
+                skyline[i][2] += skyline[i + 1][2]
+                del skyline[i + 1]
+            else:
+                i += 1
+
+
+def pack_rects(sizes, spacing=1):
+    """Pack {key: (width, height)} into the smallest power-of-two atlas found.
+
+    Returns (atlas_width, atlas_height, {key: (x, y)}). Zero-area rects are
+    not packed and get no entry. `spacing` empty pixels are kept to the right
+    of and below every rect so filtered sampling never bleeds between glyphs.
+    """
+    rects = [(key, w + spacing, h + spacing) for key, (w, h) in sizes.items() if w > 0 and h > 0]
+    if not rects:
+        return 1, 1, {}
+
+    # Tallest first packs tightest on a skyline; key keeps the order stable
+    rects.sort(key=lambda rect: (-rect[2], -rect[1], rect[0]))
+
+    total_area = sum(w * h for _, w, h in rects)
+    atlas_width = next_power_of_two(max(max(w for _, w, _ in rects), int(total_area ** 0.5)))
+    atlas_height = next_power_of_two(max(max(h for _, _, h in rects), total_area // atlas_width))
+
+    while True:
+        packer = SkylinePacker(atlas_width, atlas_height)
+        positions = {}
+        for key, w, h in rects:
+            position = packer.insert(w, h)
+            if position is None:
+                break
+            positions[key] = position
+        if len(positions) == len(rects):
+            return atlas_width, atlas_height, positions
+        # Grow the shorter side and try again
+        if atlas_height <= atlas_width:
+            atlas_height *= 2
+        else:
+            atlas_width *= 2
@@ -0,0 +1,220 @@
+# ============================
+# text_rasterizer.py
+# ============================
+#
+# Renders lines or whole pages of text from a bitmap font atlas in one go.
+#
+# The atlas is loaded once into a contiguous (glyphs, height, width) coverage
+# stack, with slot 0 left blank for missing codepoints, and a dense
+# codepoint -> slot table (from <name>_lookup.bin, see glyph_lookup.py).
+# Rendering a page is then:
+#   text -> codepoint grid -> slot grid -> stack[slots] (one gather)
+# followed by a vectorized blend of the coverage over the background (a
+# 256-entry color table lookup when fg and bg are uniform).
+#
+# Blend modes match the Godot displays:
+# - NORMAL:      rgba = lerp(bg, fg, a)                  (ScrollableTextDisplay)
+# - ADDITIVE:    rgb += fg.rgb * a, alpha += a, clamped  (CharacterDisplay)
+# - SUBTRACTIVE: rgb -= fg.rgb * a, alpha -= a, clamped  (CharacterDisplay)
+# where a = fg.a * glyph coverage.
+#
+# Wrapping follows TextUtils.word_wrap / TextUtils.hard_wrap.
+# ============================
+import json
+import os
+
+import numpy as np
+from PIL import Image
+
+import font_atlas
+import glyph_lookup
+
+NORMAL = "normal"
+ADDITIVE = "additive"
+SUBTRACTIVE = "subtractive"
+BLEND_MODES = [NORMAL, ADDITIVE, SUBTRACTIVE]
+
+WHITE = (1.0, 1.0, 1.0, 1.0)
+BLACK = (0.0, 0.0, 0.0, 1.0)
+
+
+# ========== WRAPPING ==========
+def word_wrap(text, max_cols):
+    """Break at spaces where possible, hard-breaking words longer than max_cols."""
+    if max_cols <= 0:
+        raise ValueError("word_wrap: max_cols must be positive")
+
+    lines = []
+    for paragraph in text.split("\n"):
+        if not paragraph.strip():
+            lines.append("")
+            continue
+
+        current_line = ""
+        for word in paragraph.split(" "):
+            if not word:
+                continue
+            test_line = current_line + " " + word if current_line else word
+            if len(test_line) <= max_cols:
+                current_line = test_line
+                continue
+
+            if current_line:
+                lines.append(current_line)
+            while len(word) > max_cols:
+                lines.append(word[:max_cols])
+                word = word[max_cols:]
+            current_line = word
+
+        if current_line:
+            lines.append(current_line)
+    return lines
+
+
+def hard_wrap(text, max_cols):
+    """Break at exactly max_cols characters (and at newlines)."""
+    if max_cols <= 0:
+        raise ValueError("hard_wrap: max_cols must be positive")
+
+    lines = []
+    pos = 0
+    while pos < len(text):
+        chunk = text[pos:pos + max_cols]
+        newline = chunk.find("\n")
+        if newline != -1:
+            lines.append(chunk[:newline])
+            pos += newline + 1
+        else:
+            lines.append(chunk)
+            pos += max_cols
+    return lines
+
+
+def paginate(lines, rows):
+    """Split wrapped lines into pages of `rows` lines."""
+    return [lines[start:start + rows] for start in range(0, len(lines), rows)]
+
+
+# ========== BLENDING ==========
+def blend_terms(fg, bg, blend_mode):
+    """(base, slope) with blended = base + slope * coverage (coverage 0..1).
+
+    Every blend mode is linear in the glyph coverage, so it reduces to these
+    two color arrays; fg and bg are float32 [..., 4] arrays in 0..1.
+    """
+    fg_alpha = fg[..., 3:4]
+    if blend_mode == NORMAL:
+        return bg, (fg - bg) * fg_alpha
+    sign = 1.0 if blend_mode == ADDITIVE else -1.0
+    slope = sign * fg * fg_alpha
+    slope[..., 3] = sign * fg_alpha[..., 0]
+    return bg, slope
+
+
+def to_rgba8(colors):
+    return np.round(np.clip(colors, 0.0, 1.0) * 255).astype(np.uint8)
+
+
+# ========== RASTERIZER ==========
+class TextRasterizer:
+    """Bitmap atlas loaded once for whole-page rendering.
+
+    Works with grid and skyline atlases (solid or anti-aliased); coverage is
+    the atlas alpha channel, or the gray level for single-channel atlases.
+    """
+
+    def __init__(self, atlas_image, metadata, font_info, lookup=None):
+        if font_info.get("format") == font_atlas.FORMAT_SDF:
+            raise ValueError("SDF atlases store distances, not coverage; use render_sdf.py")
+
+        self.glyph_width = font_info["glyph_box_width"]
+        self.glyph_height = font_info["glyph_box_height"]
+
+        if "A" in atlas_image.getbands():
+            coverage = np.asarray(atlas_image.getchannel("A"), dtype=np.uint8)
+        else:
+            coverage = np.asarray(atlas_image.convert("L"), dtype=np.uint8)
+
+        if lookup is None:
+            lookup = glyph_lookup.GlyphLookup.from_metadata(metadata, font_info)
+        codepoints = lookup.codepoints()
+        self.glyphs = np.zeros((len(codepoints) + 1, self.glyph_height, self.glyph_width), dtype=np.uint8)
+        self.slots = np.zeros(max(codepoints, default=0) + 1, dtype=np.int32)
+        for slot, cp in enumerate(codepoints):
+            self.copy_glyph(coverage, slot + 1, lookup.record(slot))
+            self.slots[cp] = slot + 1
+
+    @classmethod
+    def load(cls, prefix):
+        """Load <prefix>.png and <prefix>_fontinfo.json, plus <prefix>_lookup.bin
+        (or <prefix>_metadata.json for atlases built before the lookup existed)."""
+        with open(prefix + "_fontinfo.json", "r", encoding="utf-8") as f:
+            font_info = json.load(f)
+        if os.path.exists(prefix + "_lookup.bin"):
+            return cls(Image.open(prefix + ".png"), None, font_info, glyph_lookup.GlyphLookup.load(prefix + "_lookup.bin"))
+        with open(prefix + "_metadata.json", "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        return cls(Image.open(prefix + ".png"), metadata, font_info)
+
+    def copy_glyph(self, coverage, slot, record):
+        x, y, w, h, dx, dy, _ = record
+        # Clip the rect to the glyph box, as AtlasHelper's blit_rect does
+        left, top = max(0, -dx), max(0, -dy)
+        right = min(w, self.glyph_width - dx)
+        bottom = min(h, self.glyph_height - dy)
+        if right > left and bottom > top:
+            self.glyphs[slot, dy + top:dy + bottom, dx + left:dx + right] = \
+                coverage[y + top:y + bottom, x + left:x + right]
+
+    def slot_grid(self, lines, cols=None):
+        """(rows, cols) int32 array of glyph slots; missing glyphs and padding are 0."""
+        cols = cols if cols is not None else max((len(line) for line in lines), default=0)
+        codepoints = np.zeros((len(lines), cols), dtype=np.int64)
+        for row, line in enumerate(lines):
+            line = line[:cols]
+            if line:
+                codepoints[row, :len(line)] = np.frombuffer(line.encode("utf-32-le"), dtype=np.uint32)
+
+        in_range = codepoints < len(self.slots)
+        return np.where(in_range, self.slots[np.where(in_range, codepoints, 0)], 0)
+
+    def render_coverage(self, lines, cols=None):
+        """(rows * glyph_height, cols * glyph_width) uint8 coverage for the lines."""
+        slots = self.slot_grid(lines, cols)
+        rows, cols = slots.shape
+        # (rows, cols, gh, gw) -> (rows, gh, cols, gw) -> page
+        cells = self.glyphs[slots]
+        return cells.transpose(0, 2, 1, 3).reshape(rows * self.glyph_height, cols * self.glyph_width)
+
+    def render(self, lines, cols=None, fg=WHITE, bg=BLACK, blend_mode=NORMAL):
+        """Render lines to an RGBA image.
+
+        fg and bg are RGBA tuples in 0..1, or (rows, cols, 4) arrays of
+        per-cell colors.
+        """
+        if blend_mode not in BLEND_MODES:
+            raise ValueError(f"Unknown blend mode {blend_mode!r}")
+
+        coverage = self.render_coverage(lines, cols)
+        fg = np.asarray(fg, dtype=np.float32)
+        bg = np.asarray(bg, dtype=np.float32)
+
+        if fg.ndim == 1 and bg.ndim == 1:
+            # Uniform colors: every output pixel is a function of coverage alone,
+            # so blend the 256 levels once and map each band through a table
+            base, slope = blend_terms(fg, bg, blend_mode)
+            table = to_rgba8(base + slope * (np.arange(256, dtype=np.float32)[:, None] / 255.0))
+            page = Image.fromarray(coverage)
+            return Image.merge("RGBA", [page.point(table[:, band].tolist()) for band in range(4)])
+
+        # Per-cell colors: broadcast each cell's terms over its glyph box
+        rows = len(lines)
+        cols = coverage.shape[1] // self.glyph_width if self.glyph_width else 0
+        base, slope = blend_terms(np.broadcast_to(fg, (rows, cols, 4)).copy(),
+                                  np.broadcast_to(bg, (rows, cols, 4)), blend_mode)
+        cells = coverage.reshape(rows, self.glyph_height, cols, self.glyph_width).astype(np.float32) / 255.0
+        bands = []
+        for band in range(4):
+            values = base[:, None, :, None, band] + slope[:, None, :, None, band] * cells
+            bands.append(Image.fromarray(to_rgba8(values).reshape(coverage.shape)))
+        return Image.merge("RGBA", bands)
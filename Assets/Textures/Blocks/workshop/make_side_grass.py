@@ -1,30 +1,46 @@
 from PIL import Image
 import random
+import sys
 
-# Load the images (assume 16x16 PNGs; handle RGBA if needed)
-dirt = Image.open('dirt.png')
-grass = Image.open('grass.png')
-
-# Create a new 16x16 image
-side = Image.new('RGBA', (16, 16))
-
-# Generate jagged grass heights for each column (x)
-heights = []
-current_height = 3  # Starting depth from top
-for x in range(16):
-    heights.append(current_height)
-    delta = random.choice([-1, 0, 1])
-    current_height = max(3, min(6, current_height + delta))  # Clamp for natural variation
-
-# Apply pixels: grass above the boundary, dirt below
-for x in range(16):
-    for y in range(16):
-        if y < heights[x]:
-            pixel = grass.getpixel((x, y))
-        else:
-            pixel = dirt.getpixel((x, y))
-        side.putpixel((x, y), pixel)
-
-# Save the result
-side.save('grass_side_jagged.png')
-print("Generated grass_side_jagged.png")
\ No newline at end of file
+
+def jagged_heights(width, rng=random):
+    # Generate jagged grass heights for each column (x)
+    heights = []
+    current_height = 3  # Starting depth from top
+    for x in range(width):
+        heights.append(current_height)
+        delta = rng.choice([-1, 0, 1])
+        current_height = max(3, min(6, current_height + delta))  # Clamp for natural variation
+    return heights
+
+
+def make_side(dirt, grass, rng=random):
+    """Grass side texture: grass above a jagged boundary, dirt below (16x16 RGBA)."""
+    # Create a new 16x16 image
+    side = Image.new('RGBA', (16, 16))
+    heights = jagged_heights(16, rng)
+
+    # Apply pixels: grass above the boundary, dirt below
+    for x in range(16):
+        for y in range(16):
+            if y < heights[x]:
+                pixel = grass.getpixel((x, y))
+            else:
+                pixel = dirt.getpixel((x, y))
+            side.putpixel((x, y), pixel)
+    return side
+
+
+def main():
+    # Load the images (assume 16x16 PNGs; handle RGBA if needed)
+    dirt = Image.open('dirt.png')
+    grass = Image.open('grass.png')
+
+    # Save the result
+    make_side(dirt, grass).save('grass_side_jagged.png')
+    print("Generated grass_side_jagged.png")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+# ============================
+# benchmark_pipelines.py
+# ============================
+#
+# Regression benchmarks for the Python asset and text tooling. Every stage
+# runs on fixed inputs in a scratch directory:
+# - the bundled Assets/Fonts/NotoSansMono-Regular.ttf
+# - a seeded synthetic corpus in kjv_ascii.txt format (Zipf-distributed
+#   words, KJV-sized by default), plus the kjv.json built from it
+# - the dirt/grass tiles next to make_side_grass.py
+#
+# For each stage it records:
+# - wall time: best of --repeats runs
+# - peak memory: one extra run under tracemalloc
+# - hot spots: one extra run under cProfile, top --hotspots functions by own time
+#
+# Results go to --output as JSON. Every run is compared against a baseline
+# (the committed Benchmarks/baseline.json unless --baseline names another
+# output, or --no-baseline skips it) and exits 1 when any stage's time or
+# peak memory grew by more than --threshold times. Timings are only
+# comparable on the same machine: refresh the baseline with
+# --output Benchmarks/baseline.json when the reference machine changes.
+#
+# Usage: python benchmark_pipelines.py [--stages a,b,...] [--list] [--output results.json]
+#                                      [--baseline baseline.json | --no-baseline] [--threshold 1.25]
+# ============================
+import argparse
+import cProfile
+import io
+import itertools
+import json
+import os
+import platform
+import pstats
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+FONTS_DIR = os.path.join(ROOT, "Assets", "Fonts")
+OLD_FONTS_DIR = os.path.join(FONTS_DIR, "old")
+BIBLE_DIR = os.path.join(ROOT, "Bible")
+WORKSHOP_DIR = os.path.join(ROOT, "Assets", "Textures", "Blocks", "workshop")
+for directory in (FONTS_DIR, OLD_FONTS_DIR, BIBLE_DIR, WORKSHOP_DIR):
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+
+from PIL import Image  # noqa: E402
+
+import font_atlas  # noqa: E402
+import generate_atlas  # noqa: E402
+import kjv_ascii_to_json  # noqa: E402
+import kjv_binary  # noqa: E402
+import kjv_page_cache  # noqa: E402
+import kjv_search_index  # noqa: E402
+import make_side_grass  # noqa: E402
+import render_atlas  # noqa: E402
+import text_rasterizer  # noqa: E402
+
+# ========== CONFIG ==========
+RESULTS_VERSION = 1
+FONT_PATH = os.path.join(FONTS_DIR, "NotoSansMono-Regular.ttf")
+CORPUS_SEED = 1611
+CORPUS_VERSES = 31102  # Verses in the KJV
+CORPUS_VOCABULARY = 12000
+BOOKS = 66
+VERSES_PER_CHAPTER = 26
+PAGE_COLS = 80
+PAGE_ROWS = 25
+RENDER_PAGES = 200
+GRASS_TILES = 500
+REPEATS = 3
+HOTSPOTS = 8
+THRESHOLD = 1.25
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+
+
+# ========== FIXED INPUTS ==========
+def synthetic_word(rng):
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(1, 10)))
+
+
+def write_corpus(path, verses=CORPUS_VERSES, seed=CORPUS_SEED, vocabulary=CORPUS_VOCABULARY):
+    """Write a deterministic kjv_ascii.txt-style corpus with Zipf word frequencies."""
+    rng = random.Random(seed)
+    words = sorted({synthetic_word(rng) for _ in range(vocabulary)})
+    rng.shuffle(words)
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(words))))
+
+    per_book = -(-verses // BOOKS)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("KJV\nKing James Bible\n")
+        for verse in range(verses):
+            book = verse // per_book + 1
+            chapter = (verse % per_book) // VERSES_PER_CHAPTER + 1
+            number = verse % per_book % VERSES_PER_CHAPTER + 1
+            text = " ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(8, 40)))
+            f.write(f"Book {book} {chapter}:{number}\t{text[0].upper()}{text[1:]}.\n")
+
+
+def bible_json(corpus_path):
+    """The kjv.json structure (as written by kjv_bible_json_maker.gd) for a corpus."""
+    bible = []
+    for book, chapter, text in kjv_ascii_to_json.iter_verses(corpus_path):
+        if not bible or bible[-1]["book"] != book:
+            bible.append({"book": book, "chapters": []})
+        chapters = bible[-1]["chapters"]
+        if not chapters or chapters[-1]["chapter"] != chapter:
+            chapters.append({"chapter": chapter, "verses": []})
+        verses = chapters[-1]["verses"]
+        verses.append({"verse": len(verses) + 1, "text": text})
+    return bible
+
+
+def quiet(function, *args, **kwargs):
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        return function(*args, **kwargs)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+class Inputs:
+    """Fixed inputs shared by the stages; built once, outside any measurement."""
+
+    def __init__(self, workdir, verses):
+        self.workdir = workdir
+        self.corpus = os.path.join(workdir, "kjv_ascii.txt")
+        write_corpus(self.corpus, verses)
+        self.bible = bible_json(self.corpus)
+        with open(self.corpus, "r", encoding="utf-8") as f:
+            lines = [line.rstrip("\n").replace("\t", " ") for line in f if "\t" in line]
+        self.pages = text_rasterizer.paginate(text_rasterizer.word_wrap("\n".join(lines), PAGE_COLS), PAGE_ROWS)
+        atlas_rgba, metadata, font_info, _ = font_atlas.build_atlas(FONT_PATH, antialiased=False, cache_dir=None)
+        self.rasterizer = text_rasterizer.TextRasterizer(atlas_rgba, metadata, font_info)
+        self.old_atlas = generate_atlas.build_atlas(FONT_PATH)
+        self.dirt = Image.open(os.path.join(WORKSHOP_DIR, "dirt.png"))
+        self.grass = Image.open(os.path.join(WORKSHOP_DIR, "grass.png"))
+        self.dirt.load()
+        self.grass.load()
+
+    def path(self, name):
+        return os.path.join(self.workdir, name)
+
+
+# ========== STAGES ==========
+def stage_font_atlas_solid(inputs):
+    font_atlas.build_atlas(FONT_PATH, antialiased=False, cache_dir=None)
+
+
+def stage_font_atlas_antialiased(inputs):
+    font_atlas.build_atlas(FONT_PATH, antialiased=True, cache_dir=None)
+
+
+def stage_font_atlas_sdf(inputs):
+    font_atlas.build_atlas(FONT_PATH, cache_dir=None, sdf_spread=font_atlas.DEFAULT_SDF_SPREAD)
+
+
+def stage_old_generate_atlas(inputs):
+    generate_atlas.build_atlas(FONT_PATH)
+
+
+def stage_old_render_atlas(inputs):
+    atlas_image, metadata, font_info = inputs.old_atlas
+    for text in render_atlas.TEST_STRINGS:
+        render_atlas.render_text_from_atlas(text, atlas_image, metadata, font_info["glyph_box_width"],
+                                            font_info["glyph_box_height"], font_info["columns"])
+
+
+def stage_text_wrap(inputs):
+    with open(inputs.corpus, "r", encoding="utf-8") as f:
+        lines = [line.rstrip("\n").replace("\t", " ") for line in f if "\t" in line]
+    text_rasterizer.paginate(text_rasterizer.word_wrap("\n".join(lines), PAGE_COLS), PAGE_ROWS)
+
+
+def stage_text_render(inputs):
+    for page in inputs.pages[:RENDER_PAGES]:
+        inputs.rasterizer.render(page, PAGE_COLS, fg=(1.0, 0.85, 0.4, 1.0), bg=(0.05, 0.05, 0.1, 1.0))
+
+
+def stage_kjv_convert_godot(inputs):
+    quiet(kjv_ascii_to_json.convert_godot, inputs.corpus, inputs.path("kjv_bible.gd"))
+
+
+def stage_kjv_convert_binary(inputs):
+    quiet(kjv_ascii_to_json.convert_binary, inputs.corpus, inputs.path("kjv.bin"))
+
+
+def stage_kjv_search_index(inputs):
+    kjv_search_index.write_index(kjv_ascii_to_json.iter_verses(inputs.corpus), inputs.path("kjv_search.bin"))
+
+
+def stage_kjv_binary_from_json(inputs):
+    kjv_binary.write_binary(kjv_binary.json_verses(inputs.bible), inputs.path("kjv_from_json.bin"))
+
+
+def stage_kjv_page_cache(inputs):
+    kjv_page_cache.build_cache(inputs.bible, inputs.path(kjv_page_cache.PAYLOAD_NAME),
+                               kjv_page_cache.DEFAULT_COLS, kjv_page_cache.DEFAULT_ROWS)
+
+
+def stage_make_side_grass(inputs):
+    rng = random.Random(0)
+    for _ in range(GRASS_TILES):
+        make_side_grass.make_side(inputs.dirt, inputs.grass, rng)
+
+
+STAGES = {
+    "font_atlas_solid": stage_font_atlas_solid,
+    "font_atlas_antialiased": stage_font_atlas_antialiased,
+    "font_atlas_sdf": stage_font_atlas_sdf,
+    "old_generate_atlas": stage_old_generate_atlas,
+    "old_render_atlas": stage_old_render_atlas,
+    "text_wrap": stage_text_wrap,
+    "text_render": stage_text_render,
+    "kjv_convert_godot": stage_kjv_convert_godot,
+    "kjv_convert_binary": stage_kjv_convert_binary,
+    "kjv_search_index": stage_kjv_search_index,
+    "kjv_binary_from_json": stage_kjv_binary_from_json,
+    "kjv_page_cache": stage_kjv_page_cache,
+    "make_side_grass": stage_make_side_grass,
+}
+
+
+# ========== MEASUREMENT ==========
+def function_name(key):
+    filename, line, name = key
+    if filename.startswith(ROOT):
+        filename = os.path.relpath(filename, ROOT)
+    elif filename.startswith("~") or filename.startswith("<"):
+        return name
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{line}({name})"
+
+
+def hotspots(profile, count):
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:count]
+    return [{"function": function_name(key), "calls": calls, "tottime": round(tottime, 6),
+             "cumtime": round(cumtime, 6)}
+            for key, (_, calls, tottime, cumtime, _) in rows]
+
+
+def measure(stage, inputs, repeats, hotspot_count):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        stage(inputs)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    stage(inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {"time": min(times), "times": times, "peak_memory": peak}
+    if hotspot_count:
+        profile = cProfile.Profile()
+        profile.runcall(stage, inputs)
+        result["hotspots"] = hotspots(profile, hotspot_count)
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Print time/memory ratios against baseline; returns the regressed stage names."""
+    regressions = []
+    print(f"\nAgainst baseline (threshold {threshold:.2f}x):")
+    for name, result in results["stages"].items():
+        old = baseline.get("stages", {}).get(name)
+        if old is None:
+            print(f"  {name:<24} (not in baseline)")
+            continue
+        time_ratio = result["time"] / old["time"] if old["time"] else 1.0
+        memory_ratio = result["peak_memory"] / old["peak_memory"] if old["peak_memory"] else 1.0
+        regressed = time_ratio > threshold or memory_ratio > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"  {name:<24} time {time_ratio:>5.2f}x  memory {memory_ratio:>5.2f}x"
+              f"{'  REGRESSION' if regressed else ''}")
+    if baseline.get("inputs") != results["inputs"]:
+        print("  warning: baseline was measured on different inputs")
+    if baseline.get("environment") != results["environment"]:
+        print("  warning: baseline was measured on a different machine or Python")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Python asset and text pipelines.")
+    parser.add_argument("--stages", help="comma-separated stage names (default: all)")
+    parser.add_argument("--list", action="store_true", help="list the stages and exit")
+    parser.add_argument("--verses", type=int, default=CORPUS_VERSES, help="synthetic corpus size")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="timed runs per stage (best is kept)")
+    parser.add_argument("--hotspots", type=int, default=HOTSPOTS, help="profile hot spots per stage (0 to skip)")
+    parser.add_argument("--output", help="write results as JSON here")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="earlier --output to compare against (default: %(default)s)")
+    parser.add_argument("--no-baseline", action="store_true", help="don't compare against a baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="slowdown or memory growth ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(STAGES))
+        return 0
+    names = args.stages.split(",") if args.stages else list(STAGES)
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        print(f"Unknown stages: {', '.join(unknown)} (see --list)")
+        return 2
+
+    results = {
+        "version": RESULTS_VERSION,
+        "inputs": {"font": os.path.basename(FONT_PATH), "corpus_seed": CORPUS_SEED, "verses": args.verses,
+                   "vocabulary": CORPUS_VOCABULARY, "render_pages": RENDER_PAGES, "grass_tiles": GRASS_TILES},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "machine": platform.machine()},
+        "repeats": args.repeats,
+        "stages": {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        inputs = Inputs(workdir, args.verses)
+        print(f"Inputs ready in {time.perf_counter() - start:.1f} s ({args.verses} verses, "
+              f"{len(inputs.pages)} pages)")
+        print(f"{'stage':<24} {'time':>10} {'peak memory':>14}  top hot spot")
+        for name in names:
+            result = measure(STAGES[name], inputs, args.repeats, args.hotspots)
+            results["stages"][name] = result
+            top = result["hotspots"][0]["function"] if result.get("hotspots") else ""
+            print(f"{name:<24} {result['time'] * 1e3:>8.1f}ms {result['peak_memory'] / 1e6:>11.2f} MB  {top}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to: {args.output}")
+
+    if not args.no_baseline:
+        if not os.path.exists(args.baseline):
+            print(f"\nNo baseline at {args.baseline}; write one with --output")
+            return 0
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
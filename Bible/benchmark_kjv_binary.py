@@ -0,0 +1,93 @@
+# ============================
+# benchmark_kjv_binary.py
+# ============================
+#
+# kjv_bible.gd (JSON text from godot_stringify) against kjv.bin (kjv_binary.py):
+# - conversion time from kjv_ascii.txt
+# - file size
+# - load time (json.loads of the whole file vs. header + offset tables)
+# - verse lookups
+# and checks both outputs hold the same verses in the same order.
+#
+# Usage: python benchmark_kjv_binary.py [kjv_ascii.txt]
+# ============================
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import kjv_ascii_to_json
+import kjv_binary
+
+REPEATS = 3
+LOOKUPS = 20000
+
+
+def best_of(function, repeats=REPEATS):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def quiet(function, *args):
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        return function(*args)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+def main(source):
+    if not os.path.exists(source):
+        print(f"Missing {source}; pass the path to kjv_ascii.txt")
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        gd_path = os.path.join(tmp, "kjv_bible.gd")
+        bin_path = os.path.join(tmp, "kjv.bin")
+
+        # ========== CONVERSION ==========
+        gd_convert, _ = best_of(lambda: quiet(kjv_ascii_to_json.convert_godot, source, gd_path))
+        bin_convert, _ = best_of(lambda: quiet(kjv_ascii_to_json.convert_binary, source, bin_path))
+        gd_size = os.path.getsize(gd_path)
+        bin_size = os.path.getsize(bin_path)
+
+        # ========== LOAD ==========
+        def load_json():
+            with open(gd_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        json_load, data = best_of(load_json)
+        bin_load, bible = best_of(lambda: kjv_binary.KJVBinary.load(bin_path))
+
+    print(f"{'':<12} {'convert':>10} {'size':>12} {'load':>10}")
+    print(f"{'JSON (.gd)':<12} {gd_convert * 1e3:>8.1f}ms {gd_size:>12,} {json_load * 1e3:>8.1f}ms")
+    print(f"{'binary':<12} {bin_convert * 1e3:>8.1f}ms {bin_size:>12,} {bin_load * 1e3:>8.1f}ms")
+    print(f"binary/JSON: convert {bin_convert / gd_convert:.2f}x, size {bin_size / gd_size:.2f}x, "
+          f"load {bin_load / json_load:.3f}x")
+
+    # ========== VERSES ==========
+    linear = [(v["book"], v["chapter"], v["verse"], v["verse_text"]) for v in data["linear_verses"]]
+    identical = linear == list(bible.linear_verses())
+    print(f"{len(linear)} verses, identical={identical}")
+
+    refs = random.Random(0).sample([row[:3] for row in linear], min(LOOKUPS, len(linear)))
+    bible_data = data["bible_data"]
+    json_lookup, json_texts = best_of(lambda: [bible_data[b][str(c)][v - 1] for b, c, v in refs])
+    bin_lookup, bin_texts = best_of(lambda: [bible.verse(b, c, v) for b, c, v in refs])
+    identical = identical and json_texts == bin_texts
+    print(f"Verse lookup: JSON {json_lookup / len(refs) * 1e9:.0f} ns, "
+          f"binary {bin_lookup / len(refs) * 1e9:.0f} ns, identical={json_texts == bin_texts}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else kjv_ascii_to_json.file_path))
@@ -0,0 +1,94 @@
+# ============================
+# benchmark_kjv_chapters.py
+# ============================
+#
+# Startup cost of the two BibleHelper backends, mirrored in Python:
+# - eager: json.load of the whole kjv.json, then one verse
+# - lazy:  kjv.bin (kjv_binary.py, written from the same kjv.json) opened
+#          for its header and tables, then a seek to the one chapter holding
+#          the verse
+# Reports time-to-first-verse and peak memory (tracemalloc) for each, and
+# checks every chapter read from kjv.bin matches kjv.json.
+#
+# Usage: python benchmark_kjv_chapters.py [kjv.json]
+# ============================
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import kjv_binary
+
+REPEATS = 5
+FIRST_VERSE = ("Psalm", 91, 3)
+
+
+def eager_first_verse(json_path, ref):
+    with open(json_path, "r", encoding="utf-8") as f:
+        bible = json.load(f)
+    book, chapter, verse = ref
+    for entry in bible:
+        if entry["book"] == book:
+            for chap in entry["chapters"]:
+                if chap["chapter"] == chapter:
+                    return chap["verses"][verse - 1]["text"]
+    return ""
+
+
+def lazy_first_verse(binary_path, ref):
+    binary = kjv_binary.KJVBinary.open(binary_path)
+    try:
+        book, chapter, verse = ref
+        return binary.verse(book, chapter, verse)
+    finally:
+        binary.close()
+
+
+def measure(function):
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main(source):
+    if not os.path.exists(source):
+        print(f"Missing {source}; pass the path to kjv.json")
+        return 1
+    with open(source, "r", encoding="utf-8") as f:
+        bible = json.load(f)
+    ref = FIRST_VERSE
+    if not any(book["book"] == ref[0] for book in bible):
+        ref = (bible[0]["book"], bible[0]["chapters"][0]["chapter"], 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        binary_path = os.path.join(tmp, "kjv.bin")
+        kjv_binary.write_binary(kjv_binary.json_verses(bible), binary_path)
+        identical = kjv_binary.verify(bible, binary_path)
+        binary_size = os.path.getsize(binary_path)
+        del bible
+
+        eager_time, eager_peak, eager_text = measure(lambda: eager_first_verse(source, ref))
+        lazy_time, lazy_peak, lazy_text = measure(lambda: lazy_first_verse(binary_path, ref))
+
+    identical = identical and eager_text == lazy_text
+    print(f"First verse: {ref[0]} {ref[1]}:{ref[2]}")
+    print(f"{'':<8} {'file size':>12} {'first verse':>12} {'peak memory':>14}")
+    print(f"{'eager':<8} {os.path.getsize(source):>12,} {eager_time * 1e3:>10.2f}ms {eager_peak:>14,}")
+    print(f"{'lazy':<8} {binary_size:>12,} {lazy_time * 1e3:>10.2f}ms {lazy_peak:>14,}")
+    print(f"lazy/eager: time {lazy_time / eager_time:.3f}x, memory {lazy_peak / eager_peak:.3f}x, "
+          f"identical={identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else "kjv.json"))
@@ -0,0 +1,82 @@
+# ============================
+# benchmark_kjv_search.py
+# ============================
+#
+# Query latency of the inverted index (kjv_search_index.py) against a scan
+# over every tokenized verse, for common and rare words, AND queries and
+# phrases, and checks both return the same verse ordinals.
+#
+# Usage: python benchmark_kjv_search.py [kjv_ascii.txt]
+# ============================
+import os
+import sys
+import tempfile
+import time
+
+import kjv_ascii_to_json
+import kjv_search_index
+
+REPEATS = 5
+COMMON = ["the", "lord", "god"]
+AND_QUERIES = ["lord god", "king israel", "the and of"]
+PHRASES = ["the lord", "in the beginning", "the son of"]
+RARE_COUNT = 3
+
+
+def best_of(function, repeats=REPEATS):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def scan_search(verses, query):
+    terms = set(kjv_search_index.tokenize(query))
+    return [ordinal for ordinal, tokens in enumerate(verses) if terms and terms.issubset(tokens)]
+
+
+def scan_phrase(verses, query):
+    terms = kjv_search_index.tokenize(query)
+    n = len(terms)
+    return [ordinal for ordinal, tokens in enumerate(verses)
+            if n and any(tokens[i:i + n] == terms for i in range(len(tokens) - n + 1))]
+
+
+def main(source):
+    if not os.path.exists(source):
+        print(f"Missing {source}; pass the path to kjv_ascii.txt")
+        return 1
+
+    verses = [kjv_search_index.tokenize(text) for _, _, text in kjv_ascii_to_json.iter_verses(source)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, kjv_search_index.output_index)
+        build, counts = best_of(lambda: kjv_search_index.write_index(kjv_ascii_to_json.iter_verses(source), path), 1)
+        size = os.path.getsize(path)
+        load, index = best_of(lambda: kjv_search_index.KJVSearch.load(path))
+
+    text_size = os.path.getsize(source)
+    print(f"{counts[0]} verses, {counts[1]} terms; build {build * 1e3:.0f} ms, "
+          f"{size:,} bytes ({size / text_size:.2f}x the text), load {load * 1e3:.1f} ms")
+
+    by_freq = sorted(index.term_lookup, key=lambda term: (index.verse_freq[index.term_lookup[term]], term))
+    queries = [("word", q, index.search, scan_search) for q in COMMON + by_freq[:RARE_COUNT]]
+    queries += [("and", q, index.search, scan_search) for q in AND_QUERIES]
+    queries += [("phrase", q, index.phrase, scan_phrase) for q in PHRASES]
+
+    identical = True
+    print(f"{'kind':<7} {'query':<20} {'hits':>6} {'index':>10} {'scan':>10} {'speedup':>8}")
+    for kind, query, indexed, scanned in queries:
+        index_time, index_hits = best_of(lambda: indexed(query))
+        scan_time, scan_hits = best_of(lambda: scanned(verses, query), 1)
+        identical = identical and index_hits == scan_hits
+        print(f"{kind:<7} {query:<20} {len(index_hits):>6} {index_time * 1e6:>8.0f}us {scan_time * 1e6:>8.0f}us "
+              f"{scan_time / max(index_time, 1e-9):>7.0f}x")
+    print(f"identical={identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else kjv_ascii_to_json.file_path))
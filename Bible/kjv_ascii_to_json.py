@@ -1,33 +1,46 @@
+import argparse
 import re
+import sys
+
+import kjv_binary
 
 file_path = "kjv_ascii.txt"
 output_godot = "kjv_bible.gd"
+output_binary = "kjv.bin"
+
+
+def iter_verses(path):
+    """Stream (book, chapter, verse_text) from the KJV text, one line at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("KJV") or line.startswith("King James"):
+                continue
+
+            if ":" not in line:
+                continue  # skip malformed lines
+
+            # Split on the first colon
+            book_chapter, verse_text = line.split(":", 1)
+            parts = book_chapter.rsplit(" ", 1)
+            if len(parts) != 2:
+                continue  # skip malformed lines
+            book, chapter_str = parts
+            chapter = int(chapter_str)
 
-bible_data = {}
-chapters_per_book = {}
-verses_per_chapter = {}
-
-with open(file_path, "r", encoding="utf-8") as f:
-    for line in f:
-        line = line.strip()
-        if not line or line.startswith("KJV") or line.startswith("King James"):
-            continue
-        
-        if ":" not in line:
-            continue  # skip malformed lines
-
-        # Split on the first colon
-        book_chapter, verse_text = line.split(":", 1)
-        parts = book_chapter.rsplit(" ", 1)
-        if len(parts) != 2:
-            continue  # skip malformed lines
-        book, chapter_str = parts
-        chapter = int(chapter_str)
-
-        # Clean the verse text: remove leading verse number and whitespace
-        verse_text = verse_text.strip()
-        verse_text = re.sub(r'^\d+\s+', '', verse_text)
+            # Clean the verse text: remove leading verse number and whitespace
+            verse_text = verse_text.strip()
+            verse_text = re.sub(r'^\d+\s+', '', verse_text)
 
+            yield book, chapter, verse_text
+
+
+def build_export_data(verses):
+    bible_data = {}
+    chapters_per_book = {}
+    verses_per_chapter = {}
+
+    for book, chapter, verse_text in verses:
         # Initialize nested structures
         if book not in bible_data:
             bible_data[book] = {}
@@ -41,17 +54,26 @@ with open(file_path, "r", encoding="utf-8") as f:
         # Use string key instead of tuple
         verses_per_chapter[f"{book} {chapter}"] = len(bible_data[book][chapter])
 
-# Flatten for easier linear traversal in Godot
-linear_verses = []
-for book in bible_data:
-    for chapter in sorted(bible_data[book]):
-        for verse_number, verse_text in enumerate(bible_data[book][chapter], start=1):
-            linear_verses.append({
-                "book": book,
-                "chapter": chapter,
-                "verse": verse_number,
-                "verse_text": verse_text
-            })
+    # Flatten for easier linear traversal in Godot
+    linear_verses = []
+    for book in bible_data:
+        for chapter in sorted(bible_data[book]):
+            for verse_number, verse_text in enumerate(bible_data[book][chapter], start=1):
+                linear_verses.append({
+                    "book": book,
+                    "chapter": chapter,
+                    "verse": verse_number,
+                    "verse_text": verse_text
+                })
+
+    # Combine all data for export
+    return {
+        "bible_data": bible_data,
+        "chapters_per_book": chapters_per_book,
+        "verses_per_chapter": verses_per_chapter,
+        "linear_verses": linear_verses
+    }
+
 
 # Function to convert Python dict/list to Godot Stringify
 def godot_stringify(obj, indent=0):
@@ -70,17 +92,45 @@ def godot_stringify(obj, indent=0):
     else:
         return str(obj)
 
-# Combine all data for export
-export_data = {
-    "bible_data": bible_data,
-    "chapters_per_book": chapters_per_book,
-    "verses_per_chapter": verses_per_chapter,
-    "linear_verses": linear_verses
-}
 
-with open(output_godot, "w", encoding="utf-8") as f:
-    f.write(godot_stringify(export_data))
+def convert_godot(source, output):
+    export_data = build_export_data(iter_verses(source))
+
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(godot_stringify(export_data))
+
+    print(f"Processed {len(export_data['bible_data'])} books.")
+    print(f"Total verses: {len(export_data['linear_verses'])}")
+    print(f"Godot-compatible export to: {output}")
+
+
+def convert_binary(source, output):
+    # Streams: only the offset tables are held in memory (see kjv_binary.py)
+    books, chapters, verses = kjv_binary.write_binary(iter_verses(source), output)
+
+    print(f"Processed {books} books, {chapters} chapters.")
+    print(f"Total verses: {verses}")
+    print(f"Binary export to: {output}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the KJV text for Godot.")
+    parser.add_argument("--source", default=file_path, help="KJV text, one 'Book C:V text' line per verse")
+    parser.add_argument("--binary", action="store_true",
+                        help="write the compact binary container (kjv_binary.py) instead of kjv_bible.gd")
+    parser.add_argument("--output", help=f"output path (default {output_godot}, or {output_binary} with --binary)")
+    args = parser.parse_args(argv)
+
+    if args.binary:
+        try:
+            convert_binary(args.source, args.output or output_binary)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    else:
+        convert_godot(args.source, args.output or output_godot)
+    return 0
+
 
-print(f"Processed {len(bible_data)} books.")
-print(f"Total verses: {len(linear_verses)}")
-print(f"Godot-compatible export to: {output_godot}")
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+# ============================
+# kjv_binary.py
+# ============================
+#
+# Compact binary KJV container (kjv.bin), written in one streaming pass.
+#
+# Layout (little-endian; every table entry is a u32 so Godot can read each
+# table with a single PackedByteArray.to_int32_array()):
+#   header    "KJVB", u16 version, u16 flags,
+#             u32 book_count, u32 chapter_count, u32 verse_count,
+#             u32 pool_offset, u32 pool_size,
+#             u32 books_offset, u32 chapters_offset, u32 verses_offset   (44 bytes)
+#   pool      UTF-8 verse texts back to back, then the book names
+#   books     book_count x (name_start, name_end, first_chapter, chapter_count)
+#   chapters  (chapter_count + 1) x (chapter_number, first_verse); the last
+#             entry is (0, verse_count), so chapter c holds verses
+#             first_verse[c] .. first_verse[c + 1]
+#   verses    (verse_count + 1) x pool offset; verse v is pool[off[v]:off[v + 1]]
+#
+# Verse numbers are implicit: the n-th verse of a chapter is verse n + 1,
+# as in kjv_ascii_to_json.py. Read back with KJVBinary here or
+# Scripts/Bible/BibleBinary.gd in Godot; BibleHelper's lazy backend reads
+# chapters straight from the file, seeking through the offset tables.
+#
+# Written from kjv_ascii.txt by kjv_ascii_to_json.py --binary, or from
+# kjv.json (kjv_bible_json_maker.gd) by this script:
+#
+# Usage: python kjv_binary.py [kjv.json] [--output kjv.bin] [--verify]
+# ============================
+import argparse
+import json
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"KJVB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIIIII")
+
+
+def u32_bytes(values):
+    table = array("I", values)
+    if sys.byteorder != "little":
+        table.byteswap()
+    return table.tobytes()
+
+
+def json_verses(bible):
+    """(book, chapter, verse_text) tuples from kjv.json's array of books.
+
+    Verses must be numbered 1..n in every chapter (true for the KJV), since
+    kjv.bin only stores their order.
+    """
+    for book in bible:
+        for chapter in book["chapters"]:
+            numbers = [verse["verse"] for verse in chapter["verses"]]
+            if numbers != list(range(1, len(numbers) + 1)):
+                raise ValueError(f"{book['book']} {chapter['chapter']}: verses are not numbered 1..n")
+            for verse in chapter["verses"]:
+                yield book["book"], chapter["chapter"], verse["text"]
+
+
+def write_binary(verses, output_path):
+    """Stream (book, chapter, verse_text) tuples, in book/chapter order, to output_path.
+
+    Only the offset tables are kept in memory; verse texts go straight to
+    the file. Returns (book_count, chapter_count, verse_count).
+
+    Each book's verses must come together, with its chapters in increasing
+    order (true for the KJV): kjv_ascii_to_json's JSON output merges a book
+    that reappears and sorts its chapters, which a stream can't, so such
+    input raises ValueError rather than numbering books and verses
+    differently.
+    """
+    books = []          # [name, first_chapter, chapter_count]
+    chapters = []       # (chapter_number, first_verse)
+    verse_offsets = array("I")
+    pool_size = 0
+
+    try:
+        with open(output_path, "wb") as f:
+            f.write(b"\0" * HEADER.size)
+
+            current_book = None
+            current_chapter = None
+            seen_books = set()
+            for book, chapter, verse_text in verses:
+                if book != current_book:
+                    if book in seen_books:
+                        raise ValueError(f"{book} {chapter}: {book} appears again after {current_book}; "
+                                         "kjv.bin needs each book's verses together")
+                    seen_books.add(book)
+                    books.append([book, len(chapters), 0])
+                    current_book = book
+                    current_chapter = None
+                if chapter != current_chapter:
+                    if current_chapter is not None and chapter < current_chapter:
+                        raise ValueError(f"{book} {chapter}: comes after chapter {current_chapter}; "
+                                         "kjv.bin needs each book's chapters in order")
+                    chapters.append((chapter, len(verse_offsets)))
+                    books[-1][2] += 1
+                    current_chapter = chapter
+
+                data = verse_text.encode("utf-8")
+                verse_offsets.append(pool_size)
+                f.write(data)
+                pool_size += len(data)
+            verse_offsets.append(pool_size)
+
+            # Book names go at the end of the pool
+            book_rows = []
+            for name, first_chapter, chapter_count in books:
+                data = name.encode("utf-8")
+                book_rows.extend((pool_size, pool_size + len(data), first_chapter, chapter_count))
+                f.write(data)
+                pool_size += len(data)
+
+            books_offset = HEADER.size + pool_size
+            f.write(u32_bytes(book_rows))
+            chapters_offset = f.tell()
+            f.write(u32_bytes([value for row in chapters for value in row] + [0, len(verse_offsets) - 1]))
+            verses_offset = f.tell()
+            f.write(u32_bytes(verse_offsets))
+
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, 0, len(books), len(chapters), len(verse_offsets) - 1,
+                                HEADER.size, pool_size, books_offset, chapters_offset, verses_offset))
+    except ValueError:
+        os.remove(output_path)  # don't leave a partial kjv.bin behind
+        raise
+
+    return len(books), len(chapters), len(verse_offsets) - 1
+
+
+class KJVBinary:
+    """Reader for kjv.bin. Tables are decoded up front, verse texts on access.
+
+    load() reads the whole file; open() keeps it open and reads only the
+    header and tables, seeking to verse texts as they are needed.
+    """
+
+    def __init__(self, data=None, file=None):
+        self.data = bytes(data) if data is not None else None
+        self.file = file
+        header = self._read(0, HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"Not a version {VERSION} KJV binary")
+        (magic, version, _flags, book_count, chapter_count, verse_count,
+         pool_offset, pool_size, books_offset, chapters_offset, verses_offset) = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} KJV binary")
+
+        self.pool_offset = pool_offset
+        self.verse_count = verse_count
+        book_rows = self._table(books_offset, book_count * 4)
+        chapter_rows = self._table(chapters_offset, (chapter_count + 1) * 2)
+        self.verse_offsets = self._table(verses_offset, verse_count + 1)
+
+        self.chapter_numbers = chapter_rows[0::2]
+        self.chapter_first_verse = chapter_rows[1::2]
+        self.books = []  # (name, first_chapter, chapter_count)
+        self.chapter_lookup = {}  # (book, chapter number) -> chapter index
+        for i in range(book_count):
+            start, end, first_chapter, count = book_rows[i * 4:i * 4 + 4]
+            name = self._read(pool_offset + start, end - start).decode("utf-8")
+            self.books.append((name, first_chapter, count))
+            for c in range(first_chapter, first_chapter + count):
+                self.chapter_lookup[(name, self.chapter_numbers[c])] = c
+
+    def _read(self, offset, size):
+        if self.file is None:
+            return self.data[offset:offset + size]
+        self.file.seek(offset)
+        return self.file.read(size)
+
+    def _table(self, offset, count):
+        table = array("I", self._read(offset, count * 4))
+        if sys.byteorder != "little":
+            table.byteswap()
+        return table
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    @classmethod
+    def open(cls, path):
+        return cls(file=open(path, "rb"))
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def book_names(self):
+        return [name for name, _, _ in self.books]
+
+    def chapter_index(self, book, chapter):
+        """Global chapter index, or -1."""
+        return self.chapter_lookup.get((book, chapter), -1)
+
+    def verse_text(self, index):
+        """Text of the verse with global (linear) index."""
+        start = self.verse_offsets[index]
+        return self._read(self.pool_offset + start, self.verse_offsets[index + 1] - start).decode("utf-8")
+
+    def chapter_texts(self, c):
+        """Verse texts of global chapter index c, read as one span of the pool."""
+        first, end = self.chapter_first_verse[c], self.chapter_first_verse[c + 1]
+        base = self.verse_offsets[first]
+        span = self._read(self.pool_offset + base, self.verse_offsets[end] - base)
+        return [span[self.verse_offsets[v] - base:self.verse_offsets[v + 1] - base].decode("utf-8")
+                for v in range(first, end)]
+
+    def chapter(self, book, chapter):
+        c = self.chapter_index(book, chapter)
+        if c < 0:
+            return []
+        return self.chapter_texts(c)
+
+    def verse(self, book, chapter, verse):
+        c = self.chapter_lookup.get((book, chapter), -1)
+        if c < 0:
+            return ""
+        index = self.chapter_first_verse[c] + verse - 1
+        if verse < 1 or index >= self.chapter_first_verse[c + 1]:
+            return ""
+        return self.verse_text(index)
+
+    def linear_verses(self):
+        """(book, chapter, verse, text) for every verse, in order."""
+        for name, first_chapter, count in self.books:
+            for c in range(first_chapter, first_chapter + count):
+                first = self.chapter_first_verse[c]
+                for v in range(first, self.chapter_first_verse[c + 1]):
+                    yield name, self.chapter_numbers[c], v - first + 1, self.verse_text(v)
+
+
+def verify(bible, path):
+    """True if path holds exactly kjv.json's books, chapters and verse texts."""
+    binary = KJVBinary.open(path)
+    try:
+        if binary.book_names() != [book["book"] for book in bible]:
+            return False
+        for book in bible:
+            for chapter in book["chapters"]:
+                expected = [verse["text"] for verse in chapter["verses"]]
+                if binary.chapter(book["book"], chapter["chapter"]) != expected:
+                    return False
+        return binary.verse_count == sum(len(c["verses"]) for b in bible for c in b["chapters"])
+    finally:
+        binary.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write kjv.json as the compact binary container.")
+    parser.add_argument("source", nargs="?", default="kjv.json")
+    parser.add_argument("--output", help="output path (default: kjv.bin next to the source)")
+    parser.add_argument("--verify", action="store_true", help="read every chapter back and compare")
+    args = parser.parse_args(argv)
+
+    with open(args.source, "r", encoding="utf-8") as f:
+        bible = json.load(f)
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(args.source)), "kjv.bin")
+    books, chapters, verses = write_binary(json_verses(bible), output)
+    print(f"{books} books, {chapters} chapters, {verses} verses")
+    print(f"{output}: {os.path.getsize(output):,} bytes")
+
+    if args.verify:
+        ok = verify(bible, output)
+        print(f"Verify: {'OK' if ok else 'MISMATCH'}")
+        return 0 if ok else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+# ============================
+# kjv_page_cache.py
+# ============================
+#
+# Precomputes the reader's wrapped, paginated chapter text so Godot never
+# word-wraps a chapter it has precomputed. For every chapter of kjv.json,
+# each text mode and each column width, the chapter text is built exactly
+# as BibleHelper.get_chapter_text() does and wrapped exactly as
+# TextUtils.word_wrap() does, then written as a payload plus a JSON index:
+#
+#   kjv_pages.bin         entries as compact UTF-8 JSON, back to back:
+#                         {"lines": [...], "paragraphs": [first line of each
+#                          text paragraph], "pages": [first line of each page]}
+#   kjv_pages_index.json  {"version": 1, "payload": "kjv_pages.bin", "rows": rows,
+#                          "entries": {"Book|chapter|mode|cols": [offset, length]}}
+#
+# Read by Scripts/Bible/ChapterPageCache.gd, which keys its LRU cache the
+# same way.
+#
+# Usage: python kjv_page_cache.py [kjv.json] [--cols 80 --cols 100] [--rows 25] [--verify]
+# ============================
+import argparse
+import bisect
+import json
+import os
+import sys
+
+INDEX_VERSION = 1
+INDEX_NAME = "kjv_pages_index.json"
+PAYLOAD_NAME = "kjv_pages.bin"
+DEFAULT_COLS = [80]
+DEFAULT_ROWS = 25
+MODES = (1, 2)
+GODOT_SPACE = "".join(chr(c) for c in range(33))  # String.strip_edges() strips code points <= 32
+
+
+def entry_key(book, chapter, mode, cols):
+    return f"{book}|{chapter}|{mode}|{cols}"
+
+
+def chapter_text(book, chapter, mode):
+    """BibleHelper.get_chapter_text() for a kjv.json chapter."""
+    number = int(chapter["chapter"])
+    if mode == 1:
+        body = " ".join(verse["text"] for verse in chapter["verses"])
+        return f"{book} {number}\n\n{body}".strip(GODOT_SPACE)
+    lines = [f"{book} {number}:{int(verse['verse'])} {verse['text']}" for verse in chapter["verses"]]
+    return "\n".join(lines).strip(GODOT_SPACE)
+
+
+def word_wrap(text, max_cols):
+    """TextUtils.word_wrap(), plus the first line of every paragraph."""
+    lines = []
+    paragraphs = []
+    for paragraph in text.split("\n"):
+        paragraphs.append(len(lines))
+        if not paragraph.strip(GODOT_SPACE):
+            lines.append("")
+            continue
+
+        current_line = ""
+        for word in (word for word in paragraph.split(" ") if word):
+            test_line = current_line + " " + word if current_line else word
+            if len(test_line) <= max_cols:
+                current_line = test_line
+                continue
+            if current_line:
+                lines.append(current_line)
+            # Hard break words longer than the line
+            while len(word) > max_cols:
+                lines.append(word[:max_cols])
+                word = word[max_cols:]
+            current_line = word
+        if current_line:
+            lines.append(current_line)
+    return lines, paragraphs
+
+
+def paginate(paragraphs, line_count, rows):
+    """First line of each page: a page ends before the last paragraph that starts within it."""
+    pages = [0]
+    start = 0
+    while start + rows < line_count:
+        limit = start + rows
+        last = paragraphs[bisect.bisect_right(paragraphs, limit) - 1]
+        start = last if last > start else limit
+        pages.append(start)
+    return pages
+
+
+def build_entry(book, chapter, mode, cols, rows):
+    lines, paragraphs = word_wrap(chapter_text(book, chapter, mode), cols)
+    return {"lines": lines, "paragraphs": paragraphs, "pages": paginate(paragraphs, len(lines), rows)}
+
+
+def build_cache(bible, payload_path, cols_list, rows, modes=MODES):
+    """Write every entry to payload_path and return the index dict."""
+    entries = {}
+    offset = 0
+    with open(payload_path, "wb") as f:
+        for book in bible:
+            for chapter in book["chapters"]:
+                for mode in modes:
+                    for cols in cols_list:
+                        entry = build_entry(book["book"], chapter, mode, cols, rows)
+                        data = json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                        f.write(data)
+                        entries[entry_key(book["book"], int(chapter["chapter"]), mode, cols)] = [offset, len(data)]
+                        offset += len(data)
+    return {"version": INDEX_VERSION, "payload": os.path.basename(payload_path), "rows": rows, "entries": entries}
+
+
+def read_entry(f, row):
+    offset, length = row
+    f.seek(offset)
+    return json.loads(f.read(length).decode("utf-8"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute wrapped, paginated KJV chapters for the reader.")
+    parser.add_argument("source", nargs="?", default="kjv.json")
+    parser.add_argument("--cols", type=int, action="append", help=f"column width (repeatable, default {DEFAULT_COLS})")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="rows per page")
+    parser.add_argument("--verify", action="store_true", help="read every entry back and compare")
+    args = parser.parse_args(argv)
+    cols_list = args.cols or DEFAULT_COLS
+
+    with open(args.source, "r", encoding="utf-8") as f:
+        bible = json.load(f)
+
+    directory = os.path.dirname(os.path.abspath(args.source))
+    payload_path = os.path.join(directory, PAYLOAD_NAME)
+    index_path = os.path.join(directory, INDEX_NAME)
+    index = build_cache(bible, payload_path, cols_list, args.rows)
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+
+    print(f"{len(index['entries'])} entries (modes {list(MODES)}, cols {cols_list}, {args.rows} rows per page)")
+    print(f"{index_path}: {os.path.getsize(index_path):,} bytes")
+    print(f"{payload_path}: {os.path.getsize(payload_path):,} bytes")
+
+    if args.verify:
+        ok = True
+        with open(payload_path, "rb") as f:
+            for book in bible:
+                for chapter in book["chapters"]:
+                    for mode in MODES:
+                        for cols in cols_list:
+                            key = entry_key(book["book"], int(chapter["chapter"]), mode, cols)
+                            ok = ok and read_entry(f, index["entries"][key]) == build_entry(
+                                book["book"], chapter, mode, cols, args.rows)
+        print(f"Verify: {'OK' if ok else 'MISMATCH'}")
+        return 0 if ok else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+# ============================
+# kjv_search_index.py
+# ============================
+#
+# Full-text inverted index of the KJV (kjv_search.bin) for word, AND and
+# phrase queries. Verses are identified by their ordinal, 0..n-1 in reading
+# order, the same numbering as BibleHelper's verse ordinals.
+#
+# Layout (little-endian):
+#   header    "KJVS", u16 version, u16 flags,
+#             u32 verse_count, u32 term_count,
+#             u32 pool_offset, u32 pool_size,
+#             u32 dict_offset, u32 postings_offset, u32 postings_size   (36 bytes)
+#   pool      the terms, sorted, UTF-8, joined by "\n" (one split() in Godot)
+#   dict      (term_count + 1) x u32 (verses_start, positions_start, verse_count);
+#             the last entry is (postings_size, postings_size, 0), so term t's
+#             postings are postings[verses_start[t]:verses_start[t + 1]]
+#   postings  per term, as unsigned LEB128 varints, two blocks:
+#             verses     each verse ordinal holding the term minus the previous
+#                        one (the first is the ordinal itself)
+#             positions  per verse, the number of occurrences, then each word
+#                        position in the verse minus the previous one
+#             so word and AND queries decode only the verses block
+#
+# Tokens are lowercase runs of letters/digits, apostrophes allowed inside
+# (TOKEN_PATTERN; Scripts/Bible/BibleSearch.gd uses the same pattern).
+# Read back with KJVSearch here or BibleSearch in Godot.
+#
+# Usage: python kjv_search_index.py [kjv_ascii.txt] [--output kjv_search.bin]
+# ============================
+import argparse
+import re
+import struct
+import sys
+from array import array
+
+import kjv_ascii_to_json
+
+MAGIC = b"KJVS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIIII")
+TOKEN_PATTERN = r"[a-z0-9]+(?:'[a-z0-9]+)*"
+TOKEN_RE = re.compile(TOKEN_PATTERN)
+output_index = "kjv_search.bin"
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def u32_bytes(values):
+    table = array("I", values)
+    if sys.byteorder != "little":
+        table.byteswap()
+    return table.tobytes()
+
+
+def put_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def get_varints(data, i, count):
+    """Decode count varints from data[i:]; returns (values, next index)."""
+    values = []
+    for _ in range(count):
+        value = shift = 0
+        byte = data[i]
+        while byte >= 0x80:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            i += 1
+            byte = data[i]
+        values.append(value | (byte << shift))
+        i += 1
+    return values, i
+
+
+def write_index(verses, output_path):
+    """Index (book, chapter, verse_text) tuples, in reading order, to output_path.
+
+    Returns (verse_count, term_count, postings_size).
+    """
+    occurrences = {}  # term -> [(ordinal, [positions])]
+    verse_count = 0
+    for ordinal, (_, _, verse_text) in enumerate(verses):
+        verse_count += 1
+        positions = {}
+        for position, term in enumerate(tokenize(verse_text)):
+            positions.setdefault(term, []).append(position)
+        for term, term_positions in positions.items():
+            occurrences.setdefault(term, []).append((ordinal, term_positions))
+
+    terms = sorted(occurrences)
+    postings = bytearray()
+    dict_rows = []
+    for term in terms:
+        verses_start = len(postings)
+        previous = 0
+        for ordinal, _ in occurrences[term]:
+            put_varint(postings, ordinal - previous)
+            previous = ordinal
+        positions_start = len(postings)
+        for _, positions in occurrences[term]:
+            put_varint(postings, len(positions))
+            last = 0
+            for position in positions:
+                put_varint(postings, position - last)
+                last = position
+        dict_rows.extend((verses_start, positions_start, len(occurrences[term])))
+    dict_rows.extend((len(postings), len(postings), 0))
+
+    pool = "\n".join(terms).encode("utf-8")
+    pool_offset = HEADER.size
+    dict_offset = pool_offset + len(pool)
+    postings_offset = dict_offset + len(dict_rows) * 4
+    with open(output_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, verse_count, len(terms), pool_offset, len(pool),
+                            dict_offset, postings_offset, len(postings)))
+        f.write(pool)
+        f.write(u32_bytes(dict_rows))
+        f.write(postings)
+    return verse_count, len(terms), len(postings)
+
+
+class KJVSearch:
+    """Reader for kjv_search.bin. The term dictionary is decoded up front, postings on query."""
+
+    def __init__(self, data):
+        (magic, version, _flags, verse_count, term_count, pool_offset, pool_size,
+         dict_offset, postings_offset, postings_size) = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} KJV search index")
+
+        self.data = bytes(data)
+        self.verse_count = verse_count
+        self.postings_offset = postings_offset
+        pool = self.data[pool_offset:pool_offset + pool_size].decode("utf-8")
+        terms = pool.split("\n") if term_count else []
+        self.term_lookup = {term: t for t, term in enumerate(terms)}
+        rows = array("I", self.data[dict_offset:dict_offset + (term_count + 1) * 12])
+        if sys.byteorder != "little":
+            rows.byteswap()
+        self.verses_start = rows[0::3]
+        self.positions_start = rows[1::3]
+        self.verse_freq = rows[2::3]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def verses(self, term):
+        """Ordinals of the verses holding a term, in order."""
+        t = self.term_lookup.get(term, -1)
+        if t < 0:
+            return []
+        deltas, _ = get_varints(self.data, self.postings_offset + self.verses_start[t], self.verse_freq[t])
+        ordinal = 0
+        result = []
+        for delta in deltas:
+            ordinal += delta
+            result.append(ordinal)
+        return result
+
+    def postings(self, term):
+        """{ordinal: [positions]} for a term."""
+        result = {}
+        t = self.term_lookup.get(term, -1)
+        if t < 0:
+            return result
+        i = self.postings_offset + self.positions_start[t]
+        for ordinal in self.verses(term):
+            (count,), i = get_varints(self.data, i, 1)
+            deltas, i = get_varints(self.data, i, count)
+            positions = []
+            position = 0
+            for delta in deltas:
+                position += delta
+                positions.append(position)
+            result[ordinal] = positions
+        return result
+
+    def search(self, query):
+        """Ordinals of verses containing every word of the query."""
+        terms = tokenize(query)
+        if not terms or any(term not in self.term_lookup for term in terms):
+            return []
+        terms.sort(key=lambda term: self.verse_freq[self.term_lookup[term]])
+        result = set(self.verses(terms[0]))
+        for term in terms[1:]:
+            result.intersection_update(self.verses(term))
+        return sorted(result)
+
+    def phrase(self, query):
+        """Ordinals of verses containing the query's words consecutively."""
+        terms = tokenize(query)
+        if not terms or any(term not in self.term_lookup for term in terms):
+            return []
+        lists = [self.postings(term) for term in terms]
+        result = []
+        for ordinal in sorted(set(lists[0]).intersection(*lists[1:])):
+            later = [set(positions[ordinal]) for positions in lists[1:]]
+            if any(all(start + k + 1 in later[k] for k in range(len(later))) for start in lists[0][ordinal]):
+                result.append(ordinal)
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the KJV full-text search index.")
+    parser.add_argument("source", nargs="?", default=kjv_ascii_to_json.file_path)
+    parser.add_argument("--output", default=output_index)
+    args = parser.parse_args(argv)
+
+    verse_count, term_count, postings_size = write_index(kjv_ascii_to_json.iter_verses(args.source), args.output)
+    print(f"Indexed {verse_count} verses, {term_count} terms, {postings_size:,} bytes of postings.")
+    print(f"Search index written to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,27 @@
 import json
+import sys
 
-# Load your Bible data JSON file
-with open("kjv_bible.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
 
-# Extract the Bible data dictionary
-bible_data = data.get("bible_data", {})
+def main(path="kjv_bible.json"):
+    # Load your Bible data JSON file
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
 
-# Get the list of book names
-book_names = list(bible_data.keys())
+    # Extract the Bible data dictionary
+    bible_data = data.get("bible_data", {})
 
-# Print each book name
-print("Books in the Bible:")
-for name in book_names:
-    print("-", name)
+    # Get the list of book names
+    book_names = list(bible_data.keys())
 
-# Print total number of books
-print("\nTotal number of books:", len(book_names))
+    # Print each book name
+    print("Books in the Bible:")
+    for name in book_names:
+        print("-", name)
+
+    # Print total number of books
+    print("\nTotal number of books:", len(book_names))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
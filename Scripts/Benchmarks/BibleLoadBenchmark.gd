@@ -0,0 +1,80 @@
+extends Node
+
+# =======================================
+# BibleLoadBenchmark.gd
+# =======================================
+#
+# Load time and verse lookups in Godot:
+# - JSON:   res://Bible/kjv.json through JSON.parse_string (BibleHelper's path)
+# - binary: res://Bible/kjv.bin through BibleBinary
+# Build the inputs with Scripts/Bible/kjv_bible_json_maker.gd and
+#   python Bible/kjv_ascii_to_json.py --binary --output kjv.bin
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/BibleLoadBenchmark.tscn
+#
+# =======================================
+
+const JSON_PATH = "res://Bible/kjv.json"
+const BINARY_PATH = "res://Bible/kjv.bin"
+const LOOKUPS = 10000
+
+func _ready() -> void:
+	if not FileAccess.file_exists(JSON_PATH) or not FileAccess.file_exists(BINARY_PATH):
+		push_error("Need both %s and %s" % [JSON_PATH, BINARY_PATH])
+		get_tree().quit(1)
+		return
+
+	# === Load ===
+	var start = Time.get_ticks_usec()
+	var bible_data = JSON.parse_string(FileAccess.get_file_as_string(JSON_PATH))
+	var json_load_usec = Time.get_ticks_usec() - start
+
+	var bible = BibleBinary.new()
+	start = Time.get_ticks_usec()
+	bible.load_file(BINARY_PATH)
+	var binary_load_usec = Time.get_ticks_usec() - start
+
+	print("Load:   JSON %8d us (%d bytes), binary %8d us (%d bytes), speedup %.1fx" % [
+		json_load_usec, FileAccess.get_file_as_bytes(JSON_PATH).size(),
+		binary_load_usec, bible.data.size(), float(json_load_usec) / max(binary_load_usec, 1)])
+
+	# === Lookups: same random references through both ===
+	var refs = []
+	var rng = RandomNumberGenerator.new()
+	rng.seed = 0
+	for i in range(LOOKUPS):
+		var book = bible_data[rng.randi_range(0, bible_data.size() - 1)]
+		var chapter = book["chapters"][rng.randi_range(0, book["chapters"].size() - 1)]
+		var verse = chapter["verses"][rng.randi_range(0, chapter["verses"].size() - 1)]
+		refs.append([book["book"], int(chapter["chapter"]), int(verse["verse"]), verse["text"]])
+
+	start = Time.get_ticks_usec()
+	var matches = 0
+	for ref in refs:
+		if json_verse(bible_data, ref[0], ref[1], ref[2]) == ref[3]:
+			matches += 1
+	var json_lookup_usec = Time.get_ticks_usec() - start
+
+	start = Time.get_ticks_usec()
+	var binary_matches = 0
+	for ref in refs:
+		if bible.get_verse(ref[0], ref[1], ref[2]) == ref[3]:
+			binary_matches += 1
+	var binary_lookup_usec = Time.get_ticks_usec() - start
+
+	print("Lookup: JSON %8.1f us/verse, binary %8.1f us/verse, identical=%s" % [
+		float(json_lookup_usec) / LOOKUPS, float(binary_lookup_usec) / LOOKUPS,
+		matches == LOOKUPS and binary_matches == LOOKUPS])
+	get_tree().quit(0 if binary_matches == LOOKUPS else 1)
+
+# BibleHelper.get_verse's linear scans over the parsed JSON
+func json_verse(bible_data: Array, book_name: String, chapter_num: int, verse_num: int) -> String:
+	for book in bible_data:
+		if book["book"].to_lower() == book_name.to_lower():
+			for chap in book["chapters"]:
+				if chap["chapter"] == chapter_num:
+					for v in chap["verses"]:
+						if v["verse"] == verse_num:
+							return v["text"]
+	return ""
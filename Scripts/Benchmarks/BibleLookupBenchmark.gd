@@ -0,0 +1,79 @@
+extends Node
+
+# =======================================
+# BibleLookupBenchmark.gd
+# =======================================
+#
+# Resolves every verse reference in the KJV (res://Bible/kjv.json):
+# - scan:    the old get_book/get_chapter/get_verse linear scans
+# - indexed: BibleHelper's hash indexes and verse ordinals
+# then walks the whole Bible with next/previous-verse navigation.
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/BibleLookupBenchmark.tscn
+#
+# =======================================
+
+const BIBLE_PATH = "res://Bible/kjv.json"
+
+func _ready() -> void:
+	if BibleHelper.bible_data.is_empty():
+		BibleHelper.load_bible(BIBLE_PATH)
+	var bible_data = BibleHelper.bible_data
+	if bible_data.is_empty():
+		get_tree().quit(1)
+		return
+
+	var refs = []
+	for book in bible_data:
+		for chap in book["chapters"]:
+			for v in chap["verses"]:
+				refs.append([book["book"], int(chap["chapter"]), int(v["verse"])])
+	print("Resolving %d verse references:" % refs.size())
+
+	var start = Time.get_ticks_usec()
+	var scanned = PackedStringArray()
+	for ref in refs:
+		scanned.append(scan_verse(bible_data, ref[0], ref[1], ref[2]))
+	var scan_usec = Time.get_ticks_usec() - start
+
+	start = Time.get_ticks_usec()
+	var indexed = PackedStringArray()
+	for ref in refs:
+		indexed.append(BibleHelper.get_verse(ref[0], ref[1], ref[2]))
+	var indexed_usec = Time.get_ticks_usec() - start
+
+	print("  scan:    %10d us (%7.2f us/ref)" % [scan_usec, float(scan_usec) / refs.size()])
+	print("  indexed: %10d us (%7.2f us/ref)  speedup %.0fx, identical=%s" % [
+		indexed_usec, float(indexed_usec) / refs.size(), float(scan_usec) / max(indexed_usec, 1), scanned == indexed])
+
+	# === Navigation: first verse to last and back ===
+	start = Time.get_ticks_usec()
+	var steps = 0
+	var ordinal = BibleHelper.get_verse_ordinal(refs[0][0], refs[0][1], refs[0][2])
+	while ordinal >= 0:
+		var reference = BibleHelper.get_verse_reference(ordinal)
+		if reference["verse"] != refs[steps][2]:
+			push_error("Verse %d resolved to %s" % [steps, reference])
+			break
+		steps += 1
+		ordinal = BibleHelper.get_next_verse_ordinal(ordinal)
+	ordinal = BibleHelper.get_verse_count() - 1
+	while ordinal >= 0:
+		ordinal = BibleHelper.get_previous_verse_ordinal(ordinal)
+		steps += 1
+	var nav_usec = Time.get_ticks_usec() - start
+	print("  next/previous over all verses: %d steps, %7.3f us/step" % [steps, float(nav_usec) / max(steps, 1)])
+
+	get_tree().quit(0 if scanned == indexed else 1)
+
+# The pre-index lookup: lowercase compare per book, then linear scans
+func scan_verse(bible_data: Array, book_name: String, chapter_num: int, verse_num: int) -> String:
+	for book in bible_data:
+		if book["book"].to_lower() == book_name.to_lower():
+			for chap in book["chapters"]:
+				if chap["chapter"] == chapter_num:
+					for v in chap["verses"]:
+						if v["verse"] == verse_num:
+							return v["text"]
+	return ""
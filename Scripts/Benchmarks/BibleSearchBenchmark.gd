@@ -0,0 +1,75 @@
+extends Node
+
+# =======================================
+# BibleSearchBenchmark.gd
+# =======================================
+#
+# Query latency of BibleSearch (res://Bible/kjv_search.bin) for common and
+# rare words, AND queries and phrases; cold (postings decoded) and warm
+# (cached). Phrase hits are checked against the verse text from BibleHelper,
+# and find_word on punctuated words against their bare term and find_all.
+# Build the index with
+#   python Bible/kjv_search_index.py Bible/kjv_ascii.txt --output kjv_search.bin
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/BibleSearchBenchmark.tscn
+#
+# =======================================
+
+const INDEX_PATH = "res://Bible/kjv_search.bin"
+const COMMON = ["the", "lord", "god"]
+const AND_QUERIES = ["lord god", "king israel", "the and of"]
+const PHRASES = ["the lord", "in the beginning", "the son of"]
+const RARE_COUNT = 3
+
+func _ready() -> void:
+	var search = BibleSearch.new()
+	var start = Time.get_ticks_usec()
+	if not search.load_file(INDEX_PATH):
+		get_tree().quit(1)
+		return
+	print("Load: %d us, %d terms, %d verses, %d bytes" % [
+		Time.get_ticks_usec() - start, search.term_lookup.size(), search.verse_count, search.data.size()])
+
+	# Rarest terms: the fewest verses, then alphabetical
+	var terms = search.term_lookup.keys()
+	terms.sort_custom(func(a, b):
+		var fa = search.get_verse_frequency(a)
+		var fb = search.get_verse_frequency(b)
+		return fa < fb or (fa == fb and a < b))
+
+	var queries = []
+	for q in COMMON + terms.slice(0, RARE_COUNT):
+		queries.append(["word", q, search.find_word])
+	for q in AND_QUERIES:
+		queries.append(["and", q, search.find_all])
+	for q in PHRASES:
+		queries.append(["phrase", q, search.find_phrase])
+
+	var ok = true
+	print("%-7s %-20s %6s %10s %10s" % ["kind", "query", "hits", "cold", "warm"])
+	for query in queries:
+		start = Time.get_ticks_usec()
+		var hits = query[2].call(query[1])
+		var cold_usec = Time.get_ticks_usec() - start
+		start = Time.get_ticks_usec()
+		query[2].call(query[1])
+		var warm_usec = Time.get_ticks_usec() - start
+		print("%-7s %-20s %6d %8d us %8d us" % [query[0], query[1], hits.size(), cold_usec, warm_usec])
+		if query[0] == "phrase" and BibleHelper.get_verse_count() == search.verse_count:
+			var phrase = " ".join(search.tokenize(query[1]))
+			for ordinal in hits:
+				var words = " ".join(search.tokenize(BibleHelper.get_verse_by_ordinal(ordinal)))
+				if (" %s " % words).find(" %s " % phrase) < 0:
+					push_error("%s: verse %d does not hold the phrase" % [query[1], ordinal])
+					ok = false
+					break
+
+	# Words are tokenized like find_all: punctuation and case don't matter
+	for word in ["Lord,", "God's ", " LIGHT."]:
+		var term = search.tokenize(word)[0]
+		if search.find_word(word) != search.find_word(term) or search.find_word(word) != search.find_all(word):
+			push_error("find_word(%s) differs from find_word(%s) / find_all" % [word, term])
+			ok = false
+
+	get_tree().quit(0 if ok else 1)
@@ -0,0 +1,69 @@
+extends Node
+
+# =======================================
+# BibleStartupBenchmark.gd
+# =======================================
+#
+# Time-to-first-verse and resident memory of BibleHelper's two backends:
+# - eager: load_bible(res://Bible/kjv.json), the whole Bible parsed up front
+# - lazy:  load_binary(res://Bible/kjv.bin), chapters read on demand
+# then reads every chapter once through the lazy LRU cache and checks the
+# verses match the eager backend.
+# Build kjv.bin from the same kjv.json with
+#   python Bible/kjv_binary.py Bible/kjv.json
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/BibleStartupBenchmark.tscn
+#
+# =======================================
+
+const BibleHelperScript = preload("res://Scripts/Bible/BibleHelper.gd")
+const BIBLE_PATH = "res://Bible/kjv.json"
+const BINARY_PATH = "res://Bible/kjv.bin"
+const FIRST_VERSE = ["Psalm", 91, 3]
+
+func _ready() -> void:
+	if not FileAccess.file_exists(BIBLE_PATH) or not FileAccess.file_exists(BINARY_PATH):
+		push_error("Need both %s and %s" % [BIBLE_PATH, BINARY_PATH])
+		get_tree().quit(1)
+		return
+
+	# === Lazy first, so the eager parse does not inflate its baseline ===
+	var memory = OS.get_static_memory_usage()
+	var start = Time.get_ticks_usec()
+	var lazy = BibleHelperScript.new()
+	lazy.load_binary(BINARY_PATH)
+	var lazy_text = lazy.get_verse(FIRST_VERSE[0], FIRST_VERSE[1], FIRST_VERSE[2])
+	var lazy_usec = Time.get_ticks_usec() - start
+	var lazy_bytes = OS.get_static_memory_usage() - memory
+
+	memory = OS.get_static_memory_usage()
+	start = Time.get_ticks_usec()
+	var eager = BibleHelperScript.new()
+	eager.load_bible(BIBLE_PATH)
+	var eager_text = eager.get_verse(FIRST_VERSE[0], FIRST_VERSE[1], FIRST_VERSE[2])
+	var eager_usec = Time.get_ticks_usec() - start
+	var eager_bytes = OS.get_static_memory_usage() - memory
+
+	print("%s %d:%d" % FIRST_VERSE)
+	print("  eager: %8d us to first verse, %10d bytes resident" % [eager_usec, eager_bytes])
+	print("  lazy:  %8d us to first verse, %10d bytes resident (%d chapter read)" % [
+		lazy_usec, lazy_bytes, lazy.chapters_parsed])
+	print("  lazy/eager: time %.3fx, memory %.3fx" % [
+		float(lazy_usec) / max(eager_usec, 1), float(lazy_bytes) / max(eager_bytes, 1)])
+
+	# === Every verse through the cache ===
+	start = Time.get_ticks_usec()
+	var identical = lazy_text == eager_text and lazy.get_verse_count() == eager.get_verse_count()
+	for ordinal in range(eager.get_verse_count()):
+		if lazy.get_verse_by_ordinal(ordinal) != eager.get_verse_by_ordinal(ordinal):
+			identical = false
+			break
+	var walk_usec = Time.get_ticks_usec() - start
+	print("  all %d verses: %d us, %d chapters read, %d cached (limit %d), identical=%s" % [
+		lazy.get_verse_count(), walk_usec, lazy.chapters_parsed, lazy.chapter_cache.size(),
+		lazy.chapter_cache_limit, identical])
+
+	lazy.free()
+	eager.free()
+	get_tree().quit(0 if identical else 1)
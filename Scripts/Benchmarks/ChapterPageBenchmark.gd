@@ -0,0 +1,84 @@
+extends Node
+
+# =======================================
+# ChapterPageBenchmark.gd
+# =======================================
+#
+# Cost of showing a chapter in the reader (mode 2 text, 80 columns):
+# - legacy:      get_chapter_text() by += concatenation, then TextUtils.word_wrap
+# - wrap:        ChapterPageCache miss, wrapped at runtime
+# - precomputed: ChapterPageCache miss, read from res://Bible/kjv_pages_index.json
+# - hit:         ChapterPageCache hit (every page turn / revisit)
+# over every chapter, checking all paths produce the same lines.
+# Build the precomputed pages with
+#   python Bible/kjv_page_cache.py Bible/kjv.json --cols 80
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/ChapterPageBenchmark.tscn
+#
+# =======================================
+
+const MODE = 2
+const COLS = 80
+const ROWS = 25
+
+func _ready() -> void:
+	var chapters = []
+	for b in range(BibleHelper.book_names.size()):
+		for chapter_num in BibleHelper.chapter_lookup[b].keys():
+			chapters.append([BibleHelper.book_names[b], chapter_num])
+	if chapters.is_empty():
+		push_error("BibleHelper has no chapters loaded")
+		get_tree().quit(1)
+		return
+	# Parse every chapter once so lazy loading does not count against any path
+	for ref in chapters:
+		BibleHelper.get_chapter(ref[0], ref[1])
+	BibleHelper.set_chapter_cache_limit(chapters.size())
+	print("%d chapters, mode %d, %d cols:" % [chapters.size(), MODE, COLS])
+
+	var start = Time.get_ticks_usec()
+	var legacy = []
+	for ref in chapters:
+		legacy.append(TextUtils.word_wrap(legacy_chapter_text(ref[0], ref[1]), COLS))
+	report("legacy", Time.get_ticks_usec() - start, chapters.size())
+
+	var ok = true
+	var cache = ChapterPageCache.new(ROWS, chapters.size())
+	start = Time.get_ticks_usec()
+	for i in range(chapters.size()):
+		ok = ok and cache.get_lines(chapters[i][0], chapters[i][1], MODE, COLS) == legacy[i]
+	report("wrap", Time.get_ticks_usec() - start, chapters.size())
+
+	start = Time.get_ticks_usec()
+	var pages = 0
+	for ref in chapters:
+		pages += cache.get_page_count(ref[0], ref[1], MODE, COLS)
+	report("hit", Time.get_ticks_usec() - start, chapters.size())
+
+	if FileAccess.file_exists(ChapterPageCache.INDEX_PATH):
+		var precomputed = ChapterPageCache.new(ROWS, chapters.size())
+		precomputed.load_precomputed()
+		start = Time.get_ticks_usec()
+		for i in range(chapters.size()):
+			var entry = precomputed.get_entry(chapters[i][0], chapters[i][1], MODE, COLS)
+			ok = ok and entry["lines"] == legacy[i] \
+				and entry["pages"] == cache.get_entry(chapters[i][0], chapters[i][1], MODE, COLS)["pages"]
+		report("precomputed", Time.get_ticks_usec() - start, chapters.size())
+		print("  %d read from the payload, %d wrapped" % [precomputed.entries_read, precomputed.chapters_wrapped])
+	else:
+		print("  (no %s; skipping precomputed)" % ChapterPageCache.INDEX_PATH)
+
+	print("  %d pages of %d rows, identical=%s" % [pages, ROWS, ok])
+	get_tree().quit(0 if ok else 1)
+
+func report(label: String, usec: int, count: int) -> void:
+	print("  %-12s %9d us (%7.1f us/chapter)" % [label, usec, float(usec) / count])
+
+# get_chapter_text before it built the string with join()
+func legacy_chapter_text(book_name: String, chapter_num: int) -> String:
+	var chapter = BibleHelper.get_chapter(book_name, chapter_num)
+	var output = ""
+	for v in chapter["verses"]:
+		output += "%s %d:%d %s\n" % [book_name, chapter_num, v["verse"], v["text"]]
+	return output.strip_edges()
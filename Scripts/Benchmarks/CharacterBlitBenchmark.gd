@@ -0,0 +1,115 @@
+extends Node
+
+# =======================================
+# CharacterBlitBenchmark.gd
+# =======================================
+#
+# Full-screen redraw time of an 80x25 CharacterDisplay:
+# - before: per-pixel draw_rect + get_pixel/Color/set_pixel blending
+#           (LegacyCharacterDisplay below keeps the old code path)
+# - after:  CharacterDisplay's fill_cell + blit_coverage_spans
+# for ADDITIVE, SUBTRACTIVE and NORMAL cells, and checks both paths leave
+# the same bytes in raw_data (to within rounding).
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/CharacterBlitBenchmark.tscn
+#
+# =======================================
+
+const SAMPLE_TEXT = "In the beginning God created the heaven and the earth. В начале сотворил Бог небо и землю. "
+const REDRAWS = 3
+const MAX_CHANNEL_ERROR = 1  # old path truncates to 8 bits, new path rounds
+
+class LegacyCharacterDisplay extends CharacterDisplay:
+	func draw_char(x: int, y: int):
+		var cell = char_grid[y][x]
+		var cp = cell["char"]
+		var glyph_w = AtlasHelper.font_info["glyph_box_width"]
+		var glyph_h = AtlasHelper.font_info["glyph_box_height"]
+		var dest_x = x * glyph_w
+		var dest_y = y * glyph_h
+		draw_rect(dest_x, dest_y, glyph_w, glyph_h, [cell["bg"].r, cell["bg"].g, cell["bg"].b, cell["bg"].a])
+		if AtlasHelper.has_glyph(cp):
+			var glyph_img = AtlasHelper.get_glyph_image_for_codepoint(cp)
+			if glyph_img != null:
+				legacy_blit(glyph_img, Vector2i(dest_x, dest_y), cell["fg"], cell["blend_mode"])
+
+	func legacy_blit(glyph_img: Image, dest_pos: Vector2i, fg_color: Color, blend_mode: BlendMode):
+		for y in range(glyph_img.get_height()):
+			var dest_y = dest_pos.y + y
+			if dest_y < 0 or dest_y >= pixel_height:
+				continue
+			for x in range(glyph_img.get_width()):
+				var dest_x = dest_pos.x + x
+				if dest_x < 0 or dest_x >= pixel_width:
+					continue
+				var glyph_pixel = glyph_img.get_pixel(x, y)
+				if glyph_pixel.a == 0:
+					continue
+				var fg_alpha = fg_color.a * glyph_pixel.a
+				var current_color = Color(get_pixel(dest_x, dest_y)[0], get_pixel(dest_x, dest_y)[1], get_pixel(dest_x, dest_y)[2], get_pixel(dest_x, dest_y)[3])
+				var final_color = current_color
+				match blend_mode:
+					BlendMode.ADDITIVE:
+						final_color.r += fg_color.r * fg_alpha
+						final_color.g += fg_color.g * fg_alpha
+						final_color.b += fg_color.b * fg_alpha
+						final_color.a += fg_alpha
+					BlendMode.SUBTRACTIVE:
+						final_color.r -= fg_color.r * fg_alpha
+						final_color.g -= fg_color.g * fg_alpha
+						final_color.b -= fg_color.b * fg_alpha
+						final_color.a -= fg_alpha
+					BlendMode.NORMAL:
+						final_color = current_color.lerp(fg_color, fg_alpha)
+				final_color = final_color.clamp()
+				set_pixel(dest_x, dest_y, [final_color.r, final_color.g, final_color.b, final_color.a])
+
+func _ready() -> void:
+	var before = LegacyCharacterDisplay.new()
+	var after = CharacterDisplay.new()
+	add_child(before)
+	add_child(after)
+
+	var modes = [CharacterDisplay.BlendMode.ADDITIVE, CharacterDisplay.BlendMode.SUBTRACTIVE, CharacterDisplay.BlendMode.NORMAL]
+	var names = ["ADDITIVE", "SUBTRACTIVE", "NORMAL"]
+	var all_match = true
+	print("Full-screen redraw, %dx%d cells:" % [after.cols, after.rows])
+	for m in range(modes.size()):
+		fill_display(before, modes[m])
+		fill_display(after, modes[m])
+		var before_usec = time_redraw(before)
+		var after_usec = time_redraw(after)
+		var max_error = max_channel_error(before.raw_data, after.raw_data)
+		all_match = all_match and max_error <= MAX_CHANNEL_ERROR
+		print("  %-11s before %8d us, after %8d us, speedup %6.2fx, max channel error %d" % [
+			names[m], before_usec, after_usec, float(before_usec) / max(after_usec, 1), max_error])
+
+	get_tree().quit(0 if all_match else 1)
+
+func fill_display(display : CharacterDisplay, blend_mode) -> void:
+	var fg = CharacterDisplay.COLORS.TRANSLUCENT_YELLOW if blend_mode == CharacterDisplay.BlendMode.NORMAL else CharacterDisplay.COLORS.CYAN
+	var bg = CharacterDisplay.COLORS.DARK_BLUE if blend_mode == CharacterDisplay.BlendMode.NORMAL else CharacterDisplay.COLORS.DARK_GRAY
+	var i = 0
+	for y in range(display.rows):
+		for x in range(display.cols):
+			var cell = display.char_grid[y][x]
+			cell["char"] = SAMPLE_TEXT.unicode_at(i % SAMPLE_TEXT.length())
+			cell["fg"] = fg
+			cell["bg"] = bg
+			cell["blend_mode"] = blend_mode
+			i += 1
+
+func time_redraw(display : CharacterDisplay) -> int:
+	var start = Time.get_ticks_usec()
+	for r in range(REDRAWS):
+		display.render_all()
+	return (Time.get_ticks_usec() - start) / REDRAWS
+
+func max_channel_error(a : PackedByteArray, b : PackedByteArray) -> int:
+	if a.size() != b.size():
+		return 255
+	var worst = 0
+	for i in range(a.size()):
+		worst = max(worst, abs(a[i] - b[i]))
+	return worst
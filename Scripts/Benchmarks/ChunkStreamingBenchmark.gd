@@ -0,0 +1,79 @@
+extends Node
+
+# =======================================
+# ChunkStreamingBenchmark.gd
+# =======================================
+#
+# Frame cost of VoxelWorld chunk streaming while a tracked node flies along
+# x at SPEED voxels per frame for FRAMES frames, with view distance
+# VIEW_DISTANCE and JobScheduler frame budget BUDGET_USEC.
+# Reports, over all frames: mean/max main-thread time in VoxelWorld._process
+# and JobScheduler._process (adding to the world, lighting, snapshotting
+# chunks for meshing and swapping finished meshes in; generation and mesh
+# building run on workers), jobs still pending at the end, and the
+# most chunks and bytes ever loaded. Fails if a frame goes far over budget
+# (one job may finish past it) or loaded chunks exceed the memory budget.
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/ChunkStreamingBenchmark.tscn
+#
+# =======================================
+
+const FRAMES = 600
+const SPEED = 0.5
+const VIEW_DISTANCE = 6
+const BUDGET_USEC = 4000
+const MEMORY_BUDGET = 4 * 1024 * 1024
+const SLACK_USEC = 20000 # allowance for the last job of a frame
+
+var world
+var tracked
+var frame = 0
+var total_usec = 0
+var max_usec = 0
+var max_chunks = 0
+var max_memory = 0
+
+func _ready() -> void:
+	world = VoxelWorld.new()
+	world.view_distance = VIEW_DISTANCE
+	world.memory_budget = MEMORY_BUDGET
+	world.set_process(false) # stepped by hand below, so they can be timed
+	JobScheduler.set_process(false)
+	JobScheduler.frame_budget_usec = BUDGET_USEC
+	add_child(world)
+	tracked = Node3D.new()
+	add_child(tracked)
+	world.tracked_node_path = world.get_path_to(tracked)
+
+func _process(delta):
+	tracked.position.x += SPEED
+	var start = Time.get_ticks_usec()
+	world._process(delta)
+	JobScheduler._process(delta)
+	var elapsed = Time.get_ticks_usec() - start
+	total_usec += elapsed
+	max_usec = max(max_usec, elapsed)
+	max_chunks = max(max_chunks, world.chunks.size())
+	max_memory = max(max_memory, measure_memory())
+	frame += 1
+	if frame < FRAMES:
+		return
+
+	var ok = max_usec <= BUDGET_USEC + SLACK_USEC and max_memory <= MEMORY_BUDGET
+	var stats = JobScheduler.get_stats()
+	var pending = stats["waiting"] + stats["ready"] + stats["running"] + stats["completing"]
+	print("%-8s %-10s %-10s %-8s %-12s %-12s" % ["frames", "mean", "max", "pending", "max chunks", "max memory"])
+	print("%-8d %7.3f ms %7.3f ms %-8d %-12d %-12d" % [
+		FRAMES, total_usec / 1000.0 / FRAMES, max_usec / 1000.0, pending, max_chunks, max_memory])
+	print("jobs: %d done, %d cancelled, mean latency %.2f ms, worker utilization %.0f%%" % [
+		stats["completed"], stats["cancelled"], stats["mean_latency_ms"], stats["utilization"] * 100.0])
+	print("frame time and memory within budget: %s" % ok)
+	get_tree().quit(0 if ok else 1)
+
+func measure_memory() -> int:
+	var total = 0
+	for chunk in world.chunks.values():
+		var usage = chunk.get_memory_usage()
+		total += usage["total"] + usage["lighting"]
+	return total
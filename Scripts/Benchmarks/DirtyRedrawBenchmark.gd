@@ -0,0 +1,102 @@
+extends Node
+
+# =======================================
+# DirtyRedrawBenchmark.gd
+# =======================================
+#
+# Cost of typing into a full 80x25 screen, one character per frame:
+# - full:  render_all() per keystroke (the old behaviour of a redraw)
+# - dirty: set_char() + one flush per frame, for CharacterDisplay and Terminal
+# Prints time per frame and the per-frame counters (cells redrawn, dirty
+# rect bytes, bytes uploaded).
+#
+# First checks that dirty flushes paint cells raw_data doesn't show yet: on
+# a fresh display, and after clear_display(), clear_screen() plus a flush
+# must leave the same bytes as render_all().
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/DirtyRedrawBenchmark.tscn
+#
+# =======================================
+
+const SAMPLE_TEXT = "In the beginning God created the heaven and the earth. "
+const FRAMES = 60
+
+func _ready() -> void:
+	var ok = check_fresh_flush()
+	print("fresh clear_screen + flush matches render_all: %s" % ok)
+
+	var display = CharacterDisplay.new()
+	add_child(display)
+	display.set_process(false)  # frames are driven by hand below
+	for y in range(display.rows):
+		display.set_text(0, y, SAMPLE_TEXT.repeat(2).substr(y % SAMPLE_TEXT.length(), display.cols))
+	display.render_all()
+	display._process(0.0)
+
+	print("Typing %d characters, one per frame:" % FRAMES)
+
+	# === Full redraw per keystroke ===
+	var start = Time.get_ticks_usec()
+	for f in range(FRAMES):
+		display.set_char(f % display.cols, 0, "#" if f % 2 == 0 else "*")
+		display.render_all()
+		display._process(0.0)
+	var full_usec = (Time.get_ticks_usec() - start) / FRAMES
+	print("  CharacterDisplay full:  %8d us/frame, %5d cells, %8d bytes uploaded" % [
+		full_usec, display.frame_cells_redrawn, display.bytes_uploaded])
+
+	# === Dirty cells, one flush per frame ===
+	start = Time.get_ticks_usec()
+	for f in range(FRAMES):
+		display.set_char(f % display.cols, 1, "#" if f % 2 == 0 else "*")
+		display._process(0.0)
+	var dirty_usec = (Time.get_ticks_usec() - start) / FRAMES
+	print("  CharacterDisplay dirty: %8d us/frame, %5d cells, %8d dirty bytes, %8d bytes uploaded" % [
+		dirty_usec, display.frame_cells_redrawn, display.frame_dirty_bytes, display.bytes_uploaded])
+
+	# === Terminal: full grid render against dirty flush ===
+	var terminal = Terminal.new(80, 25)
+	add_child(terminal)
+	terminal.set_process(false)
+	terminal.set_process_input(false)
+	for y in range(25):
+		terminal.write_string(SAMPLE_TEXT.repeat(2).substr(0, 80))
+	terminal.flush_dirty()
+
+	start = Time.get_ticks_usec()
+	for f in range(FRAMES):
+		terminal.set_char(f % 80, 2, "#" if f % 2 == 0 else "*")
+		terminal.render_full_grid()
+	var terminal_full_usec = (Time.get_ticks_usec() - start) / FRAMES
+
+	start = Time.get_ticks_usec()
+	for f in range(FRAMES):
+		terminal.set_char(f % 80, 3, "#" if f % 2 == 0 else "*")
+		terminal.flush_dirty()
+	var terminal_dirty_usec = (Time.get_ticks_usec() - start) / FRAMES
+	print("  Terminal full:          %8d us/frame" % terminal_full_usec)
+	print("  Terminal dirty:         %8d us/frame, %5d cells, %8d bytes uploaded" % [
+		terminal_dirty_usec, terminal.frame_cells_redrawn, terminal.frame_bytes_uploaded])
+
+	print("  speedup: CharacterDisplay %.1fx, Terminal %.1fx" % [
+		float(full_usec) / max(dirty_usec, 1), float(terminal_full_usec) / max(terminal_dirty_usec, 1)])
+	get_tree().quit(0 if ok else 1)
+
+# clear_screen (all default cells) + flush against render_all, on a fresh
+# display (not in the tree, so its demo doesn't draw) and after clear_display
+func check_fresh_flush() -> bool:
+	var ok = true
+	var display = CharacterDisplay.new()
+	for when in ["fresh", "after clear_display"]:
+		if when == "after clear_display":
+			display.clear_display()
+		display.clear_screen(CharacterDisplay.COLORS.BLACK)
+		display.flush_dirty()
+		var flushed = display.raw_data.duplicate()
+		display.render_all()
+		if flushed != display.raw_data:
+			push_error("%s: clear_screen + flush left different bytes than render_all" % when)
+			ok = false
+	display.free()
+	return ok
@@ -0,0 +1,71 @@
+extends Node
+
+# =======================================
+# GlyphCacheBenchmark.gd
+# =======================================
+#
+# Per-redraw cost of an 80x25 CharacterDisplay with and without the
+# AtlasHelper glyph cache:
+# - glyph images: how many Images get sliced out of the atlas per redraw
+# - fetch:        time to fetch every cell's glyph image
+# - render_all:   time for the whole redraw (fetch + blit)
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/GlyphCacheBenchmark.tscn
+#
+# =======================================
+
+const SAMPLE_TEXT = "In the beginning God created the heaven and the earth. В начале сотворил Бог небо и землю. "
+const REDRAWS = 5
+
+var display : CharacterDisplay
+
+func _ready() -> void:
+	display = CharacterDisplay.new()
+	add_child(display)
+	fill_display()
+
+	var was_enabled = AtlasHelper.glyph_cache_enabled
+	AtlasHelper.glyph_cache_enabled = false
+	var uncached = measure("no cache")
+	AtlasHelper.glyph_cache_enabled = true
+	var cached = measure("glyph cache")
+	AtlasHelper.glyph_cache_enabled = was_enabled
+
+	print("  fetch speedup %.2fx, render_all speedup %.2fx" % [
+		float(uncached["fetch_usec"]) / max(cached["fetch_usec"], 1),
+		float(uncached["render_usec"]) / max(cached["render_usec"], 1)])
+
+	get_tree().quit()
+
+func fill_display() -> void:
+	var i = 0
+	for y in range(display.rows):
+		for x in range(display.cols):
+			display.char_grid[y][x]["char"] = SAMPLE_TEXT.unicode_at(i % SAMPLE_TEXT.length())
+			i += 1
+
+func measure(label : String) -> Dictionary:
+	# Warm up once so a lazily filled cache is measured in its steady state
+	display.render_all()
+
+	var sliced_before = AtlasHelper.glyph_images_sliced
+	var start = Time.get_ticks_usec()
+	for r in range(REDRAWS):
+		for y in range(display.rows):
+			for x in range(display.cols):
+				AtlasHelper.get_glyph_image_for_codepoint(display.char_grid[y][x]["char"])
+	var fetch_usec = (Time.get_ticks_usec() - start) / REDRAWS
+	var fetch_sliced = (AtlasHelper.glyph_images_sliced - sliced_before) / REDRAWS
+
+	sliced_before = AtlasHelper.glyph_images_sliced
+	start = Time.get_ticks_usec()
+	for r in range(REDRAWS):
+		display.render_all()
+	var render_usec = (Time.get_ticks_usec() - start) / REDRAWS
+	var render_sliced = (AtlasHelper.glyph_images_sliced - sliced_before) / REDRAWS
+
+	print("%s (%dx%d cells, per redraw):" % [label, display.cols, display.rows])
+	print("  fetch:      %8d us, %5d glyph images" % [fetch_usec, fetch_sliced])
+	print("  render_all: %8d us, %5d glyph images" % [render_usec, render_sliced])
+	return {"fetch_usec": fetch_usec, "render_usec": render_usec}
@@ -0,0 +1,60 @@
+extends Node
+
+# =======================================
+# GlyphLookupBenchmark.gd
+# =======================================
+#
+# Per-glyph lookup cost in AtlasHelper: the metadata JSON with str(cp)
+# keys (what CharacterDisplay.draw_char used to do) against the integer
+# lookup loaded from the atlas' _lookup.bin.
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/GlyphLookupBenchmark.tscn
+#
+# =======================================
+
+const SAMPLE_TEXT = "In the beginning God created the heaven and the earth. В начале сотворил Бог небо и землю. Ёё 一"
+const REPEATS = 2000
+
+func _ready() -> void:
+	if not AtlasHelper.has_lookup():
+		push_error("No glyph lookup loaded from %s" % AtlasHelper.LOOKUP_PATH)
+		get_tree().quit(1)
+		return
+
+	var codepoints = PackedInt32Array()
+	for i in range(SAMPLE_TEXT.length()):
+		codepoints.append(SAMPLE_TEXT.unicode_at(i))
+	var lookups = codepoints.size() * REPEATS
+
+	var glyph_w = AtlasHelper.get_glyph_width()
+	var glyph_h = AtlasHelper.get_glyph_height()
+
+	# === JSON metadata, str(cp) keys ===
+	var json_checksum = 0
+	var start = Time.get_ticks_usec()
+	for r in range(REPEATS):
+		for cp in codepoints:
+			if AtlasHelper.metadata.has(str(cp)):
+				var row_col = AtlasHelper.metadata[str(cp)]
+				json_checksum += int(row_col[1]) * glyph_w + int(row_col[0]) * glyph_h
+	var json_usec = Time.get_ticks_usec() - start
+
+	# === Binary lookup, integer indexing ===
+	var lookup_checksum = 0
+	var records = AtlasHelper.glyph_records
+	start = Time.get_ticks_usec()
+	for r in range(REPEATS):
+		for cp in codepoints:
+			var slot = AtlasHelper.get_glyph_slot(cp)
+			if slot >= 0:
+				var i = slot * AtlasHelper.LOOKUP_RECORD_SIZE
+				lookup_checksum += records[i] + records[i + 1]
+	var lookup_usec = Time.get_ticks_usec() - start
+
+	print("Glyph lookups: %d" % lookups)
+	print("  metadata str keys: %8.1f ns/glyph" % (json_usec * 1000.0 / lookups))
+	print("  lookup.bin slots:  %8.1f ns/glyph" % (lookup_usec * 1000.0 / lookups))
+	print("  speedup %.2fx, identical=%s" % [float(json_usec) / max(lookup_usec, 1), json_checksum == lookup_checksum])
+
+	get_tree().quit(0 if json_checksum == lookup_checksum else 1)
@@ -0,0 +1,211 @@
+extends Node
+
+# =======================================
+# GreedyMeshBenchmark.gd
+# =======================================
+#
+# GreedyCubeGrid meshing per chunk size (cubes of SIZES voxels a side), on
+# seeded noise terrain with several voxel types, caves and some glass:
+# - legacy: the old per-voxel mesher, which probed get_voxel/is_face_visible
+#           with a new coordinate Array for every voxel, direction and
+#           expansion step, and rebuilt six Arrays of bools as merge masks
+# - bitmask: GreedyMesher.build, which packs voxels into per-type rows of
+#            bits and merges faces with integer operations
+# Both draw into a GreedyMesher's MeshArrays from a VoxelSnapshot of the
+# grid (capturing and unpacking it is timed too).
+# Reports faces (merged quads), triangles and milliseconds per chunk, and
+# checks both draw the same quads.
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/GreedyMeshBenchmark.tscn
+#
+# =======================================
+
+const SIZES = [16, 32, 64]
+const REPEATS = 3
+const SEED = 1234
+
+# records the quads a mesher draws
+class RecordingMesher extends GreedyMesher:
+	var quads = []
+
+	func draw_merged_face(verts: Array, voxel_type: int, start_pos: Array, direction: String):
+		quads.append([verts, voxel_type, start_pos, direction])
+		super(verts, voxel_type, start_pos, direction)
+
+func _ready() -> void:
+	var ok = true
+	print("%-6s %9s %10s %12s %12s %8s" % ["size", "faces", "triangles", "legacy", "bitmask", "speedup"])
+	for size in SIZES:
+		var grid = make_grid(size)
+		var legacy_usec = best_of(func(): legacy_mesh(grid, unpacked_mesher(GreedyMesher, grid)))
+		var bitmask_usec = best_of(func(): GreedyMesher.new(VoxelSnapshot.capture(grid)).build())
+
+		var legacy = unpacked_mesher(RecordingMesher, grid)
+		legacy_mesh(grid, legacy)
+		var bitmask = RecordingMesher.new(VoxelSnapshot.capture(grid))
+		bitmask.build()
+		if legacy.quads != bitmask.quads:
+			push_error("%d^3: meshers drew different quads" % size)
+			ok = false
+
+		print("%-6s %9d %10d %9.2f ms %9.2f ms %7.1fx" % [
+			"%d^3" % size, bitmask.quads.size(), bitmask.arrays.get_vertex_count() / 2, legacy_usec / 1000.0,
+			bitmask_usec / 1000.0, float(legacy_usec) / max(bitmask_usec, 1)])
+		grid.free()
+	print("identical quads: %s" % ok)
+	get_tree().quit(0 if ok else 1)
+
+func best_of(callable: Callable) -> int:
+	var best = -1
+	for i in range(REPEATS):
+		var start = Time.get_ticks_usec()
+		callable.call()
+		var elapsed = Time.get_ticks_usec() - start
+		if best < 0 or elapsed < best:
+			best = elapsed
+	return best
+
+# a mesher_class for grid, with its snapshot unpacked (as build() would) for the legacy mesher to draw with
+func unpacked_mesher(mesher_class, grid):
+	var mesher = mesher_class.new(VoxelSnapshot.capture(grid))
+	mesher.snapshot.unpack()
+	return mesher
+
+# a lit grid of seeded noise terrain (not added to the tree)
+func make_grid(size) -> GreedyCubeGrid:
+	var grid = GreedyCubeGrid.new()
+	grid.grid_x_len = size
+	grid.grid_y_len = size
+	grid.grid_z_len = size
+	grid.storage.resize(size * size * size)
+	var voxels = PackedByteArray()
+	voxels.resize(size * size * size)
+
+	var noise = FastNoiseLite.new()
+	noise.seed = SEED
+	noise.frequency = 0.06
+	var index = 0
+	for x in range(size):
+		for y in range(size):
+			for z in range(size):
+				var density = noise.get_noise_3d(x, y, z) + 0.5 - float(y) / size
+				var voxel_type = Voxel.VoxelType.AIR
+				if density > 0.35: voxel_type = Voxel.VoxelType.STONE
+				elif density > 0.25: voxel_type = Voxel.VoxelType.GRAVEL
+				elif density > 0.15: voxel_type = Voxel.VoxelType.DIRT
+				elif density > 0.1: voxel_type = Voxel.VoxelType.GRASS
+				elif density > 0.08: voxel_type = Voxel.VoxelType.GLASS
+				elif density > 0.05: voxel_type = Voxel.VoxelType.SAND
+				voxels[index] = voxel_type
+				index += 1
+	grid.update_voxels(voxels)
+	grid.generate_light_data()
+	return grid
+
+# --- Legacy mesher, as GreedyCubeGrid.generate_mesh_data did it ---
+var merge_masks = {}
+
+func legacy_mesh(grid, mesher):
+	var size = grid.grid_x_len * grid.grid_y_len * grid.grid_z_len
+	for direction in GreedyCubeGrid.DIRECTION_NORMALS:
+		merge_masks[direction] = []
+		merge_masks[direction].resize(size)
+		merge_masks[direction].fill(false)
+	for direction in GreedyCubeGrid.DIRECTION_NORMALS:
+		legacy_generate_faces(grid, mesher, direction, GreedyCubeGrid.DIRECTION_NORMALS[direction])
+
+func legacy_generate_faces(grid, mesher, direction: String, normal: Array):
+	for x in range(0, grid.grid_x_len):
+		for y in range(0, grid.grid_y_len):
+			for z in range(0, grid.grid_z_len):
+				var idx = grid.calculate_voxel_index([x, y, z])
+				if not merge_masks[direction][idx] and grid.is_face_visible([x, y, z], normal):
+					legacy_try_merge_face(grid, mesher, x, y, z, direction, normal)
+
+func legacy_try_merge_face(grid, mesher, start_x: int, start_y: int, start_z: int, direction: String, normal: Array):
+	var current_idx = grid.calculate_voxel_index([start_x, start_y, start_z])
+	if merge_masks[direction][current_idx]:
+		return
+
+	var voxel_type = grid.get_voxel([start_x, start_y, start_z])
+	if voxel_type == Voxel.VoxelType.AIR:
+		return
+
+	var y_extent = 1
+	var z_extent = 1
+	var x_extent = 1
+
+	if abs(normal[0]) > 0:  # X-axis faces
+		while start_y + y_extent < grid.grid_y_len:
+			var test_pos = [start_x, start_y + y_extent, start_z]
+			if grid.get_voxel(test_pos) != voxel_type or not grid.is_face_visible(test_pos, normal):
+				break
+			y_extent += 1
+
+		var can_expand_z = true
+		while start_z + z_extent < grid.grid_z_len and can_expand_z:
+			for y in range(start_y, start_y + y_extent):
+				var test_pos = [start_x, y, start_z + z_extent]
+				if grid.get_voxel(test_pos) != voxel_type or not grid.is_face_visible(test_pos, normal):
+					can_expand_z = false
+					break
+			if can_expand_z:
+				z_extent += 1
+
+	elif abs(normal[1]) > 0:  # Y-axis faces
+		while start_x + x_extent < grid.grid_x_len:
+			var test_pos = [start_x + x_extent, start_y, start_z]
+			if grid.get_voxel(test_pos) != voxel_type or not grid.is_face_visible(test_pos, normal):
+				break
+			x_extent += 1
+
+		var can_expand_z = true
+		while start_z + z_extent < grid.grid_z_len and can_expand_z:
+			for x in range(start_x, start_x + x_extent):
+				var test_pos = [x, start_y, start_z + z_extent]
+				if grid.get_voxel(test_pos) != voxel_type or not grid.is_face_visible(test_pos, normal):
+					can_expand_z = false
+					break
+			if can_expand_z:
+				z_extent += 1
+
+	else:  # Z-axis faces
+		while start_x + x_extent < grid.grid_x_len:
+			var test_pos = [start_x + x_extent, start_y, start_z]
+			if grid.get_voxel(test_pos) != voxel_type or not grid.is_face_visible(test_pos, normal):
+				break
+			x_extent += 1
+
+		var can_expand_y = true
+		while start_y + y_extent < grid.grid_y_len and can_expand_y:
+			for x in range(start_x, start_x + x_extent):
+				var test_pos = [x, start_y + y_extent, start_z]
+				if grid.get_voxel(test_pos) != voxel_type or not grid.is_face_visible(test_pos, normal):
+					can_expand_y = false
+					break
+			if can_expand_y:
+				y_extent += 1
+
+	# Mark merged faces
+	if abs(normal[0]) > 0:  # X-axis faces
+		for y in range(start_y, start_y + y_extent):
+			for z in range(start_z, start_z + z_extent):
+				merge_masks[direction][grid.calculate_voxel_index([start_x, y, z])] = true
+	elif abs(normal[1]) > 0:  # Y-axis faces
+		for x in range(start_x, start_x + x_extent):
+			for z in range(start_z, start_z + z_extent):
+				merge_masks[direction][grid.calculate_voxel_index([x, start_y, z])] = true
+	else:  # Z-axis faces
+		for x in range(start_x, start_x + x_extent):
+			for y in range(start_y, start_y + y_extent):
+				merge_masks[direction][grid.calculate_voxel_index([x, y, start_z])] = true
+
+	var merged_verts
+	if abs(normal[0]) > 0:
+		merged_verts = GreedyMesher.generate_face_vertices(start_x, start_y, start_z, y_extent, z_extent, normal)
+	elif abs(normal[1]) > 0:
+		merged_verts = GreedyMesher.generate_face_vertices(start_x, start_y, start_z, x_extent, z_extent, normal)
+	else:
+		merged_verts = GreedyMesher.generate_face_vertices(start_x, start_y, start_z, x_extent, y_extent, normal)
+	mesher.draw_merged_face(merged_verts, voxel_type, [start_x, start_y, start_z], direction)
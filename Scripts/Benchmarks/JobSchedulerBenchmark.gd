@@ -0,0 +1,167 @@
+extends Node
+
+# =======================================
+# JobSchedulerBenchmark.gd
+# =======================================
+#
+# Throughput of JobScheduler against the old ThreadPool autoload (copied
+# below as LegacyThreadPool) on JOBS terrain generation jobs
+# (PerlinTerrainGrid.generate_ids, CHUNK_SIZE^3 each).
+# ThreadPool starts one Thread per task and can start one task and finish
+# one task per frame, so JOBS jobs take at least JOBS frames; JobScheduler
+# keeps every worker busy and completes as many jobs per frame as its
+# budget allows.
+# Reports frames and wall time to finish every job, plus JobScheduler's
+# stats (mean wait for a worker, mean latency, worker utilization).
+#
+# Then checks that done callbacks run in priority order, that chained jobs
+# (generate -> light -> mesh) run in order, and that cancelled groups never
+# run their done callbacks.
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/JobSchedulerBenchmark.tscn
+#
+# =======================================
+
+const JOBS = 64
+const CHUNK_SIZE = 16
+const CHAINS = 16
+const SEED = 1234
+
+# The old ThreadPool.gd
+class LegacyThreadPool:
+	const thread_count = 16
+	var available_threads = []
+	var running_threads = []
+	var tasks_to_start = []
+	var tasks_to_finish = []
+
+	func _init():
+		running_threads.resize(thread_count)
+		for i in range(0, thread_count):
+			available_threads.append([i, Thread.new()])
+
+	func queue_task(task_info):
+		tasks_to_start.append(task_info)
+
+	func queue_task_finished(thread_id):
+		tasks_to_finish.append(thread_id)
+
+	func try_start_task():
+		if (available_threads.is_empty()): return
+		if (tasks_to_start.is_empty()): return
+		var thread_info = available_threads.pop_front()
+		var task_info = tasks_to_start.pop_back()
+		thread_info[1].start(Callable(task_info[0], task_info[1]).bind(thread_info[0]))
+		running_threads[thread_info[0]] = thread_info
+
+	func try_finish_task():
+		if (tasks_to_finish.is_empty()): return
+		var thread_id = tasks_to_finish.pop_back()
+		var thread_info = running_threads[thread_id]
+		thread_info[1].wait_to_finish()
+		available_threads.append(thread_info)
+		running_threads[thread_id] = null
+
+	func step():
+		try_start_task()
+		try_finish_task()
+
+var phase = "legacy"
+var legacy = LegacyThreadPool.new()
+var legacy_mutex = Mutex.new()
+var legacy_done = 0
+var scheduler_done = 0
+var frames = 0
+var start_usec = 0
+var results = {}
+var ok = true
+
+var order = [] # done callbacks, in the order they ran
+var chain_log = []
+var cancelled_groups = []
+
+func _ready() -> void:
+	TerrainGenerator.for_seed(SEED) # created before any worker reads it
+	for i in range(JOBS):
+		legacy.queue_task([self, "legacy_task"])
+	start_usec = Time.get_ticks_usec()
+
+func _process(_delta):
+	frames += 1
+	match phase:
+		"legacy":
+			legacy_mutex.lock()
+			legacy.step()
+			legacy_mutex.unlock()
+			if legacy_done == JOBS and legacy.tasks_to_finish.is_empty() and legacy.available_threads.size() == LegacyThreadPool.thread_count:
+				finish_phase("ThreadPool")
+				JobScheduler.reset_stats()
+				for i in range(JOBS):
+					JobScheduler.schedule(generate.bind(i), i, [], null, func(): scheduler_done += 1)
+				phase = "scheduler"
+		"scheduler":
+			if scheduler_done == JOBS:
+				var stats = JobScheduler.get_stats()
+				finish_phase("JobScheduler")
+				print("%-12s %8s %12s" % ["scheduler", "frames", "wall"])
+				for name in results:
+					print("%-12s %8d %9.3f ms" % [name, results[name][0], results[name][1] / 1000.0])
+				print("JobScheduler: mean wait %.3f ms, mean latency %.3f ms, worker utilization %.0f%%" % [
+					stats["mean_wait_ms"], stats["mean_latency_ms"], stats["utilization"] * 100.0])
+				start_checks()
+				phase = "checks"
+		"checks":
+			var stats = JobScheduler.get_stats()
+			if stats["waiting"] + stats["ready"] + stats["running"] + stats["completing"] == 0:
+				finish_checks()
+
+func finish_phase(name):
+	results[name] = [frames, Time.get_ticks_usec() - start_usec]
+	frames = 0
+	start_usec = Time.get_ticks_usec()
+
+func generate(i):
+	PerlinTerrainGrid.generate_ids(TerrainGenerator.for_seed(SEED), [i * CHUNK_SIZE, 0, 0], CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE)
+
+func legacy_task(thread_id):
+	generate(thread_id)
+	legacy_mutex.lock()
+	legacy_done += 1
+	legacy.queue_task_finished(thread_id)
+	legacy_mutex.unlock()
+
+# --- Checks ---
+func start_checks():
+	# main-thread jobs, scheduled in scrambled priority order
+	for i in range(JOBS):
+		var priority = (i * 37) % JOBS
+		JobScheduler.schedule(Callable(), priority, [], null, func(): order.append(priority))
+	# generate -> light -> mesh chains, a few of them cancelled right away
+	for chain in range(CHAINS):
+		var group = ["check", chain]
+		var generate_job = JobScheduler.schedule(generate.bind(chain), chain, [], group, func(): chain_log.append(["generate", chain]))
+		var light_job = JobScheduler.schedule(Callable(), chain, [generate_job], group, func(): chain_log.append(["light", chain]))
+		JobScheduler.schedule(Callable(), chain, [light_job], group, func(): chain_log.append(["mesh", chain]))
+	for chain in range(0, CHAINS, 4):
+		cancelled_groups.append(chain)
+		JobScheduler.cancel_group(["check", chain])
+
+func finish_checks():
+	phase = "done"
+	var sorted_order = order.duplicate()
+	sorted_order.sort()
+	if order != sorted_order:
+		push_error("done callbacks ran out of priority order")
+		ok = false
+	for chain in range(CHAINS):
+		var steps = []
+		for entry in chain_log:
+			if entry[1] == chain:
+				steps.append(entry[0])
+		var expected = [] if cancelled_groups.has(chain) else ["generate", "light", "mesh"]
+		if steps != expected:
+			push_error("chain %d ran %s" % [chain, steps])
+			ok = false
+	print("priority order, chains and cancellation: %s" % ok)
+	get_tree().quit(0 if ok else 1)
@@ -0,0 +1,215 @@
+extends Node
+
+# =======================================
+# LightingBenchmark.gd
+# =======================================
+#
+# Chunk lighting per chunk size (cubes of SIZES voxels a side), on seeded
+# noise terrain with caves and a few light-emitting voxels:
+# - legacy: the old CubeGrid/TerrainChunk lighting, one flood fill per lit
+#           voxel with a str(coordinates)-keyed visited Dictionary and an
+#           Array queue (only run up to LEGACY_MAX_SIZE; it is far too slow
+#           beyond that)
+# - packed: VoxelLighting, one multi-source BFS over PackedByteArrays
+# for both ambient modes (CubeGrid's boundary light, TerrainChunk's
+# skylight), and checks the two give identical light values.
+# Then, per size, EDITS seeded block edits (placing and digging stone) lit
+# incrementally with VoxelLightUpdate vs relit from scratch, checking both
+# end with the same light.
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/LightingBenchmark.tscn
+#
+# =======================================
+
+const SIZES = [8, 16, 32, 64]
+const LEGACY_MAX_SIZE = 16
+const REPEATS = 3
+const SEED = 1234
+const EMITTER_CHANCE = 0.002
+const EDITS = 200
+const AMBIENT = CubeGrid.ambient_light_level
+
+var emitters = {} # voxel index -> light level
+var last_result = null # return value of the last best_of() call
+
+func _ready() -> void:
+	var ok = true
+	print("%-6s %-9s %12s %12s %8s %10s" % ["size", "ambient", "legacy", "packed", "speedup", "lit"])
+	for size in SIZES:
+		var voxels = make_terrain(size)
+		for sky in [false, true]:
+			var engine = VoxelLighting.new(size, size, size)
+			var packed_usec = best_of(func(): light_packed(engine, voxels, sky))
+			var legacy_text = "-"
+			var speedup_text = "-"
+			if size <= LEGACY_MAX_SIZE:
+				var legacy_usec = best_of(func(): return light_legacy(voxels, size, sky))
+				var legacy_light = last_result
+				legacy_text = "%10.2f ms" % (legacy_usec / 1000.0)
+				speedup_text = "%7.1fx" % (float(legacy_usec) / max(packed_usec, 1))
+				if PackedByteArray(legacy_light) != engine.light:
+					push_error("%d^3 %s: light values differ" % [size, "sky" if sky else "boundary"])
+					ok = false
+			print("%-6s %-9s %12s %10.2f ms %8s %10d" % [
+				"%d^3" % size, "sky" if sky else "boundary", legacy_text, packed_usec / 1000.0,
+				speedup_text, engine.voxels_lit])
+	print("")
+	print("%-6s %8s %14s %14s %8s" % ["size", "edits", "full relight", "incremental", "speedup"])
+	for size in SIZES:
+		ok = bench_edits(size) and ok
+	print("identical light values: %s" % ok)
+	get_tree().quit(0 if ok else 1)
+
+func best_of(callable: Callable) -> int:
+	var best = -1
+	for i in range(REPEATS):
+		var start = Time.get_ticks_usec()
+		last_result = callable.call()
+		var elapsed = Time.get_ticks_usec() - start
+		if best < 0 or elapsed < best:
+			best = elapsed
+	return best
+
+# per-edit time of relighting the whole grid vs VoxelLightUpdate.edit
+func bench_edits(size) -> bool:
+	var voxels = make_terrain(size)
+	var rng = RandomNumberGenerator.new()
+	rng.seed = SEED
+	var edits = []
+	while edits.size() < EDITS:
+		var index = rng.randi_range(0, voxels.size() - 1)
+		if emitters.has(index):
+			continue # the benchmark's own emitters are not voxel types, so leave them be
+		var id = Voxel.VoxelType.STONE if edits.size() % 2 == 0 else Voxel.VoxelType.AIR
+		edits.append([index, id])
+
+	var full = VoxelLighting.new(size, size, size)
+	var full_voxels = voxels.duplicate()
+	var start = Time.get_ticks_usec()
+	for edit in edits:
+		full_voxels[edit[0]] = edit[1]
+		light_packed(full, full_voxels, true)
+	var full_usec = Time.get_ticks_usec() - start
+
+	var engine = VoxelLighting.new(size, size, size)
+	light_packed(engine, voxels, true)
+	start = Time.get_ticks_usec()
+	for edit in edits:
+		VoxelLightUpdate.new().edit(engine, edit[0], edit[1])
+	var incremental_usec = Time.get_ticks_usec() - start
+
+	print("%-6s %8d %11.3f ms %11.3f ms %7.1fx" % [
+		"%d^3" % size, EDITS, full_usec / 1000.0 / EDITS, incremental_usec / 1000.0 / EDITS,
+		float(full_usec) / max(incremental_usec, 1)])
+	if engine.light != full.light:
+		push_error("%d^3: incremental light differs from a full relight" % size)
+		return false
+	return true
+
+# seeded noise hills with caves, some glass, and a few emitters
+func make_terrain(size) -> Array:
+	var noise = FastNoiseLite.new()
+	noise.seed = SEED
+	noise.frequency = 0.08
+	var rng = RandomNumberGenerator.new()
+	rng.seed = SEED
+	var voxels = []
+	voxels.resize(size * size * size)
+	emitters.clear()
+	var index = 0
+	for x in range(size):
+		for y in range(size):
+			for z in range(size):
+				var density = noise.get_noise_3d(x, y, z) + 0.5 - float(y) / size
+				var voxel_type = Voxel.VoxelType.AIR
+				if density > 0.15: voxel_type = Voxel.VoxelType.STONE
+				elif density > 0.1: voxel_type = Voxel.VoxelType.GLASS
+				voxels[index] = voxel_type
+				if Voxel.is_transparent(voxel_type) and rng.randf() < EMITTER_CHANCE:
+					emitters[index] = rng.randi_range(4, 14)
+				index += 1
+	return voxels
+
+func light_packed(engine: VoxelLighting, voxels: Array, sky: bool) -> void:
+	engine.clear()
+	engine.load_voxels(voxels)
+	# Voxel has no emitting types yet, so the benchmark places its own
+	for index in emitters:
+		engine.emission[index] = emitters[index]
+	if sky:
+		engine.add_sky_sources(AMBIENT)
+	else:
+		engine.add_boundary_sources(AMBIENT)
+	engine.add_emitters()
+	engine.propagate()
+
+# --- Legacy lighting, as CubeGrid/TerrainChunk.generate_light_data did it ---
+func light_legacy(voxels: Array, size: int, sky: bool) -> Array:
+	var light = []
+	light.resize(voxels.size())
+	light.fill(0)
+	var ambient = []
+	ambient.resize(voxels.size())
+	ambient.fill(false)
+	if sky:
+		for reverse_y in range(0, size):
+			var y = (size - 1) - reverse_y
+			for x in range(0, size):
+				for z in range(0, size):
+					var top_sky_light = true if y == size - 1 else ambient[legacy_index([x, y + 1, z], size)]
+					var index = legacy_index([x, y, z], size)
+					var sky_light = Voxel.is_transparent(voxels[index]) and top_sky_light
+					ambient[index] = sky_light
+					if sky_light:
+						light[index] = AMBIENT
+	else:
+		for x in range(0, size):
+			for y in range(0, size):
+				for z in range(0, size):
+					var index = legacy_index([x, y, z], size)
+					if Voxel.is_transparent(voxels[index]):
+						if x == 0 or x == size-1 or y == 0 or y == size-1 or z == 0 or z == size-1:
+							ambient[index] = true
+							light[index] = AMBIENT
+	for x in range(0, size):
+		for y in range(0, size):
+			for z in range(0, size):
+				var index = legacy_index([x, y, z], size)
+				var light_level = max(light[index], emitters.get(index, 0))
+				if light_level > 0:
+					legacy_flood_fill(voxels, light, size, [x, y, z], light_level)
+	return light
+
+func legacy_index(coordinates, size):
+	for c in coordinates:
+		if c < 0 or c >= size:
+			return -1
+	return coordinates[0] * size * size + coordinates[1] * size + coordinates[2]
+
+func legacy_flood_fill(voxels, light, size, start_coordinates, light_level):
+	var queue = []
+	var visited = {}
+	queue.push_back([start_coordinates, light_level])
+	visited[str(start_coordinates)] = true
+	while not queue.is_empty():
+		var current = queue.pop_front()
+		var current_coordinates = current[0]
+		var current_light = current[1]
+		var current_index = legacy_index(current_coordinates, size)
+		light[current_index] = current_light
+		if not Voxel.is_transparent(voxels[current_index]):
+			continue
+		for next_coordinates in CubeGrid.get_surrounding_coordinates(current_coordinates):
+			var next_index = legacy_index(next_coordinates, size)
+			if next_index == -1:
+				continue
+			var next_key = str(next_coordinates)
+			if next_key in visited:
+				continue
+			var next_light = current_light - 1
+			if next_light <= 0:
+				continue
+			if Voxel.is_transparent(voxels[next_index]) and light[next_index] < next_light:
+				queue.push_back([next_coordinates, next_light])
+				visited[next_key] = true
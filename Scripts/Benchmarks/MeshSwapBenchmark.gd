@@ -0,0 +1,190 @@
+extends Node
+
+# =======================================
+# MeshSwapBenchmark.gd
+# =======================================
+#
+# Main-thread cost of remeshing GRIDS CubeGrids of SIZE^3 seeded noise
+# terrain at once, as after a burst of block edits:
+# - legacy: the old CubeGrid.generate_mesh_data, drawing every face into the
+#           grid's SurfaceTools and committing them (index, generate_normals),
+#           all on the main thread
+# - jobs:   CubeGrid.schedule_mesh_build (snapshot on the main thread,
+#           CubeMesher.build on JobScheduler's workers) and apply_mesh
+#           (ArrayMesh commit and swap, in JobScheduler's done callbacks)
+# Reports main-thread milliseconds for the whole burst and the worst frame,
+# plus worker milliseconds per build.
+#
+# Also checks that the jobs build the same triangles (vertices, uvs, light
+# uvs) as the legacy mesher, and that each grid keeps showing its old mesh
+# until the new one is swapped in.
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/MeshSwapBenchmark.tscn
+#
+# =======================================
+
+const GRIDS = 8
+const SIZE = 16
+const SEED = 1234
+
+var grids = []
+var legacy_arrays = [] # per grid: {"opaque": arrays, "transparent": arrays} from the SurfaceTools
+var old_meshes = []
+var phase = "first build"
+var frames = 0
+var schedule_usec = 0
+var frame_usec = 0
+var max_frame_usec = 0
+var ok = true
+
+func _ready() -> void:
+	JobScheduler.set_process(false) # stepped by hand below, so it can be timed
+	for i in range(GRIDS):
+		var grid = CubeGrid.new()
+		grid.grid_x_len = SIZE
+		grid.grid_y_len = SIZE
+		grid.grid_z_len = SIZE
+		grid.deactivate() # meshed by hand below
+		add_child(grid)
+		grid.update_voxels(make_voxels(i))
+		grid.generate_light_data()
+		grids.append(grid)
+
+	var start = Time.get_ticks_usec()
+	for grid in grids:
+		legacy_arrays.append(legacy_mesh(grid))
+	var legacy_usec = Time.get_ticks_usec() - start
+	print("legacy: %.2f ms on the main thread for %d grids of %d^3 (one frame)" % [legacy_usec / 1000.0, GRIDS, SIZE])
+	start_builds()
+
+func _process(_delta):
+	var start = Time.get_ticks_usec()
+	JobScheduler._process(_delta)
+	var elapsed = Time.get_ticks_usec() - start
+	frame_usec += elapsed
+	max_frame_usec = max(max_frame_usec, elapsed)
+	frames += 1
+	for grid in grids:
+		if grid.updating_mesh:
+			return
+	finish_builds()
+
+func start_builds():
+	JobScheduler.reset_stats()
+	frames = 0
+	frame_usec = 0
+	max_frame_usec = 0
+	old_meshes.clear()
+	var start = Time.get_ticks_usec()
+	for grid in grids:
+		old_meshes.append(grid.mesh_instance.mesh if grid.mesh_instance != null else null)
+		grid.updating_mesh = true
+		grid.schedule_mesh_build()
+	schedule_usec = Time.get_ticks_usec() - start
+	for i in range(GRIDS):
+		var shown = grids[i].mesh_instance.mesh if grids[i].mesh_instance != null else null
+		if shown != old_meshes[i]:
+			push_error("grid %d: mesh changed before its build finished" % i)
+			ok = false
+
+func finish_builds():
+	print("jobs (%s): %.2f ms snapshots + %.2f ms swaps over %d frames (worst frame %.2f ms), %.2f ms per build on workers" % [
+		phase, schedule_usec / 1000.0, frame_usec / 1000.0, frames, max_frame_usec / 1000.0,
+		JobScheduler.busy_usec / 1000.0 / max(JobScheduler.started_count, 1)])
+	for i in range(GRIDS):
+		if grids[i].mesh_instance.mesh == old_meshes[i]:
+			push_error("grid %d: new mesh wasn't swapped in" % i)
+			ok = false
+		if not same_triangles(grids[i].mesh_instance.mesh, legacy_arrays[i]):
+			push_error("grid %d: jobs built different triangles" % i)
+			ok = false
+	if phase == "first build":
+		# edit every grid and remesh: the first meshes must stay up meanwhile
+		phase = "remesh"
+		for i in range(GRIDS):
+			grids[i].edit_voxel([SIZE / 2, SIZE - 1, SIZE / 2], Voxel.VoxelType.STONE)
+			legacy_arrays[i] = legacy_mesh(grids[i])
+		start_builds()
+		return
+	set_process(false)
+	print("same triangles, old mesh kept until the swap: %s" % ok)
+	get_tree().quit(0 if ok else 1)
+
+func make_voxels(offset) -> PackedByteArray:
+	var noise = FastNoiseLite.new()
+	noise.seed = SEED
+	noise.frequency = 0.08
+	var voxels = PackedByteArray()
+	voxels.resize(SIZE * SIZE * SIZE)
+	var index = 0
+	for x in range(SIZE):
+		for y in range(SIZE):
+			for z in range(SIZE):
+				var density = noise.get_noise_3d(x + offset * SIZE, y, z) + 0.5 - float(y) / SIZE
+				var voxel_type = Voxel.VoxelType.AIR
+				if density > 0.3: voxel_type = Voxel.VoxelType.STONE
+				elif density > 0.15: voxel_type = Voxel.VoxelType.DIRT
+				elif density > 0.1: voxel_type = Voxel.VoxelType.GLASS
+				voxels[index] = voxel_type
+				index += 1
+	return voxels
+
+# same triangles, in the same order, as the legacy SurfaceTools' arrays
+func same_triangles(mesh, legacy) -> bool:
+	var keys = legacy.keys().filter(func(key): return legacy[key][Mesh.ARRAY_VERTEX].size() > 0)
+	keys.sort()
+	if mesh.get_surface_count() != keys.size():
+		return false
+	for surface in range(keys.size()):
+		var arrays = mesh.surface_get_arrays(surface)
+		var expected = legacy[keys[surface]]
+		var indices = arrays[Mesh.ARRAY_INDEX]
+		if indices.size() != expected[Mesh.ARRAY_VERTEX].size():
+			return false
+		for i in range(indices.size()):
+			for array in [Mesh.ARRAY_VERTEX, Mesh.ARRAY_TEX_UV, Mesh.ARRAY_TEX_UV2]:
+				if arrays[array][indices[i]] != expected[array][i]:
+					return false
+	return true
+
+# --- Legacy mesher, as CubeGrid.generate_mesh_data did it ---
+# returns each SurfaceTool's unindexed arrays (one vertex per triangle corner);
+# the mesh is still committed as before, so its cost is counted
+func legacy_mesh(grid) -> Dictionary:
+	grid.update_light_data()
+	var tools = {"opaque": MeshHelper.get_new_surface_tool(), "transparent": MeshHelper.get_new_surface_tool()}
+	for x in range(grid.grid_x_len):
+		for y in range(grid.grid_y_len):
+			for z in range(grid.grid_z_len):
+				legacy_draw_block_mesh(grid, tools, [x, y, z])
+	var result = {}
+	for key in tools:
+		result[key] = tools[key].commit_to_arrays()
+		if result[key][Mesh.ARRAY_VERTEX] == null:
+			result[key][Mesh.ARRAY_VERTEX] = PackedVector3Array()
+		MeshHelper.finish_mesh(tools[key]).free()
+	return result
+
+func legacy_draw_block_mesh(grid, tools, coordinates):
+	var surface_tool_to_use = tools["opaque"]
+	var voxel = grid.get_voxel(coordinates)
+	if (Voxel.is_transparent(voxel)):
+		surface_tool_to_use = tools["transparent"]
+	if (voxel == 0): return # air
+	var verts = CubeGrid.calculate_block_vertices(coordinates)
+	var surrounding_coordinates = CubeGrid.get_surrounding_coordinates(coordinates)
+	var mesh_data = [
+		[surrounding_coordinates[0], [verts[4], verts[5], verts[7], verts[6]]], # +x face
+		[surrounding_coordinates[1], [verts[1], verts[0], verts[2], verts[3]]], # -x face
+		[surrounding_coordinates[2], [verts[2], verts[6], verts[7], verts[3]]], # +y face
+		[surrounding_coordinates[3], [verts[1], verts[5], verts[4], verts[0]]], # -y face
+		[surrounding_coordinates[4], [verts[5], verts[1], verts[3], verts[7]]], # +z face
+		[surrounding_coordinates[5], [verts[0], verts[4], verts[6], verts[2]]]  # -z face
+	]
+	for face_index in range(mesh_data.size()):
+		var other_coordinates = mesh_data[face_index][0]
+		var other_voxel = grid.get_voxel(other_coordinates)
+		if (Voxel.is_transparent(other_voxel) and (other_voxel != voxel)):
+			var face_uvs = MeshHelper.calculate_face_uvs(CubeGrid.DIRECTION_NORMALS_ARRAY[face_index], 1.0, 1.0)
+			MeshHelper.draw_quad(surface_tool_to_use, mesh_data[face_index][1], face_uvs, grid.calculate_light_uvs(other_coordinates))
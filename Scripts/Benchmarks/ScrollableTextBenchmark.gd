@@ -0,0 +1,122 @@
+extends Node
+
+# =======================================
+# ScrollableTextBenchmark.gd
+# =======================================
+#
+# CPU cost of ScrollableTextDisplay on a 30,000-line document:
+# - RASTER:      every window re-render blits each glyph into an RGBA image
+# - GLYPH_INDEX: every window re-render writes one index + one color texel
+#                per cell; the shader samples the atlas
+# Times the initial render and scrolling the first SCROLL_LINES lines one
+# line at a time, and reports re-renders and bytes uploaded per re-render.
+# (GPU cost is not measured; headless runs have no renderer.)
+#
+# Also checks glyph indices on a WIDE_ATLAS x WIDE_ATLAS cell grid atlas
+# (cells past 255 on both axes): the index texels, decoded as the shader
+# does, must draw the same pixels as RASTER.
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/ScrollableTextBenchmark.tscn
+#
+# =======================================
+
+const DOCUMENT_LINES = 30000
+const SCROLL_LINES = 200
+const SAMPLE_LINE = "%d In the beginning God created the heaven and the earth. And the earth was"
+const WIDE_ATLAS = 300
+const WIDE_CELLS = [Vector2i(299, 0), Vector2i(256, 1), Vector2i(44, 0), Vector2i(0, 299),
+	Vector2i(255, 255), Vector2i(256, 256), Vector2i(299, 299), Vector2i(1, 257)]
+const WIDE_FIRST_CP = 0xE000
+
+func _ready() -> void:
+	var lines = PackedStringArray()
+	for i in range(DOCUMENT_LINES):
+		lines.append(SAMPLE_LINE % i)
+
+	var results = {}
+	for mode in [ScrollableTextDisplay.RenderMode.RASTER, ScrollableTextDisplay.RenderMode.GLYPH_INDEX]:
+		var display = ScrollableTextDisplay.new(80, 25, mode)
+		add_child(display)
+		display.set_process(false)
+
+		var start = Time.get_ticks_usec()
+		display.set_content(lines)
+		var initial_usec = Time.get_ticks_usec() - start
+
+		var renders = 0
+		start = Time.get_ticks_usec()
+		for i in range(SCROLL_LINES):
+			var before = display.last_render_start_line
+			display.scroll_by_lines(1)
+			if display.last_render_start_line != before:
+				renders += 1
+		var scroll_usec = Time.get_ticks_usec() - start
+
+		var name = ScrollableTextDisplay.RenderMode.keys()[mode]
+		results[name] = scroll_usec
+		print("%-11s initial %8d us, scroll %d lines %9d us (%d re-renders, %d bytes each)" % [
+			name, initial_usec, SCROLL_LINES, scroll_usec, renders, display.bytes_uploaded])
+		display.queue_free()
+
+	print("Scrolling speedup: %.1fx" % (float(results["RASTER"]) / max(results["GLYPH_INDEX"], 1)))
+	var ok = check_wide_atlas()  # last: it clears the glyph cache
+	print("wide atlas glyph indices match RASTER: %s" % ok)
+	get_tree().quit(0 if ok else 1)
+
+# Renders one line of WIDE_CELLS glyphs from a synthetic grid atlas both ways
+func check_wide_atlas() -> bool:
+	var saved = [AtlasHelper.atlas_image, AtlasHelper.atlas_texture, AtlasHelper.metadata,
+		AtlasHelper.font_info, AtlasHelper.glyph_records]
+	var glyph_w = 2
+	var glyph_h = 2
+	var atlas = Image.create(WIDE_ATLAS * glyph_w, WIDE_ATLAS * glyph_h, false, Image.FORMAT_RGBA8)
+	for row in range(WIDE_ATLAS):
+		for col in range(WIDE_ATLAS):
+			var v = ((col * 7 + row * 13) % 251 + 4) / 255.0  # differs from the cell a wrapped byte would give
+			atlas.fill_rect(Rect2i(col * glyph_w, row * glyph_h, glyph_w, glyph_h), Color(v, v, v, 1.0))
+	var metadata = {}
+	var line = ""
+	for i in range(WIDE_CELLS.size()):
+		metadata[str(WIDE_FIRST_CP + i)] = [WIDE_CELLS[i].y, WIDE_CELLS[i].x]
+		line += String.chr(WIDE_FIRST_CP + i)
+	AtlasHelper.atlas_image = atlas
+	AtlasHelper.atlas_texture = null
+	AtlasHelper.metadata = metadata
+	AtlasHelper.font_info = {"glyph_box_width": glyph_w, "glyph_box_height": glyph_h, "columns": WIDE_ATLAS}
+	AtlasHelper.glyph_records = PackedInt32Array()  # no binary lookup: cells come from metadata
+	AtlasHelper.clear_glyph_cache()
+
+	var display = ScrollableTextDisplay.new(WIDE_CELLS.size(), 1, ScrollableTextDisplay.RenderMode.GLYPH_INDEX)
+	var ok = display.render_mode == ScrollableTextDisplay.RenderMode.GLYPH_INDEX
+	display.set_content(PackedStringArray([line]))
+	var expected = display.rasterize_window(0, 1)
+	ok = ok and shade_glyph_indices(display, 0, 1).get_data() == expected.get_data()
+	display.free()
+
+	AtlasHelper.atlas_image = saved[0]
+	AtlasHelper.atlas_texture = saved[1]
+	AtlasHelper.metadata = saved[2]
+	AtlasHelper.font_info = saved[3]
+	AtlasHelper.glyph_records = saved[4]
+	AtlasHelper.clear_glyph_cache()
+	return ok
+
+# CPU copy of scrollable_text.gdshader's glyph mode, over the window's index data
+func shade_glyph_indices(display, start_line: int, end_line: int) -> Image:
+	var data = display.build_glyph_index_data(start_line, end_line)
+	var indices = data[0]
+	var colors = data[1]
+	var box = Vector2i(display.glyph_width, display.glyph_height)
+	var image = Image.create(display.content_width, (end_line - start_line) * box.y, false, Image.FORMAT_RGBA8)
+	image.fill(Color.BLACK)
+	for row in range(end_line - start_line):
+		for col in range(display.cols):
+			var i = (row * display.cols + col) * 4
+			if colors[i + 3] == 0:
+				continue
+			var atlas_cell = Vector2i(indices[i] | (indices[i + 1] << 8), indices[i + 2] | ((indices[i + 3] & 63) << 8))
+			var glyph = AtlasHelper.atlas_image.get_region(Rect2i(atlas_cell * box, box))
+			var color = Color(colors[i] / 255.0, colors[i + 1] / 255.0, colors[i + 2] / 255.0, colors[i + 3] / 255.0)
+			display.blit_colored_glyph(image, glyph, col * box.x, row * box.y, color, indices[i + 3] >> 6)
+	return image
@@ -0,0 +1,171 @@
+extends Node
+
+# =======================================
+# TerrainGenerationBenchmark.gd
+# =======================================
+#
+# Terrain generation throughput, in chunks per second, for each grid that
+# generates terrain (CHUNKS chunks in a row along x):
+# - chunk:  TerrainChunk, 3D density noise
+# - perlin: PerlinTerrainGrid, 2D height/biome/material maps
+# - plains: GrassyPlainsGrid, 2D height maps
+# legacy is the old per-grid code: noise generators created for every grid
+# (for every voxel, in TerrainChunk's case), sampled one call at a time and
+# written with a set_voxel per voxel. batched is the grid's generate_ids:
+# generators shared through TerrainGenerator.for_seed, noise sampled into
+# maps/slices a chunk at a time at world coordinates, ids in one buffer
+# (loaded with a single CubeGrid.update_voxels).
+#
+# Also checks that batched generation is deterministic (same seed, same ids)
+# and seamless (two neighboring chunks match one chunk twice as wide).
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/TerrainGenerationBenchmark.tscn
+#
+# =======================================
+
+const RECIPES = {
+	"chunk": [8, 8, 8],
+	"perlin": [16, 16, 16],
+	"plains": [32, 16, 32],
+}
+const CHUNKS = 16
+const REPEATS = 3
+const SEED = 1234
+
+func _ready() -> void:
+	var ok = true
+	print("%-8s %-10s %7s %12s %12s %12s %8s" % [
+		"recipe", "size", "chunks", "legacy ms", "legacy c/s", "batched c/s", "speedup"])
+	for recipe in RECIPES:
+		var size = RECIPES[recipe]
+		var storage = VoxelStorage.new(size[0] * size[1] * size[2])
+		var legacy = best_of(func(): legacy_run(recipe, size))
+		var batched = best_of(func(): batched_run(recipe, size, storage))
+		print("%-8s %-10s %7d %9.3f ms %12.1f %12.1f %7.1fx" % [
+			recipe, "%dx%dx%d" % size, CHUNKS, legacy / 1000.0,
+			chunks_per_second(legacy), chunks_per_second(batched), float(legacy) / max(batched, 1)])
+		ok = check(recipe, size) and ok
+	print("deterministic and seamless: %s" % ok)
+	get_tree().quit(0 if ok else 1)
+
+func best_of(callable: Callable) -> int:
+	var best = -1
+	for i in range(REPEATS):
+		var start = Time.get_ticks_usec()
+		callable.call()
+		var elapsed = Time.get_ticks_usec() - start
+		if best < 0 or elapsed < best:
+			best = elapsed
+	return best
+
+func chunks_per_second(usec) -> float:
+	return CHUNKS * 1000000.0 / max(usec, 1)
+
+# CHUNKS chunks in a row, each loaded into storage as CubeGrid.update_voxels does
+func batched_run(recipe, size, storage):
+	var generator = TerrainGenerator.for_seed(SEED)
+	for chunk in range(CHUNKS):
+		storage.load_voxels(generate(recipe, generator, [chunk * size[0], 0, 0], size[0], size[1], size[2]))
+
+func generate(recipe, generator, origin, x_len, y_len, z_len) -> PackedByteArray:
+	match recipe:
+		"chunk": return TerrainChunk.generate_ids(generator, origin, x_len, y_len, z_len)
+		"perlin": return PerlinTerrainGrid.generate_ids(generator, origin, x_len, y_len, z_len)
+		_: return GrassyPlainsGrid.generate_ids(generator, origin, x_len, y_len, z_len)
+
+func check(recipe, size) -> bool:
+	var x_len = size[0]
+	var y_len = size[1]
+	var z_len = size[2]
+	var generator = TerrainGenerator.for_seed(SEED)
+	var first = generate(recipe, generator, [x_len, 0, -z_len], x_len, y_len, z_len)
+	if first != generate(recipe, TerrainGenerator.new(SEED), [x_len, 0, -z_len], x_len, y_len, z_len):
+		push_error("%s: same seed, different voxels" % recipe)
+		return false
+	# x-major layout: the wide chunk's second half is the second chunk
+	var wide = generate(recipe, generator, [0, 0, -z_len], x_len * 2, y_len, z_len)
+	if wide.slice(0, first.size()) != generate(recipe, generator, [0, 0, -z_len], x_len, y_len, z_len) \
+			or wide.slice(first.size()) != first:
+		push_error("%s: neighboring chunks don't line up" % recipe)
+		return false
+	return true
+
+# --- Legacy generation, as the grids did it ---
+func legacy_run(recipe, size):
+	for chunk in range(CHUNKS):
+		legacy_generate(recipe, size)
+
+func legacy_generate(recipe, size) -> Array:
+	var voxel_data = []
+	voxel_data.resize(size[0] * size[1] * size[2])
+	voxel_data.fill(Voxel.VoxelType.AIR)
+	match recipe:
+		"chunk": legacy_chunk(voxel_data, size)
+		"perlin": legacy_perlin(voxel_data, size)
+		_: legacy_plains(voxel_data, size)
+	return voxel_data
+
+func legacy_set_voxel(voxel_data, size, coordinates, value):
+	var x = int(coordinates[0])
+	var y = int(coordinates[1])
+	var z = int(coordinates[2])
+	if x < 0 or x >= size[0] or y < 0 or y >= size[1] or z < 0 or z >= size[2]:
+		return
+	voxel_data[(x * size[1] + y) * size[2] + z] = int(value)
+
+func make_noise(noise_seed, frequency, octaves, gain) -> FastNoiseLite:
+	var noise = FastNoiseLite.new()
+	noise.noise_type = FastNoiseLite.TYPE_PERLIN
+	noise.seed = noise_seed
+	noise.frequency = frequency
+	noise.fractal_octaves = octaves
+	noise.fractal_gain = gain
+	return noise
+
+# TerrainChunk.generate_test_data: a new generator per voxel
+func legacy_chunk(voxel_data, size):
+	for x in range(size[0]):
+		for y in range(size[1]):
+			for z in range(size[2]):
+				var fast_noise_lite = FastNoiseLite.new()
+				var rng = RandomNumberGenerator.new()
+				rng.randomize()
+				fast_noise_lite.seed = rng.randi()
+				var voxel_type = Voxel.VoxelType.AIR
+				if fast_noise_lite.get_noise_3d(x, y, z) > 0: voxel_type = Voxel.VoxelType.SAND
+				legacy_set_voxel(voxel_data, size, [x, y, z], voxel_type)
+
+# PerlinTerrainGrid: three generators per grid, three samples per column (stone/gravel biome only)
+func legacy_perlin(voxel_data, size):
+	var perlin_noise = make_noise(randi(), 0.02, 5, 0.6)
+	var height_noise = make_noise(randi() + 1, 0.05, 3, 0.4)
+	var material_noise = make_noise(randi() + 2, 0.1, 2, 0.5)
+	var max_height = size[1] * 0.7
+	var base_height = size[1] * 0.2
+	for x in range(size[0]):
+		for z in range(size[2]):
+			var terrain_height = base_height + (perlin_noise.get_noise_2d(x, z) + 1.0) * 0.5 * (max_height * 0.5)
+			terrain_height = clamp(terrain_height, base_height, size[1] - 1)
+			var biome_noise = height_noise.get_noise_2d(x, z) * 0.5
+			var mat_noise = material_noise.get_noise_2d(x, z)
+			for y in range(size[1]):
+				if y > terrain_height:
+					continue
+				var voxel_type = Voxel.VoxelType.GRAVEL if biome_noise > 0.0 else Voxel.VoxelType.STONE
+				if y == floor(terrain_height):
+					voxel_type = Voxel.VoxelType.STONE if mat_noise > 0 else Voxel.VoxelType.GRAVEL
+				legacy_set_voxel(voxel_data, size, [x, y, z], voxel_type)
+
+# GrassyPlainsGrid: two generators per grid, two samples per column
+func legacy_plains(voxel_data, size):
+	var terrain_noise = make_noise(randi(), 0.008, 2, 0.4)
+	var detail_noise = make_noise(randi() + 1, 0.05, 2, 0.25)
+	var base_height = size[1] * 0.4
+	for x in range(size[0]):
+		for z in range(size[2]):
+			var height = base_height + terrain_noise.get_noise_2d(x, z) * 5.0 + detail_noise.get_noise_2d(x, z)
+			var height_int = int(clamp(height, 0, size[1] - 1))
+			for y in range(height_int + 1):
+				var voxel_type = Voxel.VoxelType.GRASS if y >= height_int - 1 else Voxel.VoxelType.DIRT
+				legacy_set_voxel(voxel_data, size, [x, y, z], voxel_type)
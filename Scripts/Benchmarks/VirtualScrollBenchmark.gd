@@ -0,0 +1,94 @@
+extends Node
+
+# =======================================
+# VirtualScrollBenchmark.gd
+# =======================================
+#
+# Opening the whole Bible as one scroll in ScrollableTextDisplay (80 cols):
+# - eager:   wrap every chapter, then set_colored_content() with every line
+# - virtual: set_content_provider(BibleContentProvider), wrapping only the
+#            chapters around the viewport
+# Times startup and JUMPS random scroll-to-offset jumps across the document,
+# checks the virtual window shows the same lines as the eager one after
+# jumping to each chapter start, and reports chapters wrapped.
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/VirtualScrollBenchmark.tscn
+#
+# =======================================
+
+const COLS = 80
+const ROWS = 25
+const JUMPS = 200
+const CHECKED_CHAPTERS = 50
+
+func _ready() -> void:
+	var chapter_count = BibleHelper.chapter_book.size()
+	if chapter_count == 0:
+		push_error("BibleHelper has no chapters loaded")
+		get_tree().quit(1)
+		return
+	var rng = RandomNumberGenerator.new()
+	rng.seed = 7
+
+	# === Eager: every line up front ===
+	var eager = ScrollableTextDisplay.new(COLS, ROWS)
+	add_child(eager)
+	eager.set_process(false)
+	var start = Time.get_ticks_usec()
+	var provider = BibleContentProvider.new(ChapterPageCache.new(ROWS, 1))
+	var lines = PackedStringArray()
+	var chapter_starts = PackedInt32Array()
+	for block in range(chapter_count):
+		chapter_starts.append(lines.size())
+		lines.append_array(provider.get_block_lines(block, COLS))
+	var colors: Array[Color] = []
+	for line in lines:
+		colors.append(provider.get_line_color(line))
+	eager.set_colored_content(lines, colors)
+	var eager_usec = Time.get_ticks_usec() - start
+	print("eager:   %9d us to first frame, %d lines held" % [eager_usec, lines.size()])
+
+	# === Virtual: blocks around the viewport ===
+	var display = ScrollableTextDisplay.new(COLS, ROWS)
+	add_child(display)
+	display.set_process(false)
+	start = Time.get_ticks_usec()
+	display.set_content_provider(BibleContentProvider.new(ChapterPageCache.new(ROWS)))
+	var virtual_usec = Time.get_ticks_usec() - start
+	var layout = display.content_layout
+	print("virtual: %9d us to first frame, %d blocks wrapped, %d lines estimated" % [
+		virtual_usec, layout.blocks_wrapped, layout.get_total_lines()])
+
+	# === Random scroll-to-offset jumps ===
+	start = Time.get_ticks_usec()
+	for i in range(JUMPS):
+		var target = rng.randi_range(0, layout.get_total_lines() - 1)
+		display.scroll_by_pixels(target * display.glyph_height - display.scroll_offset)
+		display.render_content()
+	var jump_usec = Time.get_ticks_usec() - start
+	print("  %d jumps: %7.1f us/jump, %d blocks wrapped, %d cached" % [
+		JUMPS, float(jump_usec) / JUMPS, layout.blocks_wrapped, layout.blocks.size()])
+
+	# === Same lines as the eager document at chapter starts ===
+	var ok = true
+	# Chapters near the end cannot scroll to the top of the viewport
+	var last_checked = max(chapter_count - 10, 1) - 1
+	for i in range(CHECKED_CHAPTERS):
+		var block = rng.randi_range(0, last_checked)
+		var line = layout.get_block_start(block)
+		display.scroll_by_pixels(line * display.glyph_height - display.scroll_offset)
+		display.render_content()
+		var top = int(display.scroll_offset / display.glyph_height)
+		var first = top - display.last_render_start_line
+		var expected = lines.slice(chapter_starts[block], chapter_starts[block] + ROWS)
+		var shown = display.window_lines.slice(first, first + ROWS)
+		if layout.find_block(top) != block or shown != expected:
+			push_error("Chapter ordinal %d: window does not match" % block)
+			ok = false
+			break
+	print("  %d chapter starts match the eager document: %s" % [CHECKED_CHAPTERS, ok])
+
+	eager.queue_free()
+	display.queue_free()
+	get_tree().quit(0 if ok else 1)
@@ -0,0 +1,132 @@
+extends Node
+
+# =======================================
+# VoxelStorageBenchmark.gd
+# =======================================
+#
+# Per-chunk memory and bulk operation cost of CubeGrid's voxel storage, for
+# chunk sizes SIZES and three kinds of content:
+# - uniform: all air (0 bits per voxel)
+# - terrain: air, grass, dirt and stone (2 bits per voxel)
+# - mixed:   every voxel type (4 bits per voxel)
+# legacy is the old layout: voxel ids, light levels and ambient flags in
+# three untyped Arrays (a Variant per element); its memory is measured with
+# OS.get_static_memory_usage over COPIES chunks. packed is VoxelStorage
+# (palette + bit-packed ids, 4-bit light, ambient bitset).
+# Timings are per chunk: fill (clear_grid), copy in (update_voxels) and read
+# out every id (as lighting and meshing do).
+#
+# Run headless:
+#   godot --headless res://Scenes/Benchmarks/VoxelStorageBenchmark.tscn
+#
+# =======================================
+
+const SIZES = [8, 16, 32]
+const KINDS = ["uniform", "terrain", "mixed"]
+const COPIES = 16
+const REPEATS = 3
+const SEED = 1234
+
+func _ready() -> void:
+	var ok = true
+	print("%-6s %-8s %5s %11s %11s %7s %10s %10s %10s %10s %10s %10s" % [
+		"size", "kind", "bits", "legacy B", "packed B", "ratio",
+		"fill old", "fill new", "copy old", "copy new", "read old", "read new"])
+	for size in SIZES:
+		var count = size * size * size
+		for kind in KINDS:
+			var ids = make_ids(size, kind)
+			var storage = VoxelStorage.new(count)
+			storage.load_voxels(ids)
+			if storage.get_voxels() != ids:
+				push_error("%d^3 %s: stored voxels differ" % [size, kind])
+				ok = false
+			var packed_bytes = storage.get_memory_usage()["total"]
+			var legacy_bytes = measure_legacy_bytes(ids)
+
+			var legacy = make_legacy(count)
+			var fill_old = best_of(func(): legacy[0].fill(Voxel.VoxelType.AIR))
+			var fill_new = best_of(func(): storage.fill_voxels(Voxel.VoxelType.AIR))
+			var copy_old = best_of(func(): legacy_copy(legacy[0], ids))
+			var copy_new = best_of(func(): storage.load_voxels(ids))
+			var read_old = best_of(func(): legacy_read(legacy[0]))
+			var read_new = best_of(func(): storage.get_voxels())
+			print("%-6s %-8s %5d %11d %11d %6.1fx %7.3f ms %7.3f ms %7.3f ms %7.3f ms %7.3f ms %7.3f ms" % [
+				"%d^3" % size, kind, storage.bits, legacy_bytes, packed_bytes,
+				float(legacy_bytes) / max(packed_bytes, 1),
+				fill_old / 1000.0, fill_new / 1000.0, copy_old / 1000.0, copy_new / 1000.0,
+				read_old / 1000.0, read_new / 1000.0])
+	print("stored voxels identical: %s" % ok)
+	get_tree().quit(0 if ok else 1)
+
+func best_of(callable: Callable) -> int:
+	var best = -1
+	for i in range(REPEATS):
+		var start = Time.get_ticks_usec()
+		callable.call()
+		var elapsed = Time.get_ticks_usec() - start
+		if best < 0 or elapsed < best:
+			best = elapsed
+	return best
+
+# seeded voxel ids, one byte per voxel in CubeGrid index order
+func make_ids(size, kind) -> PackedByteArray:
+	var ids = PackedByteArray()
+	ids.resize(size * size * size)
+	if kind == "uniform":
+		return ids # all air
+	var noise = FastNoiseLite.new()
+	noise.seed = SEED
+	noise.frequency = 0.08
+	var index = 0
+	for x in range(size):
+		for y in range(size):
+			for z in range(size):
+				var density = noise.get_noise_3d(x, y, z) + 0.5 - float(y) / size
+				var voxel_type = Voxel.VoxelType.AIR
+				if kind == "terrain":
+					if density > 0.3: voxel_type = Voxel.VoxelType.STONE
+					elif density > 0.1: voxel_type = Voxel.VoxelType.DIRT
+					elif density > 0.0: voxel_type = Voxel.VoxelType.GRASS
+				elif density > 0.0:
+					voxel_type = 1 + (index * 7919) % (Voxel.VoxelType.size() - 1)
+				ids[index] = voxel_type
+				index += 1
+	return ids
+
+# the old CubeGrid arrays: [voxel_data, light_data, ambient_lights]
+func make_legacy(count) -> Array:
+	var voxel_data = []
+	voxel_data.resize(count)
+	voxel_data.fill(Voxel.VoxelType.AIR)
+	var light_data = []
+	light_data.resize(count)
+	light_data.fill(0)
+	var ambient_lights = []
+	ambient_lights.resize(count)
+	ambient_lights.fill(false)
+	return [voxel_data, light_data, ambient_lights]
+
+# static memory of one chunk's legacy arrays, averaged over COPIES chunks
+func measure_legacy_bytes(ids) -> int:
+	var chunks = []
+	var before = OS.get_static_memory_usage()
+	for i in range(COPIES):
+		var legacy = make_legacy(ids.size())
+		legacy_copy(legacy[0], ids)
+		chunks.append(legacy)
+	var after = OS.get_static_memory_usage()
+	chunks.clear()
+	return (after - before) / COPIES
+
+# update_voxels as it was: a sanitized set per voxel
+func legacy_copy(voxel_data, ids):
+	for index in range(ids.size()):
+		voxel_data[index] = int(ids[index])
+
+func legacy_read(voxel_data) -> PackedByteArray:
+	var ids = PackedByteArray()
+	ids.resize(voxel_data.size())
+	for index in range(voxel_data.size()):
+		ids[index] = int(voxel_data[index])
+	return ids
@@ -0,0 +1,153 @@
+extends RefCounted
+class_name BibleBinary
+# =======================================
+# BibleBinary.gd
+# =======================================
+# Reader for the compact KJV container written by
+#   python Bible/kjv_ascii_to_json.py --binary
+# (layout in Bible/kjv_binary.py). load_file reads the whole file once;
+# open_file reads only the header and offset tables and keeps the file open,
+# seeking to verse texts as they are needed (BibleHelper's lazy backend).
+# Either way verse texts are decoded from the string pool on access.
+
+const MAGIC = "KJVB"
+const VERSION = 1
+const HEADER_SIZE = 44
+
+var data : PackedByteArray = PackedByteArray()  # load_file: the whole file
+var file : FileAccess = null  # open_file: read from on access instead
+var pool_offset : int = 0
+var book_names : PackedStringArray = PackedStringArray()
+var book_first_chapter : PackedInt32Array = PackedInt32Array()
+var book_chapter_count : PackedInt32Array = PackedInt32Array()
+var chapter_numbers : PackedInt32Array = PackedInt32Array()
+var chapter_first_verse : PackedInt32Array = PackedInt32Array()  # chapter_count + 1 entries
+var verse_offsets : PackedInt32Array = PackedInt32Array()  # verse_count + 1 entries
+var book_index : Dictionary = {}  # lowercase name -> book index
+
+
+func load_file(path: String) -> bool:
+	if not FileAccess.file_exists(path):
+		push_error("Bible binary not found at %s" % path)
+		return false
+	file = null
+	data = FileAccess.get_file_as_bytes(path)
+	if not read_tables(path):
+		data = PackedByteArray()
+		return false
+	return true
+
+func open_file(path: String) -> bool:
+	data = PackedByteArray()
+	file = FileAccess.open(path, FileAccess.READ)
+	if file == null:
+		push_error("Bible binary not found at %s" % path)
+		return false
+	if not read_tables(path):
+		file = null
+		return false
+	return true
+
+# Bytes offset .. offset + length of the file, from data or file
+func read_bytes(offset: int, length: int) -> PackedByteArray:
+	if file == null:
+		return data.slice(offset, offset + length)
+	file.seek(offset)
+	return file.get_buffer(length)
+
+func read_tables(path: String) -> bool:
+	var header = read_bytes(0, HEADER_SIZE)
+	if header.size() < HEADER_SIZE or header.slice(0, 4).get_string_from_ascii() != MAGIC \
+			or header.decode_u16(4) != VERSION:
+		push_error("Not a version %d Bible binary: %s" % [VERSION, path])
+		return false
+
+	var book_count = header.decode_u32(8)
+	var chapter_count = header.decode_u32(12)
+	var verse_count = header.decode_u32(16)
+	pool_offset = header.decode_u32(20)
+	var books_offset = header.decode_u32(28)
+	var chapters_offset = header.decode_u32(32)
+	var verses_offset = header.decode_u32(36)
+
+	var book_rows = read_bytes(books_offset, book_count * 16).to_int32_array()
+	var chapter_rows = read_bytes(chapters_offset, (chapter_count + 1) * 8).to_int32_array()
+	verse_offsets = read_bytes(verses_offset, (verse_count + 1) * 4).to_int32_array()
+
+	chapter_numbers.resize(chapter_count + 1)
+	chapter_first_verse.resize(chapter_count + 1)
+	for c in range(chapter_count + 1):
+		chapter_numbers[c] = chapter_rows[c * 2]
+		chapter_first_verse[c] = chapter_rows[c * 2 + 1]
+
+	book_names.clear()
+	book_first_chapter.clear()
+	book_chapter_count.clear()
+	book_index.clear()
+	for b in range(book_count):
+		var name = pool_string(book_rows[b * 4], book_rows[b * 4 + 1])
+		book_index[name.to_lower()] = b
+		book_names.append(name)
+		book_first_chapter.append(book_rows[b * 4 + 2])
+		book_chapter_count.append(book_rows[b * 4 + 3])
+	return true
+
+func is_loaded() -> bool:
+	return not verse_offsets.is_empty()
+
+func pool_string(start: int, end: int) -> String:
+	return read_bytes(pool_offset + start, end - start).get_string_from_utf8()
+
+func get_chapter_count() -> int:
+	return chapter_numbers.size() - 1
+
+func get_verse_count() -> int:
+	return verse_offsets.size() - 1
+
+# Text of the verse with global (linear) index
+func get_verse_text(index: int) -> String:
+	if index < 0 or index >= get_verse_count():
+		return ""
+	return pool_string(verse_offsets[index], verse_offsets[index + 1])
+
+# Texts of the verses of a global chapter index, read as one span of the pool
+func get_chapter_texts(chapter: int) -> PackedStringArray:
+	var verses = PackedStringArray()
+	if chapter < 0 or chapter >= get_chapter_count():
+		return verses
+	var first = chapter_first_verse[chapter]
+	var end = chapter_first_verse[chapter + 1]
+	var base = verse_offsets[first]
+	var span = read_bytes(pool_offset + base, verse_offsets[end] - base)
+	for v in range(first, end):
+		verses.append(span.slice(verse_offsets[v] - base, verse_offsets[v + 1] - base).get_string_from_utf8())
+	return verses
+
+
+# --- Lookup helpers ---
+# Global chapter index, or -1
+func get_chapter_index(book_name: String, chapter_num: int) -> int:
+	var b = book_index.get(book_name.to_lower(), -1)
+	if b < 0:
+		return -1
+	var first = book_first_chapter[b]
+	# Chapters are numbered 1..n in order, so try the direct slot first
+	var c = first + chapter_num - 1
+	if chapter_num >= 1 and chapter_num <= book_chapter_count[b] and chapter_numbers[c] == chapter_num:
+		return c
+	for i in range(first, first + book_chapter_count[b]):
+		if chapter_numbers[i] == chapter_num:
+			return i
+	return -1
+
+func get_chapter_verses(book_name: String, chapter_num: int) -> PackedStringArray:
+	return get_chapter_texts(get_chapter_index(book_name, chapter_num))
+
+func get_verse(book_name: String, chapter_num: int, verse_num: int) -> String:
+	var c = get_chapter_index(book_name, chapter_num)
+	if c < 0:
+		return ""
+	var index = chapter_first_verse[c] + verse_num - 1
+	if verse_num < 1 or index >= chapter_first_verse[c + 1]:
+		return ""
+	return get_verse_text(index)
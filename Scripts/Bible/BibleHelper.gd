@@ -2,48 +2,235 @@ extends Node
 # =======================================
 # BibleHelper.gd (singleton)
 # =======================================
+# Two backends behind the same lookups:
+# - eager: the whole of kjv.json parsed into bible_data (load_bible)
+# - lazy:  the header and offset tables of kjv.bin (Bible/kjv_binary.py,
+#          read through BibleBinary.open_file) loaded up front, and each
+#          chapter's verses read from the file on first use, with the most
+#          recently used chapters kept (load_binary)
 
-var bible_data: Array = []
+const BIBLE_PATH = "res://Bible/kjv.json"
+const BINARY_PATH = "res://Bible/kjv.bin"
+
+var bible_data: Array = []  # eager backend only
+
+# --- Lazy backend, set up by load_binary() ---
+var lazy: bool = false
+var chapter_cache_limit: int = 64  # decoded chapters kept in memory
+var binary: BibleBinary = null  # chapter ordinals are its global chapter indexes
+var chapter_cache: Dictionary = {}  # chapter ordinal -> chapter, least recently used first
+var chapters_parsed: int = 0  # chapters read from kjv.bin
+
+# --- Indexes, built by build_indexes() or load_binary() ---
+var book_names: PackedStringArray = PackedStringArray()  # book index -> name
+var book_lookup: Dictionary = {}  # normalized book name -> book index
+var chapter_lookup: Array = []  # per book: chapter number -> chapter ordinal
+var chapter_book: PackedInt32Array = PackedInt32Array()  # chapter ordinal -> book index
+var chapter_entry: PackedInt32Array = PackedInt32Array()  # chapter ordinal -> index in book["chapters"]
+var chapter_numbers: PackedInt32Array = PackedInt32Array()  # chapter ordinal -> chapter number
+var chapter_first_verse: PackedInt32Array = PackedInt32Array()  # chapter ordinal -> first verse ordinal (+ end sentinel)
+var verse_chapter: PackedInt32Array = PackedInt32Array()  # verse ordinal -> chapter ordinal
+var verse_numbers: PackedInt32Array = PackedInt32Array()  # verse ordinal -> verse number
 
 func _ready() -> void:
-	# Optional: auto-load on startup
-	load_bible("res://Bible/kjv.json")
+	# Optional: auto-load on startup, on demand if the binary was generated
+	if FileAccess.file_exists(BINARY_PATH):
+		load_binary(BINARY_PATH)
+	else:
+		load_bible(BIBLE_PATH)
 
 
 # --- Load Bible JSON ---
 func load_bible(path: String) -> void:
 	var f := FileAccess.open(path, FileAccess.READ)
 	if f:
+		close_binary()
 		bible_data = JSON.parse_string(f.get_as_text())
 		f.close()
+		build_indexes()
 	else:
 		push_error("Bible file not found at %s" % path)
 
 
-# --- Lookup helpers ---
-func get_book(book_name: String) -> Dictionary:
+# --- Load kjv.bin (lazy backend) ---
+func load_binary(path: String) -> bool:
+	var opened := BibleBinary.new()
+	if not opened.open_file(path):
+		return false
+
+	close_binary()
+	bible_data = []
+	clear_indexes()
+	lazy = true
+	binary = opened
+	# kjv.bin numbers verses 1..n in every chapter
+	for b in range(binary.book_names.size()):
+		index_book(binary.book_names[b])
+		var first := binary.book_first_chapter[b]
+		for c in range(first, first + binary.book_chapter_count[b]):
+			var ordinal := index_chapter(b, binary.chapter_numbers[c], c - first)
+			for v in range(binary.chapter_first_verse[c + 1] - binary.chapter_first_verse[c]):
+				verse_chapter.append(ordinal)
+				verse_numbers.append(v + 1)
+	chapter_first_verse.append(verse_numbers.size())
+	return true
+
+func close_binary() -> void:
+	lazy = false
+	binary = null
+	chapter_cache.clear()
+
+func set_chapter_cache_limit(limit: int) -> void:
+	chapter_cache_limit = max(limit, 1)
+	while chapter_cache.size() > chapter_cache_limit:
+		chapter_cache.erase(chapter_cache.keys()[0])
+
+# {"chapter", "verses"} for an ordinal, read from kjv.bin through the LRU cache
+func load_chapter(ordinal: int) -> Dictionary:
+	var chapter = chapter_cache.get(ordinal)
+	if chapter != null:
+		# Re-insert to mark it most recently used (Dictionary keeps insertion order)
+		chapter_cache.erase(ordinal)
+		chapter_cache[ordinal] = chapter
+		return chapter
+	var verses = []
+	var texts := binary.get_chapter_texts(ordinal)
+	for v in range(texts.size()):
+		verses.append({"verse": v + 1, "text": texts[v]})
+	chapter = {"chapter": chapter_numbers[ordinal], "verses": verses}
+	chapters_parsed += 1
+	while chapter_cache.size() >= max(chapter_cache_limit, 1):
+		chapter_cache.erase(chapter_cache.keys()[0])
+	chapter_cache[ordinal] = chapter
+	return chapter
+
+
+# --- Indexes ---
+static func normalize_book_name(book_name: String) -> String:
+	return " ".join(book_name.strip_edges().to_lower().split(" ", false))
+
+func clear_indexes() -> void:
+	book_names.clear()
+	book_lookup.clear()
+	chapter_lookup.clear()
+	chapter_book.clear()
+	chapter_entry.clear()
+	chapter_numbers.clear()
+	chapter_first_verse.clear()
+	verse_chapter.clear()
+	verse_numbers.clear()
+
+func index_book(book_name: String) -> int:
+	var b := book_names.size()
+	book_lookup[normalize_book_name(book_name)] = b
+	book_names.append(book_name)
+	chapter_lookup.append({})
+	return b
+
+func index_chapter(b: int, chapter_num: int, entry: int) -> int:
+	var ordinal := chapter_book.size()
+	chapter_lookup[b][chapter_num] = ordinal
+	chapter_book.append(b)
+	chapter_entry.append(entry)
+	chapter_numbers.append(chapter_num)
+	chapter_first_verse.append(verse_numbers.size())
+	return ordinal
+
+# Verse ordinals number every verse 0..n-1 in reading order, chapter
+# ordinals every chapter, so lookups and navigation are array indexing
+func build_indexes() -> void:
+	clear_indexes()
 	for book in bible_data:
-		if book["book"].to_lower() == book_name.to_lower():
-			return book
-	return {}
+		var b := index_book(book["book"])
+		for c in range(book["chapters"].size()):
+			var chap = book["chapters"][c]
+			var ordinal := index_chapter(b, int(chap["chapter"]), c)
+			for v in chap["verses"]:
+				verse_chapter.append(ordinal)
+				verse_numbers.append(int(v["verse"]))
+	chapter_first_verse.append(verse_numbers.size())
 
-func get_chapter(book_name: String, chapter_num: int) -> Dictionary:
-	var book := get_book(book_name)
-	if book.is_empty():
+func get_book_index(book_name: String) -> int:
+	return book_lookup.get(normalize_book_name(book_name), -1)
+
+func get_chapter_ordinal(book_name: String, chapter_num: int) -> int:
+	var b := get_book_index(book_name)
+	if b < 0:
+		return -1
+	return chapter_lookup[b].get(chapter_num, -1)
+
+func get_verse_ordinal(book_name: String, chapter_num: int, verse_num: int) -> int:
+	var c := get_chapter_ordinal(book_name, chapter_num)
+	if c < 0:
+		return -1
+	var first := chapter_first_verse[c]
+	var end := chapter_first_verse[c + 1]
+	# Verses are numbered 1..n, so verse_num - 1 is the offset; scan only if the numbering has gaps
+	var ordinal := first + verse_num - 1
+	if ordinal >= first and ordinal < end and verse_numbers[ordinal] == verse_num:
+		return ordinal
+	for i in range(first, end):
+		if verse_numbers[i] == verse_num:
+			return i
+	return -1
+
+func get_verse_count() -> int:
+	return verse_numbers.size()
+
+# {"chapter", "verses"} for a chapter ordinal, or {} if out of range
+func get_chapter_by_ordinal(ordinal: int) -> Dictionary:
+	if ordinal < 0 or ordinal >= chapter_book.size():
 		return {}
-	for chap in book["chapters"]:
-		if chap["chapter"] == chapter_num:
-			return chap
-	return {}
+	if lazy:
+		return load_chapter(ordinal)
+	return bible_data[chapter_book[ordinal]]["chapters"][chapter_entry[ordinal]]
 
-func get_verse(book_name: String, chapter_num: int, verse_num: int) -> String:
-	var chapter := get_chapter(book_name, chapter_num)
+func get_verse_by_ordinal(ordinal: int) -> String:
+	if ordinal < 0 or ordinal >= verse_numbers.size():
+		return ""
+	var c := verse_chapter[ordinal]
+	var chapter := get_chapter_by_ordinal(c)
 	if chapter.is_empty():
 		return ""
-	for v in chapter["verses"]:
-		if v["verse"] == verse_num:
-			return v["text"]
-	return ""
+	return chapter["verses"][ordinal - chapter_first_verse[c]]["text"]
+
+# {"book", "chapter", "verse"} for a verse ordinal, or {} if out of range
+func get_verse_reference(ordinal: int) -> Dictionary:
+	if ordinal < 0 or ordinal >= verse_numbers.size():
+		return {}
+	var c := verse_chapter[ordinal]
+	return {
+		"book": book_names[chapter_book[c]],
+		"chapter": chapter_numbers[c],
+		"verse": verse_numbers[ordinal]
+	}
+
+# Next/previous verse across chapter and book boundaries, or -1 at either end
+func get_next_verse_ordinal(ordinal: int) -> int:
+	return ordinal + 1 if ordinal >= 0 and ordinal + 1 < verse_numbers.size() else -1
+
+func get_previous_verse_ordinal(ordinal: int) -> int:
+	return ordinal - 1 if ordinal > 0 and ordinal < verse_numbers.size() else -1
+
+
+# --- Lookup helpers ---
+func get_book(book_name: String) -> Dictionary:
+	var b := get_book_index(book_name)
+	if b < 0:
+		return {}
+	if not lazy:
+		return bible_data[b]
+	# Lazy: parses every chapter of the book
+	var chapters = []
+	for ordinal in chapter_lookup[b].values():
+		chapters.append(get_chapter_by_ordinal(ordinal))
+	return {"book": book_names[b], "chapters": chapters}
+
+func get_chapter(book_name: String, chapter_num: int) -> Dictionary:
+	return get_chapter_by_ordinal(get_chapter_ordinal(book_name, chapter_num))
+
+func get_verse(book_name: String, chapter_num: int, verse_num: int) -> String:
+	return get_verse_by_ordinal(get_verse_ordinal(book_name, chapter_num, verse_num))
 
 
 # --- Chapter as text ---
@@ -54,13 +241,13 @@ func get_chapter_text(book_name: String, chapter_num: int, mode: int = 1) -> Str
 	if chapter.is_empty():
 		return ""
 	
-	var output := ""
+	var parts := PackedStringArray()
 	if mode == 1:
-		# Book name + chapter header
-		output += "%s %d\n\n" % [book_name, chapter_num]
+		# Book name + chapter header, then the verses as one paragraph
 		for v in chapter["verses"]:
-			output += v["text"] + " "
+			parts.append(v["text"])
+		return ("%s %d\n\n%s" % [book_name, chapter_num, " ".join(parts)]).strip_edges()
 	elif mode == 2:
 		for v in chapter["verses"]:
-			output += "%s %d:%d %s\n" % [book_name, chapter_num, v["verse"], v["text"]]
-	return output.strip_edges()
+			parts.append("%s %d:%d %s" % [book_name, chapter_num, v["verse"], v["text"]])
+	return "\n".join(parts).strip_edges()
@@ -0,0 +1,247 @@
+extends RefCounted
+class_name BibleSearch
+# =======================================
+# BibleSearch.gd
+# =======================================
+# Word, AND and phrase queries over the full-text index written by
+#   python Bible/kjv_search_index.py
+# (layout there). Loading decodes only the term dictionary; a term's
+# delta-encoded postings are decoded on first use and kept in a small LRU
+# cache.
+# Results are verse ordinals, the same numbering as BibleHelper's, so
+# BibleHelper.get_verse_reference() / get_verse_by_ordinal() resolve them.
+
+const MAGIC = "KJVS"
+const VERSION = 1
+const HEADER_SIZE = 36
+const TOKEN_PATTERN = "[a-z0-9]+(?:'[a-z0-9]+)*"  # must match kjv_search_index.py
+const CACHE_LIMIT = 256  # decoded terms kept, least recently used evicted first
+
+var data : PackedByteArray = PackedByteArray()
+var verse_count : int = 0
+var postings_offset : int = 0
+var term_lookup : Dictionary = {}  # term -> term index
+var verses_start : PackedInt32Array = PackedInt32Array()  # term_count + 1 entries
+var positions_start : PackedInt32Array = PackedInt32Array()
+var verse_freq : PackedInt32Array = PackedInt32Array()
+var verse_cache : Dictionary = {}  # term index -> PackedInt32Array of verse ordinals, least recently used first
+var position_cache : Dictionary = {}  # term index -> [PackedInt32Array starts, PackedInt32Array positions], same order
+var token_regex : RegEx = RegEx.create_from_string(TOKEN_PATTERN)
+
+
+func load_file(path: String) -> bool:
+	if not FileAccess.file_exists(path):
+		push_error("Bible search index not found at %s" % path)
+		return false
+	data = FileAccess.get_file_as_bytes(path)
+	if data.size() < HEADER_SIZE or data.slice(0, 4).get_string_from_ascii() != MAGIC \
+			or data.decode_u16(4) != VERSION:
+		push_error("Not a version %d Bible search index: %s" % [VERSION, path])
+		data = PackedByteArray()
+		return false
+
+	verse_count = data.decode_u32(8)
+	var term_count = data.decode_u32(12)
+	var pool_offset = data.decode_u32(16)
+	var pool_size = data.decode_u32(20)
+	var dict_offset = data.decode_u32(24)
+	postings_offset = data.decode_u32(28)
+
+	var rows = data.slice(dict_offset, dict_offset + (term_count + 1) * 12).to_int32_array()
+	verses_start.resize(term_count + 1)
+	positions_start.resize(term_count + 1)
+	verse_freq.resize(term_count + 1)
+	for t in range(term_count + 1):
+		verses_start[t] = rows[t * 3]
+		positions_start[t] = rows[t * 3 + 1]
+		verse_freq[t] = rows[t * 3 + 2]
+
+	term_lookup.clear()
+	verse_cache.clear()
+	position_cache.clear()
+	if term_count > 0:
+		var terms = data.slice(pool_offset, pool_offset + pool_size).get_string_from_utf8().split("\n")
+		for t in range(terms.size()):
+			term_lookup[terms[t]] = t
+	return true
+
+func is_loaded() -> bool:
+	return not verse_freq.is_empty()
+
+func tokenize(text: String) -> PackedStringArray:
+	var terms = PackedStringArray()
+	for m in token_regex.search_all(text.to_lower()):
+		terms.append(m.get_string())
+	return terms
+
+func get_term_index(term: String) -> int:
+	return term_lookup.get(term, -1)
+
+# Number of verses holding the term
+func get_verse_frequency(term: String) -> int:
+	var t = get_term_index(term)
+	return verse_freq[t] if t >= 0 else 0
+
+
+# --- Postings ---
+# Verse ordinals holding term index t, in order
+func decode_verses(t: int) -> PackedInt32Array:
+	var cached = get_cached(verse_cache, t)
+	if cached != null:
+		return cached
+	var verses = PackedInt32Array()
+	verses.resize(verse_freq[t])
+	var i = postings_offset + verses_start[t]
+	var ordinal = 0
+	for n in range(verses.size()):
+		var value = 0
+		var shift = 0
+		var byte = data[i]
+		i += 1
+		while byte >= 0x80:
+			value |= (byte & 0x7F) << shift
+			shift += 7
+			byte = data[i]
+			i += 1
+		ordinal += value | (byte << shift)
+		verses[n] = ordinal
+	cache_term(verse_cache, t, verses)
+	return verses
+
+# [starts, positions] for term index t: the n-th verse of decode_verses(t)
+# holds the term at positions[starts[n]] .. positions[starts[n + 1] - 1]
+func decode_positions(t: int) -> Array:
+	var cached = get_cached(position_cache, t)
+	if cached != null:
+		return cached
+	var starts = PackedInt32Array()
+	var positions = PackedInt32Array()
+	var i = postings_offset + positions_start[t]
+	var end = postings_offset + verses_start[t + 1]
+	var remaining = 0
+	var position = 0
+	while i < end:
+		var value = 0
+		var shift = 0
+		var byte = data[i]
+		i += 1
+		while byte >= 0x80:
+			value |= (byte & 0x7F) << shift
+			shift += 7
+			byte = data[i]
+			i += 1
+		value |= byte << shift
+		if remaining == 0:
+			# Occurrence count, starting the next verse
+			starts.append(positions.size())
+			remaining = value
+			position = 0
+		else:
+			position += value
+			positions.append(position)
+			remaining -= 1
+	starts.append(positions.size())
+	var decoded = [starts, positions]
+	cache_term(position_cache, t, decoded)
+	return decoded
+
+# Cached value for term index t, or null; a hit marks it most recently used
+func get_cached(cache: Dictionary, t: int):
+	var value = cache.get(t)
+	if value != null:
+		# Re-insert at the end (Dictionary keeps insertion order)
+		cache.erase(t)
+		cache[t] = value
+	return value
+
+func cache_term(cache: Dictionary, t: int, value) -> void:
+	while cache.size() >= CACHE_LIMIT:
+		# The first key is the least recently used; iterating reaches it without copying the keys
+		for oldest in cache:
+			cache.erase(oldest)
+			break
+	cache[t] = value
+
+# Term indices of the query's words, or empty if any word is not in the index
+func get_query_terms(query: String) -> PackedInt32Array:
+	var indices = PackedInt32Array()
+	for term in tokenize(query):
+		var t = get_term_index(term)
+		if t < 0:
+			return PackedInt32Array()
+		indices.append(t)
+	return indices
+
+static func intersect(small: PackedInt32Array, large: PackedInt32Array) -> PackedInt32Array:
+	var result = PackedInt32Array()
+	for ordinal in small:
+		var i = large.bsearch(ordinal)
+		if i < large.size() and large[i] == ordinal:
+			result.append(ordinal)
+	return result
+
+
+# --- Queries (verse ordinals, in reading order) ---
+# Verses holding the word, tokenized like the index ("Lord," finds "lord");
+# empty unless it is exactly one term
+func find_word(word: String) -> PackedInt32Array:
+	var terms = tokenize(word)
+	if terms.size() != 1:
+		return PackedInt32Array()
+	var t = get_term_index(terms[0])
+	return decode_verses(t) if t >= 0 else PackedInt32Array()
+
+# Verses holding every word of the query
+func find_all(query: String) -> PackedInt32Array:
+	var indices = get_query_terms(query)
+	if indices.is_empty():
+		return PackedInt32Array()
+	var lists = []
+	for t in indices:
+		lists.append(decode_verses(t))
+	# Rarest first keeps every intermediate result small
+	lists.sort_custom(func(a, b): return a.size() < b.size())
+	var result = lists[0]
+	for k in range(1, lists.size()):
+		result = intersect(result, lists[k])
+	return result
+
+# Verses holding the query's words consecutively
+func find_phrase(query: String) -> PackedInt32Array:
+	var indices = get_query_terms(query)
+	if indices.is_empty():
+		return PackedInt32Array()
+	var candidates = find_all(query)
+	if indices.size() == 1:
+		return candidates
+	var verses = []
+	var postings = []
+	for t in indices:
+		verses.append(decode_verses(t))
+		postings.append(decode_positions(t))
+
+	var result = PackedInt32Array()
+	for ordinal in candidates:
+		# Each word's positions in this verse, as [start, end) into its positions array
+		var ranges = PackedInt32Array()
+		for k in range(indices.size()):
+			var slot = verses[k].bsearch(ordinal)
+			ranges.append(postings[k][0][slot])
+			ranges.append(postings[k][0][slot + 1])
+		var first = postings[0][1]
+		for p in range(ranges[0], ranges[1]):
+			var matched = true
+			for k in range(1, indices.size()):
+				var positions = postings[k][1]
+				var found = false
+				for q in range(ranges[k * 2], ranges[k * 2 + 1]):
+					if positions[q] == first[p] + k:
+						found = true
+						break
+				if not found:
+					matched = false
+					break
+			if matched:
+				result.append(ordinal)
+				break
+	return result
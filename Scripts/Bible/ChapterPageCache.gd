@@ -0,0 +1,151 @@
+extends RefCounted
+class_name ChapterPageCache
+# =======================================
+# ChapterPageCache.gd
+# =======================================
+# Wrapped, paginated chapter text for the readers, keyed by
+# (book, chapter, mode, cols) and kept under an LRU bound. An entry is
+#   {"lines": PackedStringArray, "paragraphs": PackedInt32Array, "pages": PackedInt32Array}
+# where paragraphs/pages hold the first line of each text paragraph/page.
+# Misses are read from the precomputed payload written by
+#   python Bible/kjv_page_cache.py Bible/kjv.json --cols 80
+# when it has the key, otherwise BibleHelper.get_chapter_text() is wrapped
+# once with TextUtils.word_wrap().
+
+const INDEX_PATH = "res://Bible/kjv_pages_index.json"
+const INDEX_VERSION = 1
+
+var limit : int = 32  # entries kept
+var page_rows : int = 25
+var entries : Dictionary = {}  # key -> entry, least recently used first
+var precomputed_file : FileAccess = null
+var precomputed : Dictionary = {}  # key -> [offset, length] in precomputed_file
+var precomputed_rows : int = 0
+var chapters_wrapped : int = 0
+var entries_read : int = 0
+
+
+func _init(rows: int = 25, max_entries: int = 32) -> void:
+	page_rows = rows
+	limit = max_entries
+
+static func make_key(book_name: String, chapter_num: int, mode: int, cols: int) -> String:
+	return "%s|%d|%d|%d" % [book_name, chapter_num, mode, cols]
+
+func load_precomputed(path: String = INDEX_PATH) -> bool:
+	var f := FileAccess.open(path, FileAccess.READ)
+	if not f:
+		push_error("Page cache index not found at %s" % path)
+		return false
+	var index = JSON.parse_string(f.get_as_text())
+	f.close()
+	if typeof(index) != TYPE_DICTIONARY or int(index.get("version", 0)) != INDEX_VERSION:
+		push_error("Not a version %d page cache index: %s" % [INDEX_VERSION, path])
+		return false
+	var payload_path: String = path.get_base_dir().path_join(index["payload"])
+	precomputed_file = FileAccess.open(payload_path, FileAccess.READ)
+	if not precomputed_file:
+		push_error("Page cache payload not found at %s" % payload_path)
+		precomputed.clear()
+		return false
+	precomputed = index["entries"]
+	precomputed_rows = int(index["rows"])
+	return true
+
+func set_page_rows(rows: int) -> void:
+	if rows == page_rows:
+		return
+	page_rows = rows
+	for entry in entries.values():
+		entry["pages"] = paginate(entry["paragraphs"], entry["lines"].size(), page_rows)
+
+func clear() -> void:
+	entries.clear()
+
+
+# --- Entries ---
+# The entry for a chapter, or {} if BibleHelper has no such chapter
+func get_entry(book_name: String, chapter_num: int, mode: int, cols: int) -> Dictionary:
+	# Key on the canonical name so "psalm" and "Psalm" share an entry
+	var b = BibleHelper.get_book_index(book_name)
+	if b < 0:
+		return {}
+	var key = make_key(BibleHelper.book_names[b], chapter_num, mode, cols)
+	var entry = entries.get(key)
+	if entry != null:
+		# Re-insert to mark it most recently used (Dictionary keeps insertion order)
+		entries.erase(key)
+		entries[key] = entry
+		return entry
+
+	entry = read_precomputed(key)
+	if entry.is_empty():
+		entry = wrap_chapter(BibleHelper.get_chapter_text(BibleHelper.book_names[b], chapter_num, mode), cols)
+		if entry.is_empty():
+			return {}
+	while entries.size() >= max(limit, 1):
+		entries.erase(entries.keys()[0])
+	entries[key] = entry
+	return entry
+
+func read_precomputed(key: String) -> Dictionary:
+	var row = precomputed.get(key)
+	if row == null:
+		return {}
+	precomputed_file.seek(int(row[0]))
+	var data = JSON.parse_string(precomputed_file.get_buffer(int(row[1])).get_string_from_utf8())
+	if typeof(data) != TYPE_DICTIONARY:
+		push_error("Bad page cache entry %s" % key)
+		return {}
+	entries_read += 1
+	var paragraphs = PackedInt32Array(data["paragraphs"])
+	var lines = PackedStringArray(data["lines"])
+	var pages = PackedInt32Array(data["pages"])
+	if precomputed_rows != page_rows:
+		pages = paginate(paragraphs, lines.size(), page_rows)
+	return {"lines": lines, "paragraphs": paragraphs, "pages": pages}
+
+# Wraps each paragraph separately, so its first line is known
+func wrap_chapter(text: String, cols: int) -> Dictionary:
+	if text.is_empty():
+		return {}
+	chapters_wrapped += 1
+	var lines = PackedStringArray()
+	var paragraphs = PackedInt32Array()
+	for paragraph in text.split("\n"):
+		paragraphs.append(lines.size())
+		lines.append_array(TextUtils.word_wrap(paragraph, cols))
+	return {"lines": lines, "paragraphs": paragraphs, "pages": paginate(paragraphs, lines.size(), page_rows)}
+
+# First line of each page: a page ends before the last paragraph that starts within it
+static func paginate(paragraphs: PackedInt32Array, line_count: int, rows: int) -> PackedInt32Array:
+	var pages = PackedInt32Array([0])
+	var start = 0
+	while start + rows < line_count:
+		var end = start + rows
+		var last = paragraphs[paragraphs.bsearch(end, false) - 1]
+		start = last if last > start else end
+		pages.append(start)
+	return pages
+
+
+# --- Convenience ---
+func get_lines(book_name: String, chapter_num: int, mode: int, cols: int) -> PackedStringArray:
+	var entry = get_entry(book_name, chapter_num, mode, cols)
+	return entry["lines"] if not entry.is_empty() else PackedStringArray()
+
+func get_page_count(book_name: String, chapter_num: int, mode: int, cols: int) -> int:
+	var entry = get_entry(book_name, chapter_num, mode, cols)
+	return entry["pages"].size() if not entry.is_empty() else 0
+
+func get_page(book_name: String, chapter_num: int, mode: int, cols: int, page: int) -> PackedStringArray:
+	var entry = get_entry(book_name, chapter_num, mode, cols)
+	if entry.is_empty() or page < 0 or page >= entry["pages"].size():
+		return PackedStringArray()
+	var pages: PackedInt32Array = entry["pages"]
+	var end = pages[page + 1] if page + 1 < pages.size() else entry["lines"].size()
+	return entry["lines"].slice(pages[page], end)
+
+# Page holding a line, for the readers' scroll position
+static func page_of_line(pages: PackedInt32Array, line: int) -> int:
+	return max(pages.bsearch(line, false) - 1, 0)
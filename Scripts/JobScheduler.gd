@@ -0,0 +1,273 @@
+extends Node
+
+# Priority job scheduler (autoload as JobScheduler).
+#
+# A job has an optional work Callable, run on a WorkerThreadPool thread, and
+# an optional done Callable, run on the main thread once work has finished.
+# Jobs without work only have the main-thread part (for anything touching
+# the scene tree or shared state).
+# - priority: lower runs first (VoxelWorld uses squared chunk distance).
+#   Ready jobs are handed to at most worker_count workers at a time, so the
+#   pool's own FIFO order never overrides priority.
+# - dependencies: a job becomes ready once every job it depends on is done
+#   (its done callback has run) or cancelled, e.g. generate -> light -> mesh.
+# - groups: jobs can be tagged with a group (e.g. chunk coordinates) to
+#   cancel or reprioritize them together.
+# - cancellation: a cancelled job's done callback never runs; work that is
+#   already running is finished and thrown away. Cancelling a job doesn't
+#   cancel its dependents (cancel their group for that).
+# - done callbacks run in priority order until frame_budget_usec is used up
+#   each frame (at least one per frame).
+# get_stats() reports queue depths, latencies and worker utilization.
+
+enum JobState {WAITING, READY, RUNNING, COMPLETING, DONE, CANCELLED}
+
+class Job:
+	var work: Callable # runs on a worker (optional)
+	var done: Callable # runs on the main thread after work (optional)
+	var priority = 0.0
+	var group = null
+	var state = JobState.WAITING
+	var cancelled = false # cancelled while running; dropped when the worker finishes
+	var dependents = [] # jobs waiting for this one
+	var pending_dependencies = 0
+	var heap_sequence = -1 # sequence of this job's live heap entry
+	var task_id = -1 # WorkerThreadPool task while running
+	var scheduled_usec = 0
+	var ready_usec = 0
+	var started_usec = 0
+	var finished_usec = 0 # set by the worker
+
+var worker_count = max(1, OS.get_processor_count() - 1) # leave a core for the main thread
+var frame_budget_usec = 4000 # time for done callbacks per frame
+
+var ready_heap = [] # [priority, sequence, job] of jobs waiting for a worker
+var completion_heap = [] # [priority, sequence, job] of jobs waiting for their done callback
+var running = [] # jobs on workers
+var groups = {} # group -> Array of unfinished jobs
+var next_sequence = 0 # also breaks priority ties in scheduling order
+var state_counts = {}
+
+# stats since reset_stats()
+var stats_start_usec = 0
+var started_count = 0 # jobs handed to workers
+var completed_count = 0
+var cancelled_count = 0
+var total_wait_usec = 0 # ready -> started on a worker
+var total_latency_usec = 0 # scheduled -> done
+var busy_usec = 0 # time workers spent in work
+
+func _init():
+	for state in JobState.values():
+		state_counts[state] = 0
+	reset_stats()
+
+func _process(_delta):
+	collect_finished_work()
+	dispatch()
+	run_completions()
+	dispatch() # jobs released by done callbacks
+
+func _exit_tree():
+	for job in running: # WorkerThreadPool tasks must always be waited for
+		WorkerThreadPool.wait_for_task_completion(job.task_id)
+	running.clear()
+
+# adds a job; returns it (for cancel and depends_on of later jobs)
+func schedule(work: Callable, priority = 0.0, depends_on = [], group = null, done = Callable()) -> Job:
+	var job = Job.new()
+	job.work = work
+	job.done = done
+	job.priority = priority
+	job.group = group
+	job.scheduled_usec = Time.get_ticks_usec()
+	state_counts[job.state] += 1
+	if group != null:
+		if not groups.has(group):
+			groups[group] = []
+		groups[group].append(job)
+	for dependency in depends_on:
+		if dependency != null and dependency.state != JobState.DONE and dependency.state != JobState.CANCELLED:
+			dependency.dependents.append(job)
+			job.pending_dependencies += 1
+	if job.pending_dependencies == 0:
+		make_ready(job)
+	return job
+
+func cancel(job):
+	if job.state == JobState.DONE or job.state == JobState.CANCELLED or job.cancelled:
+		return
+	if job.state == JobState.RUNNING:
+		job.cancelled = true # collect_finished_work finishes cancelling it
+		return
+	finish(job, JobState.CANCELLED)
+
+func cancel_group(group):
+	if not groups.has(group):
+		return
+	for job in groups[group].duplicate():
+		cancel(job)
+
+func set_priority(job, priority):
+	job.priority = priority
+	if job.state == JobState.READY:
+		heap_push(ready_heap, job) # the old entry is skipped when popped
+	elif job.state == JobState.COMPLETING:
+		heap_push(completion_heap, job)
+
+func set_group_priority(group, priority):
+	if not groups.has(group):
+		return
+	for job in groups[group]:
+		set_priority(job, priority)
+
+func has_group(group) -> bool:
+	return groups.has(group)
+
+# --- Running jobs ---
+func make_ready(job):
+	job.ready_usec = Time.get_ticks_usec()
+	if job.work.is_valid():
+		set_state(job, JobState.READY)
+		heap_push(ready_heap, job)
+	else:
+		set_state(job, JobState.COMPLETING)
+		heap_push(completion_heap, job)
+
+# hand the highest priority ready jobs to free workers
+func dispatch():
+	while running.size() < worker_count:
+		var job = heap_pop(ready_heap, JobState.READY)
+		if job == null:
+			return
+		set_state(job, JobState.RUNNING)
+		job.started_usec = Time.get_ticks_usec()
+		started_count += 1
+		total_wait_usec += job.started_usec - job.ready_usec
+		job.task_id = WorkerThreadPool.add_task(run_work.bind(job))
+		running.append(job)
+
+# runs on a worker
+func run_work(job):
+	job.work.call()
+	job.finished_usec = Time.get_ticks_usec()
+
+func collect_finished_work():
+	var still_running = []
+	for job in running:
+		if not WorkerThreadPool.is_task_completed(job.task_id):
+			still_running.append(job)
+			continue
+		WorkerThreadPool.wait_for_task_completion(job.task_id)
+		busy_usec += job.finished_usec - job.started_usec
+		if job.cancelled:
+			finish(job, JobState.CANCELLED)
+		else:
+			set_state(job, JobState.COMPLETING)
+			heap_push(completion_heap, job)
+	running = still_running
+
+# done callbacks, highest priority first, within this frame's budget
+func run_completions():
+	var start = Time.get_ticks_usec()
+	while Time.get_ticks_usec() - start < frame_budget_usec:
+		var job = heap_pop(completion_heap, JobState.COMPLETING)
+		if job == null:
+			return
+		if job.done.is_valid():
+			job.done.call()
+		if job.state == JobState.COMPLETING: # unless done cancelled it
+			finish(job, JobState.DONE)
+
+func finish(job, state):
+	set_state(job, state)
+	if state == JobState.DONE:
+		completed_count += 1
+		total_latency_usec += Time.get_ticks_usec() - job.scheduled_usec
+	else:
+		cancelled_count += 1
+	if job.group != null and groups.has(job.group):
+		groups[job.group].erase(job)
+		if groups[job.group].is_empty():
+			groups.erase(job.group)
+	for dependent in job.dependents:
+		dependent.pending_dependencies -= 1
+		if dependent.pending_dependencies == 0 and dependent.state == JobState.WAITING:
+			make_ready(dependent)
+	job.dependents.clear()
+
+func set_state(job, state):
+	state_counts[job.state] -= 1
+	state_counts[state] += 1
+	job.state = state
+
+# --- Priority heaps ---
+# entries are [priority, sequence, job]; an entry is stale once its job has
+# been pushed again (new priority) or has left the heap's state
+func heap_push(heap, job):
+	job.heap_sequence = next_sequence
+	next_sequence += 1
+	heap.append([job.priority, job.heap_sequence, job])
+	var i = heap.size() - 1
+	while i > 0:
+		var parent = (i - 1) / 2
+		if not entry_before(heap[i], heap[parent]):
+			break
+		var swap = heap[i]
+		heap[i] = heap[parent]
+		heap[parent] = swap
+		i = parent
+
+# pops entries until one is live for a job in state; returns its job or null
+func heap_pop(heap, state):
+	while not heap.is_empty():
+		var top = heap[0]
+		var last = heap.pop_back()
+		if not heap.is_empty():
+			heap[0] = last
+			var i = 0
+			while true:
+				var smallest = i
+				for child in [2 * i + 1, 2 * i + 2]:
+					if child < heap.size() and entry_before(heap[child], heap[smallest]):
+						smallest = child
+				if smallest == i:
+					break
+				var swap = heap[i]
+				heap[i] = heap[smallest]
+				heap[smallest] = swap
+				i = smallest
+		var job = top[2]
+		if job.state == state and job.heap_sequence == top[1]:
+			return job
+	return null
+
+static func entry_before(a, b) -> bool:
+	return a[0] < b[0] or (a[0] == b[0] and a[1] < b[1])
+
+# --- Stats ---
+func reset_stats():
+	stats_start_usec = Time.get_ticks_usec()
+	started_count = 0
+	completed_count = 0
+	cancelled_count = 0
+	total_wait_usec = 0
+	total_latency_usec = 0
+	busy_usec = 0
+
+# queue depths (jobs per state right now) plus, since reset_stats(): jobs
+# completed/cancelled, mean wait for a worker, mean latency from schedule()
+# to done, and the share of worker time spent in work
+func get_stats() -> Dictionary:
+	var elapsed = max(Time.get_ticks_usec() - stats_start_usec, 1)
+	return {
+		"waiting": state_counts[JobState.WAITING],
+		"ready": state_counts[JobState.READY],
+		"running": state_counts[JobState.RUNNING],
+		"completing": state_counts[JobState.COMPLETING],
+		"completed": completed_count,
+		"cancelled": cancelled_count,
+		"mean_wait_ms": total_wait_usec / 1000.0 / max(started_count, 1),
+		"mean_latency_ms": total_latency_usec / 1000.0 / max(completed_count, 1),
+		"utilization": float(busy_usec) / (elapsed * worker_count),
+	}
@@ -0,0 +1,62 @@
+extends RefCounted
+class_name MeshArrays
+
+# =======================================
+# MeshArrays.gd
+# =======================================
+# Raw triangle arrays for one mesh build: filled on a worker, turned into an
+# ArrayMesh on the main thread (commit). Every build gets its own, so grids
+# can mesh at the same time (unlike the shared SurfaceTools they replace).
+# Each surface (one per material, under any sortable key) has its own
+# vertex/normal/uv/uv2/index arrays. Quads are drawn like
+# MeshHelper.draw_quad (triangles 0,1,2 and 0,2,3), but indexed as they go
+# and with the face normal given instead of generated.
+# Collision boxes are collected alongside, as center/size pairs.
+
+const QUAD_INDICES = [0, 1, 2, 0, 2, 3]
+
+var surfaces = {} # key -> [vertices, normals, uvs, uv2s, indices]
+var boxes := PackedVector3Array() # center, size, center, size, ...
+
+func add_quad(key, verts, normal: Vector3, uvs, uv2s):
+	if not surfaces.has(key):
+		surfaces[key] = [PackedVector3Array(), PackedVector3Array(), PackedVector2Array(), PackedVector2Array(), PackedInt32Array()]
+	var surface = surfaces[key]
+	var vertices = surface[0]
+	var base = vertices.size()
+	for i in range(4):
+		vertices.append(verts[i])
+		surface[1].append(normal)
+		surface[2].append(uvs[i])
+		surface[3].append(uv2s[i])
+	for i in QUAD_INDICES:
+		surface[4].append(base + i)
+
+func add_box(center: Vector3, size: Vector3):
+	boxes.append(center)
+	boxes.append(size)
+
+func get_vertex_count() -> int:
+	var total = 0
+	for key in surfaces:
+		total += surfaces[key][0].size()
+	return total
+
+# main thread: an ArrayMesh with one surface per key (in sorted key order),
+# each with the material material_for returns for its key
+func commit(material_for: Callable) -> ArrayMesh:
+	var mesh = ArrayMesh.new()
+	var keys = surfaces.keys()
+	keys.sort()
+	for key in keys:
+		var surface = surfaces[key]
+		var arrays = []
+		arrays.resize(Mesh.ARRAY_MAX)
+		arrays[Mesh.ARRAY_VERTEX] = surface[0]
+		arrays[Mesh.ARRAY_NORMAL] = surface[1]
+		arrays[Mesh.ARRAY_TEX_UV] = surface[2]
+		arrays[Mesh.ARRAY_TEX_UV2] = surface[3]
+		arrays[Mesh.ARRAY_INDEX] = surface[4]
+		mesh.add_surface_from_arrays(Mesh.PRIMITIVE_TRIANGLES, arrays)
+		mesh.surface_set_material(mesh.get_surface_count() - 1, material_for.call(key))
+	return mesh
@@ -1,18 +1,22 @@
-#TODO: change light level depending on voxel update, flood-fill light, and then update mesh instead of regenerating ALL light data
 extends MeshGrid
 class_name CubeGrid
 
-var voxel_data = []
-var light_data = []
-var ambient_lights = []
+var storage = VoxelStorage.new() # voxel ids, light levels and ambient light flags
+var lighting = null # VoxelLighting engine, created on first use
+var light_dirty = true # whether voxels changed since light data was last generated
 
 const texture_sheet_width = 4 # width of the voxel texture file in tiles
 const light_map_width = 4
 
 const ambient_light_level = 15
 
+var mesh_instance = null # shows the current mesh (see apply_mesh)
+var collision_boxes = [] # CollisionShape3Ds of the current mesh
+
 var grid_z_len = 16 # 3D grids have depth
 
+@export var world_seed = 0 # terrain generation seed (see TerrainGenerator.for_seed)
+
 const DIRECTION_NORMALS_ARRAY = [
 	[1, 0, 0],   # 0: +x
 	[-1, 0, 0],  # 1: -x
@@ -26,14 +30,13 @@ func _init():
 	super()
 
 func _ready():
-	voxel_data.resize(get_voxel_count())
-	light_data.resize(get_voxel_count())
-	ambient_lights.resize(get_voxel_count())
+	storage.resize(get_voxel_count())
 	
 	generate_voxel_data() # data initialization is not well-suited for multithreading with mesh updates, so just do it all at once
 	generate_light_data()
 
-# overrides MeshGrid.add_collision_shapes()
+# overrides MeshGrid.add_collision_shapes() (used by grids meshing on the main thread, like Workshop;
+# job-built meshes get their boxes from CubeMesher)
 func add_collision_shapes():
 	add_collision_boxes()
 
@@ -61,9 +64,15 @@ func get_voxel_count():
 func generate_voxel_data():
 	generate_test_data()
 
+# world voxel coordinates of this grid's [0,0,0] voxel, which terrain generation samples from
+func get_world_origin():
+	var origin = global_position.floor()
+	return [int(origin.x), int(origin.y), int(origin.z)]
+
 # empty the grid so that it's all air
 func clear_grid():
-	voxel_data.fill(Voxel.VoxelType.AIR) # air is the default for now
+	storage.fill_voxels(Voxel.VoxelType.AIR) # air is the default for now
+	light_dirty = true
 
 # children should replace the following test code with actual terrain generation
 func generate_test_data():
@@ -93,88 +102,144 @@ func generate_test_data():
 
 
 func reset_light_data():
-	ambient_lights.fill(false)
-	light_data.fill(0)
+	storage.clear_ambient()
+	storage.fill_light(0)
+
+# returns this grid's VoxelLighting, emptied and loaded with the current voxels
+func prepare_lighting():
+	if lighting == null:
+		lighting = VoxelLighting.new(grid_x_len, grid_y_len, grid_z_len)
+		lighting.grid = self
+	else:
+		lighting.clear()
+	lighting.load_voxels(storage.get_voxels())
+	return lighting
 
 func generate_light_data():
 	reset_light_data()
+	prepare_lighting()
 	
-	# First, set up ambient light from outside grid boundaries
-	for x in range(0, grid_x_len):
-		for y in range(0, grid_y_len):
-			for z in range(0, grid_z_len):
-				var coordinates = [x,y,z]
-				if Voxel.is_transparent(get_voxel(coordinates)):
-					# If this voxel is transparent and next to a boundary, it gets ambient light
-					if x == 0 or x == grid_x_len-1 or y == 0 or y == grid_y_len-1 or z == 0 or z == grid_z_len-1:
-						set_ambient_light(coordinates, true)
-						set_light_level(coordinates, ambient_light_level)
+	# First, set up ambient light from outside grid boundaries:
+	# transparent voxels next to a boundary get ambient light
+	for voxel_index in lighting.add_boundary_sources(ambient_light_level):
+		storage.set_ambient(voxel_index, true)
 	
-	# Then, flood fill from light sources and ambient light
-	for x in range(0, grid_x_len):
-		for y in range(0, grid_y_len):
-			for z in range(0, grid_z_len):
-				var coordinates = [x,y,z]
-				var voxel = get_voxel(coordinates)
-				var light_level = max(
-					get_light_level(coordinates),   # Either ambient or 0
-					Voxel.get_light_source_level(voxel)  # Any light from the block itself
-				)
-				if light_level > 0:
-					flood_fill_light(coordinates, light_level)
+	# Then, flood fill from light sources and ambient light, all in one pass
+	lighting.add_emitters()
+	lighting.propagate()
+	storage.load_light(lighting.light)
+	light_dirty = false
+	grid_data_changed = true
 
+# regenerate light data only if voxels changed since it was last generated
+func update_light_data():
+	if light_dirty or lighting == null:
+		generate_light_data()
+
+# copy the light of the dirty sections of every grid in dirty (a
+# VoxelLightUpdate result) into its storage and have it remeshed
+func apply_light_update(dirty):
+	for grid in dirty:
+		if grid is CubeGrid:
+			for section in dirty[grid]:
+				grid.storage.load_light_at(grid.lighting.light, grid.lighting.get_section_voxels(section))
+			grid.grid_data_changed = true
+
+# light start_coordinates at exactly light_level and flood fill outward from it
+# (light decreases by 1 each block and stops at solid blocks)
 func flood_fill_light(start_coordinates, light_level):
 	if not coordinates_within_bounds(start_coordinates):
 		print("Tried to start flood_fill_light from outside the grid. Bad!")
 		return
-		
-	var queue = []
-	var visited = {}  
-	var start_key = str(start_coordinates)  
-	queue.push_back([start_coordinates, light_level])
-	visited[start_key] = true
-
-	while not queue.is_empty():
-		var current = queue.pop_front()
-		var current_coordinates = current[0]
-		var current_light = current[1]
-		
-		# Set the light level for current block
-		set_light_level(current_coordinates, current_light)
-		
-		# If current block is solid, stop propagating light through it
-		if not Voxel.is_transparent(get_voxel(current_coordinates)):
-			continue
-			
-		# Otherwise spread to neighbors
-		for next_coordinates in get_surrounding_coordinates(current_coordinates):
-			if not coordinates_within_bounds(next_coordinates):
-				continue
-				
-			var next_key = str(next_coordinates)
-			if next_key in visited:
-				continue
-				
-			# Light decreases by 1 each block
-			var next_light = current_light - 1
-			if next_light <= 0:
-				continue
-				
-			if Voxel.is_transparent(get_voxel(next_coordinates)):
-				if get_light_level(next_coordinates) < next_light:
-					queue.push_back([next_coordinates, next_light])
-					visited[next_key] = true
-					
-	grid_data_changed = true
-
-func generate_mesh_data():
-	generate_light_data()
-	grid_data_changed = false # unless data changes AGAIN (after updating light data), don't bother making another mesh
 	
-	for x in range(0,grid_x_len):
-		for y in range(0,grid_y_len):
-			for z in range(0,grid_z_len):
-					draw_block_mesh([x,y,z])
+	if lighting == null:
+		prepare_lighting()
+	else:
+		lighting.load_voxels(storage.get_voxels())
+	lighting.light = storage.get_light_levels()
+	var update = VoxelLightUpdate.new()
+	update.touch(lighting)
+	lighting.set_source(calculate_voxel_index(start_coordinates), light_level)
+	apply_light_update(update.finish())
+
+# set_voxel, after bringing light data up to date so the edit is lit incrementally
+func edit_voxel(coordinates, value):
+	if not coordinates_within_bounds(coordinates): return {}
+	update_light_data()
+	return set_voxel(coordinates, value)
+
+# update light around the voxel at coordinates (whose id just changed)
+# instead of relighting the whole grid: only voxels within light range of it
+# are recomputed, in this grid and any linked to it
+# returns {grid: PackedInt32Array of VoxelLighting sections to remesh}
+func update_light_at(coordinates):
+	var voxel_index = calculate_voxel_index(coordinates)
+	var dirty = VoxelLightUpdate.new().edit(lighting, voxel_index, storage.get_voxel(voxel_index))
+	# skylight can change down the whole column
+	for y in range(0, grid_y_len):
+		var column_index = calculate_voxel_index([coordinates[0], y, coordinates[2]])
+		storage.set_ambient(column_index, lighting.ambient[column_index] == 1)
+	apply_light_update(dirty)
+	return dirty
+
+# meshes are built on a JobScheduler worker from a snapshot and swapped in
+# when done (schedule_mesh_build); the old mesh stays up until then
+# overrides MeshGrid.queue_mesh_update()
+func queue_mesh_update():
+	updating_mesh = true
+	schedule_mesh_build()
+
+# snapshot the grid (with up-to-date light) and schedule building its mesh on
+# a worker; apply_mesh swaps it in on the main thread, then calls done
+# returns the build's job
+func schedule_mesh_build(priority = 0.0, group = null, done = Callable()):
+	update_light_data()
+	grid_data_changed = false # unless data changes AGAIN (after updating light data), don't bother making another mesh
+	var mesher = create_mesher(VoxelSnapshot.capture(self))
+	return JobScheduler.schedule(mesher.build, priority, [], group, apply_mesh.bind(mesher, done))
+
+# the mesher that builds this grid's mesh from snapshot
+func create_mesher(snapshot):
+	return CubeMesher.new(snapshot)
+
+# swap in a finished build: one assignment replaces the whole mesh, and the
+# collision boxes are updated in place
+func apply_mesh(mesher, done = Callable()):
+	if mesh_instance == null:
+		mesh_instance = MeshInstance3D.new()
+		add_child(mesh_instance)
+	mesh_instance.mesh = mesher.arrays.commit(get_surface_material)
+	update_collision_boxes(mesher.arrays.boxes)
+	updating_mesh = false # can update mesh(es) again now
+	if done.is_valid():
+		done.call()
+
+# material of a mesher's surface
+func get_surface_material(key):
+	return transparent_material if key == "transparent" else opaque_material
+
+# reuse the current collision boxes for boxes (center/size pairs), adding or freeing the difference
+func update_collision_boxes(boxes):
+	var count = boxes.size() / 2
+	while collision_boxes.size() > count:
+		collision_boxes.pop_back().queue_free()
+	for i in range(count):
+		if i == collision_boxes.size():
+			var collision_shape = CollisionShape3D.new()
+			collision_shape.shape = BoxShape3D.new()
+			add_child(collision_shape)
+			collision_boxes.append(collision_shape)
+		collision_boxes[i].position = boxes[2 * i]
+		collision_boxes[i].shape.size = boxes[2 * i + 1]
+
+# storage of the grid beyond the face in direction (DIRECTION_NORMALS_ARRAY), or null;
+# meshing reads the voxels and light on its side of the face (see VoxelSnapshot)
+func get_neighbor_storage(_direction):
+	return null
+
+# light level meshing uses beyond the face in direction where there is no neighbor
+func get_border_light(_direction):
+	return ambient_light_level
 
 # returns an array of coordinates that surround the given coordinates (+x,-x,+y,-y,+z,-z)
 static func get_surrounding_coordinates(coordinates):
@@ -200,36 +265,6 @@ static func calculate_block_vertices(coordinates):
 		Vector3(coordinates[0]+1, coordinates[1]+1, coordinates[2]+1)
 	]
 
-# draw the mesh for the block at coordinates (x,y,z)
-# draw the mesh for the block at coordinates (x,y,z)
-# draw the mesh for the block at coordinates (x,y,z)
-func draw_block_mesh(coordinates):
-	var surface_tool_to_use = surface_tool
-	var voxel = get_voxel(coordinates)
-	if (Voxel.is_transparent(voxel)):
-		surface_tool_to_use = transparent_surface_tool
-	if (voxel == 0): return # air
-	var verts = calculate_block_vertices(coordinates)
-	var surrounding_coordinates = get_surrounding_coordinates(coordinates)
-	var mesh_data = [
-		[surrounding_coordinates[0], [verts[4], verts[5], verts[7], verts[6]]], # +x face
-		[surrounding_coordinates[1], [verts[1], verts[0], verts[2], verts[3]]], # -x face
-		[surrounding_coordinates[2], [verts[2], verts[6], verts[7], verts[3]]], # +y face
-		[surrounding_coordinates[3], [verts[1], verts[5], verts[4], verts[0]]], # -y face
-		[surrounding_coordinates[4], [verts[5], verts[1], verts[3], verts[7]]], # +z face
-		[surrounding_coordinates[5], [verts[0], verts[4], verts[6], verts[2]]]  # -z face
-	]
-	for face_index in range(mesh_data.size()):
-		var faces_data = mesh_data[face_index]
-		var other_coordinates = faces_data[0]
-		var current_verts = faces_data[1]
-		var other_voxel = get_voxel(other_coordinates)
-		var other_voxel_transparent = Voxel.is_transparent(other_voxel)
-		if (other_voxel_transparent and (other_voxel != voxel)): # other voxel is transparent and has a different id from this one: should display face
-			var normal = DIRECTION_NORMALS_ARRAY[face_index]
-			var face_uvs = MeshHelper.calculate_face_uvs(normal, 1.0, 1.0)
-			MeshHelper.draw_quad(surface_tool_to_use, current_verts, face_uvs, calculate_light_uvs(other_coordinates))
-			
 # calculate uv coordinates in the lightmap for the given voxel coordinates
 func calculate_light_uvs(coordinates):
 	var light_level = get_light_level(coordinates)
@@ -238,25 +273,26 @@ func calculate_light_uvs(coordinates):
 func get_light_level(coordinates):
 	var voxel_index = calculate_voxel_index(coordinates)
 	if voxel_index == -1: return ambient_light_level
-	return light_data[voxel_index]
+	return storage.get_light(voxel_index)
 
 # sets the light level at the given coordinates
 func set_light_level(coordinates, light_level):
 	var voxel_index = calculate_voxel_index(coordinates)
 	if voxel_index == -1: return # coordinates out of bounds
-	light_data[voxel_index] = light_level
+	storage.set_light(voxel_index, light_level)
+	if lighting != null: lighting.light[voxel_index] = light_level
 	grid_data_changed = true
 
 func get_ambient_light(coordinates):
 	var voxel_index = calculate_voxel_index(coordinates)
 	if (voxel_index == -1): return true # ambient light if outside of chunk
-	return ambient_lights[voxel_index]
+	return storage.get_ambient(voxel_index)
 
 # sets the voxel at the given coordinates to be an "ambient light" voxel
 func set_ambient_light(coordinates, ambient_light):
 	var voxel_index = calculate_voxel_index(coordinates)
 	if (voxel_index == -1): return # don't try to set ambient light if index is invalid
-	ambient_lights[calculate_voxel_index(coordinates)] = ambient_light
+	storage.set_ambient(voxel_index, ambient_light)
 
 func calculate_block_uvs(coordinates):
 	var id = get_voxel(coordinates)
@@ -266,22 +302,31 @@ func calculate_block_uvs(coordinates):
 func get_voxel(coordinates):
 	var voxel_index = calculate_voxel_index(coordinates)
 	if voxel_index == -1: return -1 # out of bounds, so invalid
-	else:
-		return int(voxel_data[voxel_index])
+	return storage.get_voxel(voxel_index)
 
-# sets voxel voxel_data for voxel at voxel coordinates(x,y,z)
+# sets the voxel id for voxel at voxel coordinates(x,y,z)
+# if light data is current, light is updated incrementally (see update_light_at)
+# and the grids/sections to remesh are returned; otherwise the whole grid is
+# relit before its next mesh and {} is returned
 func set_voxel(coordinates, value):
 	var voxel_index = calculate_voxel_index(coordinates)
-	if voxel_index == -1: return # coordinates out of bounds
-	voxel_data[voxel_index] = int(value)
+	if voxel_index == -1: return {} # coordinates out of bounds
+	storage.set_voxel(voxel_index, int(value))
 	grid_data_changed = true
+	if light_dirty or lighting == null:
+		light_dirty = true
+		return {}
+	return update_light_at(coordinates)
 
 # returns index (always an integer) in data arrays for the voxel at local coordinates (x, y, z)
 # returns -1 if coordinates are out of bounds
 func calculate_voxel_index(coordinates):
-	if coordinates_within_bounds(coordinates):
-		return int(coordinates[0]*grid_z_len*grid_y_len) + (coordinates[1]*grid_z_len) + (coordinates[2])
-	return -1
+	var x = int(coordinates[0])
+	var y = int(coordinates[1])
+	var z = int(coordinates[2])
+	if x < 0 or x >= grid_x_len or y < 0 or y >= grid_y_len or z < 0 or z >= grid_z_len:
+		return -1
+	return (x * grid_y_len + y) * grid_z_len + z
 	
 func coordinates_within_bounds(coordinates):
 	return coordinates_within_x_bounds(coordinates) and coordinates_within_y_bounds(coordinates) and coordinates_within_z_bounds(coordinates)
@@ -305,16 +350,24 @@ func load_materials():
 
 # updates voxels to be a sanitized, deep copy of new_voxel_data
 func update_voxels(new_voxel_data):
-	for x in range(0, grid_x_len):
-		for y in range(0, grid_y_len):
-			for z in range(0, grid_z_len):
-				var index = calculate_voxel_index([x,y,z])
-				set_voxel([x,y,z], new_voxel_data[index])
+	storage.load_voxels(new_voxel_data) # one bulk copy; light is regenerated once before the next mesh
+	light_dirty = true
+	grid_data_changed = true
+
+# bytes used by this grid's voxel storage and its lighting engine (if any)
+func get_memory_usage() -> Dictionary:
+	var usage = storage.get_memory_usage()
+	usage["lighting"] = lighting.get_memory_usage() if lighting != null else 0
+	return usage
 
 # In CubeGrid
 func interact(other_object=null, info=null):
 	# add a block!
 	var global_point = info.position + (info.normal / 2)
 	var local_point = to_local(global_point)
-	var coords = [floor(local_point.x), floor(local_point.y), floor(local_point.z)]
-	set_voxel(coords, Voxel.VoxelType.SAND)
+	var coords = [int(floor(local_point.x)), int(floor(local_point.y)), int(floor(local_point.z))]
+	edit_voxel(coords, Voxel.VoxelType.SAND)
+
+func _notification(what):
+	if what == NOTIFICATION_PREDELETE and lighting != null:
+		lighting.unlink_all() # linked engines reference each other
@@ -0,0 +1,100 @@
+extends RefCounted
+class_name CubeMesher
+
+# =======================================
+# CubeMesher.gd
+# =======================================
+# Builds a CubeGrid's mesh from a VoxelSnapshot on a JobScheduler worker
+# (CubeGrid.schedule_mesh_build), into its own MeshArrays:
+# - a quad for every face of a non-air voxel whose neighbor is transparent
+#   and a different id, on the "opaque" or "transparent" surface, lit by the
+#   neighbor's light level (neighbors across the grid's faces come from the
+#   snapshot's padding)
+# - a collision box on every solid voxel next to a non-solid one
+# build() reads nothing but the snapshot, so the grid can change (or be
+# freed) while it runs; CubeGrid.apply_mesh swaps the result in on the main
+# thread. Lookup tables are filled in _init, which runs on the main thread.
+
+# vertices (CubeGrid.calculate_block_vertices) of the face in each direction
+const FACE_VERTICES = [
+	[4, 5, 7, 6], # +x
+	[1, 0, 2, 3], # -x
+	[2, 6, 7, 3], # +y
+	[1, 5, 4, 0], # -y
+	[5, 1, 3, 7], # +z
+	[0, 4, 6, 2]  # -z
+]
+
+static var transparent_ids := PackedByteArray() # id (0-255) -> 1 if transparent (unknown ids are)
+static var solid_ids := PackedByteArray() # id (0-255) -> 1 if solid
+static var light_uvs = [] # light level -> lightmap uvs
+static var face_uvs = [] # direction -> uvs of a single face
+static var normals = [] # direction -> Vector3
+
+var snapshot
+var arrays = MeshArrays.new()
+
+func _init(_snapshot):
+	snapshot = _snapshot
+	if transparent_ids.is_empty():
+		transparent_ids.resize(VoxelStorage.MAX_ID + 1)
+		solid_ids.resize(VoxelStorage.MAX_ID + 1)
+		for id in range(VoxelStorage.MAX_ID + 1):
+			transparent_ids[id] = 1 if Voxel.is_transparent(id) else 0
+			solid_ids[id] = 1 if Voxel.is_solid(id) else 0
+		for level in range(CubeGrid.ambient_light_level + 1):
+			light_uvs.append(MeshHelper.calculate_tile_uvs(level, CubeGrid.light_map_width))
+		for normal in CubeGrid.DIRECTION_NORMALS_ARRAY:
+			face_uvs.append(MeshHelper.calculate_face_uvs(normal, 1.0, 1.0))
+			normals.append(Vector3(normal[0], normal[1], normal[2]))
+
+# runs on a worker
+func build():
+	snapshot.unpack()
+	build_faces()
+	build_collision()
+
+# padded index step to the neighbor in each direction
+func get_neighbor_offsets() -> Array:
+	var z_step = 1
+	var y_step = snapshot.z_len + 2
+	var x_step = (snapshot.y_len + 2) * y_step
+	return [x_step, -x_step, y_step, -y_step, z_step, -z_step]
+
+func build_faces():
+	var offsets = get_neighbor_offsets()
+	var voxels = snapshot.padded_voxels
+	var light = snapshot.padded_light
+	for x in range(snapshot.x_len):
+		for y in range(snapshot.y_len):
+			var index = snapshot.padded_index(x, y, 0)
+			for z in range(snapshot.z_len):
+				var voxel = voxels[index]
+				if voxel != Voxel.VoxelType.AIR:
+					var key = "transparent" if transparent_ids[voxel] == 1 else "opaque"
+					var verts = null
+					for direction in range(6):
+						var other_index = index + offsets[direction]
+						var other = voxels[other_index]
+						if transparent_ids[other] == 1 and other != voxel: # other voxel is transparent and a different id: face shows
+							if verts == null:
+								verts = CubeGrid.calculate_block_vertices([x, y, z])
+							var face = FACE_VERTICES[direction]
+							arrays.add_quad(key, [verts[face[0]], verts[face[1]], verts[face[2]], verts[face[3]]],
+								normals[direction], face_uvs[direction], light_uvs[light[other_index]])
+				index += 1
+
+# boxes on the boundaries between solid and non-solid voxels
+func build_collision():
+	var offsets = get_neighbor_offsets()
+	var voxels = snapshot.padded_voxels
+	for x in range(snapshot.x_len):
+		for y in range(snapshot.y_len):
+			var index = snapshot.padded_index(x, y, 0)
+			for z in range(snapshot.z_len):
+				if solid_ids[voxels[index]] == 1:
+					for offset in offsets:
+						if solid_ids[voxels[index + offset]] == 0:
+							arrays.add_box(Vector3(x + 0.5, y + 0.5, z + 0.5), Vector3.ONE)
+							break
+				index += 1
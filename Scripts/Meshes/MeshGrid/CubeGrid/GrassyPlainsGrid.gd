@@ -1,51 +1,43 @@
 extends GreedyCubeGrid
 class_name GrassyPlainsGrid
 
-var terrain_noise := FastNoiseLite.new()
-var detail_noise := FastNoiseLite.new()
-
 func _init():
 	super()
 	# Set grid dimensions
 	grid_x_len = 64
 	grid_y_len = 16
 	grid_z_len = 64
-	
-	# Primary noise for gentle rolling hills
-	terrain_noise.noise_type = FastNoiseLite.TYPE_PERLIN
-	terrain_noise.seed = randi()
-	terrain_noise.frequency = 0.008  # Very low frequency for wide, flat hills
-	terrain_noise.fractal_octaves = 2  # Fewer octaves for smoother, flatter terrain
-	terrain_noise.fractal_gain = 0.4
-	terrain_noise.fractal_lacunarity = 2.0
-
-	# Detail noise for subtle surface variation
-	detail_noise.noise_type = FastNoiseLite.TYPE_PERLIN
-	detail_noise.seed = randi() + 1
-	detail_noise.frequency = 0.05  # Lower frequency for wider bumps
-	detail_noise.fractal_octaves = 2
-	detail_noise.fractal_gain = 0.25
 
 func generate_voxel_data():
-	clear_grid()
+	update_voxels(generate_ids(TerrainGenerator.for_seed(world_seed), get_world_origin(), grid_x_len, grid_y_len, grid_z_len))
+
+# voxel ids (laid out like calculate_voxel_index) for x_len * y_len * z_len voxels from
+# world coordinates origin; heights are measured from the bottom of the grid
+static func generate_ids(generator, origin, x_len, y_len, z_len) -> PackedByteArray:
+	var ids = PackedByteArray()
+	ids.resize(x_len * y_len * z_len) # all air
 
 	# Terrain parameters for gentle plains
-	var base_height = grid_y_len * 0.4  # Middle of the world
+	var base_height = y_len * 0.4  # Middle of the world
 	var wave_amplitude = 5.0  # Reduced height variation for flatter terrain
 	var detail_amplitude = 1.0  # Smaller surface bumps
 
-	for x in range(grid_x_len):
-		for z in range(grid_z_len):
-			# Get noise values once per column
-			var terrain_value = terrain_noise.get_noise_2d(x, z)
-			var detail_value = detail_noise.get_noise_2d(x, z)
-			
+	# Gentle rolling hills plus subtle surface variation, one map each for the whole grid
+	var terrain_values = generator.sample_map("plains", origin[0], origin[2], x_len, z_len)
+	var detail_values = generator.sample_map("plains_detail", origin[0], origin[2], x_len, z_len)
+
+	var column = 0
+	for x in range(x_len):
+		for z in range(z_len):
 			# Calculate height with gentle waves
-			var height = base_height + (terrain_value * wave_amplitude) + (detail_value * detail_amplitude)
-			var height_int = int(clamp(height, 0, grid_y_len - 1))
-			
+			var height = base_height + (terrain_values[column] * wave_amplitude) + (detail_values[column] * detail_amplitude)
+			var height_int = int(clamp(height, 0, y_len - 1))
+			column += 1
+
 			# Fill column with minimal calculations
+			var row = x * y_len * z_len + z
 			for y in range(height_int + 1):
 				# Top 2 layers are grass, everything below is dirt
-				var voxel_type = Voxel.VoxelType.GRASS if y >= height_int - 1 else Voxel.VoxelType.DIRT
-				set_voxel([x, y, z], voxel_type)
+				ids[row + y * z_len] = Voxel.VoxelType.GRASS if y >= height_int - 1 else Voxel.VoxelType.DIRT
+
+	return ids
@@ -0,0 +1,283 @@
+extends CubeMesher
+class_name GreedyMesher
+
+# =======================================
+# GreedyMesher.gd
+# =======================================
+# GreedyCubeGrid's mesher: merges faces into quads with bitmask rows and
+# gives every voxel type and direction its own surface (keyed
+# Vector2i(voxel type, direction index), see GreedyCubeGrid.get_surface_material).
+# Collision boxes are vertical runs of one solid voxel type per column.
+#
+# Bitmask meshing: voxels are packed into rows of bits (one bit per voxel,
+# so rows hold at most MAX_ROW_LENGTH voxels), one set of rows per voxel
+# type, and faces are found and merged a whole row at a time with integer
+# operations. Two row layouts are kept: along z (rows indexed x * y_len + y)
+# for the x and y faces, and along y (rows indexed x * z_len + z) for the
+# z faces, so every face plane is a stack of rows with the merge's
+# secondary axis along the bits.
+# Faces on the grid's boundary are always drawn (neighboring grids aren't
+# looked at); their light still comes from the snapshot's padding.
+
+const MAX_ROW_LENGTH = 64
+const MAX_X_LENGTH = 65536 # x is the primary axis of y and z faces; quads store extents in 16 bits
+
+static var type_count = Voxel.VoxelType.size()
+static var bit_index = {} # single-bit int -> its position
+
+var z_rows := PackedInt64Array() # type * (x_len * y_len) + row -> voxels of that type
+var y_rows := PackedInt64Array() # type * (x_len * z_len) + row
+var transparent_z_rows := PackedInt64Array()
+var transparent_y_rows := PackedInt64Array()
+var face_count = 0
+
+func _init(_snapshot):
+	super(_snapshot)
+	if bit_index.is_empty():
+		var bit = 1
+		for i in range(MAX_ROW_LENGTH):
+			bit_index[bit] = i
+			bit <<= 1
+
+# runs on a worker
+func build():
+	if snapshot.y_len > MAX_ROW_LENGTH or snapshot.z_len > MAX_ROW_LENGTH:
+		push_error("GreedyCubeGrid rows hold at most %d voxels" % MAX_ROW_LENGTH)
+		return
+	if snapshot.x_len > MAX_X_LENGTH:
+		push_error("GreedyCubeGrid quads span at most %d voxels along x" % MAX_X_LENGTH)
+		return
+	super()
+
+func build_faces():
+	build_rows()
+	for direction in GreedyCubeGrid.DIRECTION_NORMALS:
+		generate_faces(direction, GreedyCubeGrid.DIRECTION_NORMALS[direction])
+
+# pack the snapshot's voxels into the per-type z and y rows (and the transparent rows)
+func build_rows():
+	var x_len = snapshot.x_len
+	var y_len = snapshot.y_len
+	var z_len = snapshot.z_len
+	var voxel_ids = snapshot.voxels
+	var z_row_count = x_len * y_len
+	var y_row_count = x_len * z_len
+	z_rows.resize(type_count * z_row_count)
+	z_rows.fill(0)
+	y_rows.resize(type_count * y_row_count)
+	y_rows.fill(0)
+	transparent_z_rows.resize(z_row_count)
+	transparent_z_rows.fill(0)
+	transparent_y_rows.resize(y_row_count)
+	transparent_y_rows.fill(0)
+	var index = 0
+	for x in range(x_len):
+		for y in range(y_len):
+			var z_row = x * y_len + y
+			var y_bit = 1 << y
+			var z_bit = 1
+			for z in range(z_len):
+				var id = voxel_ids[index]
+				var y_row = x * z_len + z
+				z_rows[id * z_row_count + z_row] |= z_bit
+				y_rows[id * y_row_count + y_row] |= y_bit
+				if transparent_ids[id] == 1:
+					transparent_z_rows[z_row] |= z_bit
+					transparent_y_rows[y_row] |= y_bit
+				z_bit <<= 1
+				index += 1
+
+# greedy-merge every visible face facing direction into quads
+# Faces are started in voxel index order; each quad grows along its primary
+# axis first, then its secondary axis (the bits), over faces of the start's
+# voxel type. Growing ignores faces already merged, as the per-voxel mesher
+# this replaced did, so the quads are the same.
+func generate_faces(direction: String, normal: Array):
+	var x_len = snapshot.x_len
+	var y_len = snapshot.y_len
+	var z_len = snapshot.z_len
+	var voxel_ids = snapshot.voxels
+	# plane layout: rows are indexed a * b_len + b
+	var along_y = normal[2] != 0
+	var rows = y_rows if along_y else z_rows
+	var transparent_rows = transparent_y_rows if along_y else transparent_z_rows
+	var b_len = z_len if along_y else y_len
+	var row_count = x_len * b_len
+	var bit_count = y_len if along_y else z_len
+	var slice_is_a = normal[0] != 0 # x faces: slice a, primary b; others: slice b, primary a
+	var primary_step = 1 if slice_is_a else b_len
+	var primary_len = b_len if slice_is_a else x_len
+	var neighbor_step = (b_len if slice_is_a else 1) * (normal[0] + normal[1] + normal[2])
+	var slice_len = x_len if slice_is_a else b_len
+
+	# faces[type * row_count + row]: visible faces of that type
+	var faces = PackedInt64Array()
+	faces.resize(type_count * row_count)
+	var visible = PackedInt64Array() # faces of any type
+	visible.resize(row_count)
+	for row in range(row_count):
+		var slice = row / b_len if slice_is_a else row % b_len
+		var neighbor_slice = slice + normal[0] + normal[1] + normal[2]
+		var has_neighbor = neighbor_slice >= 0 and neighbor_slice < slice_len
+		var neighbor_row = row + neighbor_step
+		var any = 0
+		for id in range(1, type_count): # air has no faces
+			var voxels = rows[id * row_count + row]
+			if voxels == 0:
+				continue
+			var face = voxels
+			if has_neighbor:
+				# visible where the neighbor differs and either side is transparent
+				face &= ~rows[id * row_count + neighbor_row]
+				if transparent_ids[id] == 0:
+					face &= transparent_rows[neighbor_row]
+			faces[id * row_count + row] = face
+			any |= face
+		visible[row] = any
+
+	var merged = PackedInt64Array()
+	merged.resize(row_count)
+	var quads = PackedInt64Array() # start voxel index << 24 | (primary extent - 1) << 8 | (secondary extent - 1)
+	for row in range(row_count):
+		var available = visible[row] & ~merged[row]
+		if available == 0:
+			continue
+		var a = row / b_len
+		var b = row % b_len
+		var primary = b if slice_is_a else a
+		while available != 0:
+			var low = available & -available
+			var bit = bit_index[low]
+			var start_index = (a * y_len + bit) * z_len + b if along_y else (a * y_len + b) * z_len + bit
+			var id = voxel_ids[start_index]
+			var base = id * row_count
+			var primary_extent = 1
+			var spanned = faces[base + row]
+			while primary + primary_extent < primary_len:
+				var next_row = faces[base + row + primary_extent * primary_step]
+				if (next_row & low) == 0:
+					break
+				spanned &= next_row
+				primary_extent += 1
+			var run = low
+			var secondary_extent = 1
+			var next_bit = low << 1
+			while bit + secondary_extent < bit_count and (spanned & next_bit) != 0:
+				run |= next_bit
+				next_bit <<= 1
+				secondary_extent += 1
+			for i in range(primary_extent):
+				merged[row + i * primary_step] |= run
+			available &= ~run
+			quads.append((start_index << 24) | ((primary_extent - 1) << 8) | (secondary_extent - 1))
+
+	quads.sort() # draw in start voxel order
+	for quad in quads:
+		var start_index = quad >> 24
+		var x = start_index / (y_len * z_len)
+		var y = (start_index / z_len) % y_len
+		var z = start_index % z_len
+		var merged_verts = generate_face_vertices(x, y, z, ((quad >> 8) & 65535) + 1, (quad & 255) + 1, normal)
+		draw_merged_face(merged_verts, voxel_ids[start_index], [x, y, z], direction)
+
+# add a merged quad to its voxel type and direction's surface, lit by the voxel in front of its start
+func draw_merged_face(verts: Array, voxel_type: int, start_pos: Array, direction: String):
+	var dimensions = calculate_face_dimensions(verts)
+	var normal = GreedyCubeGrid.DIRECTION_NORMALS[direction]
+	var dir_index = GreedyCubeGrid.DIRECTION_TO_INDEX[direction]
+	var uvs = MeshHelper.calculate_face_uvs(normal, dimensions.x, dimensions.y)
+	var light_level = snapshot.get_light(start_pos[0] + normal[0], start_pos[1] + normal[1], start_pos[2] + normal[2])
+	arrays.add_quad(Vector2i(voxel_type, dir_index), verts, normals[dir_index], uvs, light_uvs[light_level])
+	face_count += 1
+
+static func calculate_face_dimensions(verts: Array) -> Vector2:
+	if len(verts) < 4:
+		return Vector2.ZERO
+	var primary_extent = (verts[1] - verts[0]).length()
+	var secondary_extent = (verts[2] - verts[1]).length()
+	return Vector2(primary_extent, secondary_extent)
+
+static func generate_face_vertices(start_x: int, start_y: int, start_z: int, primary_extent: float, secondary_extent: float, normal: Array) -> Array:
+	if normal[0] > 0:
+		return [
+			Vector3(start_x + 1, start_y + primary_extent, start_z),
+			Vector3(start_x + 1, start_y, start_z),
+			Vector3(start_x + 1, start_y, start_z + secondary_extent),
+			Vector3(start_x + 1, start_y + primary_extent, start_z + secondary_extent)
+		]
+	elif normal[0] < 0:
+		return [
+			Vector3(start_x, start_y, start_z),
+			Vector3(start_x, start_y + primary_extent, start_z),
+			Vector3(start_x, start_y + primary_extent, start_z + secondary_extent),
+			Vector3(start_x, start_y, start_z + secondary_extent)
+		]
+	elif normal[1] > 0:
+		return [
+			Vector3(start_x, start_y + 1, start_z),
+			Vector3(start_x + primary_extent, start_y + 1, start_z),
+			Vector3(start_x + primary_extent, start_y + 1, start_z + secondary_extent),
+			Vector3(start_x, start_y + 1, start_z + secondary_extent)
+		]
+	elif normal[1] < 0:
+		return [
+			Vector3(start_x + primary_extent, start_y, start_z),
+			Vector3(start_x, start_y, start_z),
+			Vector3(start_x, start_y, start_z + secondary_extent),
+			Vector3(start_x + primary_extent, start_y, start_z + secondary_extent)
+		]
+	elif normal[2] > 0:
+		return [
+			Vector3(start_x + primary_extent, start_y, start_z + 1),
+			Vector3(start_x, start_y, start_z + 1),
+			Vector3(start_x, start_y + secondary_extent, start_z + 1),
+			Vector3(start_x + primary_extent, start_y + secondary_extent, start_z + 1)
+		]
+	else:
+		return [
+			Vector3(start_x, start_y, start_z),
+			Vector3(start_x + primary_extent, start_y, start_z),
+			Vector3(start_x + primary_extent, start_y + secondary_extent, start_z),
+			Vector3(start_x, start_y + secondary_extent, start_z)
+		]
+
+# one box per vertical run of a single solid voxel type in each column
+func build_collision():
+	for x in range(snapshot.x_len):
+		for z in range(snapshot.z_len):
+			build_column_collision(x, z)
+
+func build_column_collision(x: int, z: int):
+	var current_start = -1
+	var current_type = -1
+	var index = x * snapshot.y_len * snapshot.z_len + z
+
+	# Scan vertically through the column
+	for y in range(snapshot.y_len):
+		var voxel = snapshot.voxels[index]
+		index += snapshot.z_len
+
+		# Start new collision shape if we hit a solid block
+		if current_start == -1 and solid_ids[voxel] == 1:
+			current_start = y
+			current_type = voxel
+			continue
+
+		# End current collision shape if we hit air or different block type
+		if current_start != -1:
+			if solid_ids[voxel] == 0 or voxel != current_type:
+				add_column_box(x, z, current_start, y)
+				current_start = -1
+
+				# Start new shape immediately if we hit a different solid block
+				if solid_ids[voxel] == 1:
+					current_start = y
+					current_type = voxel
+
+	# Add final collision shape if column ended with solid blocks
+	if current_start != -1:
+		add_column_box(x, z, current_start, snapshot.y_len)
+
+# full-size box over y from start_y to end_y, centered in the column
+func add_column_box(x: int, z: int, start_y: int, end_y: int):
+	arrays.add_box(Vector3(x + 0.5, start_y + (end_y - start_y) * 0.5, z + 0.5), Vector3(1.0, end_y - start_y, 1.0))
@@ -1,73 +1,59 @@
 extends GreedyCubeGrid
 class_name PerlinTerrainGrid
 
-var perlin_noise := FastNoiseLite.new()
-var height_noise := FastNoiseLite.new()
-var material_noise := FastNoiseLite.new()
-
-func _init():
-	super()
-	# Configure primary noise for terrain height
-	perlin_noise.noise_type = FastNoiseLite.TYPE_PERLIN
-	perlin_noise.seed = randi()
-	perlin_noise.frequency = 0.02  # Lower frequency for smoother, broader terrain
-	perlin_noise.fractal_octaves = 5
-	perlin_noise.fractal_gain = 0.6
-	perlin_noise.fractal_lacunarity = 2.0
-
-	# Secondary noise for biome-like variation
-	height_noise.noise_type = FastNoiseLite.TYPE_PERLIN
-	height_noise.seed = randi() + 1  # Different seed for variation
-	height_noise.frequency = 0.05
-	height_noise.fractal_octaves = 3
-	height_noise.fractal_gain = 0.4
-
-	# Tertiary noise for material blobs
-	material_noise.noise_type = FastNoiseLite.TYPE_PERLIN
-	material_noise.seed = randi() + 2
-	material_noise.frequency = 0.1  # Adjust for blob size: lower for larger blobs
-	material_noise.fractal_octaves = 2
-	material_noise.fractal_gain = 0.5
+# biome layer cutoffs: below each is biome 0, 1 and 2; above the last is biome 3
+const BIOME_CUTOFFS = [-0.1, 0.0, 0.1]
 
 func generate_voxel_data():
-	clear_grid()
+	var ids = generate_ids(TerrainGenerator.for_seed(world_seed), get_world_origin(), grid_x_len, grid_y_len, grid_z_len)
+
+	# Add isolated floating grass block in center sky
+	var center_x = floor(grid_x_len / 2.0)
+	var center_z = floor(grid_z_len / 2.0)
+	var sky_y = grid_y_len - 5  # High up, adjust as needed
+	var sky_index = calculate_voxel_index([center_x, sky_y, center_z])
+	if sky_index != -1:
+		ids[sky_index] = Voxel.VoxelType.GRASS
+	update_voxels(ids)
+
+# voxel ids (laid out like calculate_voxel_index) for x_len * y_len * z_len voxels from
+# world coordinates origin; heights are measured from the bottom of the grid
+static func generate_ids(generator, origin, x_len, y_len, z_len) -> PackedByteArray:
+	var ids = PackedByteArray()
+	ids.resize(x_len * y_len * z_len) # all air
 
 	# Define terrain parameters
-	var max_height = grid_y_len * 0.7  # Max height is 70% of grid height
-	var base_height = grid_y_len * 0.2  # Base ground level
+	var max_height = y_len * 0.7  # Max height is 70% of grid height
+	var base_height = y_len * 0.2  # Base ground level
 	var water_level = base_height + 2.0  # Water level for the sand biome
 
-	var half_x = grid_x_len / 2
-	var half_z = grid_z_len / 2
-
-	for x in range(grid_x_len):
-		for z in range(grid_z_len):
-			# Determine biome based on quarters
-			var biome_id = 0
-			if x < half_x:
-				if z < half_z:
-					biome_id = 0  # Sand with glass for water
-				else:
-					biome_id = 1  # Grass
-			else:
-				if z < half_z:
-					biome_id = 2  # Stone/gravel
-				else:
-					biome_id = 3  # Stone/dirt
+	# One noise map per layer for the whole grid
+	var heights = generator.sample_map("hills", origin[0], origin[2], x_len, z_len)
+	var variations = generator.sample_map("hill_variation", origin[0], origin[2], x_len, z_len)
+	var materials = generator.sample_map("material", origin[0], origin[2], x_len, z_len)
+	var biomes = generator.sample_map("biome", origin[0], origin[2], x_len, z_len)
+
+	var column = 0
+	for x in range(x_len):
+		for z in range(z_len):
+			# Determine biome from the biome layer
+			var biome_id = BIOME_CUTOFFS.size()
+			for cutoff in range(BIOME_CUTOFFS.size()):
+				if biomes[column] < BIOME_CUTOFFS[cutoff]:
+					biome_id = cutoff  # 0: sand with glass for water, 1: grass, 2: stone/gravel, 3: stone/dirt
+					break
 
 			# Get 2D noise for terrain height (less influence for more hard-coded feel)
-			var world_x = x
-			var world_z = z
-			var height_noise_value = perlin_noise.get_noise_2d(world_x, world_z)
+			var height_noise_value = heights[column]
 			# Reduce noise impact for more deterministic heights
 			var terrain_height = base_height + (height_noise_value + 1.0) * 0.5 * (max_height * 0.5)  # Halved noise amplitude
-			terrain_height = clamp(terrain_height, base_height, grid_y_len - 1)
+			terrain_height = clamp(terrain_height, base_height, y_len - 1)
 
 			# Secondary noise for variation (reduced influence)
-			var biome_noise = height_noise.get_noise_2d(world_x, world_z) * 0.5  # Halved amplitude
+			var biome_noise = variations[column] * 0.5  # Halved amplitude
 
 			# Material noise for blob distribution
-			var mat_noise = material_noise.get_noise_2d(world_x, world_z)
+			var mat_noise = materials[column]
 
 			# Calculate effective height for water in sand biome
 			var effective_height = terrain_height
@@ -75,9 +61,11 @@ func generate_voxel_data():
 				effective_height = max(terrain_height, water_level)
 
 			# Fill column
-			for y in range(grid_y_len):
+			column += 1
+			var row = x * y_len * z_len + z
+			for y in range(y_len):
 				if y > effective_height:
-					continue
+					break
 
 				var height_ratio = float(y) / terrain_height if terrain_height > 0 else 0.0
 
@@ -112,10 +100,6 @@ func generate_voxel_data():
 					if y == floor(terrain_height):
 						voxel_type = Voxel.VoxelType.STONE if mat_noise > 0 else Voxel.VoxelType.DIRT
 
-				set_voxel([x, y, z], voxel_type)
+				ids[row + y * z_len] = voxel_type
 
-	# Add isolated floating grass block in center sky
-	var center_x = floor(grid_x_len / 2.0)
-	var center_z = floor(grid_z_len / 2.0)
-	var sky_y = grid_y_len - 5  # High up, adjust as needed
-	set_voxel([center_x, sky_y, center_z], Voxel.VoxelType.GRASS)
+	return ids
@@ -1,13 +1,11 @@
 # TODO: multithread light data updates
-# You'll need to make a really efficient light/mesh update system, though (only update the blocks around the ones whose light level changed)
-# TODO: refactor flood_fill_light code
-# TODO: refactor terrain chunk initialization code vs. terrain chunk creation code in VoxelWorld.gd
 
 extends CubeGrid
 class_name TerrainChunk
 
 var world # voxel chunks always have the voxel world as their parent
 var chunk_coordinates # chunk's coordinates in the world
+var voxels_edited = false # whether voxels were edited since generation (VoxelWorld keeps them when unloading)
 
 const chunk_width = 8
 const chunk_height = 8
@@ -19,84 +17,99 @@ func _init(_world, _chunk_coordinates): # TerrainChunks must ALWAYS have a world
 	grid_x_len = chunk_width
 	grid_y_len = chunk_height
 	grid_z_len = chunk_width
+	world_seed = world.world_seed
 	deactivate() # terrain chunks shouldn't start as active
 	super()
 
 func _ready():
 	global_position = Vector3(chunk_coordinates[0] * grid_x_len, 0, chunk_coordinates[1] * grid_z_len)
+	# voxel and light data are generated by VoxelWorld's jobs (see VoxelWorld.request_chunk)
+
+# fill the chunk with generated terrain, or with saved voxel ids
+func generate(saved_voxel_ids = null):
+	storage.resize(get_voxel_count())
+	if saved_voxel_ids == null:
+		generate_voxel_data()
+	else:
+		update_voxels(saved_voxel_ids)
+		voxels_edited = true
 
 func generate_voxel_data():
-	generate_test_data()
+	update_voxels(generate_ids(TerrainGenerator.for_seed(world_seed), get_world_origin(), grid_x_len, grid_y_len, grid_z_len))
+
+# overrides CubeGrid.get_world_origin(), which needs the chunk to be positioned first
+func get_world_origin():
+	return calculate_global_coordinates([0, 0, 0])
+
+# meshes are built by VoxelWorld's jobs, nearest chunk first
+# overrides CubeGrid.queue_mesh_update()
+func queue_mesh_update():
+	updating_mesh = true
+	world.request_mesh(self)
+
+# the loaded chunk beyond the face in direction (none above or below: the world is one chunk tall)
+# overrides CubeGrid.get_neighbor_storage()
+func get_neighbor_storage(direction):
+	var normal = DIRECTION_NORMALS_ARRAY[direction]
+	if normal[1] != 0:
+		return null
+	var neighbor = world.chunks.get([chunk_coordinates[0] + normal[0], chunk_coordinates[1] + normal[2]])
+	return neighbor.storage if neighbor != null else null
 
+# as VoxelWorld.get_light_level: dark below the world, ambient elsewhere
+# overrides CubeGrid.get_border_light()
+func get_border_light(direction):
+	return 0 if DIRECTION_NORMALS_ARRAY[direction][1] < 0 else ambient_light_level
 
+func edit_voxel(coordinates, value):
+	voxels_edited = true
+	return super(coordinates, value)
+
+# the chunk's lighting is linked to its neighbors' (see VoxelWorld.link_lighting)
+func prepare_lighting():
+	var is_new = lighting == null
+	super()
+	if is_new:
+		world.link_lighting(self)
+	return lighting
+
+# light flows across chunk borders, so relighting a chunk also relights
+# whatever its old light reached in neighboring chunks (which get remeshed)
 func generate_light_data():
 	reset_light_data()
+	var update = VoxelLightUpdate.new()
+	if lighting != null:
+		update.remove_grid(lighting) # take back the light this chunk gave its neighbors
+	prepare_lighting()
 	
-	# Handle skylight first - from top to bottom
-	for reverse_y in range(0, grid_y_len): 
-		var y = (grid_y_len - 1) - reverse_y
-		for x in range(0, grid_x_len):
-			for z in range(0, grid_z_len):
-				var coordinates = [x,y,z]
-				var top_coordinates = [x,y+1,z]
-				
-				# Get skylight status
-				var sky_light = false
-				var top_sky_light = false
-				
-				top_sky_light = get_ambient_light(top_coordinates)
-				
-				# If block is transparent and has skylight above, it gets skylight
-				if Voxel.is_transparent(get_voxel(coordinates)) and top_sky_light:
-					sky_light = true
-					
-				set_ambient_light(coordinates, sky_light)
-				if sky_light:
-					set_light_level(coordinates, ambient_light_level)
+	# Handle skylight first - from top to bottom:
+	# a transparent block with skylight above it (or at the top) gets skylight
+	for voxel_index in lighting.add_sky_sources(ambient_light_level):
+		storage.set_ambient(voxel_index, true)
 	
-	# Then do standard lighting from emitters and ambient sources
-	for x in range(0, grid_x_len):
-		for y in range(0, grid_y_len):
-			for z in range(0, grid_z_len):
-				var coordinates = [x,y,z]
-				var voxel = get_voxel(coordinates)
-				var light_level = max(
-					get_light_level(coordinates),
-					Voxel.get_light_source_level(voxel)
-				)
-				flood_fill_light(coordinates, light_level)
-
-# generate some test voxel data
-func generate_test_data():
-	for x in range(0, grid_x_len):
-		for y in range(0, grid_y_len):
-			for z in range(0, grid_z_len):
-#				var voxel_id = 2 # TODO: proper terrain generation
-#
-#				if (y <= 4) and y != 0: voxel_id = 0 # low layer
-#
-#				# glass exhibition
-#				if (y == 7 or y == 8) and \
-#					(x != 0 and x != grid_x_len-1 and z != 0 and z != grid_z_len-1): voxel_id = 3
-#				if ((x >= 2 and x <= 10) and (y >= 7 and y <= 8) and ((z >= 4) and (z <= 6))):
-#					voxel_id = 3
-#					if (x == 6): voxel_id = 0
-#
-#				# make some tunnels
-#				if (y == 7 or y == 8) and (x == 3): voxel_id = 0
-#				if (x == 4 and z == 5 and y > 0): voxel_id = 0
-				
-				# allow chunk sides to be seen
-				#if x == 0: voxel_id = 0
-				
-				var fast_noise_lite = FastNoiseLite.new() # smooth_simplex noise by default
-				var rng = RandomNumberGenerator.new()
-				rng.randomize()
-				fast_noise_lite.seed = rng.randi()
-				var noise_value = fast_noise_lite.get_noise_3d(x,y,z)
-				var voxel_type = Voxel.VoxelType.AIR
-				if noise_value > 0: voxel_type = Voxel.VoxelType.SAND
-				set_voxel([x,y,z],voxel_type)
+	# Then do standard lighting from emitters, ambient sources and neighboring chunks, all in one pass
+	lighting.add_emitters()
+	update.pull_from_neighbors(lighting)
+	apply_light_update(update.finish())
+	storage.load_light(lighting.light)
+	light_dirty = false
+	grid_data_changed = true
+
+# voxel ids (laid out like calculate_voxel_index) for the grid_x_len * grid_y_len * grid_z_len
+# voxels from world coordinates origin: sand wherever the density noise is positive, air elsewhere
+static func generate_ids(generator, origin, x_len, y_len, z_len) -> PackedByteArray:
+	var ids = PackedByteArray()
+	ids.resize(x_len * y_len * z_len) # all air
+	for y in range(y_len):
+		var density = generator.sample_slice("density", origin[0], origin[1] + y, origin[2], x_len, z_len)
+		var sample = 0
+		for x in range(x_len):
+			var row = (x * y_len + y) * z_len
+			for z in range(z_len):
+				if density[sample] > 0:
+					ids[row + z] = Voxel.VoxelType.SAND
+				sample += 1
+	return ids
 
 # TODO: refactor voxel indexing code in get_voxel() and get_light_level()
 # gets the voxel in world given local (relative to this chunk) voxel coordinates (x,y,z)
@@ -58,6 +58,11 @@ func print_triangle_statistics():
 	print("Original: %d" % total_orig)
 	print("Optimized: %d" % total_opt)
 	print("Reduction: %.1f%%" % total_reduction)
+# the workshop draws its debug triangles and statistics with SurfaceTools, so
+# it meshes on the main thread (MeshGrid's path) rather than in CubeGrid's jobs
+func queue_mesh_update():
+	updating_mesh = true
+	thread_update_mesh(self)
 func draw_block_mesh(coordinates):
 	var surface_tool_to_use = surface_tool
 	var voxel = get_voxel(coordinates)
@@ -36,7 +36,6 @@ func _process(_delta):
 
 func queue_mesh_update():
 	updating_mesh = true
-	#ThreadPool.queue_task([self, "thread_update_mesh"])
 	thread_update_mesh(self)
 
 # update chunk visuals (light_data, uvs, mesh, etc)
@@ -44,7 +43,6 @@ func thread_update_mesh(userdata):
 	grid_data_changed = false # right before generating mesh data, in case grid data changes again and another mesh needs to be generated
 	generate_mesh_data()
 	finalize_meshes()
-	#ThreadPool.queue_task_finished(userdata) # free up the thread
 
 func generate_mesh_data():
 	pass # should be overridden by child classes
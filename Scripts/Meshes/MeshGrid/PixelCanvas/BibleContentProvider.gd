@@ -0,0 +1,42 @@
+extends TextContentProvider
+class_name BibleContentProvider
+
+# The whole Bible as one continuous document for ScrollableTextDisplay: one
+# block per chapter (BibleHelper's chapter ordinals), each followed by a
+# blank line. Wrapped chapters come from a ChapterPageCache, so chapters the
+# paged reader has wrapped, or that were precomputed, are not wrapped again.
+
+const AVERAGE_VERSE_CHARS = 150  # "Book C:V " plus an average KJV verse, for height estimates
+const VERSE_COLOR = Color(0.6, 0.6, 0.6)
+
+var page_cache: ChapterPageCache
+var mode: int = 2
+
+func _init(cache: ChapterPageCache, text_mode: int = 2):
+	page_cache = cache
+	mode = text_mode
+
+func get_block_count() -> int:
+	return BibleHelper.chapter_book.size()
+
+func get_block_text(block: int) -> String:
+	return BibleHelper.get_chapter_text(get_block_book(block), BibleHelper.chapter_numbers[block], mode)
+
+# From the verse count alone, so no chapter is loaded to estimate it
+func estimate_block_lines(block: int, cols: int) -> int:
+	var verses = BibleHelper.chapter_first_verse[block + 1] - BibleHelper.chapter_first_verse[block]
+	if mode == 1:
+		return 3 + ceili(float(verses * AVERAGE_VERSE_CHARS) / cols)  # header, blank, paragraph
+	return 1 + verses * ceili(float(AVERAGE_VERSE_CHARS) / cols)
+
+func get_block_lines(block: int, cols: int) -> PackedStringArray:
+	var lines = page_cache.get_lines(get_block_book(block), BibleHelper.chapter_numbers[block], mode, cols).duplicate()
+	lines.append("")
+	return lines
+
+func get_line_color(line: String) -> Color:
+	# Color verse numbers gray, as BibleReader does
+	return VERSE_COLOR if line.contains(":") else Color.WHITE
+
+func get_block_book(block: int) -> String:
+	return BibleHelper.book_names[BibleHelper.chapter_book[block]]
@@ -1,34 +1,32 @@
 extends ScrollableTextDisplay
 class_name BibleReader
 
-const book_names = ["Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy", 
-	"Joshua", "Judges", "Ruth", "1 Samuel", "2 Samuel", "1 Kings", "2 Kings", 
-	"1 Chronicles", "2 Chronicles", "Ezra", "Nehemiah", "Esther", "Job", "Psalm", 
-	"Proverbs", "Ecclesiastes", "Song of Solomon", "Isaiah", "Jeremiah", "Lamentations", 
-	"Ezekiel", "Daniel", "Hosea", "Joel", "Amos", "Obadiah", "Jonah", "Micah", 
-	"Nahum", "Habakkuk", "Zephaniah", "Haggai", "Zechariah", "Malachi", "Matthew", 
-	"Mark", "Luke", "John", "Acts", "Romans", "1 Corinthians", "2 Corinthians", 
-	"Galatians", "Ephesians", "Philippians", "Colossians", "1 Thessalonians", 
-	"2 Thessalonians", "1 Timothy", "2 Timothy", "Titus", "Philemon", "Hebrews", 
-	"James", "1 Peter", "2 Peter", "1 John", "2 John", "3 John", "Jude", "Revelation"]
-
-var bible_text: String
 var current_book: String = "Genesis"
 var current_chapter: int = 1
 var word_wrap_enabled: bool = true
+var text_mode: int = 2  # BibleHelper.get_chapter_text mode
+var page_cache: ChapterPageCache
+var pages: PackedInt32Array = PackedInt32Array([0])  # first line of each page of the current chapter
+var continuous: bool = false  # the whole Bible as one scroll (open_bible)
 
 func load_chapter(book: String, chapter: int):
+	if continuous:
+		jump_to_chapter(book, chapter)
+		return
 	current_book = book
 	current_chapter = chapter
 	
-	var chapter_text = get_chapter_content(book, chapter)
-	
-	# Apply word wrapping
+	# Wrapped lines and page breaks come from the cache; only a miss wraps
 	var lines: PackedStringArray
 	if word_wrap_enabled:
-		lines = TextUtils.word_wrap(chapter_text, cols)
+		var entry = page_cache.get_entry(book, chapter, text_mode, cols)
+		lines = entry.get("lines", PackedStringArray())
+		pages = entry.get("pages", PackedInt32Array([0]))
 	else:
-		lines = chapter_text.split("\n")
+		lines = BibleHelper.get_chapter_text(book, chapter, text_mode).split("\n")
+		pages = ChapterPageCache.paginate(PackedInt32Array([0]), lines.size(), visible_rows)
+	if lines.is_empty() or lines[0].is_empty():
+		lines = PackedStringArray([get_error_message(book, chapter)])
 	
 	var colored_lines = PackedStringArray()
 	var colors: Array[Color] = []
@@ -49,54 +47,80 @@ func load_chapter(book: String, chapter: int):
 
 func _init():
 	super(80, 25)
+	page_cache = ChapterPageCache.new(visible_rows)
+	if FileAccess.file_exists(ChapterPageCache.INDEX_PATH):
+		page_cache.load_precomputed()
 
 func _ready():
-	load_bible()
-
-func load_bible():
-	bible_text = FileAccess.get_file_as_string("res://Bible/kjv_ascii.txt")
-	if bible_text:
-		load_chapter(current_book, current_chapter)
+	if continuous:
+		open_bible()
 	else:
-		push_error("Failed to load Bible text file")
+		load_chapter(current_book, current_chapter)
 
-func get_chapter_content(book: String, chapter: int) -> String:
-	var chapter_start = find_chapter_start(book, chapter)
-	if chapter_start == -1:
-		return get_error_message(book, chapter)
-	
-	var chapter_end = find_chapter_end(book, chapter)
-	return bible_text.substr(chapter_start, chapter_end - chapter_start)
+# The whole Bible as one continuous scroll; chapters are wrapped as they come into view
+func open_bible():
+	continuous = true
+	set_content_provider(BibleContentProvider.new(page_cache, text_mode))
+	jump_to_chapter(current_book, current_chapter)
 
-func find_chapter_start(book: String, chapter: int) -> int:
-	var search_string = book + " " + str(chapter) + ":1"
-	return bible_text.find(search_string)
+func jump_to_chapter(book: String, chapter: int):
+	var block = BibleHelper.get_chapter_ordinal(book, chapter)
+	if block < 0:
+		return
+	current_book = BibleHelper.book_names[BibleHelper.chapter_book[block]]
+	current_chapter = chapter
+	scroll_to_line(content_layout.get_block_start(block))
 
-func find_chapter_end(book: String, chapter: int) -> int:
-	var next_chapter_start = find_chapter_start(book, chapter + 1)
-	if next_chapter_start != -1:
-		return next_chapter_start
-	
-	# Last chapter of book - find next book
-	var book_index = book_names.find(book)
-	if book_index < book_names.size() - 1:
-		var next_book = book_names[book_index + 1]
-		var next_book_start = find_chapter_start(next_book, 1)
-		if next_book_start != -1:
-			return next_book_start
-	
-	return bible_text.length()
+# Chapter ordinal at the top of the viewport (continuous mode)
+func get_top_block() -> int:
+	return content_layout.find_block(int(scroll_offset / glyph_height))
 
 func get_error_message(book: String, chapter: int) -> String:
 	return "Chapter " + str(chapter) + " not found in " + book
 
 func next_chapter():
+	if continuous:
+		var block = get_top_block() + 1
+		if block < BibleHelper.chapter_book.size():
+			jump_to_chapter(BibleHelper.book_names[BibleHelper.chapter_book[block]], BibleHelper.chapter_numbers[block])
+		return
 	load_chapter(current_book, current_chapter + 1)
 
 func prev_chapter():
+	if continuous:
+		var block = get_top_block()
+		# Back to the top of this chapter first, then to the previous one
+		if content_layout.get_block_start(block) == int(scroll_offset / glyph_height) and block > 0:
+			block -= 1
+		if block >= 0:
+			jump_to_chapter(BibleHelper.book_names[BibleHelper.chapter_book[block]], BibleHelper.chapter_numbers[block])
+		return
 	if current_chapter > 1:
 		load_chapter(current_book, current_chapter - 1)
 
+# Page turns scroll to the cached page breaks
+func next_page():
+	if continuous:
+		scroll_by_lines(visible_rows)
+		return
+	var page = ChapterPageCache.page_of_line(pages, int(scroll_offset / glyph_height))
+	if page + 1 < pages.size():
+		scroll_to_line(pages[page + 1])
+
+func prev_page():
+	if continuous:
+		scroll_by_lines(-visible_rows)
+		return
+	var line = int(scroll_offset / glyph_height)
+	var page = ChapterPageCache.page_of_line(pages, line)
+	# Back to the top of this page first, then to the previous one
+	if pages[page] == line and page > 0:
+		page -= 1
+	scroll_to_line(pages[page])
+
+func scroll_to_line(line: int):
+	scroll_by_pixels(line * glyph_height - scroll_offset)
+
 # BibleReader._input()
 func _input(event):
 	if event is InputEventKey and event.pressed:
@@ -105,9 +129,9 @@ func _input(event):
 		elif event.keycode == KEY_UP:
 			scroll_by_pixels(-1.0)  # 1 pixel up
 		elif event.keycode == KEY_PAGEDOWN:
-			scroll_by_lines(visible_rows)
+			next_page()
 		elif event.keycode == KEY_PAGEUP:
-			scroll_by_lines(-visible_rows)
+			prev_page()
 		elif event.keycode == KEY_RIGHT:
 			next_chapter()
 		elif event.keycode == KEY_LEFT:
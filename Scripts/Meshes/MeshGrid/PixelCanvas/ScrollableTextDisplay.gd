@@ -14,13 +14,32 @@ enum BlendMode {
 	SUBTRACTIVE  # Subtract colors
 }
 
+# Rendering modes
+enum RenderMode {
+	RASTER,      # CPU blits every glyph of the window into content_texture
+	GLYPH_INDEX  # CPU writes one texel per cell, the shader samples the atlas
+}
+
+# Glyph index texels hold a 16-bit atlas column and a 14-bit atlas row; the
+# top two bits of the row's high byte are the blend mode
+const MAX_INDEX_COLUMNS = 65536
+const MAX_INDEX_ROWS = 16384
+
 # Content
 var content_lines: PackedStringArray = []
 var line_colors: Array[Color] = []
 var line_blend_modes: Array[BlendMode] = []  # NEW: Per-line blend modes
+var content_layout: VirtualTextLayout = null  # set_content_provider(): lines come from here instead
+var window_lines: PackedStringArray = []  # lines of the rendered window
+var window_colors: Array[Color] = []
+var window_blend_modes: Array[BlendMode] = []
 
 # Rendering
+var render_mode: RenderMode = RenderMode.GLYPH_INDEX
 var content_texture: ImageTexture
+var glyph_index_texture: ImageTexture  # per cell: atlas col lo, col hi, row lo, row hi | blend mode << 6
+var glyph_color_texture: ImageTexture  # per cell: fg color (alpha 0 if nothing is drawn)
+var bytes_uploaded: int = 0  # texture bytes uploaded by the last render_content()
 var content_width: int
 var content_height: int
 var viewport_height: int
@@ -40,9 +59,11 @@ var total_content_height: int = 0  # Full document height in pixels
 var render_offset: int = 0          # Top of rendered window in document space
 var last_render_start_line: int = -1  # Track when to re-render
 
-func _init(columns: int = 80, rows: int = 25):
+func _init(columns: int = 80, rows: int = 25, mode: RenderMode = RenderMode.GLYPH_INDEX):
 	cols = columns
 	visible_rows = rows
+	# Glyph indices address grid cells, so packed atlases (and grids too big to index) are rastered
+	render_mode = mode if can_index_atlas() else RenderMode.RASTER
 	
 	glyph_width = AtlasHelper.get_glyph_width()
 	glyph_height = AtlasHelper.get_glyph_height()
@@ -52,6 +73,12 @@ func _init(columns: int = 80, rows: int = 25):
 	
 	setup_mesh_and_shader()
 
+static func can_index_atlas() -> bool:
+	if AtlasHelper.is_packed():
+		return false
+	var grid = AtlasHelper.get_grid_size()
+	return grid.x <= MAX_INDEX_COLUMNS and grid.y <= MAX_INDEX_ROWS
+
 func setup_mesh_and_shader():
 	var glyph_w = AtlasHelper.get_glyph_width()  # 14
 	var glyph_h = AtlasHelper.get_glyph_height() # 32
@@ -115,6 +142,7 @@ func setup_mesh_and_shader():
 	mesh_instance.material_override = shader_material
 
 func set_content(lines: PackedStringArray):
+	content_layout = null
 	content_lines = lines
 	line_colors.clear()
 	line_blend_modes.clear()
@@ -124,6 +152,7 @@ func set_content(lines: PackedStringArray):
 	render_content()
 
 func set_colored_content(lines: PackedStringArray, colors: Array[Color]):
+	content_layout = null
 	content_lines = lines
 	line_colors = colors
 	line_blend_modes.clear()
@@ -133,34 +162,107 @@ func set_colored_content(lines: PackedStringArray, colors: Array[Color]):
 
 # NEW: Full control over colors and blend modes
 func set_styled_content(lines: PackedStringArray, colors: Array[Color], blend_modes: Array[BlendMode]):
+	content_layout = null
 	content_lines = lines
 	line_colors = colors
 	line_blend_modes = blend_modes
 	render_content()
 
+# Virtualized content: only the blocks around the viewport are ever wrapped,
+# so startup cost does not depend on the document length
+func set_content_provider(provider: TextContentProvider, max_cached_blocks: int = 64):
+	content_layout = VirtualTextLayout.new(provider, cols, max_cached_blocks)
+	content_lines = PackedStringArray()
+	line_colors.clear()
+	line_blend_modes.clear()
+	scroll_offset = 0.0
+	render_content()
+
+func get_line_count() -> int:
+	return content_layout.get_total_lines() if content_layout != null else content_lines.size()
+
 # ScrollableTextDisplay.render_content()
 func render_content():
 	var buffer_lines = 5
-	total_content_height = content_lines.size() * glyph_height
+	var start_line = max(0, int(scroll_offset / glyph_height) - buffer_lines)
+	if content_layout != null:
+		start_line = fill_virtual_window(buffer_lines)
+	total_content_height = get_line_count() * glyph_height
 	max_scroll = max(0.0, total_content_height - viewport_height)
 	
 	# Calculate which lines to render
-	var start_line = max(0, int(scroll_offset / glyph_height) - buffer_lines)
-	var end_line = min(content_lines.size(), start_line + visible_rows + buffer_lines * 2)
+	var end_line = min(get_line_count(), start_line + visible_rows + buffer_lines * 2)
+	if content_layout == null:
+		fill_window(start_line, end_line)
+	else:
+		end_line = start_line + window_lines.size()
 	
 	render_offset = start_line * glyph_height
 	content_height = (end_line - start_line) * glyph_height
 	last_render_start_line = start_line
 	
+	if render_mode == RenderMode.GLYPH_INDEX:
+		render_glyph_indices(start_line, end_line)
+	else:
+		render_raster(start_line, end_line)
+	update_scroll_shader()
+
+func fill_window(start_line: int, end_line: int):
+	window_lines = content_lines.slice(start_line, end_line)
+	window_colors.clear()
+	window_blend_modes.clear()
+	for line_idx in range(start_line, end_line):
+		window_colors.append(line_colors[line_idx] if line_idx < line_colors.size() else Color.WHITE)
+		window_blend_modes.append(line_blend_modes[line_idx] if line_idx < line_blend_modes.size() else BlendMode.NORMAL)
+
+# Wraps the blocks around the viewport and fills the window from them.
+# Wrapping replaces estimated block heights with real ones, so the line at
+# the top of the viewport is re-anchored: scroll_offset follows it when
+# blocks above it change height. Returns the window's first line.
+func fill_virtual_window(buffer_lines: int) -> int:
+	var start_line = 0
+	for _attempt in range(3):
+		var top = int(scroll_offset / glyph_height)
+		var fraction = scroll_offset - top * glyph_height
+		var anchor = content_layout.find_block(top)
+		var within = top - content_layout.get_block_start(anchor)
+		
+		start_line = max(0, top - buffer_lines)
+		window_lines = content_layout.get_lines(start_line, start_line + visible_rows + buffer_lines * 2)
+		
+		if anchor < 0:
+			break
+		within = min(within, max(content_layout.heights[anchor] - 1, 0))
+		var anchored_top = content_layout.get_block_start(anchor) + within
+		if anchored_top == top:
+			break
+		scroll_offset = anchored_top * glyph_height + fraction
+	
+	window_colors.clear()
+	window_blend_modes.clear()
+	for line in window_lines:
+		window_colors.append(content_layout.provider.get_line_color(line))
+		window_blend_modes.append(BlendMode.NORMAL)
+	return start_line
+
+func render_raster(start_line: int, end_line: int):
+	var content_image = rasterize_window(start_line, end_line)
+	content_texture = upload(content_texture, content_image)
+	bytes_uploaded = content_image.get_data_size()
+	
+	shader_material.set_shader_parameter("glyph_mode", false)
+	shader_material.set_shader_parameter("content_texture", content_texture)
+
+func rasterize_window(start_line: int, end_line: int) -> Image:
 	var content_image = Image.create(content_width, content_height, false, Image.FORMAT_RGBA8)
 	content_image.fill(Color.BLACK)
 	
 	# Render only visible range
 	for line_idx in range(start_line, end_line):
-		var line = content_lines[line_idx]
+		var line = window_lines[line_idx - start_line]
 		var y_pos = (line_idx - start_line) * glyph_height
-		var color = line_colors[line_idx] if line_idx < line_colors.size() else Color.WHITE
-		var blend_mode = line_blend_modes[line_idx] if line_idx < line_blend_modes.size() else BlendMode.NORMAL
+		var color = window_colors[line_idx - start_line]
+		var blend_mode = window_blend_modes[line_idx - start_line]
 		
 		for char_idx in range(min(line.length(), cols)):
 			var char = line[char_idx]
@@ -169,17 +271,60 @@ func render_content():
 			var glyph = AtlasHelper.get_glyph_image(char)
 			if glyph:
 				blit_colored_glyph(content_image, glyph, x_pos, y_pos, color, blend_mode)
+	return content_image
+
+func render_glyph_indices(start_line: int, end_line: int):
+	var window_rows = max(end_line - start_line, 1)
+	var data = build_glyph_index_data(start_line, end_line)
+	var indices = data[0]
+	var colors = data[1]
 	
-	if content_texture == null:
-		content_texture = ImageTexture.create_from_image(content_image)
-	else:
-		content_texture.update(content_image)
+	glyph_index_texture = upload(glyph_index_texture,
+		Image.create_from_data(cols, window_rows, false, Image.FORMAT_RGBA8, indices))
+	glyph_color_texture = upload(glyph_color_texture,
+		Image.create_from_data(cols, window_rows, false, Image.FORMAT_RGBA8, colors))
+	bytes_uploaded = indices.size() + colors.size()
 	
-	shader_material.set_shader_parameter("content_texture", content_texture)
-	update_scroll_shader()
+	shader_material.set_shader_parameter("glyph_mode", true)
+	shader_material.set_shader_parameter("glyph_index_texture", glyph_index_texture)
+	shader_material.set_shader_parameter("glyph_color_texture", glyph_color_texture)
+	shader_material.set_shader_parameter("atlas_texture", AtlasHelper.get_atlas_texture())
+	shader_material.set_shader_parameter("glyph_size", Vector2(glyph_width, glyph_height))
+	shader_material.set_shader_parameter("glyph_padding", int(AtlasHelper.font_info.get("glyph_padding", 0)))
+
+# [index bytes, color bytes] of the window, 4 bytes per cell each
+func build_glyph_index_data(start_line: int, end_line: int) -> Array:
+	var window_rows = max(end_line - start_line, 1)
+	var indices = PackedByteArray()
+	indices.resize(cols * window_rows * 4)
+	indices.fill(0)
+	var colors = indices.duplicate()
 	
-	# DEBUG: Save rendered image to check if squishing happens CPU-side
-	content_image.save_png("res://debug_content_image.png")
+	for line_idx in range(start_line, end_line):
+		var line = window_lines[line_idx - start_line]
+		var color = window_colors[line_idx - start_line]
+		var blend_mode = window_blend_modes[line_idx - start_line]
+		var rgba = color.to_abgr32()  # little-endian bytes r, g, b, a
+		var row = (line_idx - start_line) * cols * 4
+		
+		for char_idx in range(min(line.length(), cols)):
+			var cell = AtlasHelper.get_glyph_cell(line.unicode_at(char_idx))
+			if cell.x < 0:
+				continue
+			var i = row + char_idx * 4
+			indices[i] = cell.x & 255
+			indices[i + 1] = cell.x >> 8
+			indices[i + 2] = cell.y & 255
+			indices[i + 3] = (cell.y >> 8) | (blend_mode << 6)
+			colors.encode_u32(i, rgba)
+	return [indices, colors]
+
+# Update texture in place when the size matches, otherwise replace it
+func upload(texture: ImageTexture, image: Image) -> ImageTexture:
+	if texture != null and texture.get_width() == image.get_width() and texture.get_height() == image.get_height():
+		texture.update(image)
+		return texture
+	return ImageTexture.create_from_image(image)
 
 func blit_colored_glyph(target: Image, glyph: Image, dest_x: int, dest_y: int, color: Color, blend_mode: BlendMode = BlendMode.NORMAL):
 	for y in range(glyph.get_height()):
@@ -250,6 +395,8 @@ func update_scroll_shader():
 	shader_material.set_shader_parameter("scroll_offset", normalized)
 	shader_material.set_shader_parameter("content_height_ratio", 
 		float(content_height) / float(viewport_height))
+	shader_material.set_shader_parameter("scroll_pixels", local_offset)
+	shader_material.set_shader_parameter("viewport_size", Vector2(content_width, viewport_height))
 
 func _process(delta):
 	if abs(scroll_velocity) > 0.1:
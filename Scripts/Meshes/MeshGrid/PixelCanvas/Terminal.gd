@@ -12,11 +12,23 @@ var word_wrap_enabled: bool = false
 # Character grid for editing
 var char_grid: Array = []
 
+# Dirty cells: set_char only marks cells, flush_dirty() redraws them once per frame
+var dirty_flags: PackedByteArray = PackedByteArray()  # one flag per cell, y * cols + x
+var dirty_cells: PackedInt32Array = PackedInt32Array()
+var dirty_rects: Array[Rect2i] = []  # cell rects redrawn by the last flush
+
+# Per-frame counters
+var frame_cells_redrawn: int = 0
+var frame_bytes_uploaded: int = 0
+
 func _init(columns: int = 80, rows: int = 25):
 	super(columns, rows)
 	initialize_grid()
 
 func initialize_grid():
+	dirty_flags.resize(cols * visible_rows)
+	dirty_flags.fill(0)
+	dirty_cells.clear()
 	char_grid.resize(visible_rows)
 	for y in range(visible_rows):
 		char_grid[y] = []
@@ -47,13 +59,45 @@ func set_char(x: int, y: int, char: String, fg: Color = Color.WHITE, bg: Color =
 	if x < 0 or x >= cols or y < 0 or y >= char_grid.size():
 		return
 	
+	var cell = char_grid[y][x]
+	if cell["char"] == char and cell["fg"] == fg and cell["bg"] == bg:
+		return
+	
 	char_grid[y][x] = {
 		"char": char,
 		"fg": fg,
 		"bg": bg
 	}
 	
-	render_char_to_text_layer(x, y)
+	mark_dirty(x, y)
+
+func mark_dirty(x: int, y: int):
+	var i = y * cols + x
+	if dirty_flags[i] == 0:
+		dirty_flags[i] = 1
+		dirty_cells.append(i)
+
+func mark_all_dirty():
+	for i in range(dirty_flags.size()):
+		mark_dirty(i % cols, i / cols)
+
+# Redraw the dirty cells into the text layer and upload it once
+func flush_dirty():
+	frame_cells_redrawn = 0
+	frame_bytes_uploaded = 0
+	if dirty_cells.is_empty():
+		return
+	
+	dirty_cells.sort()
+	for i in dirty_cells:
+		render_char_to_text_layer(i % cols, i / cols)
+		dirty_flags[i] = 0
+	dirty_rects = TextUtils.merge_dirty_cells(dirty_cells, cols)
+	frame_cells_redrawn = dirty_cells.size()
+	dirty_cells.clear()
+	
+	text_texture.update(text_layer)
+	frame_bytes_uploaded = text_layer.get_data_size()
 
 func render_char_to_text_layer(x: int, y: int):
 	var cell = char_grid[y][x]
@@ -61,16 +105,12 @@ func render_char_to_text_layer(x: int, y: int):
 	var glyph_y = y * glyph_height
 	
 	# Draw background
-	for py in range(glyph_height):
-		for px in range(glyph_width):
-			text_layer.set_pixel(glyph_x + px, glyph_y + py, cell["bg"])
+	text_layer.fill_rect(Rect2i(glyph_x, glyph_y, glyph_width, glyph_height), cell["bg"])
 	
 	# Draw glyph
 	var glyph = AtlasHelper.get_glyph_image(cell["char"])
 	if glyph:
 		blit_colored_glyph(text_layer, glyph, glyph_x, glyph_y, cell["fg"])
-	
-	text_texture.update(text_layer)
 
 func write_char(char: String, fg: Color = Color.WHITE, bg: Color = Color.BLACK):
 	if char == "\n":
@@ -117,8 +157,8 @@ func scroll_up():
 			"bg": Color.BLACK
 		})
 	
-	# Re-render entire text layer
-	render_full_grid()
+	# Every row moved; redraw them all at the next flush
+	mark_all_dirty()
 
 func render_full_grid():
 	text_layer.fill(Color.BLACK)
@@ -130,22 +170,26 @@ func render_full_grid():
 			var glyph_y = y * glyph_height
 			
 			# Background
-			for py in range(glyph_height):
-				for px in range(glyph_width):
-					text_layer.set_pixel(glyph_x + px, glyph_y + py, cell["bg"])
+			text_layer.fill_rect(Rect2i(glyph_x, glyph_y, glyph_width, glyph_height), cell["bg"])
 			
 			# Glyph
 			var glyph = AtlasHelper.get_glyph_image(cell["char"])
 			if glyph:
 				blit_colored_glyph(text_layer, glyph, glyph_x, glyph_y, cell["fg"])
 	
+	dirty_flags.fill(0)
+	dirty_cells.clear()
 	text_texture.update(text_layer)
 
 func clear_screen():
 	cursor_x = 0
 	cursor_y = 0
 	initialize_grid()
-	render_full_grid()
+	mark_all_dirty()
+
+func _process(delta):
+	flush_dirty()
+	super(delta)
 
 func update_animation_layer():
 	# Clear animation layer
@@ -0,0 +1,26 @@
+extends RefCounted
+class_name TextContentProvider
+
+# Content for ScrollableTextDisplay.set_content_provider(), in blocks (a
+# chapter, a document section, ...) that are only wrapped when they come into
+# view. Override get_block_count() and get_block_text(), or get_block_lines()
+# to wrap (or cache wrapped lines) another way. estimate_block_lines() sets
+# the scroll height of blocks not wrapped yet, so it should be cheap.
+
+func get_block_count() -> int:
+	return 0
+
+# Unwrapped text of a block
+func get_block_text(_block: int) -> String:
+	return ""
+
+# Lines a block will wrap to, before it is wrapped
+func estimate_block_lines(_block: int, _cols: int) -> int:
+	return 1
+
+# Wrapped lines of a block
+func get_block_lines(block: int, cols: int) -> PackedStringArray:
+	return TextUtils.word_wrap(get_block_text(block), cols)
+
+func get_line_color(_line: String) -> Color:
+	return Color.WHITE
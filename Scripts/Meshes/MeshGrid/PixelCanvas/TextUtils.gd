@@ -102,3 +102,37 @@ static func truncate_with_ellipsis(text: String, max_length: int) -> String:
 	if max_length < 3:
 		return text.substr(0, max_length)
 	return text.substr(0, max_length - 3) + "..."
+
+# Merge dirty cells (row-major indices y * cols + x, sorted) into cell rects:
+# runs of adjacent cells in a row, stacked across rows that have the same run
+static func merge_dirty_cells(cells: PackedInt32Array, cols: int) -> Array[Rect2i]:
+	var rects: Array[Rect2i] = []
+	var above = {}  # Vector2i(start, end) -> rect index, for runs on the previous row
+	var current = {}
+	var current_row = -1
+	var k = 0
+	while k < cells.size():
+		var y = cells[k] / cols
+		var start = cells[k] % cols
+		var end = start + 1
+		k += 1
+		while k < cells.size() and cells[k] == y * cols + end and end < cols:
+			end += 1
+			k += 1
+		
+		if y != current_row:
+			above = current if y == current_row + 1 else {}
+			current = {}
+			current_row = y
+		
+		var run = Vector2i(start, end)
+		if above.has(run):
+			var index = above[run]
+			var rect = rects[index]
+			rect.size.y += 1
+			rects[index] = rect
+			current[run] = index
+		else:
+			rects.append(Rect2i(start, y, end - start, 1))
+			current[run] = rects.size() - 1
+	return rects
@@ -0,0 +1,116 @@
+extends RefCounted
+class_name VirtualTextLayout
+
+# Line layout over a TextContentProvider's blocks. Block heights (in lines)
+# start as the provider's estimates and become exact the first time a block
+# is wrapped. A Fenwick tree over the heights gives a block's first line,
+# the block holding a line, and height updates in O(log n), so scrolling
+# anywhere in the document never walks the blocks before it. Wrapped blocks
+# are kept under an LRU bound; their heights stay exact after eviction.
+
+var provider: TextContentProvider
+var cols: int = 80
+var block_limit: int = 64
+var heights: PackedInt32Array = PackedInt32Array()
+var tree: PackedInt32Array = PackedInt32Array()  # Fenwick tree over heights, 1-based
+var measured: PackedByteArray = PackedByteArray()  # 1 once a block's height is exact
+var blocks: Dictionary = {}  # block -> wrapped lines, least recently used first
+var total_lines: int = 0
+var blocks_wrapped: int = 0
+
+func _init(content_provider: TextContentProvider, columns: int = 80, max_blocks: int = 64):
+	provider = content_provider
+	cols = columns
+	block_limit = max_blocks
+	
+	var n = provider.get_block_count()
+	heights.resize(n)
+	measured.resize(n)
+	measured.fill(0)
+	tree.resize(n + 1)
+	tree.fill(0)
+	for b in range(n):
+		heights[b] = max(provider.estimate_block_lines(b, cols), 0)
+		total_lines += heights[b]
+	# Linear-time build: each node adds itself into its parent
+	for i in range(1, n + 1):
+		tree[i] += heights[i - 1]
+		var parent = i + (i & -i)
+		if parent <= n:
+			tree[parent] += tree[i]
+
+func get_block_count() -> int:
+	return heights.size()
+
+func get_total_lines() -> int:
+	return total_lines
+
+# First line of a block (sum of the heights before it)
+func get_block_start(block: int) -> int:
+	var sum = 0
+	var i = block
+	while i > 0:
+		sum += tree[i]
+		i -= i & -i
+	return sum
+
+# Block holding a line; lines past the end give the last block
+func find_block(line: int) -> int:
+	var n = heights.size()
+	var pos = 0
+	var remaining = line
+	var step = 1
+	while step * 2 <= n:
+		step *= 2
+	while step > 0:
+		var next = pos + step
+		if next <= n and tree[next] <= remaining:
+			pos = next
+			remaining -= tree[next]
+		step /= 2
+	return min(pos, n - 1)
+
+func set_block_height(block: int, height: int):
+	var delta = height - heights[block]
+	if delta == 0:
+		return
+	heights[block] = height
+	total_lines += delta
+	var i = block + 1
+	while i <= heights.size():
+		tree[i] += delta
+		i += i & -i
+
+# Wrapped lines of a block, wrapping (and measuring) it on first use
+func get_block_lines(block: int) -> PackedStringArray:
+	var lines = blocks.get(block)
+	if lines != null:
+		# Re-insert to mark it most recently used (Dictionary keeps insertion order)
+		blocks.erase(block)
+		blocks[block] = lines
+		return lines
+	lines = provider.get_block_lines(block, cols)
+	blocks_wrapped += 1
+	if measured[block] == 0:
+		measured[block] = 1
+		set_block_height(block, lines.size())
+	while blocks.size() >= max(block_limit, 1):
+		blocks.erase(blocks.keys()[0])
+	blocks[block] = lines
+	return lines
+
+# Lines start .. end - 1 of the document. Blocks wrapped on the way may
+# change height, but never move lines at or after their own first line.
+func get_lines(start: int, end: int) -> PackedStringArray:
+	var result = PackedStringArray()
+	if heights.is_empty() or end <= start:
+		return result
+	var block = find_block(start)
+	var offset = start - get_block_start(block)
+	while result.size() < end - start and block < heights.size():
+		var lines = get_block_lines(block)
+		if offset < lines.size():
+			result.append_array(lines.slice(offset, offset + end - start - result.size()))
+		offset = max(offset - lines.size(), 0)
+		block += 1
+	return result
@@ -6,11 +6,41 @@ extends Node
 const ATLAS_PATH = "res://Assets/Fonts/font_atlas_fixed_grid_baseline_fixed.png"
 const METADATA_PATH = "res://Assets/Fonts/font_atlas_fixed_grid_baseline_fixed_metadata.json"
 const FONTINFO_PATH = "res://Assets/Fonts/font_atlas_fixed_grid_baseline_fixed_fontinfo.json"
+const LOOKUP_PATH = "res://Assets/Fonts/font_atlas_fixed_grid_baseline_fixed_lookup.bin"
+
+# Binary lookup layout, see Assets/Fonts/glyph_lookup.py
+const LOOKUP_MAGIC = "GLYL"
+const LOOKUP_VERSION = 1
+const LOOKUP_HEADER_SIZE = 20
+const LOOKUP_KIND_DENSE = 0
+const LOOKUP_RECORD_SIZE = 7  # x, y, w, h, bearing_x, bearing_y, advance
+
+# Glyph images are sliced from the atlas once and shared; atlases with more
+# glyphs than this are cached lazily and evicted oldest-first
+const GLYPH_CACHE_LIMIT = 4096
 
 static var atlas_image : Image = null
+static var atlas_texture : ImageTexture = null  # created on first use, for shaders that sample the atlas
 static var metadata : Dictionary = {}
 static var font_info : Dictionary = {}
 
+# Integer glyph lookup, loaded from LOOKUP_PATH when it exists
+static var lookup_dense : bool = true
+static var lookup_first_cp : int = 0
+static var lookup_table : PackedInt32Array = PackedInt32Array()  # dense: slot + 1 (0 = missing), sorted: codepoints
+static var glyph_records : PackedInt32Array = PackedInt32Array()  # LOOKUP_RECORD_SIZE ints per slot
+
+# Glyph image cache (codepoint -> Image). Cached images are shared between
+# callers, so treat them as read-only.
+static var glyph_cache_enabled : bool = true
+static var glyph_cache : Dictionary = {}
+static var glyph_cache_order : PackedInt32Array = PackedInt32Array()  # insertion order, for eviction
+static var glyph_cache_next : int = 0  # next glyph_cache_order entry to evict once full
+static var glyph_coverage_cache : Dictionary = {}  # codepoint -> PackedByteArray, one alpha byte per pixel
+static var glyph_span_cache : Dictionary = {}  # codepoint -> PackedInt32Array of (row, start, end) runs of coverage > 0
+static var glyph_cache_hits : int = 0
+static var glyph_images_sliced : int = 0  # Images allocated from the atlas
+
 func _init() -> void:
 	if atlas_image != null:
 		# Already initialized
@@ -38,31 +68,266 @@ func _init() -> void:
 	else:
 		push_error("Failed to load font info JSON")
 
+	# === Load binary glyph lookup (optional) ===
+	load_lookup(LOOKUP_PATH)
+
+	# === Slice every glyph up front when the whole atlas fits in the cache ===
+	var codepoints = get_glyph_codepoints()
+	if codepoints.size() <= GLYPH_CACHE_LIMIT:
+		for cp in codepoints:
+			get_glyph_image_for_codepoint(cp)
+
+static func load_lookup(path : String) -> bool:
+	if not FileAccess.file_exists(path):
+		return false
+
+	var bytes = FileAccess.get_file_as_bytes(path)
+	if bytes.size() < LOOKUP_HEADER_SIZE or bytes.slice(0, 4).get_string_from_ascii() != LOOKUP_MAGIC \
+			or bytes.decode_u16(4) != LOOKUP_VERSION:
+		push_warning("Ignoring invalid glyph lookup %s" % path)
+		return false
+
+	var glyph_count = bytes.decode_u32(8)
+	var table_length = bytes.decode_u32(16)
+	var records_start = LOOKUP_HEADER_SIZE + table_length * 4
+	var records_end = records_start + glyph_count * LOOKUP_RECORD_SIZE * 4
+	if bytes.size() < records_end:
+		push_warning("Truncated glyph lookup %s" % path)
+		return false
+
+	lookup_dense = bytes.decode_u16(6) == LOOKUP_KIND_DENSE
+	lookup_first_cp = bytes.decode_u32(12)
+	lookup_table = bytes.slice(LOOKUP_HEADER_SIZE, records_start).to_int32_array()
+	glyph_records = bytes.slice(records_start, records_end).to_int32_array()
+	return true
+
+static func has_lookup() -> bool:
+	return not glyph_records.is_empty()
+
+# Slot of a codepoint in glyph_records, or -1 if the atlas does not have it
+static func get_glyph_slot(cp : int) -> int:
+	if lookup_dense:
+		var index = cp - lookup_first_cp
+		if index < 0 or index >= lookup_table.size():
+			return -1
+		return lookup_table[index] - 1
+
+	var i = lookup_table.bsearch(cp)
+	if i < lookup_table.size() and lookup_table[i] == cp:
+		return i
+	return -1
+
+static func has_glyph(cp : int) -> bool:
+	if has_lookup():
+		return get_glyph_slot(cp) >= 0
+	return metadata.has(str(cp))
+
+# Every codepoint the atlas has a glyph for
+static func get_glyph_codepoints() -> PackedInt32Array:
+	var codepoints = PackedInt32Array()
+	if not has_lookup():
+		for key in metadata.keys():
+			codepoints.append(int(key))
+	elif lookup_dense:
+		for i in range(lookup_table.size()):
+			if lookup_table[i] > 0:
+				codepoints.append(lookup_first_cp + i)
+	else:
+		codepoints = lookup_table.duplicate()
+	return codepoints
+
 static func get_glyph_width() -> int:
 	return font_info.get("glyph_box_width", 8)  # Default fallback
 
 static func get_glyph_height() -> int:
 	return font_info.get("glyph_box_height", 16)  # Default fallback
 
+# [col, row] of cp's cell in a grid atlas, or (-1, -1) if it is missing
+static func get_glyph_cell(cp : int) -> Vector2i:
+	if has_lookup():
+		var slot = get_glyph_slot(cp)
+		if slot < 0:
+			return Vector2i(-1, -1)
+		var pad = int(font_info.get("glyph_padding", 0))
+		var r = slot * LOOKUP_RECORD_SIZE
+		return Vector2i((glyph_records[r] - pad) / (get_glyph_width() + 2 * pad),
+			(glyph_records[r + 1] - pad) / (get_glyph_height() + 2 * pad))
+	var row_col = metadata.get(str(cp))
+	if row_col == null:
+		return Vector2i(-1, -1)
+	return Vector2i(int(row_col[1]), int(row_col[0]))
+
+# Cells across and down of a grid atlas
+static func get_grid_size() -> Vector2i:
+	if atlas_image == null:
+		return Vector2i.ZERO
+	var pad = int(font_info.get("glyph_padding", 0))
+	return Vector2i(atlas_image.get_width() / (get_glyph_width() + 2 * pad),
+		atlas_image.get_height() / (get_glyph_height() + 2 * pad))
+
+static func get_atlas_texture() -> ImageTexture:
+	if atlas_texture == null and atlas_image != null:
+		atlas_texture = ImageTexture.create_from_image(atlas_image)
+	return atlas_texture
+
+# Skyline atlases store {"rect", "bearing", "advance"} per glyph instead of [row, col]
+static func is_packed() -> bool:
+	return font_info.get("packing", "grid") == "skyline"
+
+static func get_glyph_advance(char : String) -> int:
+	if char.is_empty():
+		return 0
+	var cp = char.unicode_at(0)
+	if has_lookup():
+		var slot = get_glyph_slot(cp)
+		if slot >= 0:
+			return glyph_records[slot * LOOKUP_RECORD_SIZE + 6]
+		return get_glyph_width()
+
+	var entry = metadata.get(str(cp))
+	if is_packed() and entry != null:
+		return int(entry["advance"])
+	return get_glyph_width()
+
 
 static func get_glyph_image(char : String) -> Image:
 	if atlas_image == null or char.is_empty():
 		return null
-	
-	var cp = char.unicode_at(0)
+	return get_glyph_image_for_codepoint(char.unicode_at(0))
 
-	if not metadata.has(str(cp)):
-		push_warning("Missing glyph for character: %s (codepoint %d)" % [char, cp])
+# The returned image is shared through the glyph cache; do not modify it
+static func get_glyph_image_for_codepoint(cp : int) -> Image:
+	if atlas_image == null:
 		return null
-	
+
+	if glyph_cache_enabled:
+		var cached = glyph_cache.get(cp)
+		if cached != null:
+			glyph_cache_hits += 1
+			return cached
+
+	var glyph = slice_glyph_image(cp)
+	if glyph != null and glyph_cache_enabled:
+		cache_glyph_image(cp, glyph)
+	return glyph
+
+static func cache_glyph_image(cp : int, glyph : Image) -> void:
+	if glyph_cache.size() >= GLYPH_CACHE_LIMIT:
+		var evicted = glyph_cache_order[glyph_cache_next]
+		glyph_cache.erase(evicted)
+		glyph_coverage_cache.erase(evicted)
+		glyph_span_cache.erase(evicted)
+		glyph_cache_order[glyph_cache_next] = cp
+		glyph_cache_next = (glyph_cache_next + 1) % GLYPH_CACHE_LIMIT
+	else:
+		glyph_cache_order.append(cp)
+	glyph_cache[cp] = glyph
+
+static func clear_glyph_cache() -> void:
+	glyph_cache.clear()
+	glyph_coverage_cache.clear()
+	glyph_span_cache.clear()
+	glyph_cache_order.clear()
+	glyph_cache_next = 0
+
+# Glyph alpha as glyph_box_width * glyph_box_height bytes, row by row
+static func get_glyph_coverage(cp : int) -> PackedByteArray:
+	var cached = glyph_coverage_cache.get(cp)
+	if cached != null:
+		return cached
+	var glyph = get_glyph_image_for_codepoint(cp)
+	if glyph == null:
+		return PackedByteArray()
+	var coverage = coverage_from_image(glyph)
+	if glyph_cache_enabled and glyph_cache.has(cp):
+		glyph_coverage_cache[cp] = coverage
+	return coverage
+
+# (row, start, end) triples covering every pixel of the glyph with coverage > 0
+static func get_glyph_spans(cp : int) -> PackedInt32Array:
+	var cached = glyph_span_cache.get(cp)
+	if cached != null:
+		return cached
+	var spans = spans_from_coverage(get_glyph_coverage(cp), get_glyph_width())
+	if glyph_cache_enabled and glyph_cache.has(cp):
+		glyph_span_cache[cp] = spans
+	return spans
+
+static func coverage_from_image(glyph : Image) -> PackedByteArray:
+	var rgba = glyph
+	if glyph.get_format() != Image.FORMAT_RGBA8:
+		rgba = glyph.duplicate()
+		rgba.convert(Image.FORMAT_RGBA8)
+	var data = rgba.get_data()
+	var coverage = PackedByteArray()
+	coverage.resize(data.size() / 4)
+	for i in range(coverage.size()):
+		coverage[i] = data[i * 4 + 3]
+	return coverage
+
+static func spans_from_coverage(coverage : PackedByteArray, width : int) -> PackedInt32Array:
+	var spans = PackedInt32Array()
+	if width <= 0:
+		return spans
+	for row in range(coverage.size() / width):
+		var offset = row * width
+		var x = 0
+		while x < width:
+			if coverage[offset + x] == 0:
+				x += 1
+				continue
+			var start = x
+			while x < width and coverage[offset + x] != 0:
+				x += 1
+			spans.append_array([row, start, x])
+	return spans
+
+# Cut a new glyph_box_width x glyph_box_height image for cp out of the atlas
+static func slice_glyph_image(cp : int) -> Image:
 	var glyph_w = font_info["glyph_box_width"]
 	var glyph_h = font_info["glyph_box_height"]
 
+	if has_lookup():
+		var slot = get_glyph_slot(cp)
+		if slot < 0:
+			push_warning("Missing glyph for codepoint %d" % cp)
+			return null
+		var r = slot * LOOKUP_RECORD_SIZE
+		return get_glyph_box_image(
+			Rect2i(glyph_records[r], glyph_records[r + 1], glyph_records[r + 2], glyph_records[r + 3]),
+			Vector2i(glyph_records[r + 4], glyph_records[r + 5]), glyph_w, glyph_h)
+
+	if not metadata.has(str(cp)):
+		push_warning("Missing glyph for codepoint %d" % cp)
+		return null
+
+	if is_packed():
+		var entry = metadata[str(cp)]
+		var rect = entry["rect"]
+		var bearing = entry["bearing"]
+		return get_glyph_box_image(Rect2i(rect[0], rect[1], rect[2], rect[3]),
+			Vector2i(bearing[0], bearing[1]), glyph_w, glyph_h)
+
 	var row_col = metadata[str(cp)]
 	var atlas_row = row_col[0]
 	var atlas_col = row_col[1]
 
-	var x1 = atlas_col * glyph_w
-	var y1 = atlas_row * glyph_h
+	# SDF atlases pad every cell so the distance field can extend past the glyph box
+	var pad = int(font_info.get("glyph_padding", 0))
+	var x1 = atlas_col * (glyph_w + 2 * pad) + pad
+	var y1 = atlas_row * (glyph_h + 2 * pad) + pad
 
+	glyph_images_sliced += 1
 	return atlas_image.get_region(Rect2i(x1, y1, glyph_w, glyph_h))
+
+# Packed glyphs are rebuilt into the full glyph box so callers see the same
+# glyph_box_width x glyph_box_height image a grid atlas would give them
+static func get_glyph_box_image(rect : Rect2i, bearing : Vector2i, glyph_w : int, glyph_h : int) -> Image:
+	glyph_images_sliced += 1
+	if bearing == Vector2i.ZERO and rect.size == Vector2i(glyph_w, glyph_h):
+		return atlas_image.get_region(rect)
+
+	var glyph = Image.create(glyph_w, glyph_h, false, atlas_image.get_format())
+	if rect.size.x > 0 and rect.size.y > 0:
+		glyph.blit_rect(atlas_image, rect, bearing)
+	return glyph
@@ -5,10 +5,21 @@ var char_grid : Array = []  # 2D array of cells
 var cols : int
 var rows : int
 
+# Dirty cells: set_char only marks cells, flush_dirty() redraws them once per frame
+var dirty_flags : PackedByteArray = PackedByteArray()  # one flag per cell, y * cols + x
+var dirty_cells : PackedInt32Array = PackedInt32Array()  # indices of flagged cells
+var dirty_rects : Array[Rect2i] = []  # cell rects redrawn by the last flush
+
+# Per-frame counters
+var cells_redrawn : int = 0  # cells drawn since the last frame
+var frame_cells_redrawn : int = 0  # cells drawn for the last frame
+var frame_dirty_bytes : int = 0  # raw_data bytes covered by the last frame's dirty rects
+
 # Blend modes
 enum BlendMode {
 	ADDITIVE,
-	SUBTRACTIVE
+	SUBTRACTIVE,
+	NORMAL
 }
 
 func _init() -> void:
@@ -28,6 +39,9 @@ func _ready() -> void:
 	demo_russian_chars()
 
 func initialize_char_grid(cols: int, rows: int):
+	dirty_flags.resize(cols * rows)
+	dirty_flags.fill(0)
+	dirty_cells.clear()
 	char_grid.resize(rows)
 	for y in range(rows):
 		char_grid[y] = []
@@ -38,6 +52,19 @@ func initialize_char_grid(cols: int, rows: int):
 				"bg": COLORS.BLACK,
 				"blend_mode": BlendMode.ADDITIVE
 			})
+	# raw_data starts transparent, not as the default cells: paint them all on the next flush
+	mark_all_dirty()
+
+func mark_all_dirty():
+	"""Marks every cell dirty, for when raw_data no longer shows char_grid"""
+	for i in range(cols * rows):
+		if dirty_flags[i] == 0:
+			dirty_flags[i] = 1
+			dirty_cells.append(i)
+
+func clear_display():
+	super()
+	mark_all_dirty()  # set_char skips unchanged cells, so they must be repainted
 
 func resize_character_display(new_cols: int, new_rows: int):
 	"""Resize the character display to new dimensions"""
@@ -60,12 +87,44 @@ func set_char(x: int, y: int, char: String, fg: Color=COLORS.WHITE, bg: Color=CO
 		return
 	
 	var cp = char.unicode_at(0)
-	char_grid[y][x]["char"] = cp
-	char_grid[y][x]["fg"] = fg
-	char_grid[y][x]["bg"] = bg
-	char_grid[y][x]["blend_mode"] = blend_mode
+	var cell = char_grid[y][x]
+	if cell["char"] == cp and cell["fg"] == fg and cell["bg"] == bg and cell["blend_mode"] == blend_mode:
+		return
+	cell["char"] = cp
+	cell["fg"] = fg
+	cell["bg"] = bg
+	cell["blend_mode"] = blend_mode
 	
-	draw_char(x, y)
+	mark_dirty(x, y)
+
+func mark_dirty(x: int, y: int):
+	var i = y * cols + x
+	if dirty_flags[i] == 0:
+		dirty_flags[i] = 1
+		dirty_cells.append(i)
+
+func flush_dirty():
+	"""Redraws the dirty cells and records them as merged rects in dirty_rects"""
+	if dirty_cells.is_empty():
+		return
+	dirty_cells.sort()
+	for i in dirty_cells:
+		draw_char(i % cols, i / cols)
+		dirty_flags[i] = 0
+	dirty_rects = TextUtils.merge_dirty_cells(dirty_cells, cols)
+	dirty_cells.clear()
+
+func _process(delta):
+	flush_dirty()
+	frame_cells_redrawn = cells_redrawn
+	cells_redrawn = 0
+	frame_dirty_bytes = 0
+	if frame_cells_redrawn > 0:
+		var cell_bytes = AtlasHelper.get_glyph_width() * AtlasHelper.get_glyph_height() * 4
+		for rect in dirty_rects:
+			frame_dirty_bytes += rect.get_area() * cell_bytes
+	# Texture upload (at most one per frame)
+	super(delta)
 
 func draw_char(x: int, y: int):
 	var cell = char_grid[y][x]
@@ -78,63 +137,82 @@ func draw_char(x: int, y: int):
 	var dest_y = y * glyph_h
 	
 	# Always overwrite the cell with the new background
-	draw_rect(dest_x, dest_y, glyph_w, glyph_h, [cell["bg"].r, cell["bg"].g, cell["bg"].b, cell["bg"].a])
+	fill_cell(dest_x, dest_y, glyph_w, glyph_h, cell["bg"])
 
 	# Draw glyph with specified blend mode
-	if AtlasHelper.metadata.has(str(cp)):
-		var glyph_img = AtlasHelper.get_glyph_image(char(cp))
-		if glyph_img != null:
-			blit_glyph_with_mode(glyph_img, Vector2i(dest_x, dest_y), cell["fg"], cell["blend_mode"])
+	if AtlasHelper.has_glyph(cp):
+		blit_coverage_spans(AtlasHelper.get_glyph_coverage(cp), AtlasHelper.get_glyph_spans(cp), glyph_w,
+			Vector2i(dest_x, dest_y), cell["fg"], cell["blend_mode"])
+	cells_redrawn += 1
+	needs_texture_update = true
+
+func fill_cell(dest_x: int, dest_y: int, width: int, height: int, color: Color):
+	"""Fills a rectangle of raw_data with one color, a 32-bit write per pixel"""
+	var rgba = int(clamp(color.r * 255, 0, 255)) | (int(clamp(color.g * 255, 0, 255)) << 8) \
+		| (int(clamp(color.b * 255, 0, 255)) << 16) | (int(clamp(color.a * 255, 0, 255)) << 24)
+	var x0 = max(dest_x, 0)
+	var x1 = min(dest_x + width, pixel_width)
+	for py in range(max(dest_y, 0), min(dest_y + height, pixel_height)):
+		var row = py * pixel_width * 4
+		for px in range(x0, x1):
+			raw_data.encode_u32(row + px * 4, rgba)
 
 func blit_glyph_with_mode(glyph_img: Image, dest_pos: Vector2i, fg_color: Color, blend_mode: BlendMode):
+	"""Blits an arbitrary glyph image; cells from the atlas go through blit_coverage_spans directly"""
+	var coverage = AtlasHelper.coverage_from_image(glyph_img)
+	var spans = AtlasHelper.spans_from_coverage(coverage, glyph_img.get_width())
+	blit_coverage_spans(coverage, spans, glyph_img.get_width(), dest_pos, fg_color, blend_mode)
+	needs_texture_update = true
+
+func blit_coverage_spans(coverage: PackedByteArray, spans: PackedInt32Array, glyph_w: int, dest_pos: Vector2i, fg_color: Color, blend_mode: BlendMode):
 	"""
-	Blits a glyph image using the specified blend mode.
-	ADDITIVE: bg.rgb += fg.rgb * fg.a, bg.a += fg.a
-	SUBTRACTIVE: bg.rgb -= fg.rgb * fg.a, bg.a -= fg.a
+	Blends fg_color into raw_data over the glyph's (row, start, end) coverage spans,
+	in 8-bit integer math, with a = fg.a * coverage:
+	ADDITIVE: bg.rgb += fg.rgb * a, bg.a += a
+	SUBTRACTIVE: bg.rgb -= fg.rgb * a, bg.a -= a
+	NORMAL: bg.rgba = lerp(bg.rgba, fg.rgba, a)
 	"""
-	var glyph_w = glyph_img.get_width()
-	var glyph_h = glyph_img.get_height()
-	
-	for y in range(glyph_h):
-		var dest_y = dest_pos.y + y
+	var r8 = int(clamp(fg_color.r * 255, 0, 255))
+	var g8 = int(clamp(fg_color.g * 255, 0, 255))
+	var b8 = int(clamp(fg_color.b * 255, 0, 255))
+	var a8 = int(clamp(fg_color.a * 255, 0, 255))
+	var direction = -1 if blend_mode == BlendMode.SUBTRACTIVE else 1
+
+	for s in range(0, spans.size(), 3):
+		var dest_y = dest_pos.y + spans[s]
 		if dest_y < 0 or dest_y >= pixel_height:
 			continue
-			
-		for x in range(glyph_w):
-			var dest_x = dest_pos.x + x
-			if dest_x < 0 or dest_x >= pixel_width:
-				continue
-				
-			var glyph_pixel = glyph_img.get_pixel(x, y)
-			
-			# Skip completely transparent pixels
-			if glyph_pixel.a == 0:
-				continue
-			
-			var fg_alpha = fg_color.a * glyph_pixel.a
-			var current_color = Color(get_pixel(dest_x, dest_y)[0], get_pixel(dest_x, dest_y)[1], get_pixel(dest_x, dest_y)[2], get_pixel(dest_x, dest_y)[3])
-			var final_color = current_color
-			
-			match blend_mode:
-				BlendMode.ADDITIVE:
-					final_color.r += fg_color.r * fg_alpha
-					final_color.g += fg_color.g * fg_alpha
-					final_color.b += fg_color.b * fg_alpha
-					final_color.a += fg_alpha
-				BlendMode.SUBTRACTIVE:
-					final_color.r -= fg_color.r * fg_alpha
-					final_color.g -= fg_color.g * fg_alpha
-					final_color.b -= fg_color.b * fg_alpha
-					final_color.a -= fg_alpha
-			
-			final_color = final_color.clamp()
-			set_pixel(dest_x, dest_y, [final_color.r, final_color.g, final_color.b, final_color.a])
+		var start = max(spans[s + 1], -dest_pos.x)
+		var end = min(spans[s + 2], pixel_width - dest_pos.x)
+		var src = spans[s] * glyph_w
+		var row = (dest_y * pixel_width + dest_pos.x) * 4
+
+		if blend_mode == BlendMode.NORMAL:
+			for gx in range(start, end):
+				var w = coverage[src + gx] * a8  # a in 0..255*255
+				var keep = 65025 - w
+				var i = row + gx * 4
+				raw_data[i] = (raw_data[i] * keep + r8 * w + 32512) / 65025
+				raw_data[i + 1] = (raw_data[i + 1] * keep + g8 * w + 32512) / 65025
+				raw_data[i + 2] = (raw_data[i + 2] * keep + b8 * w + 32512) / 65025
+				raw_data[i + 3] = (raw_data[i + 3] * keep + a8 * w + 32512) / 65025
+		else:
+			for gx in range(start, end):
+				var w = coverage[src + gx] * a8
+				var i = row + gx * 4
+				raw_data[i] = clampi(raw_data[i] + direction * ((r8 * w + 32512) / 65025), 0, 255)
+				raw_data[i + 1] = clampi(raw_data[i + 1] + direction * ((g8 * w + 32512) / 65025), 0, 255)
+				raw_data[i + 2] = clampi(raw_data[i + 2] + direction * ((b8 * w + 32512) / 65025), 0, 255)
+				raw_data[i + 3] = clampi(raw_data[i + 3] + direction * ((w + 127) / 255), 0, 255)
 
 func render_all():
-	clear_display()
+	raw_data.fill(0)
 	for y in range(rows):
 		for x in range(cols):
 			draw_char(x, y)
+	dirty_flags.fill(0)
+	dirty_cells.clear()
+	dirty_rects = [Rect2i(0, 0, cols, rows)]
 	needs_texture_update = true
 
 # Convenience methods for common terminal operations
@@ -196,11 +274,12 @@ const COLORS = {
 }
 
 func demo_blend_modes():
-	"""Simple demo: black background, white foreground, additive vs subtractive"""
+	"""Simple demo: black background, white foreground, additive vs subtractive vs normal"""
 	clear_screen(COLORS.BLACK)
 
 	var text_add = "ADDITIVE"
 	var text_sub = "SUBTRACTIVE"
+	var text_normal = "NORMAL"
 
 	# Draw additive text in the top half
 	var fg = COLORS.WHITE
@@ -211,12 +290,16 @@ func demo_blend_modes():
 	for i in range(text_sub.length()):
 		set_char(2 + i, 5, text_sub[i], fg, COLORS.BLACK, BlendMode.SUBTRACTIVE)
 
+	# Draw normal (alpha blended) text below that
+	for i in range(text_normal.length()):
+		set_char(2 + i, 8, text_normal[i], COLORS.TRANSLUCENT_WHITE, COLORS.DARK_BLUE, BlendMode.NORMAL)
+
 	render_all()
 
 func demo_rainbow():
 	clear_screen(COLORS.BLACK)
 	
-	var blend_modes = [BlendMode.ADDITIVE, BlendMode.SUBTRACTIVE]
+	var blend_modes = [BlendMode.ADDITIVE, BlendMode.SUBTRACTIVE, BlendMode.NORMAL]
 	
 	var x = 0
 	var y = 0
@@ -16,9 +16,10 @@ func _ready() -> void:
 	set_char(cursor_x, cursor_y, '_')
 
 func _process(delta: float) -> void:
-	super(delta)
 	if cursor_timer >= cursor_flash_time: update_cursor_display()
 	else: cursor_timer += delta
+	# Flush after the cursor update so it is drawn this frame
+	super(delta)
 
 func update_cursor_display():
 	if cursor_visible:
@@ -10,6 +10,7 @@ var shader_material = null
 var mesh_instance = null
 
 var needs_texture_update := false
+var bytes_uploaded := 0  # texture bytes uploaded by the last _process
 
 var img := Image.new()
 var texture := ImageTexture.new()
@@ -127,8 +128,7 @@ func get_pixel(x: int, y: int) -> Array:
 	]
 
 func clear_display():
-	for i in range(raw_data.size()):
-		raw_data[i] = 0
+	raw_data.fill(0)
 	img.set_data(pixel_width, pixel_height, false, Image.FORMAT_RGBA8, raw_data)
 	texture.set_image(img)
 
@@ -153,10 +153,18 @@ func get_center() -> Vector2:
 	)
 
 func _process(delta):
+	bytes_uploaded = 0
 	if needs_texture_update:
-		img.set_data(pixel_width, pixel_height, false, Image.FORMAT_RGBA8, raw_data)
+		upload_texture()
+
+func upload_texture():
+	img.set_data(pixel_width, pixel_height, false, Image.FORMAT_RGBA8, raw_data)
+	if texture.get_width() == pixel_width and texture.get_height() == pixel_height:
+		texture.update(img)  # in place, no reallocation
+	else:
 		texture.set_image(img)
-		needs_texture_update = false
+	bytes_uploaded = raw_data.size()
+	needs_texture_update = false
 
 func display_image(image: Image):
 	if image.is_empty():
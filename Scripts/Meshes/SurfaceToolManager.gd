@@ -7,8 +7,8 @@ const NUM_DIRECTIONS = 6
 const FACE_NAMES = ["top", "bottom", "east", "west", "north", "south"]
 const ATLAS_WIDTH_MULTIPLIER = 6  # One tile per face
 
-# Static surface tools for each material type
-static var surface_tools = {}
+# Static materials for each voxel type and direction (GreedyCubeGrid's mesh
+# surfaces; the geometry itself is built per job in MeshArrays)
 static var materials = {}
 
 # Initialization flag
@@ -22,13 +22,13 @@ static func initialize():
 		return
 	
 	initialized = true
-	setup_material_and_tools()
+	setup_materials()
 
-static func setup_material_and_tools():
+static func setup_materials():
 	# Load the shader
 	var shader = preload("res://shaders/pixelated_glass.gdshader")
 	
-	# Setup materials and surface tools for each voxel type and direction
+	# Setup materials for each voxel type and direction
 	for voxel_type in Voxel.VoxelType.values():
 		if voxel_type == Voxel.VoxelType.AIR:
 			continue
@@ -56,10 +56,6 @@ static func setup_material_and_tools():
 				
 			# Store material
 			materials[key] = material
-			
-			# Create and store surface tool
-			var st = MeshHelper.get_new_surface_tool()
-			surface_tools[key] = st
 
 static func create_face_atlas(voxel_name: String) -> Image:
 	var face_images = []
@@ -93,19 +89,9 @@ static func create_face_atlas(voxel_name: String) -> Image:
 	
 	return atlas
 
-static func get_surface_tool(voxel_type: int, dir_index: int) -> SurfaceTool:
-	if not initialized:
-		initialize()
-	var key = str(voxel_type) + "_" + str(dir_index)
-	return surface_tools[key]
-
 static func get_material(voxel_type: int, dir_index: int) -> Material:
 	if not initialized:
 		initialize()
 	var key = str(voxel_type) + "_" + str(dir_index)
 	return materials[key]
 
-static func reset_surface_tools():
-	for key in surface_tools:
-		var st = surface_tools[key]
-		MeshHelper.reset_surface_tool(st)
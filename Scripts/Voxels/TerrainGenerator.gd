@@ -0,0 +1,81 @@
+extends RefCounted
+class_name TerrainGenerator
+
+# =======================================
+# TerrainGenerator.gd
+# =======================================
+# Seeded noise for terrain generation. One TerrainGenerator (and one
+# FastNoiseLite per layer) exists per world seed, shared by every grid that
+# generates terrain with that seed (for_seed).
+#
+# Noise is sampled a chunk at a time into PackedFloat32Arrays: 2D maps (one
+# value per column) and horizontal slices of 3D layers (one value per voxel
+# of a y level), both indexed x * z_len + z. Samples are taken at world
+# voxel coordinates, so the same seed always gives the same terrain and
+# neighboring chunks line up. (Noise.get_image would sample in one call but
+# quantizes to 8 bits, so it is not used.)
+#
+# Grids turn the samples into voxel ids themselves (e.g.
+# PerlinTerrainGrid.generate_ids) and load them with CubeGrid.update_voxels.
+
+# layer name -> noise settings; each layer's seed is the world seed plus its
+# position in this list
+const LAYERS = {
+	"density": {"type": FastNoiseLite.TYPE_SIMPLEX_SMOOTH, "frequency": 0.05, "octaves": 3, "gain": 0.5, "lacunarity": 2.0}, # 3D, TerrainChunk
+	"hills": {"type": FastNoiseLite.TYPE_PERLIN, "frequency": 0.02, "octaves": 5, "gain": 0.6, "lacunarity": 2.0}, # PerlinTerrainGrid height
+	"hill_variation": {"type": FastNoiseLite.TYPE_PERLIN, "frequency": 0.05, "octaves": 3, "gain": 0.4, "lacunarity": 2.0},
+	"material": {"type": FastNoiseLite.TYPE_PERLIN, "frequency": 0.1, "octaves": 2, "gain": 0.5, "lacunarity": 2.0}, # blobs of surface material
+	"biome": {"type": FastNoiseLite.TYPE_PERLIN, "frequency": 0.01, "octaves": 2, "gain": 0.5, "lacunarity": 2.0},
+	"plains": {"type": FastNoiseLite.TYPE_PERLIN, "frequency": 0.008, "octaves": 2, "gain": 0.4, "lacunarity": 2.0}, # GrassyPlainsGrid height
+	"plains_detail": {"type": FastNoiseLite.TYPE_PERLIN, "frequency": 0.05, "octaves": 2, "gain": 0.25, "lacunarity": 2.0},
+}
+
+static var generators = {} # world seed -> TerrainGenerator
+
+var world_seed = 0
+var noises = {} # layer name -> FastNoiseLite
+
+# the shared generator for world_seed
+static func for_seed(_world_seed) -> TerrainGenerator:
+	if not generators.has(_world_seed):
+		generators[_world_seed] = TerrainGenerator.new(_world_seed)
+	return generators[_world_seed]
+
+func _init(_world_seed = 0):
+	world_seed = _world_seed
+	var offset = 0
+	for layer in LAYERS:
+		var settings = LAYERS[layer]
+		var noise = FastNoiseLite.new()
+		noise.noise_type = settings["type"]
+		noise.seed = world_seed + offset
+		noise.frequency = settings["frequency"]
+		noise.fractal_octaves = settings["octaves"]
+		noise.fractal_gain = settings["gain"]
+		noise.fractal_lacunarity = settings["lacunarity"]
+		noises[layer] = noise
+		offset += 1
+
+# 2D layer over x_len * z_len columns from world (origin_x, origin_z)
+func sample_map(layer, origin_x, origin_z, x_len, z_len) -> PackedFloat32Array:
+	var noise = noises[layer]
+	var samples = PackedFloat32Array()
+	samples.resize(x_len * z_len)
+	var index = 0
+	for x in range(origin_x, origin_x + x_len):
+		for z in range(origin_z, origin_z + z_len):
+			samples[index] = noise.get_noise_2d(x, z)
+			index += 1
+	return samples
+
+# 3D layer over the x_len * z_len voxels at world height y from world (origin_x, origin_z)
+func sample_slice(layer, origin_x, y, origin_z, x_len, z_len) -> PackedFloat32Array:
+	var noise = noises[layer]
+	var samples = PackedFloat32Array()
+	samples.resize(x_len * z_len)
+	var index = 0
+	for x in range(origin_x, origin_x + x_len):
+		for z in range(origin_z, origin_z + z_len):
+			samples[index] = noise.get_noise_3d(x, y, z)
+			index += 1
+	return samples
@@ -0,0 +1,260 @@
+extends RefCounted
+class_name VoxelLightUpdate
+
+# =======================================
+# VoxelLightUpdate.gd
+# =======================================
+# Incremental light updates over VoxelLighting grids and the neighbors
+# linked to them, with the usual two queues:
+# 1. removal: starting from each changed voxel, neighbors darker than the
+#    light being removed may have been lit through it, so they are darkened
+#    and searched from in turn; brighter neighbors are lit some other way
+#    and are queued to spread again
+# 2. re-propagation: darkened sources are re-seeded and every queued voxel
+#    spreads (VoxelLighting.propagate), grid after grid, until nothing
+#    changes
+# An edit therefore only touches voxels within light range of it. finish()
+# returns, for every grid whose light or geometry changed, the sections
+# (VoxelLighting.SECTION_SIZE cubes) that need remeshing. That includes
+# sections next to a changed voxel, since faces there take their light
+# from it.
+
+var removal_lightings = [] # removal queue: lighting, voxel index and light removed
+var removal_indices := PackedInt32Array()
+var removal_levels := PackedByteArray()
+var removal_head = 0
+var reseed_lightings = [] # sources darkened by removal
+var reseed_indices := PackedInt32Array()
+var touched = {} # VoxelLighting -> true, every grid whose light may have changed
+var edits = [] # [lighting, index] of voxels whose type changed
+
+# result of step()
+var step_lighting = null
+var step_index = -1
+
+func touch(lighting):
+	touched[lighting] = true
+	lighting.track_changes = true
+
+# find the voxel next to index in direction (CubeGrid.DIRECTION_NORMALS_ARRAY
+# order), following links across grid faces
+# sets step_lighting and step_index; returns false past an unlinked face
+func step(lighting, index, direction) -> bool:
+	var z_len = lighting.z_len
+	var stride_x = lighting.y_len * z_len
+	var x = index / stride_x
+	var y = (index / z_len) % lighting.y_len
+	var z = index % z_len
+	step_lighting = lighting
+	match direction:
+		0:
+			if x + 1 < lighting.x_len:
+				step_index = index + stride_x
+				return true
+			step_index = index - x * stride_x
+		1:
+			if x > 0:
+				step_index = index - stride_x
+				return true
+			step_index = index + (lighting.x_len - 1) * stride_x
+		2:
+			if y + 1 < lighting.y_len:
+				step_index = index + z_len
+				return true
+			step_index = index - y * z_len
+		3:
+			if y > 0:
+				step_index = index - z_len
+				return true
+			step_index = index + (lighting.y_len - 1) * z_len
+		4:
+			if z + 1 < z_len:
+				step_index = index + 1
+				return true
+			step_index = index - z
+		5:
+			if z > 0:
+				step_index = index - 1
+				return true
+			step_index = index + z_len - 1
+	step_lighting = lighting.neighbors[direction]
+	return step_lighting != null
+
+# indices of the voxels on one face of a grid (face named by direction)
+static func get_face_indices(lighting, direction) -> PackedInt32Array:
+	var indices = PackedInt32Array()
+	var axis = direction / 2
+	var lengths = [lighting.x_len, lighting.y_len, lighting.z_len]
+	var strides = [lighting.y_len * lighting.z_len, lighting.z_len, 1]
+	var base = 0 if direction % 2 == 1 else (lengths[axis] - 1) * strides[axis]
+	var a = (axis + 1) % 3
+	var b = (axis + 2) % 3
+	for i in range(lengths[a]):
+		for j in range(lengths[b]):
+			indices.append(base + i * strides[a] + j * strides[b])
+	return indices
+
+# --- Removal ---
+func darken(lighting, index):
+	var level = lighting.light[index]
+	lighting.light[index] = 0
+	lighting.changed.append(index)
+	if level > 0:
+		removal_lightings.append(lighting)
+		removal_indices.append(index)
+		removal_levels.append(level)
+
+func run_removal():
+	while removal_head < removal_indices.size():
+		var lighting = removal_lightings[removal_head]
+		var index = removal_indices[removal_head]
+		var level = removal_levels[removal_head]
+		removal_head += 1
+		for direction in range(6):
+			if not step(lighting, index, direction):
+				continue
+			var other = step_lighting
+			var other_index = step_index
+			if other.opacity[other_index] != 0:
+				continue # light never spreads out of opaque voxels
+			var other_light = other.light[other_index]
+			if other_light == 0:
+				continue
+			touch(other)
+			if other_light < level: # may have been lit through index
+				darken(other, other_index)
+				if other.source[other_index] > 0:
+					reseed_lightings.append(other)
+					reseed_indices.append(other_index)
+			else: # lit some other way; spread into the darkened area again
+				other.requeue(other_index)
+
+func reseed():
+	for i in range(reseed_indices.size()):
+		var lighting = reseed_lightings[i]
+		lighting.add_source(reseed_indices[i], lighting.source[reseed_indices[i]])
+	reseed_lightings.clear()
+	reseed_indices.clear()
+
+# queue the lit voxels around index (in any grid) to spread into it
+func pull_light(lighting, index):
+	for direction in range(6):
+		if step(lighting, index, direction):
+			touch(step_lighting)
+			step_lighting.requeue(step_index)
+
+# --- Operations ---
+# type of the voxel at index changed to id: update its light, its sources
+# and (for skylight) the light of the column below it
+func edit(lighting, index, id):
+	touch(lighting)
+	edits.append([lighting, index])
+	lighting.set_voxel_type(index, id)
+
+	# Voxels whose own source may change: the edited one and, under the sky,
+	# the column below it down to the first voxel whose skylight is unchanged
+	var reseeded = PackedInt32Array([index])
+	lighting.ambient[index] = 1 if lighting.is_ambient(index) else 0
+	if lighting.sky:
+		var open = lighting.ambient[index]
+		var below = index
+		for y in range((index / lighting.z_len) % lighting.y_len):
+			below -= lighting.z_len
+			var ambient = 1 if open == 1 and lighting.opacity[below] == 0 else 0
+			if ambient == lighting.ambient[below]:
+				break
+			lighting.ambient[below] = ambient
+			reseeded.append(below)
+			open = ambient
+
+	for voxel_index in reseeded:
+		var ambient_source = lighting.ambient_level if lighting.ambient[voxel_index] == 1 else 0
+		lighting.source[voxel_index] = max(ambient_source, lighting.emission[voxel_index])
+		darken(lighting, voxel_index)
+	run_removal()
+	for voxel_index in reseeded:
+		if lighting.source[voxel_index] > 0:
+			lighting.add_source(voxel_index, lighting.source[voxel_index])
+		if lighting.opacity[voxel_index] == 0:
+			pull_light(lighting, voxel_index)
+	return finish()
+
+# call before relighting a grid from scratch: takes back the light it gave
+# its linked neighbors and leaves it dark
+func remove_grid(lighting):
+	touch(lighting)
+	for direction in range(6):
+		if lighting.neighbors[direction] == null:
+			continue
+		for index in get_face_indices(lighting, direction):
+			if lighting.light[index] > 0:
+				removal_lightings.append(lighting)
+				removal_indices.append(index)
+				removal_levels.append(lighting.light[index])
+	lighting.clear()
+	run_removal()
+
+# queue the lit faces of linked neighbors to spread into a (re)lit grid
+func pull_from_neighbors(lighting):
+	touch(lighting)
+	for direction in range(6):
+		var neighbor = lighting.neighbors[direction]
+		if neighbor == null:
+			continue
+		touch(neighbor)
+		for index in get_face_indices(neighbor, VoxelLighting.OPPOSITE_DIRECTION[direction]):
+			neighbor.requeue(index)
+
+# spread every queued voxel in every touched grid until nothing changes
+func propagate_all():
+	var pending = []
+	for lighting in touched:
+		if lighting.queue_count > 0:
+			pending.append(lighting)
+	while not pending.is_empty():
+		var lighting = pending.pop_back()
+		lighting.propagate()
+		for other in lighting.spilled:
+			touch(other)
+			if not pending.has(other):
+				pending.append(other)
+		lighting.spilled.clear()
+
+# re-seed, propagate and collect the sections to remesh:
+# returns {grid (or lighting, if it has no grid): PackedInt32Array of sections}
+func finish() -> Dictionary:
+	reseed()
+	propagate_all()
+	var sections = {}
+	for lighting in touched.keys():
+		for index in lighting.changed:
+			mark_sections(sections, lighting, index)
+		lighting.changed.clear()
+		lighting.track_changes = false
+	for edit_info in edits:
+		mark_sections(sections, edit_info[0], edit_info[1])
+	touched.clear()
+	edits.clear()
+
+	var dirty = {}
+	for key in sections:
+		var list = PackedInt32Array(sections[key].keys())
+		list.sort()
+		dirty[key] = list
+	return dirty
+
+func mark_section(sections, lighting, index):
+	var key = lighting.grid if lighting.grid != null else lighting
+	if not sections.has(key):
+		sections[key] = {}
+	var x = index / (lighting.y_len * lighting.z_len)
+	var y = (index / lighting.z_len) % lighting.y_len
+	var z = index % lighting.z_len
+	sections[key][lighting.get_section(x, y, z)] = true
+
+# the voxel's own section and those of its six neighbors
+func mark_sections(sections, lighting, index):
+	mark_section(sections, lighting, index)
+	for direction in range(6):
+		if step(lighting, index, direction):
+			mark_section(sections, step_lighting, step_index)
@@ -0,0 +1,300 @@
+extends RefCounted
+class_name VoxelLighting
+
+# =======================================
+# VoxelLighting.gd
+# =======================================
+# Flood-fill lighting for a CubeGrid, on flat voxel indices laid out like
+# CubeGrid.calculate_voxel_index (x * y_len * z_len + y * z_len + z).
+# Light, opacity and emission are PackedByteArrays; sources are seeded into
+# one ring-buffer queue and spread by a single multi-source BFS.
+#
+# Light drops by 1 per step and only enters transparent voxels. An opaque
+# source lights itself but nothing around it. A voxel is raised only when a
+# neighbor offers more light, so the result does not depend on seed order
+# and matches running CubeGrid's old one-source flood fill from every lit
+# voxel. Each voxel sits in the queue at most once, so the queue never
+# needs more than one slot per voxel.
+#
+# Grids of the same size can be linked through neighbors (VoxelWorld does
+# this for its chunks); propagate() then spreads light across the shared
+# faces and lists the neighbors it raised in spilled.
+# VoxelLightUpdate runs a propagation over linked grids to completion and
+# handles edits (light removal and re-propagation).
+
+const MAX_LIGHT = 15
+const SECTION_SIZE = 8 # edge of the cubic sections reported for remeshing
+const OPPOSITE_DIRECTION = [1, 0, 3, 2, 5, 4] # directions as in CubeGrid.DIRECTION_NORMALS_ARRAY
+
+var x_len = 0
+var y_len = 0
+var z_len = 0
+
+var light := PackedByteArray()
+var opacity := PackedByteArray() # 1 where the voxel blocks light
+var emission := PackedByteArray() # light level of the voxel's own source
+var source := PackedByteArray() # light level the voxel was seeded with (ambient or emission)
+var ambient := PackedByteArray() # 1 where the voxel was seeded with ambient light
+var sky = false # ambient light comes from the sky (add_sky_sources) instead of the boundary
+var ambient_level = 0
+var queue := PackedInt32Array() # ring buffer of voxel indices
+var queued := PackedByteArray() # 1 while the voxel's index is in the queue
+var queue_head = 0
+var queue_count = 0
+var voxels_lit = 0 # queue pops in the last propagate(), for benchmarks
+
+var grid = null # CubeGrid this lighting belongs to
+var neighbors = [null, null, null, null, null, null] # linked VoxelLighting per direction
+var spilled = {} # neighbors raised by propagate() -> true
+var track_changes = false # record every voxel whose light changes in changed (empty while false)
+var changed := PackedInt32Array()
+
+var opaque_by_type := PackedByteArray()
+var emission_by_type := PackedByteArray()
+
+func _init(_x_len = 0, _y_len = 0, _z_len = 0):
+	# Voxel properties are dictionary lookups, so do them once per type
+	for id in range(Voxel.VoxelType.size()):
+		opaque_by_type.append(0 if Voxel.is_transparent(id) else 1)
+		emission_by_type.append(Voxel.get_light_source_level(id))
+	resize(_x_len, _y_len, _z_len)
+
+func resize(_x_len, _y_len, _z_len):
+	x_len = _x_len
+	y_len = _y_len
+	z_len = _z_len
+	var count = x_len * y_len * z_len
+	light.resize(count)
+	opacity.resize(count)
+	emission.resize(count)
+	source.resize(count)
+	ambient.resize(count)
+	queue.resize(count)
+	queued.resize(count)
+	opacity.fill(0)
+	emission.fill(0)
+	clear()
+
+# darken every voxel, forget every source and empty the queue
+func clear():
+	light.fill(0)
+	source.fill(0)
+	ambient.fill(0)
+	queued.fill(0)
+	queue_head = 0
+	queue_count = 0
+
+# fill opacity and emission from an array of voxel ids (VoxelStorage.get_voxels)
+func load_voxels(voxel_ids):
+	for index in range(voxel_ids.size()):
+		set_voxel_type(index, int(voxel_ids[index]))
+
+# update opacity and emission for one voxel id; unknown ids are transparent
+# and dark, as in Voxel
+func set_voxel_type(index, id):
+	if id >= 0 and id < opaque_by_type.size():
+		opacity[index] = opaque_by_type[id]
+		emission[index] = emission_by_type[id]
+	else:
+		opacity[index] = 0
+		emission[index] = 0
+
+func get_index(x, y, z):
+	return x * y_len * z_len + y * z_len + z
+
+func push(index):
+	queue[(queue_head + queue_count) % queue.size()] = index
+	queue_count += 1
+	queued[index] = 1
+
+# queue the voxel at index to spread its current light again
+func requeue(index):
+	if opacity[index] == 0 and queued[index] == 0 and light[index] > 1:
+		push(index)
+
+# raise the voxel at index to level (if darker) and queue it to spread
+func add_source(index, level):
+	if source[index] < level:
+		source[index] = level
+	if light[index] >= level:
+		return
+	light[index] = level
+	if track_changes:
+		changed.append(index)
+	if opacity[index] == 0 and queued[index] == 0:
+		push(index)
+
+# set the voxel at index to exactly level and spread from it, like one call
+# of the old CubeGrid.flood_fill_light
+func set_source(index, level):
+	light[index] = level
+	if track_changes:
+		changed.append(index)
+	if opacity[index] == 0 and queued[index] == 0:
+		push(index)
+
+# seed every light-emitting voxel with its own level
+func add_emitters():
+	for index in range(emission.size()):
+		if emission[index] > 0:
+			add_source(index, emission[index])
+
+func add_ambient_source(index, level):
+	ambient[index] = 1
+	add_source(index, level)
+
+# seed level into every transparent voxel on the grid's outer faces
+# returns the seeded indices
+func add_boundary_sources(level) -> PackedInt32Array:
+	sky = false
+	ambient_level = level
+	var seeded = PackedInt32Array()
+	var index = 0
+	for x in range(x_len):
+		var x_edge = x == 0 or x == x_len - 1
+		for y in range(y_len):
+			if x_edge or y == 0 or y == y_len - 1:
+				for z in range(z_len):
+					if opacity[index + z] == 0:
+						add_ambient_source(index + z, level)
+						seeded.append(index + z)
+			else: # only the two z faces
+				var last = index + z_len - 1
+				if opacity[index] == 0:
+					add_ambient_source(index, level)
+					seeded.append(index)
+				if last > index and opacity[last] == 0:
+					add_ambient_source(last, level)
+					seeded.append(last)
+			index += z_len
+	return seeded
+
+# seed level into every transparent voxel with open sky above it, i.e. each
+# column from the top down to its first opaque voxel
+# returns the seeded indices
+func add_sky_sources(level) -> PackedInt32Array:
+	sky = true
+	ambient_level = level
+	var seeded = PackedInt32Array()
+	for x in range(x_len):
+		for z in range(z_len):
+			var index = get_index(x, y_len - 1, z)
+			for y in range(y_len):
+				if opacity[index] != 0:
+					break
+				add_ambient_source(index, level)
+				seeded.append(index)
+				index -= z_len
+	return seeded
+
+# whether the voxel at index should get ambient light under the current mode
+func is_ambient(index) -> bool:
+	if opacity[index] != 0:
+		return false
+	var x = index / (y_len * z_len)
+	var y = (index / z_len) % y_len
+	var z = index % z_len
+	if sky:
+		return y == y_len - 1 or ambient[index + z_len] == 1
+	return x == 0 or x == x_len - 1 or y == 0 or y == y_len - 1 or z == 0 or z == z_len - 1
+
+# raise the voxel at index to level if it is transparent and darker
+# returns whether it was raised
+func spread_to(index, level) -> bool:
+	if opacity[index] != 0 or light[index] >= level:
+		return false
+	light[index] = level
+	if track_changes:
+		changed.append(index)
+	if queued[index] == 0:
+		push(index)
+	return true
+
+func spread_across(direction, index, level):
+	var neighbor = neighbors[direction]
+	if neighbor.opacity[index] != 0 or neighbor.light[index] >= level:
+		return
+	neighbor.track_changes = neighbor.track_changes or track_changes
+	neighbor.spread_to(index, level)
+	spilled[neighbor] = true
+
+# spread light from every queued voxel until nothing changes in this grid;
+# linked neighbors that were raised are left queued and listed in spilled
+func propagate():
+	var capacity = queue.size()
+	var stride_x = y_len * z_len
+	voxels_lit = 0
+	while queue_count > 0:
+		var index = queue[queue_head]
+		queue_head = (queue_head + 1) % capacity
+		queue_count -= 1
+		queued[index] = 0
+		voxels_lit += 1
+
+		var next_light = light[index] - 1
+		if next_light <= 0:
+			continue
+		var x = index / stride_x
+		var y = (index / z_len) % y_len
+		var z = index % z_len
+		if x + 1 < x_len: spread_to(index + stride_x, next_light)
+		elif neighbors[0] != null: spread_across(0, index - x * stride_x, next_light)
+		if x > 0: spread_to(index - stride_x, next_light)
+		elif neighbors[1] != null: spread_across(1, index + (x_len - 1) * stride_x, next_light)
+		if y + 1 < y_len: spread_to(index + z_len, next_light)
+		elif neighbors[2] != null: spread_across(2, index - y * z_len, next_light)
+		if y > 0: spread_to(index - z_len, next_light)
+		elif neighbors[3] != null: spread_across(3, index + (y_len - 1) * z_len, next_light)
+		if z + 1 < z_len: spread_to(index + 1, next_light)
+		elif neighbors[4] != null: spread_across(4, index - z, next_light)
+		if z > 0: spread_to(index - 1, next_light)
+		elif neighbors[5] != null: spread_across(5, index + z_len - 1, next_light)
+
+# link other as the neighbor in direction (and this as its opposite neighbor)
+func link(direction, other):
+	neighbors[direction] = other
+	if other != null:
+		other.neighbors[OPPOSITE_DIRECTION[direction]] = self
+
+func unlink_all():
+	for direction in range(neighbors.size()):
+		var other = neighbors[direction]
+		if other != null and other.neighbors[OPPOSITE_DIRECTION[direction]] == self:
+			other.neighbors[OPPOSITE_DIRECTION[direction]] = null
+		neighbors[direction] = null
+
+# --- Sections ---
+func get_section_counts() -> Vector3i:
+	return Vector3i(
+		(x_len + SECTION_SIZE - 1) / SECTION_SIZE,
+		(y_len + SECTION_SIZE - 1) / SECTION_SIZE,
+		(z_len + SECTION_SIZE - 1) / SECTION_SIZE)
+
+func get_section_count() -> int:
+	var counts = get_section_counts()
+	return counts.x * counts.y * counts.z
+
+# section of voxel (x, y, z), numbered like voxel indices
+func get_section(x, y, z) -> int:
+	var counts = get_section_counts()
+	return (x / SECTION_SIZE) * counts.y * counts.z + (y / SECTION_SIZE) * counts.z + z / SECTION_SIZE
+
+# indices of the voxels in a section
+func get_section_voxels(section) -> PackedInt32Array:
+	var counts = get_section_counts()
+	var start_x = section / (counts.y * counts.z) * SECTION_SIZE
+	var start_y = (section / counts.z) % counts.y * SECTION_SIZE
+	var start_z = section % counts.z * SECTION_SIZE
+	var voxels = PackedInt32Array()
+	for x in range(start_x, min(start_x + SECTION_SIZE, x_len)):
+		for y in range(start_y, min(start_y + SECTION_SIZE, y_len)):
+			var row = get_index(x, y, 0)
+			for z in range(start_z, min(start_z + SECTION_SIZE, z_len)):
+				voxels.append(row + z)
+	return voxels
+
+# --- Memory ---
+# bytes held by the working buffers
+func get_memory_usage() -> int:
+	return light.size() + opacity.size() + emission.size() + source.size() + ambient.size() \
+		+ queue.size() * 4 + queued.size() + changed.size() * 4
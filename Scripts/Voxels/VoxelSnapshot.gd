@@ -0,0 +1,104 @@
+extends RefCounted
+class_name VoxelSnapshot
+
+# =======================================
+# VoxelSnapshot.gd
+# =======================================
+# Everything meshing a CubeGrid reads, copied on the main thread so the mesh
+# can be built on a worker while the grid keeps changing (see CubeMesher):
+# copies of the grid's VoxelStorage and of the storage of the grid next to
+# each face (CubeGrid.get_neighbor_storage; a TerrainChunk's neighboring
+# chunks), plus the light level outside each face with no neighbor
+# (CubeGrid.get_border_light). Capturing only copies buffers (copy-on-write);
+# unpack() expands them on the worker.
+#
+# Unpacked, ids and light levels are padded by one voxel on every side
+# (coordinates -1 to len on each axis), with the layer just outside each
+# face filled from the neighbor's opposite face. Edge and corner voxels of
+# the padding are never read by meshing and stay OUTSIDE.
+
+const OUTSIDE = 255 # padded id of "no voxel" (CubeGrid.get_voxel's -1)
+
+var x_len = 0
+var y_len = 0
+var z_len = 0
+var storage = null # VoxelStorage copy
+var neighbors = [] # per CubeGrid.DIRECTION_NORMALS_ARRAY direction: VoxelStorage copy or null
+var border_light = [] # per direction: light level outside the grid where there is no neighbor
+
+# filled by unpack()
+var voxels := PackedByteArray() # the grid's ids, laid out like CubeGrid.calculate_voxel_index
+var padded_voxels := PackedByteArray()
+var padded_light := PackedByteArray()
+
+# main thread: copy what meshing grid will read
+static func capture(grid) -> VoxelSnapshot:
+	var snapshot = VoxelSnapshot.new()
+	snapshot.x_len = grid.grid_x_len
+	snapshot.y_len = grid.grid_y_len
+	snapshot.z_len = grid.grid_z_len
+	snapshot.storage = grid.storage.copy()
+	for direction in range(CubeGrid.DIRECTION_NORMALS_ARRAY.size()):
+		var neighbor = grid.get_neighbor_storage(direction)
+		snapshot.neighbors.append(neighbor.copy() if neighbor != null else null)
+		snapshot.border_light.append(grid.get_border_light(direction))
+	return snapshot
+
+# worker: expand the copies into voxels and the padded arrays
+func unpack():
+	voxels = storage.get_voxels()
+	var light = storage.get_light_levels()
+	var padded_size = (x_len + 2) * (y_len + 2) * (z_len + 2)
+	padded_voxels.resize(padded_size)
+	padded_voxels.fill(OUTSIDE)
+	padded_light.resize(padded_size)
+	padded_light.fill(0)
+	var index = 0
+	for x in range(x_len):
+		for y in range(y_len):
+			var padded = padded_index(x, y, 0)
+			for z in range(z_len):
+				padded_voxels[padded + z] = voxels[index]
+				padded_light[padded + z] = light[index]
+				index += 1
+	for direction in range(neighbors.size()):
+		unpack_border(direction)
+
+# fill the padding layer outside the face in direction
+func unpack_border(direction):
+	var normal = CubeGrid.DIRECTION_NORMALS_ARRAY[direction]
+	var lens = [x_len, y_len, z_len]
+	var ranges = [] # coordinates of the layer on each axis
+	for axis in range(3):
+		if normal[axis] == 0:
+			ranges.append(range(lens[axis]))
+		else:
+			ranges.append([lens[axis] if normal[axis] > 0 else -1])
+	var neighbor = neighbors[direction]
+	var neighbor_voxels = null
+	var neighbor_light = null
+	if neighbor != null:
+		neighbor_voxels = neighbor.get_voxels()
+		neighbor_light = neighbor.get_light_levels()
+	for x in ranges[0]:
+		for y in ranges[1]:
+			for z in ranges[2]:
+				var padded = padded_index(x, y, z)
+				if neighbor == null:
+					padded_light[padded] = border_light[direction]
+					continue
+				# the neighbor's voxel on its opposite face (-1 -> len - 1, len -> 0)
+				var index = (posmod(x, x_len) * y_len + posmod(y, y_len)) * z_len + posmod(z, z_len)
+				padded_voxels[padded] = neighbor_voxels[index]
+				padded_light[padded] = neighbor_light[index]
+
+func padded_index(x, y, z) -> int:
+	return ((x + 1) * (y_len + 2) + y + 1) * (z_len + 2) + z + 1
+
+# voxel id at x, y, z (-1 to len on each axis); -1 where there is no voxel
+func get_voxel(x, y, z) -> int:
+	var id = padded_voxels[padded_index(x, y, z)]
+	return -1 if id == OUTSIDE else id
+
+func get_light(x, y, z) -> int:
+	return padded_light[padded_index(x, y, z)]
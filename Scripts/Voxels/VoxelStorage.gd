@@ -0,0 +1,227 @@
+extends RefCounted
+class_name VoxelStorage
+
+# =======================================
+# VoxelStorage.gd
+# =======================================
+# Compact per-grid voxel storage on flat voxel indices (laid out like
+# CubeGrid.calculate_voxel_index), in three PackedByteArrays:
+# - voxels: a palette of the voxel ids in use plus one palette index per
+#   voxel, bit-packed at 0, 1, 2, 4 or 8 bits (0 bits: the whole grid is
+#   palette[0]). Bits grow as new ids are set; load_voxels/compact pick the
+#   smallest width for the ids actually present. Ids are 0-255.
+# - light: one 4-bit level (0-15) per voxel, two voxels per byte
+# - ambient: one flag bit per voxel
+# Bulk operations (fill, load, get_voxels) work on whole buffers so callers
+# don't pay per-voxel call overhead.
+
+const MAX_ID = 255
+const BIT_WIDTHS = [0, 1, 2, 4, 8]
+
+var count = 0
+
+var palette := PackedByteArray() # palette index -> voxel id (a handful of entries, so found with find())
+var bits = 0 # bits per voxel in indices
+var index_shift = 3 # voxel index >> index_shift = byte in indices
+var sub_mask = 7 # voxel index & sub_mask = position in that byte
+var value_mask = 0
+var indices := PackedByteArray()
+
+var light := PackedByteArray()
+var ambient := PackedByteArray()
+
+func _init(_count = 0):
+	resize(_count)
+
+# size for count voxels, all air, dark and without ambient light
+func resize(_count):
+	count = _count
+	light.resize((count + 1) / 2)
+	ambient.resize((count + 7) / 8)
+	fill_voxels(Voxel.VoxelType.AIR)
+	fill_light(0)
+	clear_ambient()
+
+# --- Voxels ---
+func get_voxel(index) -> int:
+	if bits == 0:
+		return palette[0]
+	return palette[(indices[index >> index_shift] >> ((index & sub_mask) * bits)) & value_mask]
+
+func set_voxel(index, id):
+	if id < 0 or id > MAX_ID:
+		push_error("VoxelStorage: voxel id %d out of range" % id)
+		return
+	var slot = palette.find(id)
+	if slot == -1:
+		slot = add_to_palette(id)
+	if bits == 0:
+		return # the only id in the palette
+	var byte_index = index >> index_shift
+	var offset = (index & sub_mask) * bits
+	indices[byte_index] = (indices[byte_index] & ~(value_mask << offset)) | (slot << offset)
+
+# every voxel becomes id
+func fill_voxels(id):
+	palette.resize(1)
+	palette[0] = id
+	set_bits(0)
+
+# copy ids (an Array or packed array of voxel ids, one per voxel) in
+func load_voxels(ids):
+	palette.clear()
+	var slots = PackedInt32Array() # voxel id -> palette index, while loading
+	slots.resize(MAX_ID + 1)
+	slots.fill(-1)
+	var values = PackedByteArray()
+	values.resize(count)
+	for index in range(count):
+		var id = int(ids[index])
+		if slots[id] == -1:
+			slots[id] = palette.size()
+			palette.append(id)
+		values[index] = slots[id]
+	set_bits(bits_for(palette.size()))
+	pack(values)
+
+# all voxel ids, one byte per voxel
+func get_voxels() -> PackedByteArray:
+	var ids = PackedByteArray()
+	ids.resize(count)
+	if bits == 0:
+		ids.fill(palette[0])
+		return ids
+	var values = unpack()
+	for index in range(count):
+		ids[index] = palette[values[index]]
+	return ids
+
+# drop palette entries no voxel uses any more and narrow the bits to match
+func compact():
+	load_voxels(get_voxels())
+
+# returns the new palette index; widens the bits when the palette outgrows them
+func add_to_palette(id) -> int:
+	palette.append(id)
+	var needed = bits_for(palette.size())
+	if needed != bits:
+		var values = unpack()
+		set_bits(needed)
+		pack(values)
+	return palette.size() - 1
+
+static func bits_for(palette_size) -> int:
+	for width in BIT_WIDTHS:
+		if palette_size <= (1 << width):
+			return width
+	return 8
+
+func set_bits(_bits):
+	bits = _bits
+	value_mask = (1 << bits) - 1
+	index_shift = {0: 3, 1: 3, 2: 2, 4: 1, 8: 0}[bits]
+	sub_mask = (1 << index_shift) - 1
+	indices.resize(0 if bits == 0 else (count + sub_mask) >> index_shift)
+	indices.fill(0)
+
+# palette indices, one byte per voxel
+func unpack() -> PackedByteArray:
+	var values = PackedByteArray()
+	values.resize(count)
+	if bits == 8:
+		values = indices.duplicate()
+	elif bits > 0:
+		for index in range(count):
+			values[index] = (indices[index >> index_shift] >> ((index & sub_mask) * bits)) & value_mask
+	return values
+
+func pack(values: PackedByteArray):
+	if bits == 8:
+		indices = values.duplicate()
+	elif bits > 0:
+		for index in range(count):
+			indices[index >> index_shift] |= values[index] << ((index & sub_mask) * bits)
+
+# --- Light ---
+func get_light(index) -> int:
+	return (light[index >> 1] >> ((index & 1) << 2)) & 15
+
+func set_light(index, level):
+	var byte_index = index >> 1
+	var offset = (index & 1) << 2
+	light[byte_index] = (light[byte_index] & (0xF0 >> offset)) | ((level & 15) << offset)
+
+func fill_light(level):
+	light.fill((level & 15) * 17) # both nibbles
+
+# copy levels (one byte per voxel, e.g. VoxelLighting.light) in
+func load_light(levels: PackedByteArray):
+	for byte_index in range(count >> 1):
+		light[byte_index] = (levels[byte_index << 1] & 15) | ((levels[(byte_index << 1) + 1] & 15) << 4)
+	if count & 1:
+		light[count >> 1] = levels[count - 1] & 15
+
+# copy levels in for the voxels at the given indices only
+func load_light_at(levels: PackedByteArray, voxel_indices: PackedInt32Array):
+	for index in voxel_indices:
+		set_light(index, levels[index])
+
+# all light levels, one byte per voxel
+func get_light_levels() -> PackedByteArray:
+	var levels = PackedByteArray()
+	levels.resize(count)
+	for byte_index in range(count >> 1):
+		var pair = light[byte_index]
+		levels[byte_index << 1] = pair & 15
+		levels[(byte_index << 1) + 1] = pair >> 4
+	if count & 1:
+		levels[count - 1] = light[count >> 1] & 15
+	return levels
+
+# --- Ambient flags ---
+func get_ambient(index) -> bool:
+	return (ambient[index >> 3] & (1 << (index & 7))) != 0
+
+func set_ambient(index, is_ambient):
+	if is_ambient:
+		ambient[index >> 3] |= 1 << (index & 7)
+	else:
+		ambient[index >> 3] &= ~(1 << (index & 7))
+
+func clear_ambient():
+	ambient.fill(0)
+
+# copy flags (one byte per voxel, nonzero = ambient, e.g. VoxelLighting.ambient) in
+func load_ambient(flags: PackedByteArray):
+	clear_ambient()
+	for index in range(count):
+		if flags[index] != 0:
+			ambient[index >> 3] |= 1 << (index & 7)
+
+# --- Copies ---
+# an independent copy (Packed*Arrays are copy-on-write, so buffers are only
+# copied once either side writes); VoxelSnapshot hands these to workers
+func copy() -> VoxelStorage:
+	var other = VoxelStorage.new()
+	other.count = count
+	other.palette = palette.duplicate()
+	other.bits = bits
+	other.index_shift = index_shift
+	other.sub_mask = sub_mask
+	other.value_mask = value_mask
+	other.indices = indices.duplicate()
+	other.light = light.duplicate()
+	other.ambient = ambient.duplicate()
+	return other
+
+# --- Memory ---
+# bytes held by each buffer (Packed*Array payloads only)
+func get_memory_usage() -> Dictionary:
+	var usage = {
+		"voxels": indices.size(),
+		"palette": palette.size(),
+		"light": light.size(),
+		"ambient": ambient.size(),
+	}
+	usage["total"] = usage["voxels"] + usage["palette"] + usage["light"] + usage["ambient"]
+	return usage
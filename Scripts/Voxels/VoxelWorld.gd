@@ -1,49 +1,207 @@
 extends Node3D
 class_name VoxelWorld
 
-# TODO: thread pool + add chunks based on position + procedural generation
+# Chunks are streamed around a tracked node (tracked_node_path, or the active
+# camera): every chunk within view_distance + 1 of it is loaded (generated and
+# lit) and those within view_distance are active (meshed). Chunks beyond
+# view_distance + 1 + unload_margin are unloaded, and the farthest chunks are
+# evicted while loaded chunks use more than memory_budget.
+# Each chunk is a chain of JobScheduler jobs, prioritized by squared distance
+# from the tracked chunk: generate (on a worker) -> add to the world and light
+# -> mesh, once the chunk and its neighbors are lit: a snapshot of them is
+# meshed on a worker and the new mesh swapped in on the main thread, so the
+# old one stays up meanwhile. Remeshes are jobs too
+# (TerrainChunk.queue_mesh_update). A chunk's jobs are cancelled when it
+# leaves the ring, and reprioritized whenever the tracked chunk changes.
 
-var chunks = {}
-const world_length = 2 # number of chunks on the x/z dimensions
+@export var world_seed = 0 # terrain generation seed shared by every chunk
+@export var tracked_node_path: NodePath # node to stream chunks around; the active camera if empty
+@export var view_distance = 4 # radius of active (meshed) chunks, in chunks
+@export var unload_margin = 2 # extra chunks kept loaded past view_distance + 1 before unloading
+@export var memory_budget = 16 * 1024 * 1024 # bytes of voxel and light data in loaded chunks
 
-# Called when the node enters the scene tree for the first time.
-func _ready():
-	#return # don't do anything with VoxelWorld right now. In fact, redo chunk generation code
-	
-	# initial chunks
-	for chunk_x in range(0,world_length):
-		for chunk_z in range(0,world_length):
-			var chunk_coordinates = [chunk_x, chunk_z]
-			#add_inactive_chunk(chunk_coordinates)
-			activate_chunk(chunk_coordinates)
-			#print("activate chunks later...")
-
-# adds a chunk for the sake of data processing (not visiblity)
-func add_inactive_chunk(chunk_coordinates):
-	if (chunks.has(chunk_coordinates)): # don't add a chunk a second time!
-		return
+var chunks = {} # chunk coordinates -> loaded (generated) TerrainChunk
+var loading = {} # chunk coordinates -> [TerrainChunk, generate job] while generating
+var light_jobs = {} # chunk coordinates -> pending light job
+var mesh_jobs = {} # chunk coordinates -> pending mesh job
+var discarded = [] # [TerrainChunk, generate job] cancelled mid-generation, freed once their job stops
+var center = null # chunk coordinates chunks are streamed around
+var saved_voxels = {} # chunk coordinates -> voxel ids of edited chunks that were unloaded
+var memory_checked = true # whether memory use was checked since the last chunk was loaded
+
+func _process(_delta):
+	var tracked_chunk = get_chunk_coordinates(to_voxel_coordinates(get_tracked_position()))
+	if tracked_chunk != center:
+		center = tracked_chunk
+		update_ring()
+	if not memory_checked:
+		enforce_memory_budget()
+	free_discarded()
+
+# global position chunks are streamed around
+func get_tracked_position() -> Vector3:
+	var tracked = get_viewport().get_camera_3d() if tracked_node_path.is_empty() else get_node_or_null(tracked_node_path)
+	if tracked == null:
+		return Vector3.ZERO
+	return tracked.global_position
+
+static func to_voxel_coordinates(position):
+	var voxel_position = position.floor()
+	return [int(voxel_position.x), int(voxel_position.y), int(voxel_position.z)]
+
+# squared distance from center to chunk_coordinates, in chunks
+func chunk_distance_squared(chunk_coordinates):
+	var dx = chunk_coordinates[0] - center[0]
+	var dz = chunk_coordinates[1] - center[1]
+	return dx * dx + dz * dz
+
+func is_in_view(chunk_coordinates):
+	return chunk_distance_squared(chunk_coordinates) <= view_distance * view_distance
+
+func is_in_load_range(chunk_coordinates):
+	return chunk_distance_squared(chunk_coordinates) <= (view_distance + 1) * (view_distance + 1)
+
+# after center moves: load the chunks that came into range, cancel or unload
+# those out of range, (de)activate chunks crossing view_distance and
+# reprioritize every pending job
+func update_ring():
+	var load_distance = view_distance + 1
+	for dx in range(-load_distance, load_distance + 1):
+		for dz in range(-load_distance, load_distance + 1):
+			var chunk_coordinates = [center[0] + dx, center[1] + dz]
+			if is_in_load_range(chunk_coordinates) and not chunks.has(chunk_coordinates) and not loading.has(chunk_coordinates):
+				request_chunk(chunk_coordinates)
+	for chunk_coordinates in loading.keys():
+		if not is_in_load_range(chunk_coordinates):
+			cancel_loading(chunk_coordinates)
+
+	var unload_distance = load_distance + unload_margin
+	for chunk_coordinates in chunks.keys():
+		var chunk = chunks[chunk_coordinates]
+		if chunk_distance_squared(chunk_coordinates) > unload_distance * unload_distance:
+			unload_chunk(chunk_coordinates)
+		elif is_in_view(chunk_coordinates):
+			chunk.activate() # meshes are requested by TerrainChunk.queue_mesh_update
+		else:
+			chunk.deactivate() # keeps its current mesh
+
+	var pending = {}
+	for jobs in [loading, light_jobs, mesh_jobs]:
+		for chunk_coordinates in jobs:
+			pending[chunk_coordinates] = true
+	for chunk_coordinates in pending:
+		JobScheduler.set_group_priority(chunk_group(chunk_coordinates), chunk_distance_squared(chunk_coordinates))
+
+# JobScheduler group of a chunk's jobs
+func chunk_group(chunk_coordinates):
+	return [get_instance_id(), chunk_coordinates[0], chunk_coordinates[1]]
+
+# schedule a chunk's generation (or the restoring of its saved edits) and lighting
+func request_chunk(chunk_coordinates):
 	var chunk = TerrainChunk.new(self, chunk_coordinates)
+	TerrainGenerator.for_seed(world_seed) # created here on the main thread; workers only read it
+	var priority = chunk_distance_squared(chunk_coordinates)
+	var group = chunk_group(chunk_coordinates)
+	var generate_job = JobScheduler.schedule(chunk.generate.bind(saved_voxels.get(chunk_coordinates)),
+		priority, [], group, add_loaded_chunk.bind(chunk))
+	loading[chunk_coordinates] = [chunk, generate_job]
+	light_jobs[chunk_coordinates] = JobScheduler.schedule(Callable(), priority, [generate_job], group, light_chunk.bind(chunk))
+
+# adds a generated chunk to the world
+func add_loaded_chunk(chunk):
+	var chunk_coordinates = chunk.chunk_coordinates
+	loading.erase(chunk_coordinates)
+	saved_voxels.erase(chunk_coordinates)
 	chunks[chunk_coordinates] = chunk
 	add_child(chunk)
+	if is_in_view(chunk_coordinates):
+		chunk.activate()
+	memory_checked = false
 
-func _process(_delta):
-	# testing on-the-fly chunk creation
-#	if (Time.get_ticks_msec() > 2000):
-#		activate_chunk([0,0])
-#	if (Time.get_ticks_msec() > 3000):
-#		activate_chunk([0,1])
-#	if (Time.get_ticks_msec() > 4000):
-#		activate_chunk([0,2])
-#	if (Time.get_ticks_msec() > 5000):
-#		activate_chunk([1,2])
-	pass
-
-# makes sure a chunk is in the world, and then makes it active
-func activate_chunk(chunk_coordinates):
-	if (not chunks.has(chunk_coordinates)):
-		add_inactive_chunk(chunk_coordinates)
+func light_chunk(chunk):
+	light_jobs.erase(chunk.chunk_coordinates)
+	chunk.generate_light_data()
+
+# schedule a chunk's (re)mesh after its own and its neighbors' light: faces and
+# light on its borders come from them (see TerrainChunk.queue_mesh_update)
+func request_mesh(chunk):
+	var chunk_coordinates = chunk.chunk_coordinates
+	if chunks.get(chunk_coordinates) != chunk or mesh_jobs.has(chunk_coordinates):
+		return
+	var dependencies = [light_jobs.get(chunk_coordinates)]
+	for direction in [0, 1, 4, 5]: # +x, -x, +z, -z in CubeGrid.DIRECTION_NORMALS_ARRAY
+		var normal = CubeGrid.DIRECTION_NORMALS_ARRAY[direction]
+		var neighbor_coordinates = [chunk_coordinates[0] + normal[0], chunk_coordinates[1] + normal[2]]
+		if not chunks.has(neighbor_coordinates) and not loading.has(neighbor_coordinates):
+			request_chunk(neighbor_coordinates)
+		dependencies.append(light_jobs.get(neighbor_coordinates))
+	mesh_jobs[chunk_coordinates] = JobScheduler.schedule(Callable(), chunk_distance_squared(chunk_coordinates),
+		dependencies, chunk_group(chunk_coordinates), mesh_chunk.bind(chunk))
+
+# snapshot the chunk and its neighbors and build its mesh on a worker; the
+# build stays in mesh_jobs (and the chunk's group) until it is swapped in
+func mesh_chunk(chunk):
+	var chunk_coordinates = chunk.chunk_coordinates
+	mesh_jobs.erase(chunk_coordinates)
+	if chunk.is_grid_active and chunk.grid_data_changed:
+		mesh_jobs[chunk_coordinates] = chunk.schedule_mesh_build(chunk_distance_squared(chunk_coordinates),
+			chunk_group(chunk_coordinates), mesh_built.bind(chunk))
+	else:
+		chunk.updating_mesh = false # nothing to mesh now; TerrainChunk.queue_mesh_update asks again
+
+func mesh_built(chunk):
+	mesh_jobs.erase(chunk.chunk_coordinates)
+
+func cancel_loading(chunk_coordinates):
+	JobScheduler.cancel_group(chunk_group(chunk_coordinates))
+	discarded.append(loading[chunk_coordinates])
+	loading.erase(chunk_coordinates)
+	light_jobs.erase(chunk_coordinates)
+	mesh_jobs.erase(chunk_coordinates)
+
+# free chunks whose generation was cancelled once no worker is using them
+func free_discarded():
+	var still_running = []
+	for entry in discarded:
+		if entry[1].state == JobScheduler.JobState.RUNNING:
+			still_running.append(entry)
+		else:
+			entry[0].free()
+	discarded = still_running
+
+# removes a chunk, keeping its voxels if they were edited
+# its neighbors keep the light it gave them: terrain is deterministic, so
+# that is the light it will give them again when it's reloaded
+func unload_chunk(chunk_coordinates):
 	var chunk = chunks[chunk_coordinates]
-	chunk.activate()
+	JobScheduler.cancel_group(chunk_group(chunk_coordinates))
+	light_jobs.erase(chunk_coordinates)
+	mesh_jobs.erase(chunk_coordinates)
+	if chunk.voxels_edited:
+		saved_voxels[chunk_coordinates] = chunk.storage.get_voxels()
+	if chunk.lighting != null:
+		chunk.lighting.unlink_all()
+	chunks.erase(chunk_coordinates)
+	chunk.deactivate()
+	chunk.queue_free()
+
+# evict the farthest chunks while loaded chunks use more than memory_budget
+func enforce_memory_budget():
+	memory_checked = true
+	var usage = {}
+	var total = 0
+	for chunk_coordinates in chunks:
+		var chunk_usage = chunks[chunk_coordinates].get_memory_usage()
+		usage[chunk_coordinates] = chunk_usage["total"] + chunk_usage["lighting"]
+		total += usage[chunk_coordinates]
+	if total <= memory_budget:
+		return
+	var by_distance = chunks.keys()
+	by_distance.sort_custom(func(a, b): return chunk_distance_squared(a) < chunk_distance_squared(b))
+	while total > memory_budget and by_distance.size() > 1:
+		var chunk_coordinates = by_distance.pop_back()
+		total -= usage[chunk_coordinates]
+		unload_chunk(chunk_coordinates)
 
 # return the ID of the voxel at global coordinates (x,y,z) 
 func get_voxel(coordinates):
@@ -58,24 +216,41 @@ func get_light_level(coordinates):
 	var chunk_and_local_coordinates = get_chunk_and_local_coordinates(coordinates)
 	if chunk_and_local_coordinates == null:
 		if (coordinates[1] < 0): return 0 # no light if below world
-		else: return CubeGrid.ambient_light_level # return default (ambient) light level if coordinates are otherwise invalid (above world)
+		else: return CubeGrid.ambient_light_level # return default (ambient) light level if coordinates are otherwise invalid (above world or not loaded)
 	else: # coordinates are within this world (and thus one of its chunks)
 		return chunk_and_local_coordinates[0].get_light_level(chunk_and_local_coordinates[1]) # return light level from within a chunk
 
 func flood_fill_light(coordinates, light_level):
 	var chunk_and_local_coordinates = get_chunk_and_local_coordinates(coordinates)
 	if chunk_and_local_coordinates == null:
-		return #  no chunk. only happens with invalid y coordinates
+		return # no chunk: invalid y coordinates or not loaded
 	else:
 		chunk_and_local_coordinates[0].flood_fill_light(chunk_and_local_coordinates[1], light_level)
 
+# sets the voxel at global coordinates (x,y,z) and updates light around it, across chunk borders
+# returns {chunk: PackedInt32Array of VoxelLighting sections} for every chunk to remesh
+func edit_voxel(coordinates, value):
+	var chunk_and_local_coordinates = get_chunk_and_local_coordinates(coordinates)
+	if chunk_and_local_coordinates == null:
+		return {} # no chunk: invalid y coordinates or not loaded
+	return chunk_and_local_coordinates[0].edit_voxel(chunk_and_local_coordinates[1], value)
+
+# links a chunk's VoxelLighting with those of the already lit chunks next to it (x/z only; the world is one chunk tall)
+func link_lighting(chunk):
+	for direction in [0, 1, 4, 5]: # +x, -x, +z, -z in CubeGrid.DIRECTION_NORMALS_ARRAY
+		var normal = CubeGrid.DIRECTION_NORMALS_ARRAY[direction]
+		var neighbor_coordinates = [chunk.chunk_coordinates[0] + normal[0], chunk.chunk_coordinates[1] + normal[2]]
+		if chunks.has(neighbor_coordinates) and chunks[neighbor_coordinates].lighting != null:
+			chunk.lighting.link(direction, chunks[neighbor_coordinates].lighting)
+
 # returns the chunk and local coordinates associated with the given global coordinates in an array
+# returns null if there is no such chunk or it isn't loaded
 func get_chunk_and_local_coordinates(coordinates):
 	var y = coordinates[1]
 	if ((y < 0) or (y >= TerrainChunk.chunk_height)): return null # no chunk if out of y bounds
 	var chunk_coordinates = get_chunk_coordinates(coordinates)
-	if not chunks.has(chunk_coordinates): 
-		add_inactive_chunk(chunk_coordinates)
+	if not chunks.has(chunk_coordinates):
+		return null # not loaded
 	var chunk = chunks[chunk_coordinates]
 	return [chunk, to_local_voxel_coordinates(coordinates, chunk_coordinates)]
 